@@ -1,4 +1,4 @@
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlmodel import Session, select
 from jose import JWTError, jwt
@@ -22,6 +22,9 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
+def decode_access_token(token: str):
+    return jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+
 async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -41,3 +44,33 @@ async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = De
     if user is None:
         raise credentials_exception
     return user
+
+def get_optional_user(request: Request, db: Session = Depends(get_db)) -> Optional[models.User]:
+    """
+    获取当前登录用户（公开接口使用，未登录或令牌无效时返回 None）
+    """
+    token = None
+    authorization = request.headers.get("Authorization")
+    if authorization and authorization.lower().startswith("bearer "):
+        token = authorization[7:]
+    else:
+        # 兼容通过查询参数传递令牌的旧客户端
+        for param in request.query_params:
+            if param.lower() == "token":
+                token = request.query_params[param]
+                break
+    
+    if not token:
+        return None
+    
+    try:
+        payload = decode_access_token(token)
+    except JWTError:
+        return None
+    
+    username = payload.get("sub")
+    if username is None:
+        return None
+    
+    statement = select(models.User).where(models.User.username == username)
+    return db.exec(statement).first()
@@ -0,0 +1,180 @@
+"""
+批量提交（group commit）写入压测：多个线程并发执行小的写操作（点赞、浏览次数、回复、关注），
+分别用“每个请求各自提交”和批量写线程 WriteQueue 执行，比较吞吐量和提交延迟。
+
+每种方式使用一个新建的临时数据库，数据和操作序列相同。
+
+用法：
+    python benchmarks/group_commit.py
+    python benchmarks/group_commit.py --threads 32 --seconds 10 --budget 0.005
+"""
+from datetime import datetime
+import argparse
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# database 模块在当前目录创建数据库和日志目录，在临时目录中运行
+os.chdir(tempfile.mkdtemp(prefix="group_commit_"))
+
+from sqlalchemy import insert, update
+from sqlmodel import Session, SQLModel, create_engine
+
+import models
+from like_counter import _execute_like, _bump_batch_like_counts
+from user_stats import bump_user_stats
+from write_queue import WriteQueue
+
+def seed(engine, users: int, posts: int):
+    now = datetime.utcnow()
+    with Session(engine) as db:
+        db.execute(models.User.__table__.insert(), [
+            {"username": f"bench_{i}", "email": f"bench_{i}@example.com", "hashed_password": "x",
+             "is_active": True, "is_admin": False, "created_at": now}
+            for i in range(1, users + 1)
+        ])
+        db.execute(models.Post.__table__.insert(), [
+            {"title": f"帖子 {i}", "content": "压测", "excerpt": "压测", "author_id": i % users + 1,
+             "view_count": 0, "is_pinned": False, "is_closed": False, "created_at": now, "updated_at": now,
+             "last_reply_at": now, "last_replier_id": i % users + 1, "like_count": 0, "last_floor_number": 0}
+            for i in range(1, posts + 1)
+        ])
+        db.execute(models.UserStats.__table__.insert(), [
+            {"user_id": i, "post_count": 0, "floor_count": 0, "followers_count": 0, "following_count": 0}
+            for i in range(1, users + 1)
+        ])
+        db.commit()
+
+def like(rng: random.Random, users: int, posts: int):
+    user_id, post_id = rng.randint(1, users), rng.randint(1, posts)
+    return lambda db: _execute_like(db, "like", user_id, post_id, datetime.now())
+
+def view(rng: random.Random, users: int, posts: int):
+    post_id = rng.randint(1, posts)
+    return lambda db: db.execute(
+        update(models.Post).where(models.Post.id == post_id).values(view_count=models.Post.view_count + 1)
+    )
+
+def reply(rng: random.Random, users: int, posts: int):
+    user_id, post_id = rng.randint(1, users), rng.randint(1, posts)
+
+    def execute(db: Session):
+        now = datetime.utcnow()
+        floor_number = db.execute(
+            update(models.Post)
+            .where(models.Post.id == post_id)
+            .values(last_floor_number=models.Post.last_floor_number + 1, last_reply_at=now,
+                    last_replier_id=user_id)
+            .returning(models.Post.last_floor_number)
+        ).scalar()
+        db.add(models.Floor(content="压测回复", post_id=post_id, author_id=user_id, floor_number=floor_number,
+                            created_at=now, updated_at=now))
+        bump_user_stats(db, user_id, floor_count=1)
+        db.flush()
+    return execute
+
+def follow(rng: random.Random, users: int, posts: int):
+    follower_id, followed_id = rng.sample(range(1, users + 1), 2)
+
+    def execute(db: Session):
+        statement = (
+            insert(models.Follow).prefix_with("OR IGNORE")
+            .values(follower_id=follower_id, followed_id=followed_id, created_at=datetime.now())
+        )
+        if db.execute(statement).rowcount:
+            bump_user_stats(db, follower_id, following_count=1)
+            bump_user_stats(db, followed_id, followers_count=1)
+    return execute
+
+# (权重, 操作)
+MIX = [(40, like), (30, view), (20, reply), (10, follow)]
+
+def direct_commit(engine):
+    """每个操作各自开启事务并提交（原来路由中的写法）"""
+    def run(execute):
+        with Session(engine) as db:
+            execute(db)
+            _bump_batch_like_counts(db)
+            db.commit()
+    return run, None
+
+def group_commit(engine, budget: float):
+    writer = WriteQueue(engine, batch_budget=budget)
+    writer.add_before_commit(_bump_batch_like_counts)
+    return writer.run, writer
+
+def run_mode(name: str, args, make_runner) -> dict:
+    path = os.path.join(os.getcwd(), f"{name}.db")
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False, "timeout": 30})
+    SQLModel.metadata.create_all(engine)
+    seed(engine, args.users, args.posts)
+    run, writer = make_runner(engine)
+
+    weights = [weight for weight, _ in MIX]
+    operations = [operation for _, operation in MIX]
+    latencies = [[] for _ in range(args.threads)]
+    errors = [0] * args.threads
+    deadline = time.perf_counter() + args.seconds
+
+    def worker(index: int):
+        rng = random.Random(args.seed + index)
+        while time.perf_counter() < deadline:
+            execute = rng.choices(operations, weights)[0](rng, args.users, args.posts)
+            started = time.perf_counter()
+            try:
+                run(execute)
+            except Exception:
+                errors[index] += 1
+                continue
+            latencies[index].append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(args.threads)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    result = {"name": name, "elapsed": elapsed, "errors": sum(errors)}
+    values = sorted(value for per_thread in latencies for value in per_thread)
+    result["operations"] = len(values)
+    result["p50"] = values[len(values) // 2] if values else 0.0
+    result["p99"] = values[min(int(len(values) * 0.99), len(values) - 1)] if values else 0.0
+    if writer is not None:
+        writer.stop()
+        result["batches"] = writer.stats()["batches"]
+    engine.dispose()
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description="批量提交写入压测")
+    parser.add_argument("--threads", type=int, default=16, help="并发写入线程数")
+    parser.add_argument("--seconds", type=float, default=5.0, help="每种方式的压测时长（秒）")
+    parser.add_argument("--budget", type=float, default=0.005, help="批量写线程收集一批操作的时间预算（秒）")
+    parser.add_argument("--users", type=int, default=1000, help="用户数量")
+    parser.add_argument("--posts", type=int, default=1000, help="帖子数量")
+    parser.add_argument("--seed", type=int, default=0, help="随机种子")
+    args = parser.parse_args()
+
+    results = [
+        run_mode("direct", args, direct_commit),
+        run_mode("group", args, lambda engine: group_commit(engine, args.budget)),
+    ]
+    print(f"{'方式':<10}{'操作数':>8}{'吞吐(次/秒)':>14}{'p50(ms)':>10}{'p99(ms)':>10}{'错误':>6}{'提交批次':>10}")
+    for result in results:
+        print(
+            f"{result['name']:<10}{result['operations']:>8}{result['operations'] / result['elapsed']:>14.0f}"
+            f"{result['p50'] * 1000:>10.2f}{result['p99'] * 1000:>10.2f}{result['errors']:>6}"
+            f"{result.get('batches', result['operations']):>10}"
+        )
+    direct, group = results
+    if direct["operations"]:
+        print(f"吞吐提升: {group['operations'] / group['elapsed'] / (direct['operations'] / direct['elapsed']):.1f} 倍")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+响应序列化耗时对比（每页）：
+
+- default：路由返回手工拼装的字典，FastAPI 按 response_model 校验后再转换，最后用标准库 json 编码（改造前）
+- orjson：同样的校验和转换，最后用 orjson 编码（ORJSONResponse）
+- adapter：路由中已是响应模型实例，直接用预编译的 TypeAdapter 序列化为 JSON 字节（serialization.model_response）
+
+用法：python benchmarks/json_serialization.py --page-size 20 100 --repeat 200
+"""
+from datetime import datetime, timedelta
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+from typing import List
+
+import schemas
+from serialization import floor_list_adapter, post_list_adapter
+
+def make_user(i: int) -> dict:
+    now = datetime.utcnow()
+    return {
+        "id": i, "username": f"user_{i}", "email": f"user_{i}@example.com", "avatar": f"/uploads/avatars/{i}.png",
+        "bio": "简介" * 20, "is_active": True, "is_admin": False, "created_at": now, "last_login": now,
+    }
+
+def make_post(i: int) -> dict:
+    now = datetime.utcnow() - timedelta(minutes=i)
+    return {
+        "id": i, "title": f"帖子标题 {i}", "tags": "压测,序列化", "excerpt": "摘要" * 60,
+        "author_id": i % 7, "board_id": None, "view_count": i * 3, "is_pinned": False, "is_closed": False,
+        "created_at": now, "updated_at": now, "author": make_user(i % 7), "floor_count": 5,
+        "like_count": i, "is_liked": False, "last_reply_at": now, "last_replier_id": i % 5,
+        "last_replier": make_user(i % 5), "last_floor_number": 5, "unread_count": None,
+    }
+
+def make_floor(i: int) -> dict:
+    now = datetime.utcnow()
+    return {
+        "id": i, "content": "回复内容" * 50, "reply_to_floor_id": None, "post_id": 1, "author_id": i % 7,
+        "floor_number": i, "created_at": now, "updated_at": now, "author": make_user(i % 7),
+    }
+
+def bench(fn, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+# 复用同一个事件循环，避免把创建事件循环的开销计入 default/orjson
+_loop = asyncio.new_event_loop()
+
+def run_default(field, content, response_class):
+    value = _loop.run_until_complete(serialize_response(field=field, response_content=content))
+    return response_class(content=value).body
+
+def main():
+    parser = argparse.ArgumentParser(description="响应序列化耗时对比")
+    parser.add_argument("--page-size", type=int, nargs="+", default=[20, 100], help="每页条数，可以给多个")
+    parser.add_argument("--repeat", type=int, default=200, help="每种方式重复次数（取中位数）")
+    args = parser.parse_args()
+
+    post_field = create_response_field(name="response", type_=schemas.PostSearchResponse)
+    floor_field = create_response_field(name="response", type_=List[schemas.FloorResponse])
+
+    print(f"{'接口':<10}{'每页':>6}{'default 毫秒':>14}{'orjson 毫秒':>14}{'adapter 毫秒':>14}{'加速':>8}")
+    for page_size in args.page_size:
+        # 改造前路由返回的字典
+        post_dicts = {"total": 1000, "page": 1, "page_size": page_size,
+                      "results": [make_post(i) for i in range(page_size)]}
+        floor_dicts = [make_floor(i) for i in range(page_size)]
+        # 改造后路由中已有的响应模型
+        post_models = schemas.PostSearchResponse.model_validate(post_dicts)
+        floor_models = [schemas.FloorResponse.model_validate(floor) for floor in floor_dicts]
+
+        cases = [
+            ("posts", post_field, post_dicts, lambda: post_list_adapter.dump_json(post_models)),
+            ("floors", floor_field, floor_dicts, lambda: floor_list_adapter.dump_json(floor_models)),
+        ]
+        for name, field, content, fast in cases:
+            default_ms = bench(lambda: run_default(field, content, JSONResponse), args.repeat)
+            orjson_ms = bench(lambda: run_default(field, content, ORJSONResponse), args.repeat)
+            adapter_ms = bench(fast, args.repeat)
+            print(
+                f"{name:<10}{page_size:>6}{default_ms:>14.3f}{orjson_ms:>14.3f}{adapter_ms:>14.3f}"
+                f"{default_ms / adapter_ms:>7.1f}x"
+            )
+
+if __name__ == "__main__":
+    main()
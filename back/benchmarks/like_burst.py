@@ -0,0 +1,122 @@
+"""
+热门帖子点赞压测：以固定速率（默认 1000 次/秒）对同一个帖子点赞，
+检查批量写线程的吞吐、提交批次和内存计数与数据库是否一致。
+
+用法：python benchmarks/like_burst.py --rate 1000 --seconds 5
+"""
+from datetime import datetime
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlmodel import Session, SQLModel, create_engine, select, func
+
+import models
+from like_counter import LikeCounter, _execute_like, _bump_batch_like_counts
+from write_queue import WriteQueue
+
+def seed(engine, user_count: int) -> int:
+    with Session(engine) as db:
+        db.execute(
+            models.User.__table__.insert(),
+            [
+                {
+                    "username": f"bench_{i}",
+                    "email": f"bench_{i}@example.com",
+                    "hashed_password": "x",
+                    "is_active": True,
+                    "is_admin": False,
+                    "created_at": datetime.utcnow(),
+                }
+                for i in range(user_count)
+            ],
+        )
+        post = models.Post(title="热门帖子", content="压测", author_id=1)
+        db.add(post)
+        db.commit()
+        return post.id
+
+def main():
+    parser = argparse.ArgumentParser(description="热门帖子点赞压测")
+    parser.add_argument("--rate", type=int, default=1000, help="每秒点赞次数")
+    parser.add_argument("--seconds", type=float, default=5.0, help="压测时长（秒）")
+    parser.add_argument("--readers", type=int, default=4, help="并发读取点赞数的线程数")
+    parser.add_argument("--read-interval", type=float, default=0.001, help="每个读线程两次读取之间的间隔（秒）")
+    args = parser.parse_args()
+
+    total = int(args.rate * args.seconds)
+    workdir = tempfile.mkdtemp(prefix="like_burst_")
+    engine = create_engine(
+        f"sqlite:///{os.path.join(workdir, 'bench.db')}", connect_args={"check_same_thread": False}
+    )
+    SQLModel.metadata.create_all(engine)
+    post_id = seed(engine, total)
+
+    counter = LikeCounter()
+    writer = WriteQueue(engine)
+    writer.add_before_commit(_bump_batch_like_counts)
+    writer.add_before_commit(lambda db: counter.begin_write(db.info.get("liked_posts", [])))
+    writer.add_after_rollback(lambda db: counter.cancel_write(db.info.pop("liked_posts", [])))
+
+    # 读线程持续从内存计数层读取点赞数
+    stop_reading = threading.Event()
+    reads = [0] * args.readers
+
+    def reader(index):
+        with Session(engine) as db:
+            while not stop_reading.is_set():
+                counter.get(db, post_id)
+                reads[index] += 1
+                time.sleep(args.read_interval)
+
+    reader_threads = [threading.Thread(target=reader, args=(i,)) for i in range(args.readers)]
+    for thread in reader_threads:
+        thread.start()
+
+    # 按固定速率提交点赞，每个用户点赞一次
+    latencies = []
+    futures = []
+    interval = 1.0 / args.rate
+    started = time.perf_counter()
+    for i in range(total):
+        target = started + i * interval
+        delay = target - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        submitted = time.perf_counter()
+        future = writer.submit(
+            lambda db, user_id=i + 1: _execute_like(db, "like", user_id, post_id, datetime.now()),
+            lambda applied: applied and counter.apply(post_id, 1)
+        )
+        future.add_done_callback(lambda _, submitted=submitted: latencies.append(time.perf_counter() - submitted))
+        futures.append(future)
+    for future in futures:
+        future.result()
+    elapsed = time.perf_counter() - started
+
+    stop_reading.set()
+    for thread in reader_threads:
+        thread.join()
+    writer.stop()
+
+    with Session(engine) as db:
+        db_count = db.exec(select(func.count()).where(models.PostLike.post_id == post_id)).one()
+        memory_count = counter.get(db, post_id)
+
+    latencies.sort()
+    writer_stats = writer.stats()
+    print(f"点赞次数: {total}，耗时: {elapsed:.2f}s，实际速率: {total / elapsed:.0f}/s")
+    print(f"提交批次: {writer_stats['batches']}，平均每批: {total / max(writer_stats['batches'], 1):.1f} 个操作")
+    print(f"提交延迟 p50: {statistics.median(latencies) * 1000:.2f}ms，"
+          f"p99: {latencies[int(len(latencies) * 0.99) - 1] * 1000:.2f}ms")
+    print(f"内存读取次数: {sum(reads)}")
+    print(f"数据库点赞数: {db_count}，内存点赞数: {memory_count}，{'一致' if db_count == memory_count else '不一致'}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+"""
+帖子列表读取路径对比：ORM 对象 + model_validate（改造前的实现） vs 只查询列的 NamedTuple 行 + model_construct
+（列表只读取摘要，不读取 content），
+分别统计每页的 CPU 时间和内存峰值。
+
+用法：python benchmarks/list_read_path.py --posts 5000 --page-size 20 --pages 50
+"""
+from datetime import datetime, timedelta
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy.orm import selectinload
+from sqlmodel import Session, SQLModel, create_engine, select
+
+import models
+import schemas
+from excerpt import make_excerpt
+from post_queries import floor_counts_for, post_page_loader, sort_order
+
+def seed(engine, user_count: int, post_count: int, content_bytes: int, floors_per_post: int):
+    now = datetime.utcnow()
+    content = "内容" * (content_bytes // 6)
+    with Session(engine) as db:
+        db.execute(
+            models.User.__table__.insert(),
+            [
+                {
+                    "username": f"bench_{i}",
+                    "email": f"bench_{i}@example.com",
+                    "hashed_password": "x",
+                    "bio": "简介" * 20,
+                    "is_active": True,
+                    "is_admin": False,
+                    "created_at": now,
+                }
+                for i in range(user_count)
+            ],
+        )
+        db.execute(
+            models.Post.__table__.insert(),
+            [
+                {
+                    "title": f"帖子 {i}",
+                    "content": content,
+                    "excerpt": make_excerpt(content),
+                    "tags": "压测,列表",
+                    "author_id": random.randint(1, user_count),
+                    "view_count": random.randint(0, 1000),
+                    "is_pinned": False,
+                    "is_closed": False,
+                    "created_at": now - timedelta(minutes=i),
+                    "updated_at": now - timedelta(minutes=i),
+                    "last_reply_at": now - timedelta(minutes=i),
+                    "last_replier_id": random.randint(1, user_count),
+                    "like_count": 0,
+                    "last_floor_number": floors_per_post,
+                }
+                for i in range(post_count)
+            ],
+        )
+        db.execute(
+            models.Floor.__table__.insert(),
+            [
+                {
+                    "content": "回复",
+                    "post_id": post_id,
+                    "author_id": random.randint(1, user_count),
+                    "floor_number": number,
+                    "created_at": now,
+                    "updated_at": now,
+                }
+                for post_id in range(1, post_count + 1)
+                for number in range(1, floors_per_post + 1)
+            ],
+        )
+        db.commit()
+
+def orm_page_loader(page: int, page_size: int, order_by: tuple):
+    """改造前的实现：加载完整的 ORM 对象，再逐字段拷贝到字典并校验"""
+    def loader(db: Session) -> list:
+        offset = (page - 1) * page_size
+        query = (
+            select(models.Post)
+            .options(selectinload(models.Post.author))
+            .order_by(*order_by)
+            .offset(offset)
+            .limit(page_size)
+        )
+        posts = db.exec(query).all()
+        floor_counts = floor_counts_for(db, [post.id for post in posts])
+
+        replier_ids = {post.last_replier_id for post in posts if post.last_replier_id is not None}
+        repliers = {}
+        if replier_ids:
+            repliers = {
+                user.id: user
+                for user in db.exec(select(models.User).where(models.User.id.in_(replier_ids))).all()
+            }
+
+        results = []
+        for post in posts:
+            post_dict = {
+                "id": post.id,
+                "title": post.title,
+                "content": post.content,
+                "view_count": post.view_count,
+                "is_pinned": post.is_pinned,
+                "is_closed": post.is_closed,
+                "created_at": post.created_at,
+                "updated_at": post.updated_at,
+                "tags": post.tags,
+                "author_id": post.author_id,
+                "board_id": post.board_id,
+                "author": post.author,
+                "floor_count": floor_counts.get(post.id, 0),
+                "last_reply_at": post.last_reply_at,
+                "last_replier_id": post.last_replier_id,
+                "last_replier": repliers.get(post.last_replier_id),
+                "last_floor_number": post.last_floor_number
+            }
+            results.append(schemas.PostResponse.model_validate(post_dict, from_attributes=True))
+        return results
+    return loader
+
+def run(engine, make_loader, pages: int, page_size: int, serialize: bool) -> dict:
+    order_by = sort_order("newest")
+    timings = []
+    peaks = []
+    for page in range(1, pages + 1):
+        # 每页使用新的会话，与一次请求相同
+        loader = make_loader(page, page_size, order_by)
+        with Session(engine) as db:
+            start = time.process_time()
+            results = loader(db)
+            if serialize:
+                schemas.PostSearchResponse(total=None, page=page, page_size=page_size, results=results).model_dump_json()
+            timings.append(time.process_time() - start)
+
+        # 单独再跑一遍统计内存峰值，避免 tracemalloc 影响计时
+        loader = make_loader(page, page_size, order_by)
+        with Session(engine) as db:
+            tracemalloc.start()
+            results = loader(db)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            peaks.append(peak)
+    return {
+        "cpu_ms_per_page": statistics.mean(timings) * 1000,
+        "cpu_ms_p95": sorted(timings)[int(len(timings) * 0.95) - 1] * 1000,
+        "peak_kb_per_page": statistics.mean(peaks) / 1024,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="帖子列表读取路径对比")
+    parser.add_argument("--posts", type=int, default=5000, help="帖子数量")
+    parser.add_argument("--users", type=int, default=500, help="用户数量")
+    parser.add_argument("--floors", type=int, default=5, help="每个帖子的楼层数")
+    parser.add_argument("--content-bytes", type=int, default=2000, help="每个帖子内容的大小（字节）")
+    parser.add_argument("--page-size", type=int, default=20, help="每页帖子数")
+    parser.add_argument("--pages", type=int, default=50, help="读取的页数")
+    parser.add_argument("--serialize", action="store_true", help="计时中包含序列化为 JSON")
+    args = parser.parse_args()
+
+    random.seed(0)
+    workdir = tempfile.mkdtemp(prefix="list_read_path_")
+    engine = create_engine(
+        f"sqlite:///{os.path.join(workdir, 'bench.db')}", connect_args={"check_same_thread": False}
+    )
+    SQLModel.metadata.create_all(engine)
+    seed(engine, args.users, args.posts, args.content_bytes, args.floors)
+
+    # 先各跑一遍预热（编译 SQL、填充缓存）
+    run(engine, orm_page_loader, 2, args.page_size, args.serialize)
+    run(engine, post_page_loader, 2, args.page_size, args.serialize)
+
+    results = {
+        "orm": run(engine, orm_page_loader, args.pages, args.page_size, args.serialize),
+        "rows": run(engine, post_page_loader, args.pages, args.page_size, args.serialize),
+    }
+    print(f"{'路径':<8}{'CPU 毫秒/页':>14}{'CPU p95':>10}{'内存峰值 KB/页':>18}")
+    for name, result in results.items():
+        print(
+            f"{name:<8}{result['cpu_ms_per_page']:>14.2f}{result['cpu_ms_p95']:>10.2f}"
+            f"{result['peak_kb_per_page']:>18.1f}"
+        )
+    orm, rows = results["orm"], results["rows"]
+    print(
+        f"CPU 降低 {1 - rows['cpu_ms_per_page'] / orm['cpu_ms_per_page']:.0%}，"
+        f"内存峰值降低 {1 - rows['peak_kb_per_page'] / orm['peak_kb_per_page']:.0%}"
+    )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,265 @@
+"""
+混合负载压测：多个并发的异步客户端按权重随机调用各路由的接口，
+统计每个接口的 p50/p95/p99 延迟、吞吐量和错误数，以 JSON 输出，便于比较多次运行的结果。
+
+先用 seed_forum.py 生成数据，再让服务使用该数据库启动，例如：
+    python benchmarks/seed_forum.py --out /tmp/load/forum.db
+    cd /tmp/load && uvicorn main:app --app-dir /path/to/back --port 8000
+    python benchmarks/load_test.py --db /tmp/load/forum.db --concurrency 32 --duration 60 --out result.json
+
+帖子、用户、版块的编号按 Zipf 分布抽取（热门对象被访问得更多），编号范围从 --db 中读取。
+需要安装 httpx。
+"""
+from datetime import datetime
+import argparse
+import asyncio
+import bisect
+import itertools
+import json
+import random
+import sqlite3
+import sys
+import time
+
+import httpx
+
+SEARCH_WORDS = ["问题", "分享", "版本", "学习", "帖子", "报错"]
+
+class Workload:
+    """按权重选择请求；每个请求为 (接口名, 方法, 路径, 请求参数)"""
+
+    def __init__(self, rng: random.Random, users: int, posts: int, boards: int, zipf: float):
+        self.rng = rng
+        self.users, self.posts, self.boards = users, posts, boards
+        self._post_cumulative = list(itertools.accumulate(1.0 / rank ** zipf for rank in range(1, posts + 1)))
+        self._user_cumulative = list(itertools.accumulate(1.0 / rank ** zipf for rank in range(1, users + 1)))
+        # 热门对象的编号随机分布
+        self._post_ids = list(range(1, posts + 1))
+        self._user_ids = list(range(1, users + 1))
+        rng.shuffle(self._post_ids)
+        rng.shuffle(self._user_ids)
+        self.mix = [
+            (25, self.list_posts),
+            (10, self.hot_posts),
+            (20, self.post_detail),
+            (15, self.floors),
+            (3, self.search),
+            (5, self.profile),
+            (3, self.user),
+            (3, self.user_posts),
+            (2, self.followers),
+            (2, self.post_likes),
+            (5, self.board_posts),
+            (4, self.create_floor),
+            (3, self.like),
+            (1, self.unlike),
+            (1, self.follow),
+            (1, self.create_post),
+        ]
+        self._cumulative = list(itertools.accumulate(weight for weight, _ in self.mix))
+
+    def _zipf(self, cumulative: list, ids: list) -> int:
+        return ids[bisect.bisect_left(cumulative, self.rng.random() * cumulative[-1])]
+
+    def post_id(self) -> int:
+        return self._zipf(self._post_cumulative, self._post_ids)
+
+    def user_id(self) -> int:
+        return self._zipf(self._user_cumulative, self._user_ids)
+
+    def page(self) -> dict:
+        # 大部分访问集中在前几页
+        return {"page": min(int(self.rng.expovariate(0.7)) + 1, 50), "page_size": 20}
+
+    def next(self) -> tuple:
+        return self.mix[bisect.bisect_left(self._cumulative, self.rng.random() * self._cumulative[-1])][1]()
+
+    def list_posts(self):
+        return "GET /posts/", "GET", "/posts/", {"params": self.page()}
+
+    def hot_posts(self):
+        return "GET /posts/hot", "GET", "/posts/hot", {"params": self.page()}
+
+    def post_detail(self):
+        return "GET /posts/{post_id}", "GET", f"/posts/{self.post_id()}", {}
+
+    def floors(self):
+        return "GET /floors/post/{post_id}", "GET", f"/floors/post/{self.post_id()}", {"params": {"page_size": 20}}
+
+    def search(self):
+        return "GET /posts/search", "GET", "/posts/search", {
+            "params": {"query": self.rng.choice(SEARCH_WORDS), "page_size": 20}
+        }
+
+    def profile(self):
+        return "GET /profile/users/{user_id}", "GET", f"/profile/users/{self.user_id()}", {}
+
+    def user(self):
+        return "GET /users/{user_id}", "GET", f"/users/{self.user_id()}", {}
+
+    def user_posts(self):
+        return "GET /profile/users/{user_id}/posts", "GET", f"/profile/users/{self.user_id()}/posts", {}
+
+    def followers(self):
+        return "GET /follow/users/{user_id}/followers", "GET", f"/follow/users/{self.user_id()}/followers", {}
+
+    def post_likes(self):
+        return "GET /likes/posts/{post_id}", "GET", f"/likes/posts/{self.post_id()}", {}
+
+    def board_posts(self):
+        board_id = self.rng.randint(1, self.boards)
+        return "GET /boards/{board_id}/posts", "GET", f"/boards/{board_id}/posts", {"params": self.page()}
+
+    def create_floor(self):
+        return "POST /floors/", "POST", "/floors/", {
+            "json": {"post_id": self.post_id(), "content": "压测回复"}
+        }
+
+    def like(self):
+        return "POST /likes", "POST", "/likes", {"json": {"post_id": self.post_id()}}
+
+    def unlike(self):
+        return "DELETE /likes/{post_id}", "DELETE", f"/likes/{self.post_id()}", {}
+
+    def follow(self):
+        return "POST /follow", "POST", "/follow", {"json": {"followed_id": self.user_id()}}
+
+    def create_post(self):
+        return "POST /posts/", "POST", "/posts/", {
+            "json": {"title": "压测帖子", "content": "压测内容 " * 20, "tags": "压测",
+                     "board_id": self.rng.randint(1, self.boards)}
+        }
+
+def dataset_sizes(db_path: str) -> tuple:
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    try:
+        return tuple(
+            conn.execute(f"SELECT COALESCE(MAX(id), 0) FROM {table}").fetchone()[0]
+            for table in ("user", "post", "board")
+        )
+    finally:
+        conn.close()
+
+async def login(client: httpx.AsyncClient, user_ids: list, password: str) -> list:
+    headers = []
+    for user_id in user_ids:
+        response = await client.post("/token", data={"username": f"user_{user_id}", "password": password})
+        response.raise_for_status()
+        headers.append({"Authorization": f"Bearer {response.json()['access_token']}"})
+    return headers
+
+def percentile(sorted_values: list, q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(int(len(sorted_values) * q), len(sorted_values) - 1)
+    return sorted_values[index]
+
+def summarize(latencies: dict, errors: dict, elapsed: float) -> dict:
+    endpoints = {}
+    for name in sorted(set(latencies) | set(errors)):
+        values = sorted(latencies.get(name, []))
+        endpoints[name] = {
+            "requests": len(values),
+            "errors": errors.get(name, 0),
+            "throughput_rps": round(len(values) / elapsed, 2),
+            "p50_ms": round(percentile(values, 0.50) * 1000, 2),
+            "p95_ms": round(percentile(values, 0.95) * 1000, 2),
+            "p99_ms": round(percentile(values, 0.99) * 1000, 2),
+            "max_ms": round(values[-1] * 1000, 2) if values else 0.0,
+        }
+    values = sorted(value for per_endpoint in latencies.values() for value in per_endpoint)
+    return {
+        "total": {
+            "requests": len(values),
+            "errors": sum(errors.values()),
+            "throughput_rps": round(len(values) / elapsed, 2),
+            "p50_ms": round(percentile(values, 0.50) * 1000, 2),
+            "p95_ms": round(percentile(values, 0.95) * 1000, 2),
+            "p99_ms": round(percentile(values, 0.99) * 1000, 2),
+        },
+        "endpoints": endpoints,
+    }
+
+async def run(args) -> dict:
+    users, posts, boards = dataset_sizes(args.db)
+    if not (users and posts and boards):
+        raise SystemExit(f"{args.db} 中没有数据，请先运行 seed_forum.py")
+    rng = random.Random(args.seed)
+    workload = Workload(rng, users, posts, boards, args.zipf)
+
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=args.timeout) as client:
+        # 登录一组用户，请求随机使用其中一个身份
+        sessions = await login(client, rng.sample(range(1, users + 1), min(args.sessions, users)), args.password)
+
+        latencies: dict = {}
+        errors: dict = {}
+        deadline = time.perf_counter() + args.warmup + args.duration
+        measure_from = time.perf_counter() + args.warmup
+
+        async def worker():
+            while True:
+                now = time.perf_counter()
+                if now >= deadline:
+                    return
+                name, method, path, request = workload.next()
+                started = time.perf_counter()
+                try:
+                    response = await client.request(method, path, headers=rng.choice(sessions), **request)
+                    # 重复点赞/关注等业务错误（4xx）不算失败
+                    failed = response.status_code >= 500
+                except httpx.HTTPError:
+                    failed = True
+                elapsed = time.perf_counter() - started
+                if started < measure_from:
+                    continue
+                if failed:
+                    errors[name] = errors.get(name, 0) + 1
+                else:
+                    latencies.setdefault(name, []).append(elapsed)
+
+        await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+
+    result = summarize(latencies, errors, args.duration)
+    result["config"] = {
+        "base_url": args.base_url,
+        "concurrency": args.concurrency,
+        "duration_seconds": args.duration,
+        "warmup_seconds": args.warmup,
+        "dataset": {"users": users, "posts": posts, "boards": boards},
+        "started_at": datetime.now().isoformat(timespec="seconds"),
+        "seed": args.seed,
+    }
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description="混合负载压测")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000", help="服务地址")
+    parser.add_argument("--db", required=True, help="服务使用的数据库文件（读取编号范围）")
+    parser.add_argument("--concurrency", type=int, default=16, help="并发客户端数")
+    parser.add_argument("--duration", type=float, default=30.0, help="统计时长（秒）")
+    parser.add_argument("--warmup", type=float, default=5.0, help="预热时长（秒），期间的请求不统计")
+    parser.add_argument("--sessions", type=int, default=50, help="登录的用户数")
+    parser.add_argument("--password", default="password", help="seed_forum.py 中设置的密码")
+    parser.add_argument("--zipf", type=float, default=1.1, help="访问热度分布的指数")
+    parser.add_argument("--timeout", type=float, default=30.0, help="单个请求的超时（秒）")
+    parser.add_argument("--seed", type=int, default=0, help="随机种子")
+    parser.add_argument("--out", help="结果写入的 JSON 文件，默认输出到标准输出")
+    args = parser.parse_args()
+
+    result = asyncio.run(run(args))
+    text = json.dumps(result, ensure_ascii=False, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+        total = result["total"]
+        print(
+            f"{total['requests']} 个请求，{total['throughput_rps']} 次/秒，p50 {total['p50_ms']} ms，"
+            f"p95 {total['p95_ms']} ms，p99 {total['p99_ms']} ms，错误 {total['errors']}",
+            file=sys.stderr,
+        )
+    else:
+        print(text)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,288 @@
+"""
+每个接口的 SQL 语句数预算检查：在临时目录中建立一个新的数据库并写入测试数据，
+通过 TestClient 依次调用 routers/ 中的所有接口，统计每个请求执行的 SQL 语句数。
+
+- 超过 BUDGETS 中声明的预算，或比基线文件中记录的数量多，即视为回归，以非零状态退出
+- 列表接口预热后分别以 page_size=5 和 page_size=20 调用，大页的语句数随行数增加说明出现了逐条查询（N+1）
+- routers/ 中新增的接口没有声明预算时同样报错
+- --update-baseline 把本次结果写入基线文件，提交后语句数的变化会以 diff 的形式出现在评审中
+
+用法：python benchmarks/query_budget.py [--update-baseline]
+"""
+from datetime import datetime, timedelta
+import argparse
+import json
+import os
+import sys
+import tempfile
+
+BACK_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE_FILE = os.path.join(BACK_DIR, "benchmarks", "query_budget_baseline.json")
+sys.path.append(BACK_DIR)
+
+# 接口 -> 每个请求允许执行的 SQL 语句数（包括认证时查询当前用户）
+BUDGETS = {
+    "POST /register": 4,
+    "POST /token": 3,
+    "GET /users/me": 1,
+    "GET /": 0,
+    "GET /metrics": 0,
+    "POST /posts/": 10,
+    "GET /posts/": 7,
+    "GET /posts/hot": 6,
+    "GET /posts/search": 4,
+    "GET /posts/{post_id}": 7,
+    "PUT /posts/{post_id}": 5,
+    "DELETE /posts/{post_id}": 17,
+    "GET /floors/post/{post_id}": 6,
+    "POST /floors/": 5,
+    "PUT /floors/{floor_id}": 5,
+    "DELETE /floors/{floor_id}": 9,
+    "PUT /users/update": 4,
+    "POST /users/upload-avatar": 4,
+    "GET /users/{user_id}": 1,
+    "GET /profile/me": 5,
+    "GET /profile/users/{user_id}": 7,
+    "GET /profile/me/posts": 5,
+    "GET /profile/users/{user_id}/posts": 5,
+    "POST /follow": 5,
+    "DELETE /follow/{user_id}": 5,
+    "GET /follow/followers": 3,
+    "GET /follow/following": 3,
+    "GET /follow/users/{user_id}/followers": 4,
+    "GET /follow/users/{user_id}/following": 4,
+    "GET /follow/users/{user_id}/mutual": 2,
+    "GET /follow/check/{user_id}": 3,
+    "POST /likes": 2,
+    "DELETE /likes/{post_id}": 2,
+    "POST /likes/batch": 5,
+    "GET /likes/posts/{post_id}": 5,
+    "GET /likes/users/me/liked-posts": 5,
+    "GET /boards/": 1,
+    "POST /boards/": 4,
+    "GET /boards/{board_id}": 1,
+    "GET /boards/{board_id}/posts": 7,
+    "GET /boards/{board_id}/hot": 7,
+    "GET /boards/{board_id}/search": 7,
+}
+
+# 不参与检查的接口及原因
+SKIPPED = {
+    "GET /nickname/generate": "只使用 RNN 模型，不访问数据库",
+    "POST /nickname/train": "在后台训练模型，不访问数据库",
+    "GET /nickname/status": "只返回内存中的训练状态",
+}
+
+# 列表接口：分别以两种页大小调用，检查语句数与页大小无关
+PAGE_SIZES = (5, 20)
+
+def seed(engine, user_count: int = 12, post_count: int = 30, floors_per_post: int = 4):
+    """直接批量写入测试数据（密码哈希使用占位值，登录接口另行注册用户）"""
+    from sqlmodel import Session
+    import models
+
+    now = datetime.now()
+    with Session(engine) as db:
+        db.add(models.Board(name="综合", description="预算检查", post_count=post_count))
+        db.commit()
+        db.execute(models.User.__table__.insert(), [
+            {
+                "username": f"budget_{i}", "email": f"budget_{i}@example.com", "hashed_password": "x",
+                "is_active": True, "is_admin": i == 0, "created_at": now,
+            }
+            for i in range(user_count)
+        ])
+        db.execute(models.Post.__table__.insert(), [
+            {
+                "title": f"帖子 {i}", "content": "内容 " * 40, "excerpt": "内容 " * 20, "tags": "预算,检查",
+                "author_id": i % user_count + 1, "board_id": 1, "view_count": i, "is_pinned": i == 0,
+                "is_closed": False, "created_at": now - timedelta(minutes=i), "updated_at": now - timedelta(minutes=i),
+                "last_reply_at": now - timedelta(minutes=i), "last_replier_id": (i + 1) % user_count + 1,
+                "like_count": 0, "hot_score": float(post_count - i), "last_floor_number": floors_per_post,
+            }
+            for i in range(post_count)
+        ])
+        db.execute(models.Floor.__table__.insert(), [
+            {
+                "content": f"回复 {number}", "post_id": post_id, "author_id": (post_id + number) % user_count + 1,
+                "floor_number": number, "created_at": now, "updated_at": now,
+            }
+            for post_id in range(1, post_count + 1)
+            for number in range(1, floors_per_post + 1)
+        ])
+        # 用户 1 关注其他所有用户，其他用户都关注用户 1；用户 1 点赞前 25 个帖子，其他用户点赞帖子 1
+        db.execute(models.Follow.__table__.insert(), [
+            {"follower_id": follower, "followed_id": followed, "created_at": now}
+            for follower, followed in [(1, i) for i in range(2, user_count + 1)] + [(i, 1) for i in range(2, user_count + 1)]
+        ])
+        # 点赞时间各不相同，列表的顺序不依赖索引的选择
+        db.execute(models.PostLike.__table__.insert(), [
+            {"user_id": user_id, "post_id": post_id, "created_at": now - timedelta(seconds=post_id * user_count + user_id)}
+            for user_id, post_id in [(1, i) for i in range(1, 26)] + [(i, 1) for i in range(2, user_count + 1)]
+        ])
+        db.execute(models.Post.__table__.update().values(like_count=1).where(models.Post.id <= 25))
+        db.execute(models.Post.__table__.update().values(like_count=user_count).where(models.Post.id == 1))
+        db.commit()
+
+def build_cases(token_for):
+    """
+    依次调用的请求：(接口, 路径, 请求参数, 是否为列表接口)
+    写操作放在最后，删除放在最后的最后，不影响前面读接口的数据量
+    """
+    admin, other = token_for(1), token_for(2)
+    return [
+        ("GET /", "/", {}, False),
+        ("GET /users/me", "/users/me", {"headers": other}, False),
+        ("GET /posts/", "/posts/", {"headers": admin}, True),
+        ("GET /posts/hot", "/posts/hot", {"headers": admin}, True),
+        ("GET /posts/search", "/posts/search", {"headers": admin, "params": {"query": "帖子"}}, True),
+        ("GET /posts/{post_id}", "/posts/1", {"headers": other}, False),
+        ("GET /floors/post/{post_id}", "/floors/post/1", {"headers": other}, True),
+        ("GET /users/{user_id}", "/users/2", {"headers": admin}, False),
+        ("GET /profile/me", "/profile/me", {"headers": admin}, False),
+        ("GET /profile/users/{user_id}", "/profile/users/1", {"headers": other}, False),
+        ("GET /profile/me/posts", "/profile/me/posts", {"headers": admin}, True),
+        ("GET /profile/users/{user_id}/posts", "/profile/users/1/posts", {}, True),
+        ("GET /follow/followers", "/follow/followers", {"headers": admin}, True),
+        ("GET /follow/following", "/follow/following", {"headers": admin}, True),
+        ("GET /follow/users/{user_id}/followers", "/follow/users/1/followers", {"headers": other}, True),
+        ("GET /follow/users/{user_id}/following", "/follow/users/1/following", {"headers": other}, True),
+        ("GET /follow/users/{user_id}/mutual", "/follow/users/1/mutual", {"headers": other}, False),
+        ("GET /follow/check/{user_id}", "/follow/check/1", {"headers": other}, False),
+        ("GET /likes/posts/{post_id}", "/likes/posts/1", {"headers": admin}, True),
+        ("GET /likes/users/me/liked-posts", "/likes/users/me/liked-posts", {"headers": admin}, True),
+        ("GET /boards/", "/boards/", {}, False),
+        ("GET /boards/{board_id}", "/boards/1", {}, False),
+        ("GET /boards/{board_id}/posts", "/boards/1/posts", {"headers": admin}, True),
+        ("GET /boards/{board_id}/hot", "/boards/1/hot", {"headers": admin}, True),
+        ("GET /boards/{board_id}/search", "/boards/1/search", {"headers": admin, "params": {"query": "帖子"}}, True),
+        ("GET /metrics", "/metrics", {}, False),
+        # 写操作
+        ("POST /register", "/register", {"json": {"username": "budget_login", "email": "login@example.com",
+                                                 "password": "pw"}}, False),
+        ("POST /token", "/token", {"data": {"username": "budget_login", "password": "pw"}}, False),
+        ("POST /boards/", "/boards/", {"headers": admin, "json": {"name": "新版块"}}, False),
+        ("POST /posts/", "/posts/", {"headers": other, "json": {"title": "新帖", "content": "内容", "tags": "a",
+                                                              "board_id": 1}}, False),
+        ("PUT /posts/{post_id}", "/posts/2", {"headers": admin, "json": {"title": "修改"}}, False),
+        ("POST /floors/", "/floors/", {"headers": admin, "json": {"post_id": 2, "content": "新回复"}}, False),
+        ("PUT /floors/{floor_id}", "/floors/5", {"headers": admin, "json": {"content": "修改回复"}}, False),
+        ("PUT /users/update", "/users/update", {"headers": other, "json": {"bio": "简介"}}, False),
+        ("POST /users/upload-avatar", "/users/upload-avatar",
+         {"headers": other, "files": {"file": ("a.png", b"\x89PNG", "image/png")}}, False),
+        ("POST /likes", "/likes", {"headers": other, "json": {"post_id": 3}}, False),
+        ("DELETE /likes/{post_id}", "/likes/3", {"headers": other}, False),
+        ("POST /likes/batch", "/likes/batch", {"headers": other, "json": {"operations": [
+            {"post_id": 4, "action": "like"}, {"post_id": 5, "action": "like"}, {"post_id": 1, "action": "unlike"},
+        ]}}, False),
+        ("POST /follow", "/follow", {"headers": other, "json": {"followed_id": 3}}, False),
+        ("DELETE /follow/{user_id}", "/follow/3", {"headers": other}, False),
+        ("DELETE /floors/{floor_id}", "/floors/6", {"headers": admin}, False),
+        ("DELETE /posts/{post_id}", "/posts/30", {"headers": admin}, False),
+    ]
+
+def main():
+    parser = argparse.ArgumentParser(description="每个接口的 SQL 语句数预算检查")
+    parser.add_argument("--update-baseline", action="store_true", help="把本次结果写入基线文件")
+    args = parser.parse_args()
+
+    # 应用使用相对路径的 ./forum.db 和 uploads/，切换到临时目录后导入，得到一个全新的数据库
+    os.chdir(tempfile.mkdtemp(prefix="query_budget_"))
+
+    from fastapi.routing import APIRoute
+    from fastapi.testclient import TestClient
+    from sqlalchemy import event
+
+    import main as app_main
+    from auth import create_access_token
+    from database import engine
+    from metrics import current_request
+
+    seed(engine)
+
+    # 只统计请求内执行的语句（后台写线程等不计入）
+    counter = {"count": 0}
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def count_statement(conn, cursor, statement, parameters, context, executemany):
+        if current_request.get() is not None:
+            counter["count"] += 1
+
+    def token_for(user_id: int) -> dict:
+        token = create_access_token({"sub": f"budget_{user_id - 1}"}, timedelta(minutes=30))
+        return {"Authorization": f"Bearer {token}"}
+
+    client = TestClient(app_main.app)
+
+    def measure(path: str, request: dict) -> int:
+        method = request.pop("method")
+        counter["count"] = 0
+        response = client.request(method, path, **request)
+        if response.status_code >= 400:
+            raise SystemExit(f"{method} {path} 返回 {response.status_code}：{response.text[:200]}")
+        return counter["count"]
+
+    results = {}
+    failures = []
+    for name, path, request, paged in build_cases(token_for):
+        method = name.split(" ", 1)[0]
+        if paged:
+            # 先用另一种页大小预热与页大小无关的缓存（总数等），再分别统计各页大小第一次请求的语句数
+            measure(path, {**request, "params": {**request.get("params", {}), "page_size": 1}, "method": method})
+            counts = []
+            for size in PAGE_SIZES:
+                params = {**request.get("params", {}), "page": 1, "page_size": size}
+                counts.append(measure(path, {**request, "params": params, "method": method}))
+            # 逐条查询时大页比小页多出与行数相当的语句；缓存命中情况不同造成的少量差异不算
+            if counts[-1] - counts[0] >= (PAGE_SIZES[-1] - PAGE_SIZES[0]) // 2:
+                failures.append(f"{name}：语句数随页大小变化 {dict(zip(PAGE_SIZES, counts))}，存在逐条查询")
+            count = max(counts)
+        else:
+            count = measure(path, {**request, "method": method})
+        results[name] = count
+
+    routes = {
+        f"{method} {route.path}"
+        for route in app_main.app.routes if isinstance(route, APIRoute)
+        for method in route.methods
+    }
+    for name in sorted(routes - set(results) - set(SKIPPED)):
+        failures.append(f"{name}：没有检查用例，请在 BUDGETS 和 build_cases 中补充")
+
+    baseline = {}
+    if os.path.exists(BASELINE_FILE):
+        with open(BASELINE_FILE, encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    print(f"{'接口':<42}{'语句数':>6}{'预算':>6}{'基线':>6}")
+    for name, count in results.items():
+        budget = BUDGETS.get(name)
+        previous = baseline.get(name)
+        marker = ""
+        if budget is None:
+            failures.append(f"{name}：没有声明预算")
+        elif count > budget:
+            failures.append(f"{name}：{count} 条语句，超过预算 {budget}")
+            marker = "  超出预算"
+        if previous is not None and count != previous:
+            marker += f"  基线 {previous} -> {count}"
+            if count > previous and not args.update_baseline:
+                failures.append(f"{name}：语句数从 {previous} 增加到 {count}")
+        print(f"{name:<42}{count:>6}{budget if budget is not None else '-':>6}"
+              f"{previous if previous is not None else '-':>6}{marker}")
+
+    if args.update_baseline:
+        with open(BASELINE_FILE, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+            f.write("\n")
+        print(f"基线已写入 {BASELINE_FILE}")
+
+    if failures:
+        print("\n检查未通过：")
+        for failure in failures:
+            print(f"- {failure}")
+        sys.exit(1)
+    print("\n所有接口都在预算之内")
+
+if __name__ == "__main__":
+    main()
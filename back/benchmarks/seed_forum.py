@@ -0,0 +1,242 @@
+"""
+生成大规模论坛数据：用户、版块、帖子、楼层、点赞和关注，用于压测和评估优化效果。
+
+- 发帖数、回复数、点赞数、粉丝数都按幂律（Zipf）分布：少数用户/帖子占了大部分互动
+- 直接用 sqlite3 的 executemany 分批写入，写入期间关闭日志和同步
+- 帖子上的冗余字段（最后回复、楼层号、点赞数、摘要、热度）和版块帖子数与明细数据一致
+- 所有用户的密码相同（--password），压测脚本可以用任意用户登录
+
+用法：
+    python benchmarks/seed_forum.py --out /tmp/forum_large.db
+    python benchmarks/seed_forum.py --out /tmp/forum_1m.db --users 100000 --posts 1000000 \\
+        --floors 10000000 --likes 5000000 --follows 2000000
+"""
+from datetime import datetime, timedelta
+import argparse
+import bisect
+import itertools
+import os
+import random
+import sqlite3
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from passlib.context import CryptContext
+from sqlmodel import SQLModel, create_engine
+
+import models  # noqa: F401  注册所有表
+from excerpt import make_excerpt
+from hot_rank import hot_score
+
+BATCH_SIZE = 50000
+
+TAGS = ["讨论", "求助", "分享", "新闻", "技术", "生活", "游戏", "学习", "吐槽", "活动"]
+SENTENCES = [
+    "今天遇到一个有意思的问题，想听听大家的看法。",
+    "这个版本的改动很大，升级之前一定要先备份数据。",
+    "**重点**：请先阅读置顶帖再发帖。",
+    "有没有人遇到过同样的情况？试了很多办法都没有解决。",
+    "分享一下最近的学习笔记，欢迎指正。",
+    "周末一起去爬山吗？天气预报说是晴天。",
+    "`pip install` 之后还是报错，附上完整日志。",
+    "感谢楼上的回复，问题已经解决了！",
+]
+
+def ts(value: datetime) -> str:
+    """与 SQLAlchemy 在 SQLite 中保存的时间格式一致"""
+    return value.strftime("%Y-%m-%d %H:%M:%S.%f")
+
+def zipf_weights(n: int, s: float) -> list:
+    """排名 1..n 的 Zipf 权重"""
+    return [1.0 / (rank ** s) for rank in range(1, n + 1)]
+
+def zipf_sampler(n: int, s: float, rng: random.Random):
+    """返回按 Zipf 分布抽取 1..n 中的编号的函数；排名和编号之间随机打乱，热门对象不集中在小编号"""
+    cumulative = list(itertools.accumulate(zipf_weights(n, s)))
+    ids = list(range(1, n + 1))
+    rng.shuffle(ids)
+
+    def sample(k: int = 1) -> list:
+        return [ids[bisect.bisect_left(cumulative, rng.random() * cumulative[-1])] for _ in range(k)]
+    return sample
+
+def zipf_allocation(total: int, n: int, s: float, minimum: int, rng: random.Random) -> list:
+    """把 total 按 Zipf 分配给 n 个对象（每个至少 minimum），返回打乱后的每个对象的数量"""
+    weights = zipf_weights(n, s)
+    weight_sum = sum(weights)
+    remaining = max(total - minimum * n, 0)
+    counts = [minimum + int(remaining * weight / weight_sum) for weight in weights]
+    rng.shuffle(counts)
+    return counts
+
+def insert_batches(conn: sqlite3.Connection, sql: str, rows, label: str):
+    """分批写入，返回实际插入的行数（INSERT OR IGNORE 忽略的重复行不计入）"""
+    started = time.perf_counter()
+    changes_before = conn.total_changes
+    iterator = iter(rows)
+    while True:
+        batch = list(itertools.islice(iterator, BATCH_SIZE))
+        if not batch:
+            break
+        conn.executemany(sql, batch)
+    conn.commit()
+    total = conn.total_changes - changes_before
+    print(f"{label}: {total} 行，{time.perf_counter() - started:.1f} 秒", flush=True)
+    return total
+
+def seed(args):
+    rng = random.Random(args.seed)
+    now = datetime.now().replace(microsecond=0)
+    start = now - timedelta(days=args.days)
+    span = (now - start).total_seconds()
+
+    # 先用 SQLModel 建表（与应用的表结构、索引一致），再用 sqlite3 直接批量写入
+    if os.path.exists(args.out):
+        os.remove(args.out)
+    SQLModel.metadata.create_all(create_engine(f"sqlite:///{args.out}"))
+    conn = sqlite3.connect(args.out)
+    conn.execute("PRAGMA journal_mode = OFF")
+    conn.execute("PRAGMA synchronous = OFF")
+    conn.execute("PRAGMA cache_size = -262144")
+
+    hashed_password = CryptContext(schemes=["bcrypt"], deprecated="auto").hash(args.password)
+    user_created = sorted(start + timedelta(seconds=rng.random() * span) for _ in range(args.users))
+    insert_batches(conn, """
+        INSERT INTO user (id, username, email, hashed_password, bio, is_active, is_admin, created_at)
+        VALUES (?, ?, ?, ?, ?, 1, ?, ?)
+    """, (
+        (i, f"user_{i}", f"user_{i}@example.com", hashed_password, None, i == 1, ts(user_created[i - 1]))
+        for i in range(1, args.users + 1)
+    ), "用户")
+
+    board_posts = [0] * args.boards
+    insert_batches(conn, "INSERT INTO board (id, name, description, post_count, created_at) VALUES (?, ?, ?, 0, ?)", (
+        (i, f"版块 {i}", f"第 {i} 个版块", ts(start)) for i in range(1, args.boards + 1)
+    ), "版块")
+
+    # 每个帖子的楼层数（含第一楼）和点赞数按帖子热度的 Zipf 分布分配
+    floor_counts = zipf_allocation(args.floors, args.posts, args.zipf, 1, rng)
+    like_counts = zipf_allocation(args.likes, args.posts, args.zipf, 0, rng)
+    pick_author = zipf_sampler(args.users, args.zipf, rng)
+    pick_board = zipf_sampler(args.boards, 1.0, rng)
+    contents = []
+    for i in range(64):
+        content = "\n\n".join(rng.sample(SENTENCES, rng.randint(2, len(SENTENCES))))
+        contents.append((content, make_excerpt(content)))
+
+    post_created = sorted(start + timedelta(seconds=rng.random() * span) for _ in range(args.posts))
+    floor_rows = []
+
+    def post_rows():
+        for index in range(args.posts):
+            post_id = index + 1
+            created_at = post_created[index]
+            author_id = pick_author()[0]
+            board_id = pick_board()[0]
+            board_posts[board_id - 1] += 1
+            content, excerpt = contents[rng.randrange(len(contents))]
+            floor_count = floor_counts[index]
+            likes = min(like_counts[index], args.users)
+            views = likes * 20 + floor_count * 5 + rng.randint(0, 50)
+
+            # 楼层时间从发帖时间开始递增，第一楼为楼主
+            replied_at = created_at
+            repliers = [author_id] + pick_author(floor_count - 1)
+            for number, replier_id in enumerate(repliers, start=1):
+                if number > 1:
+                    replied_at = min(replied_at + timedelta(seconds=rng.expovariate(1 / 600)), now)
+                floor_rows.append((
+                    content if number == 1 else SENTENCES[rng.randrange(len(SENTENCES))],
+                    number, ts(replied_at), ts(replied_at), post_id, replier_id,
+                ))
+            yield (
+                post_id, f"帖子 {post_id}：{SENTENCES[post_id % len(SENTENCES)][:12]}", content, excerpt, views,
+                False, False, ts(created_at), ts(replied_at), ",".join(rng.sample(TAGS, 2)), author_id, board_id,
+                ts(replied_at), repliers[-1], likes, hot_score(likes, floor_count - 1, views, created_at), floor_count,
+            )
+
+    post_sql = """
+        INSERT INTO post (id, title, content, excerpt, view_count, is_pinned, is_closed, created_at, updated_at,
+                          tags, author_id, board_id, last_reply_at, last_replier_id, like_count, hot_score,
+                          last_floor_number)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """
+    floor_sql = """
+        INSERT INTO floor (content, floor_number, created_at, updated_at, post_id, author_id)
+        VALUES (?, ?, ?, ?, ?, ?)
+    """
+    # 帖子和楼层交替分批写入，楼层不需要全部留在内存中
+    started = time.perf_counter()
+    posts_written = floors_written = 0
+    iterator = post_rows()
+    while True:
+        batch = list(itertools.islice(iterator, BATCH_SIZE // 10))
+        if not batch:
+            break
+        conn.executemany(post_sql, batch)
+        conn.executemany(floor_sql, floor_rows)
+        posts_written += len(batch)
+        floors_written += len(floor_rows)
+        floor_rows.clear()
+    conn.commit()
+    print(f"帖子: {posts_written} 行，楼层: {floors_written} 行，{time.perf_counter() - started:.1f} 秒", flush=True)
+
+    conn.executemany("UPDATE board SET post_count = ? WHERE id = ?", [
+        (count, board_id) for board_id, count in enumerate(board_posts, start=1)
+    ])
+    conn.commit()
+
+    def like_rows():
+        for index, count in enumerate(like_counts):
+            count = min(count, args.users)
+            if count:
+                created_at = ts(post_created[index])
+                for user_id in rng.sample(range(1, args.users + 1), count):
+                    yield user_id, index + 1, created_at
+    insert_batches(conn, "INSERT INTO postlike (user_id, post_id, created_at) VALUES (?, ?, ?)", like_rows(), "点赞")
+
+    # 关注者均匀分布，被关注者按 Zipf 分布（少数用户拥有大部分粉丝），重复的关注关系忽略
+    followed_at = ts(now)
+
+    def follow_rows():
+        for _ in range(args.follows):
+            follower_id = rng.randint(1, args.users)
+            followed_id = pick_author()[0]
+            if follower_id != followed_id:
+                yield follower_id, followed_id, followed_at
+    insert_batches(
+        conn, "INSERT OR IGNORE INTO follow (follower_id, followed_id, created_at) VALUES (?, ?, ?)",
+        follow_rows(), "关注"
+    )
+
+    started = time.perf_counter()
+    conn.execute("ANALYZE")
+    conn.commit()
+    conn.close()
+    print(f"ANALYZE: {time.perf_counter() - started:.1f} 秒")
+
+def main():
+    parser = argparse.ArgumentParser(description="生成大规模论坛数据")
+    parser.add_argument("--out", default="forum_large.db", help="输出的数据库文件（已存在时覆盖）")
+    parser.add_argument("--users", type=int, default=10000, help="用户数量")
+    parser.add_argument("--boards", type=int, default=20, help="版块数量")
+    parser.add_argument("--posts", type=int, default=100000, help="帖子数量")
+    parser.add_argument("--floors", type=int, default=1000000, help="楼层总数（含每个帖子的第一楼）")
+    parser.add_argument("--likes", type=int, default=500000, help="点赞总数")
+    parser.add_argument("--follows", type=int, default=200000, help="关注关系数量（去重前）")
+    parser.add_argument("--days", type=int, default=365, help="数据覆盖的天数")
+    parser.add_argument("--zipf", type=float, default=1.1, help="幂律分布的指数")
+    parser.add_argument("--password", default="password", help="所有用户的密码")
+    parser.add_argument("--seed", type=int, default=0, help="随机种子")
+    args = parser.parse_args()
+    if args.floors < args.posts:
+        parser.error("--floors 不能小于 --posts（每个帖子至少有第一楼）")
+
+    started = time.perf_counter()
+    seed(args)
+    print(f"完成：{args.out}，共 {time.perf_counter() - started:.1f} 秒")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+from typing import Dict, Optional
+import gzip
+
+from fastapi import Request, Response
+
+from metrics import register_cache
+
+try:
+    import brotli  # 可选依赖：pip install brotli 后启用 br 编码
+except ImportError:
+    brotli = None
+
+# 小于该大小（字节）的响应不压缩，压缩收益抵不过开销
+MIN_SIZE = 1024
+# 逐请求压缩使用较快的级别；缓存条目只压缩一次，使用较高的级别
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+PRECOMPRESS_GZIP_LEVEL = 9
+PRECOMPRESS_BROTLI_QUALITY = 9
+# 可压缩的内容类型
+COMPRESSIBLE_TYPES = ("application/json", "text/")
+
+def choose_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """
+    根据 Accept-Encoding 选择编码，优先 br，其次 gzip；都不接受时返回 None
+
+    明确以 q=0 拒绝的编码（例如 "br;q=0, *"）不会因为 * 而被选中。
+    """
+    if not accept_encoding:
+        return None
+    accepted = set()
+    refused = set()
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        params = params.replace(" ", "")
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+            if quality <= 0:
+                refused.add(name)
+                continue
+        accepted.add(name)
+
+    def acceptable(encoding: str) -> bool:
+        return encoding in accepted or ("*" in accepted and encoding not in refused)
+
+    if brotli is not None and acceptable("br"):
+        return "br"
+    if acceptable("gzip"):
+        return "gzip"
+    return None
+
+def merge_vary(vary: Optional[str], token: str = "Accept-Encoding") -> str:
+    """在已有的 Vary 值（例如 CORS 添加的 Origin）后追加 token，已包含时原样返回"""
+    if not vary:
+        return token
+    values = [value.strip().lower() for value in vary.split(",")]
+    if token.lower() in values or "*" in values:
+        return vary
+    return f"{vary}, {token}"
+
+def compress(body: bytes, encoding: str, precompress: bool = False) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=PRECOMPRESS_BROTLI_QUALITY if precompress else BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=PRECOMPRESS_GZIP_LEVEL if precompress else GZIP_LEVEL, mtime=0)
+
+class CompressionStats:
+    def __init__(self):
+        self.compressed = 0
+        self.skipped_small = 0
+        self.precompressed_hits = 0
+        self.precompressed_builds = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+
+    def stats(self) -> dict:
+        return {
+            "brotli_available": brotli is not None,
+            "compressed": self.compressed,
+            "skipped_small": self.skipped_small,
+            "precompressed_hits": self.precompressed_hits,
+            "precompressed_builds": self.precompressed_builds,
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "ratio": self.bytes_out / self.bytes_in if self.bytes_in else 0.0,
+        }
+
+compression_stats = CompressionStats()
+register_cache("compression", compression_stats)
+
+class EncodedBody:
+    """
+    缓存条目中保存的响应体：JSON 字节及各编码压缩后的结果
+
+    每种编码只在第一次被请求时压缩一次，之后所有请求直接复用压缩结果。
+    """
+    __slots__ = ("raw", "_encoded")
+
+    def __init__(self, raw: bytes):
+        self.raw = raw
+        self._encoded: Dict[str, bytes] = {}
+
+    def get(self, encoding: Optional[str]) -> bytes:
+        if encoding is None:
+            return self.raw
+        encoded = self._encoded.get(encoding)
+        if encoded is None:
+            # 并发时可能重复压缩一次，结果相同，不加锁
+            encoded = compress(self.raw, encoding, precompress=True)
+            self._encoded[encoding] = encoded
+            compression_stats.precompressed_builds += 1
+        else:
+            compression_stats.precompressed_hits += 1
+        return encoded
+
+def encoded_response(request: Request, body: EncodedBody, response: Optional[Response] = None) -> Response:
+    """
+    返回缓存中的响应体，按 Accept-Encoding 选择预先压缩好的版本
+
+    response 为路由注入的 Response，其中设置的头（ETag 等）会复制到返回的响应上。
+    """
+    headers = dict(response.headers) if response is not None else {}
+    headers["vary"] = merge_vary(headers.pop("vary", None))
+    encoding = None
+    if len(body.raw) >= MIN_SIZE:
+        encoding = choose_encoding(request.headers.get("accept-encoding"))
+    if encoding is not None:
+        headers["Content-Encoding"] = encoding
+    return Response(content=body.get(encoding), media_type="application/json", headers=headers)
+
+class CompressionMiddleware:
+    """
+    按 Accept-Encoding 压缩响应（br / gzip），小于 MIN_SIZE 或非文本类型的响应原样返回
+
+    已经带 Content-Encoding 的响应（例如 encoded_response 返回的预压缩响应）不会再次压缩；
+    分多段发送的流式响应也原样返回。
+    """
+
+    def __init__(self, app, min_size: int = MIN_SIZE):
+        self.app = app
+        self.min_size = min_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        accept_encoding = None
+        for name, value in scope["headers"]:
+            if name == b"accept-encoding":
+                accept_encoding = value.decode("latin-1")
+                break
+        # 客户端不接受压缩时同样经过下面的处理，可压缩的响应都带上 Vary: Accept-Encoding
+        encoding = choose_encoding(accept_encoding)
+        start_message = None
+
+        async def send_compressed(message):
+            nonlocal start_message
+            if message["type"] == "http.response.start":
+                # 等拿到响应体后再决定是否压缩
+                start_message = message
+                return
+            if message["type"] != "http.response.body" or start_message is None:
+                await send(message)
+                return
+
+            start, start_message = start_message, None
+            headers = [(name, value) for name, value in start["headers"]]
+            header_names = {name.lower() for name, _ in headers}
+            content_type = next((value for name, value in headers if name.lower() == b"content-type"), b"")
+            body = message.get("body", b"")
+            negotiable = (
+                b"content-encoding" not in header_names
+                and not message.get("more_body", False)
+                and content_type.decode("latin-1").startswith(COMPRESSIBLE_TYPES)
+            )
+            if not negotiable:
+                await send(start)
+                await send(message)
+                return
+
+            # 响应内容随 Accept-Encoding 变化（即使这次没有压缩），合并到已有的 Vary 中
+            vary = ", ".join(value.decode("latin-1") for name, value in headers if name.lower() == b"vary")
+            headers = [(name, value) for name, value in headers if name.lower() != b"vary"]
+            headers.append((b"vary", merge_vary(vary).encode("latin-1")))
+            if encoding is None or len(body) < self.min_size:
+                if encoding is not None:
+                    compression_stats.skipped_small += 1
+                await send({**start, "headers": headers})
+                await send(message)
+                return
+
+            compressed = compress(body, encoding)
+            compression_stats.compressed += 1
+            compression_stats.bytes_in += len(body)
+            compression_stats.bytes_out += len(compressed)
+            headers = [(name, value) for name, value in headers if name.lower() != b"content-length"]
+            headers += [
+                (b"content-encoding", encoding.encode("latin-1")),
+                (b"content-length", str(len(compressed)).encode("latin-1")),
+            ]
+            await send({**start, "headers": headers})
+            await send({**message, "body": compressed})
+
+        await self.app(scope, receive, send_compressed)
@@ -0,0 +1,85 @@
+from collections import OrderedDict
+from typing import Hashable, Optional, Tuple
+import threading
+
+from sqlalchemy import update
+from sqlmodel import Session, select, func
+
+import models
+
+from metrics import register_cache
+
+# 近似计数的上限：超过时返回上限值并标记 total_capped（显示为“1000+”）
+COUNT_CAP = 1000
+
+def capped_count(db: Session, statement, cap: Optional[int] = COUNT_CAP) -> Tuple[int, bool]:
+    """
+    对查询结果计数，最多扫描 cap + 1 行，返回 (数量, 是否被截断)；cap 为 None 时精确计数
+
+    statement 是一个 select 语句，例如 select(models.Post.id).where(...)
+    """
+    if cap is None:
+        return db.exec(select(func.count()).select_from(statement.subquery())).one(), False
+    limited = statement.limit(cap + 1).subquery()
+    count = db.exec(select(func.count()).select_from(limited)).one()
+    if count > cap:
+        return cap, True
+    return count, False
+
+def bump_board_post_count(db: Session, board_id: Optional[int], delta: int):
+    """在当前事务中更新版块的帖子数量（不提交），帖子不属于任何版块时不做任何事"""
+    if board_id is None:
+        return
+    db.execute(
+        update(models.Board)
+        .where(models.Board.id == board_id)
+        .values(post_count=models.Board.post_count + delta)
+    )
+
+class CountCache:
+    """
+    计数结果缓存，按 (键, 版本号) 保存
+
+    版本号来自写路径维护的计数器（例如帖子列表缓存的版本），版本变化后旧结果自动失效。
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, db: Session, key: Hashable, version: int, statement,
+            cap: Optional[int] = COUNT_CAP) -> Tuple[int, bool]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == version:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        result = capped_count(db, statement, cap)
+        with self._lock:
+            self._entries[key] = (version, result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return result
+
+    def stats(self) -> dict:
+        with self._lock:
+            size = len(self._entries)
+        total = self.hits + self.misses
+        return {
+            "size": size,
+            "max_size": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / total if total else 0.0,
+        }
+
+# 帖子相关的计数（帖子总数、搜索结果数），版本号为帖子列表缓存的版本
+post_counts = CountCache()
+register_cache("post_counts", post_counts)
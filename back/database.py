@@ -1,4 +1,7 @@
-from sqlmodel import SQLModel, create_engine, Session
+from sqlmodel import create_engine, Session
+
+from metrics import instrument_engine
+from slow_query import enable_slow_query_log
 
 # 数据库uri
 My_SQLLite = "sqlite:///./forum.db"
@@ -7,6 +10,10 @@ My_SQLLite = "sqlite:///./forum.db"
 engine = create_engine(
     My_SQLLite, connect_args={"check_same_thread": False}
 )
+# 统计每个请求执行的 SQL 数量和耗时
+instrument_engine(engine)
+# 帖子/楼层/关注接口中的慢查询连同执行计划写入 logs/slow_queries.log
+enable_slow_query_log(engine)
 
 # 获取会话
 def get_db():
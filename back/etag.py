@@ -0,0 +1,65 @@
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional
+import hashlib
+
+from fastapi import Request, Response
+
+def make_etag(*parts) -> str:
+    """根据行版本（updated_at、计数等）生成弱 ETag"""
+    digest = hashlib.sha1(repr(parts).encode("utf-8")).hexdigest()[:20]
+    return f'W/"{digest}"'
+
+def user_version(user) -> tuple:
+    """用户信息中会出现在响应里的字段，任一变化都会改变 ETag"""
+    return (
+        user.id, user.username, user.email, user.avatar, user.bio,
+        user.is_active, user.is_admin, user.created_at, user.last_login
+    )
+
+def _as_utc(value: datetime) -> datetime:
+    # 数据库中保存的是不带时区的 UTC 时间
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+def _opaque(tag: str) -> str:
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+def is_not_modified(request: Request, etag: str, last_modified: Optional[datetime] = None) -> bool:
+    """
+    判断条件请求是否可以返回 304：优先比较 If-None-Match，没有时再比较 If-Modified-Since
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        return _opaque(etag) in {_opaque(tag) for tag in if_none_match.split(",")}
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        return _as_utc(last_modified).replace(microsecond=0) <= since
+    return False
+
+def validator_headers(etag: str, last_modified: Optional[datetime] = None, private: bool = False) -> dict:
+    headers = {
+        "ETag": etag,
+        # 允许缓存但每次都需要重新验证
+        "Cache-Control": "private, no-cache" if private else "no-cache",
+    }
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(_as_utc(last_modified), usegmt=True)
+    return headers
+
+def set_validators(response: Response, etag: str, last_modified: Optional[datetime] = None, private: bool = False):
+    response.headers.update(validator_headers(etag, last_modified, private))
+
+def not_modified_response(etag: str, last_modified: Optional[datetime] = None, private: bool = False) -> Response:
+    return Response(status_code=304, headers=validator_headers(etag, last_modified, private))
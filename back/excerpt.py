@@ -0,0 +1,18 @@
+import html
+import re
+
+# 列表中显示的摘要长度（字符数）
+EXCERPT_LENGTH = 120
+
+_TAG_RE = re.compile(r"<[^>]+>")
+_MARKDOWN_RE = re.compile(r"!\[[^\]]*\]\([^)]*\)|[#*_`>~]+")
+_SPACE_RE = re.compile(r"\s+")
+
+def make_excerpt(content: str, length: int = EXCERPT_LENGTH) -> str:
+    """由帖子内容生成纯文本摘要：去掉 HTML 标签和常见 Markdown 标记，合并空白后截断"""
+    text = html.unescape(_TAG_RE.sub(" ", content or ""))
+    text = _MARKDOWN_RE.sub("", text)
+    text = _SPACE_RE.sub(" ", text).strip()
+    if len(text) > length:
+        return text[:length].rstrip() + "…"
+    return text
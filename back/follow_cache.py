@@ -0,0 +1,109 @@
+from collections import OrderedDict
+from typing import FrozenSet, Tuple
+import threading
+
+from sqlmodel import Session, select
+
+import models
+from metrics import register_cache
+
+# 最多缓存多少个用户的关注集合（超出后按 LRU 淘汰）
+MAX_CACHED_USERS = 10000
+
+class FollowSetCache:
+    """
+    按用户缓存关注/粉丝集合，用于共同关注、共同好友等集合运算
+
+    每个用户对应一对不可变集合 (following, followers)，求交集和计数都在内存中完成，
+    不再需要对 Follow 表做连接查询。关注关系变化时由写路径调用 invalidate 失效。
+    """
+
+    def __init__(self, max_users: int = MAX_CACHED_USERS):
+        self.max_users = max_users
+        self._entries: "OrderedDict[int, Tuple[FrozenSet[int], FrozenSet[int]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        # 每次失效都会增加版本号，避免并发加载把旧数据写回缓存
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    def _load(self, db: Session, user_id: int) -> Tuple[FrozenSet[int], FrozenSet[int]]:
+        following_query = select(models.Follow.followed_id).where(models.Follow.follower_id == user_id)
+        followers_query = select(models.Follow.follower_id).where(models.Follow.followed_id == user_id)
+        following = frozenset(db.exec(following_query).all())
+        followers = frozenset(db.exec(followers_query).all())
+        return following, followers
+
+    def get(self, db: Session, user_id: int) -> Tuple[FrozenSet[int], FrozenSet[int]]:
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None:
+                self._entries.move_to_end(user_id)
+                self.hits += 1
+                return entry
+            self.misses += 1
+            generation = self._generation
+
+        entry = self._load(db, user_id)
+
+        with self._lock:
+            if generation == self._generation:
+                self._entries[user_id] = entry
+                self._entries.move_to_end(user_id)
+                while len(self._entries) > self.max_users:
+                    self._entries.popitem(last=False)
+        return entry
+
+    def invalidate(self, *user_ids: int):
+        with self._lock:
+            self._generation += 1
+            for user_id in user_ids:
+                self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    def following(self, db: Session, user_id: int) -> FrozenSet[int]:
+        return self.get(db, user_id)[0]
+
+    def followers(self, db: Session, user_id: int) -> FrozenSet[int]:
+        return self.get(db, user_id)[1]
+
+    def friends(self, db: Session, user_id: int) -> FrozenSet[int]:
+        """互相关注的用户"""
+        following, followers = self.get(db, user_id)
+        return following & followers
+
+    def common_followers(self, db: Session, viewer_id: int, user_id: int) -> FrozenSet[int]:
+        """viewer 关注的人中，同时也关注了 user 的用户（“X、Y 等 N 位你关注的人也关注了 TA”）"""
+        return self.following(db, viewer_id) & self.followers(db, user_id)
+
+    def mutual_friends(self, db: Session, viewer_id: int, user_id: int) -> FrozenSet[int]:
+        """viewer 与 user 的共同好友（分别与双方互相关注的用户）"""
+        return self.friends(db, viewer_id) & self.friends(db, user_id)
+
+    def stats(self) -> dict:
+        with self._lock:
+            size = len(self._entries)
+        total = self.hits + self.misses
+        return {
+            "size": size,
+            "max_size": self.max_users,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / total if total else 0.0,
+        }
+
+# 全局缓存实例
+follow_sets = FollowSetCache()
+register_cache("follow_sets", follow_sets)
+
+def preview_users(db: Session, user_ids: FrozenSet[int], limit: int = 3, offset: int = 0):
+    """按用户ID顺序取出集合中的一部分用户，用于“X、Y 等”的预览展示"""
+    ids = sorted(user_ids)[offset:offset + limit]
+    if not ids:
+        return []
+    statement = select(models.User).where(models.User.id.in_(ids)).order_by(models.User.id)
+    return db.exec(statement).all()
@@ -0,0 +1,146 @@
+from datetime import datetime
+from typing import Iterable, Optional, Set
+import logging
+import math
+import threading
+
+from sqlalchemy import update
+from sqlmodel import Session, select, func
+
+from database import engine
+import models
+from metrics import register_cache
+
+logger = logging.getLogger(__name__)
+
+# 各项互动的权重
+LIKE_WEIGHT = 3.0
+REPLY_WEIGHT = 2.0
+VIEW_WEIGHT = 0.1
+# 热度每增加 1（互动量放大 10 倍）相当于发帖时间晚多少秒
+DECAY_SECONDS = 12 * 3600
+# 计算基准时间
+EPOCH = datetime(2024, 1, 1)
+# 后台重新计算的间隔（秒）
+RECOMPUTE_INTERVAL = 5.0
+# 每次最多重新计算的帖子数
+MAX_BATCH_SIZE = 500
+
+def hot_score(likes: int, replies: int, views: int, created_at: datetime) -> float:
+    """
+    帖子热度：log10(加权互动量) + 发帖时间 / DECAY_SECONDS
+
+    时间衰减体现在发帖时间项上：新帖的基础分更高，旧帖需要多 10 倍的互动才能持平。
+    分数只随帖子自身的互动变化，不随当前时间变化，因此只需要重新计算最近有变化的帖子，
+    列表直接按 hot_score 索引扫描即可。
+    """
+    weight = likes * LIKE_WEIGHT + replies * REPLY_WEIGHT + views * VIEW_WEIGHT
+    return math.log10(max(weight, 1.0)) + (created_at - EPOCH).total_seconds() / DECAY_SECONDS
+
+class HotRanker:
+    """
+    热度分数的后台计算线程
+
+    点赞、回复、浏览的写路径调用 touch() 标记帖子，线程每隔 interval 秒
+    批量读取这些帖子的计数并写回 hot_score。启动时补算 hot_score 为空的帖子。
+    """
+
+    def __init__(self, engine, interval: float = RECOMPUTE_INTERVAL, max_batch_size: int = MAX_BATCH_SIZE):
+        self.engine = engine
+        self.interval = interval
+        self.max_batch_size = max_batch_size
+        self._touched: Set[int] = set()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopping = False
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self.runs = 0
+        self.recomputed = 0
+
+    def touch(self, *post_ids: int):
+        self.start()
+        with self._lock:
+            self._touched.update(post_ids)
+
+    def start(self):
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None:
+                self._stopping = False
+                self._thread = threading.Thread(target=self._run, name="hot-ranker", daemon=True)
+                self._thread.start()
+
+    def stop(self):
+        if self._thread is not None:
+            self._stopping = True
+            self._wakeup.set()
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        self._touch_unscored()
+        while True:
+            self._wakeup.wait(self.interval)
+            self._wakeup.clear()
+            self.flush()
+            if self._stopping:
+                break
+
+    def _touch_unscored(self):
+        try:
+            with Session(self.engine) as db:
+                post_ids = db.exec(select(models.Post.id).where(models.Post.hot_score.is_(None))).all()
+        except Exception:
+            logger.exception("查询未计算热度的帖子失败")
+            return
+        with self._lock:
+            self._touched.update(post_ids)
+
+    def flush(self):
+        """重新计算已标记的帖子，每批最多 max_batch_size 个"""
+        while True:
+            with self._lock:
+                if not self._touched:
+                    return
+                batch = [self._touched.pop() for _ in range(min(len(self._touched), self.max_batch_size))]
+            try:
+                self._recompute(batch)
+            except Exception:
+                logger.exception("重新计算帖子热度失败")
+                return
+
+    def _recompute(self, post_ids: Iterable[int]):
+        post_ids = list(post_ids)
+        with Session(self.engine) as db:
+            posts = db.exec(
+                select(models.Post.id, models.Post.like_count, models.Post.view_count, models.Post.created_at)
+                .where(models.Post.id.in_(post_ids))
+            ).all()
+            floor_counts = dict(db.exec(
+                select(models.Floor.post_id, func.count())
+                .where(models.Floor.post_id.in_(post_ids))
+                .group_by(models.Floor.post_id)
+            ).all())
+            for post_id, like_count, view_count, created_at in posts:
+                # 第一楼是楼主发言，不算回复
+                replies = max(floor_counts.get(post_id, 0) - 1, 0)
+                score = hot_score(like_count, replies, view_count, created_at)
+                db.execute(update(models.Post).where(models.Post.id == post_id).values(hot_score=score))
+            db.commit()
+        self.runs += 1
+        self.recomputed += len(posts)
+
+    def stats(self) -> dict:
+        with self._lock:
+            pending = len(self._touched)
+        return {
+            "pending": pending,
+            "runs": self.runs,
+            "recomputed": self.recomputed,
+        }
+
+# 全局实例
+hot_ranker = HotRanker(engine)
+register_cache("hot_ranker", hot_ranker)
@@ -0,0 +1,384 @@
+"""
+热数据的内存只读副本
+
+副本是一个内存中的 SQLite 数据库，保存最近的帖子窗口（最新发布、最后回复各前 WINDOW_POSTS 个帖子）
+及这些帖子的全部楼层、点赞和相关用户。帖子详情、楼层分页、点赞列表和帖子列表的前几页
+从副本读取，forum.db 只处理写入和窗口之外的冷数据读取。
+
+- 写路径在主库提交之后、使列表缓存失效之前同步副本：点赞、浏览次数按增量应用，
+  帖子/楼层的写入从主库重新读取受影响的行；窗口之外的帖子有写入时整个复制进副本
+- 后台线程每隔 RESYNC_INTERVAL 秒从 forum.db 重建副本（重新计算窗口），重建期间有写入的
+  帖子在切换前重新复制
+- 带 ETag 的读取先用主库的版本（更新时间、楼层数）核对副本，不一致时回到主库读取
+- 副本出错时停止使用，直到下一次重建成功
+
+通过环境变量 FORUM_HOT_REPLICA=1 启用，默认关闭。
+"""
+from datetime import datetime
+from typing import Callable, Iterable, List, Optional, Set
+import itertools
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+from sqlalchemy import create_engine, delete, event, insert, select, update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.pool import QueuePool
+from sqlmodel import Session
+
+from database import engine
+import models
+from metrics import instrument_engine, register_cache
+
+logger = logging.getLogger(__name__)
+
+# 是否启用副本
+HOT_REPLICA_ENABLED = os.environ.get("FORUM_HOT_REPLICA", "") == "1"
+# 每种排序方式放入副本的帖子数，列表超出这个范围的页从主库读取
+WINDOW_POSTS = 2000
+# 从 forum.db 全量重建的间隔（秒）
+RESYNC_INTERVAL = 300.0
+# 每条 IN 查询最多包含的帖子数
+CHUNK_SIZE = 500
+
+# 可以从副本读取的帖子列表排序（窗口按这些排序取前 WINDOW_POSTS 个帖子）；
+# 点赞数、浏览数、热度的排序随计数变化，不在副本中维护
+WINDOW_ORDERS = {
+    "newest": (models.Post.is_pinned.desc(), models.Post.created_at.desc(), models.Post.id.desc()),
+    "latest_reply": (models.Post.is_pinned.desc(), models.Post.last_reply_at.desc(), models.Post.id.desc()),
+}
+
+USER_TABLE = models.User.__table__
+POST_TABLE = models.Post.__table__
+FLOOR_TABLE = models.Floor.__table__
+LIKE_TABLE = models.PostLike.__table__
+
+_generations = itertools.count(1)
+
+def _chunks(values: Iterable[int]) -> Iterable[List[int]]:
+    values = sorted(values)
+    for start in range(0, len(values), CHUNK_SIZE):
+        yield values[start:start + CHUNK_SIZE]
+
+class _Replica:
+    """一代副本：内存数据库、引擎以及其中的帖子和用户"""
+
+    def __init__(self):
+        # 命名的共享缓存内存数据库，同一进程中的所有连接访问同一份数据
+        self.uri = f"file:hot_replica_{os.getpid()}_{next(_generations)}?mode=memory&cache=shared"
+        # 保持一个连接打开，所有连接关闭后内存数据库会被释放
+        self.keeper = sqlite3.connect(self.uri, uri=True, check_same_thread=False)
+        self.engine = create_engine(
+            "sqlite://",
+            creator=lambda: sqlite3.connect(self.uri, uri=True, check_same_thread=False),
+            poolclass=QueuePool, pool_size=10, max_overflow=30
+        )
+
+        @event.listens_for(self.engine, "connect")
+        def read_uncommitted(dbapi_connection, connection_record):
+            # 共享缓存模式下读不等待写入的表锁（写入只有一个线程）
+            dbapi_connection.execute("PRAGMA read_uncommitted = 1")
+
+        for table in (USER_TABLE, POST_TABLE, FLOOR_TABLE, LIKE_TABLE):
+            table.create(self.engine)
+        self.post_ids: Set[int] = set()
+        self.user_ids: Set[int] = set()
+
+    def close(self):
+        self.engine.dispose()
+        self.keeper.close()
+
+class HotReplica:
+    """
+    热数据的内存只读副本，见模块说明
+
+    读取通过 read() 进行，副本不可用时直接在主库会话上执行；
+    写路径调用 sync_post / sync_users / apply_like / apply_view，副本未启用时什么也不做。
+    """
+
+    def __init__(self, source_engine, enabled: bool = HOT_REPLICA_ENABLED, window_posts: int = WINDOW_POSTS,
+                 resync_interval: float = RESYNC_INTERVAL):
+        self.source_engine = source_engine
+        self.enabled = enabled
+        self.window_posts = window_posts
+        self.resync_interval = resync_interval
+        self._replica: Optional[_Replica] = None
+        # 上一代副本在下一次切换时才关闭，切换前开始的读取可以继续使用
+        self._retired: Optional[_Replica] = None
+        self._healthy = False
+        # 副本的写入（写路径同步和重建后的切换）串行执行
+        self._write_lock = threading.Lock()
+        # 重建期间有写入的帖子和用户，切换前重新复制
+        self._pending_posts: Optional[Set[int]] = None
+        self._pending_users: Optional[Set[int]] = None
+        self._wakeup = threading.Event()
+        self._stopping = False
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self.reads = 0
+        self.fallbacks = 0
+        self.syncs = 0
+        self.rebuilds = 0
+        self.errors = 0
+        self.last_rebuild_seconds = 0.0
+
+    def start(self):
+        if not self.enabled or self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None:
+                self._stopping = False
+                self._thread = threading.Thread(target=self._run, name="hot-replica", daemon=True)
+                self._thread.start()
+
+    def stop(self):
+        if self._thread is not None:
+            self._stopping = True
+            self._wakeup.set()
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        while not self._stopping:
+            try:
+                self._rebuild()
+            except Exception:
+                self.errors += 1
+                logger.exception("重建内存副本失败")
+            self._wakeup.wait(self.resync_interval)
+            self._wakeup.clear()
+
+    # ---- 读取 ----
+
+    def covers(self, sort: str, page: int, page_size: int) -> bool:
+        """帖子列表的这一页是否在副本的窗口之内"""
+        return self.enabled and sort in WINDOW_ORDERS and page * page_size <= self.window_posts
+
+    def read(self, db: Session, loader: Callable[[Session], object], post_id: Optional[int] = None,
+             check: Optional[Callable[[Session], bool]] = None):
+        """
+        在副本上执行 loader(会话)，返回其结果
+
+        指定 post_id 时帖子必须在副本中；check(副本会话) 用于核对副本与主库的版本。
+        副本不可用、帖子不在副本中、核对不一致或副本查询出错时，在主库会话 db 上执行 loader。
+        """
+        replica = self._usable(post_id)
+        if replica is not None:
+            try:
+                with Session(replica.engine) as replica_db:
+                    if check is None or check(replica_db):
+                        result = loader(replica_db)
+                        self.reads += 1
+                        return result
+            except SQLAlchemyError:
+                self.errors += 1
+                logger.exception("内存副本查询失败，改为查询主库")
+        self.fallbacks += 1
+        return loader(db)
+
+    def reader(self, loader: Callable[[Session], object]) -> Callable[[Session], object]:
+        """把接收会话的加载函数包装为优先从副本读取（用于页面缓存的加载函数）"""
+        return lambda db: self.read(db, loader)
+
+    def _usable(self, post_id: Optional[int]) -> Optional[_Replica]:
+        if not self.enabled:
+            return None
+        self.start()
+        replica = self._replica
+        if replica is None or not self._healthy:
+            return None
+        if post_id is not None and post_id not in replica.post_ids:
+            return None
+        return replica
+
+    # ---- 写路径 ----
+
+    def sync_post(self, post_id: int, floor_ids: Optional[Iterable[int]] = None):
+        """
+        主库提交后从主库重新复制帖子
+
+        floor_ids 为 None 时复制帖子的全部楼层和点赞（帖子被删除时从副本中删除）；
+        否则只复制帖子行和这些楼层。帖子不在副本中时总是整个复制，有写入的帖子进入副本。
+        """
+        def apply(replica: _Replica, source, target):
+            if floor_ids is None or post_id not in replica.post_ids:
+                self._copy_posts(replica, source, target, [post_id])
+                return
+            post = source.execute(select(POST_TABLE).where(POST_TABLE.c.id == post_id)).mappings().first()
+            if post is None:
+                self._copy_posts(replica, source, target, [post_id])
+                return
+            floors = source.execute(
+                select(FLOOR_TABLE).where(FLOOR_TABLE.c.id.in_(list(floor_ids)))
+            ).mappings().all()
+            target.execute(insert(POST_TABLE).prefix_with("OR REPLACE"), [dict(post)])
+            if floors:
+                target.execute(insert(FLOOR_TABLE).prefix_with("OR REPLACE"), [dict(floor) for floor in floors])
+            self._copy_users(replica, source, target, {post["author_id"], post["last_replier_id"]}
+                             | {floor["author_id"] for floor in floors})
+        self._write(apply, post_ids=[post_id])
+
+    def sync_users(self, *user_ids: int):
+        """用户资料变化后，重新复制副本中已有的这些用户"""
+        def apply(replica: _Replica, source, target):
+            self._refresh_users(replica, source, target, user_ids)
+        self._write(apply, user_ids=user_ids)
+
+    def apply_like(self, action: str, user_id: int, post_id: int, created_at: datetime):
+        """点赞/取消点赞提交后按增量应用到副本（帖子不在副本中时忽略）"""
+        def apply(replica: _Replica, source, target):
+            if post_id not in replica.post_ids:
+                return
+            if action == "like":
+                applied = target.execute(
+                    insert(LIKE_TABLE).prefix_with("OR IGNORE")
+                    .values(user_id=user_id, post_id=post_id, created_at=created_at)
+                ).rowcount > 0
+                self._copy_users(replica, source, target, {user_id})
+            else:
+                applied = target.execute(
+                    delete(LIKE_TABLE)
+                    .where(LIKE_TABLE.c.user_id == user_id, LIKE_TABLE.c.post_id == post_id)
+                ).rowcount > 0
+            if applied:
+                target.execute(
+                    update(POST_TABLE).where(POST_TABLE.c.id == post_id)
+                    .values(like_count=POST_TABLE.c.like_count + (1 if action == "like" else -1))
+                )
+        self._write(apply, post_ids=[post_id])
+
+    def apply_view(self, post_id: int):
+        """浏览次数提交后按增量应用到副本"""
+        def apply(replica: _Replica, source, target):
+            if post_id in replica.post_ids:
+                target.execute(
+                    update(POST_TABLE).where(POST_TABLE.c.id == post_id)
+                    .values(view_count=POST_TABLE.c.view_count + 1)
+                )
+        self._write(apply, post_ids=[post_id])
+
+    def _write(self, apply, post_ids: Iterable[int] = (), user_ids: Iterable[int] = ()):
+        if not self.enabled:
+            return
+        with self._write_lock:
+            if self._pending_posts is not None:
+                self._pending_posts.update(post_ids)
+                self._pending_users.update(user_ids)
+            replica = self._replica
+            if replica is None or not self._healthy:
+                return
+            try:
+                with self.source_engine.connect() as source, replica.engine.begin() as target:
+                    apply(replica, source, target)
+                self.syncs += 1
+            except Exception:
+                # 副本可能与主库不一致，停止使用并尽快重建
+                self._healthy = False
+                self.errors += 1
+                logger.exception("同步内存副本失败，重建前停止使用副本")
+                self._wakeup.set()
+
+    # ---- 复制 ----
+
+    def _window_post_ids(self, source) -> Set[int]:
+        post_ids = set()
+        for order_by in WINDOW_ORDERS.values():
+            statement = select(POST_TABLE.c.id).order_by(*order_by).limit(self.window_posts)
+            post_ids.update(source.execute(statement).scalars())
+        return post_ids
+
+    def _copy_posts(self, replica: _Replica, source, target, post_ids: Iterable[int]):
+        """用主库中的数据替换副本中这些帖子的帖子行、楼层和点赞（主库中已删除的帖子从副本删除）"""
+        user_ids = set()
+        for chunk in _chunks(post_ids):
+            # 先移出副本的帖子集合，替换期间这些帖子的读取回到主库
+            replica.post_ids.difference_update(chunk)
+            target.execute(delete(LIKE_TABLE).where(LIKE_TABLE.c.post_id.in_(chunk)))
+            target.execute(delete(FLOOR_TABLE).where(FLOOR_TABLE.c.post_id.in_(chunk)))
+            target.execute(delete(POST_TABLE).where(POST_TABLE.c.id.in_(chunk)))
+
+            posts = source.execute(select(POST_TABLE).where(POST_TABLE.c.id.in_(chunk))).mappings().all()
+            if not posts:
+                continue
+            floors = source.execute(select(FLOOR_TABLE).where(FLOOR_TABLE.c.post_id.in_(chunk))).mappings().all()
+            likes = source.execute(select(LIKE_TABLE).where(LIKE_TABLE.c.post_id.in_(chunk))).mappings().all()
+            for table, rows in ((POST_TABLE, posts), (FLOOR_TABLE, floors), (LIKE_TABLE, likes)):
+                if rows:
+                    target.execute(insert(table), [dict(row) for row in rows])
+            replica.post_ids.update(post["id"] for post in posts)
+
+            user_ids.update(post["author_id"] for post in posts)
+            user_ids.update(post["last_replier_id"] for post in posts)
+            user_ids.update(floor["author_id"] for floor in floors)
+            user_ids.update(like["user_id"] for like in likes)
+        self._copy_users(replica, source, target, user_ids)
+
+    def _copy_users(self, replica: _Replica, source, target, user_ids: Iterable[int]):
+        """复制副本中还没有的用户"""
+        missing = {user_id for user_id in user_ids if user_id is not None} - replica.user_ids
+        for chunk in _chunks(missing):
+            rows = source.execute(select(USER_TABLE).where(USER_TABLE.c.id.in_(chunk))).mappings().all()
+            if rows:
+                target.execute(insert(USER_TABLE), [dict(row) for row in rows])
+                replica.user_ids.update(row["id"] for row in rows)
+
+    def _refresh_users(self, replica: _Replica, source, target, user_ids: Iterable[int]):
+        """用主库中的数据替换副本中已有的这些用户"""
+        for chunk in _chunks(user_id for user_id in user_ids if user_id in replica.user_ids):
+            rows = source.execute(select(USER_TABLE).where(USER_TABLE.c.id.in_(chunk))).mappings().all()
+            if rows:
+                target.execute(insert(USER_TABLE).prefix_with("OR REPLACE"), [dict(row) for row in rows])
+
+    def _rebuild(self):
+        started = time.perf_counter()
+        with self._write_lock:
+            self._pending_posts, self._pending_users = set(), set()
+        replica = _Replica()
+        try:
+            with self.source_engine.connect() as source, replica.engine.begin() as target:
+                self._copy_posts(replica, source, target, self._window_post_ids(source))
+
+            with self._write_lock:
+                # 重建期间有写入的帖子和用户重新复制，之后的写入直接应用到新副本
+                pending_posts, pending_users = self._pending_posts, self._pending_users
+                self._pending_posts = self._pending_users = None
+                with self.source_engine.connect() as source, replica.engine.begin() as target:
+                    self._copy_posts(replica, source, target, pending_posts)
+                    self._refresh_users(replica, source, target, pending_users)
+                retired, self._retired = self._retired, self._replica
+                self._replica = replica
+                self._healthy = True
+        except Exception:
+            with self._write_lock:
+                self._pending_posts = self._pending_users = None
+            replica.close()
+            raise
+
+        instrument_engine(replica.engine, "hot_replica")
+        if retired is not None:
+            retired.close()
+        self.rebuilds += 1
+        self.last_rebuild_seconds = time.perf_counter() - started
+        logger.info("内存副本重建完成：%d 个帖子，%d 个用户，用时 %.2f 秒",
+                    len(replica.post_ids), len(replica.user_ids), self.last_rebuild_seconds)
+
+    def stats(self) -> dict:
+        replica = self._replica
+        return {
+            "enabled": int(self.enabled),
+            "healthy": int(self._healthy),
+            "posts": len(replica.post_ids) if replica is not None else 0,
+            "users": len(replica.user_ids) if replica is not None else 0,
+            "reads": self.reads,
+            "fallbacks": self.fallbacks,
+            "syncs": self.syncs,
+            "rebuilds": self.rebuilds,
+            "errors": self.errors,
+            "last_rebuild_seconds": self.last_rebuild_seconds,
+        }
+
+# 全局实例
+hot_replica = HotReplica(engine)
+register_cache("hot_replica", hot_replica)
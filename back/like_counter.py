@@ -0,0 +1,285 @@
+from collections import OrderedDict
+from concurrent.futures import Future
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+import threading
+
+from sqlalchemy import DateTime, delete, insert, literal, update
+from sqlmodel import Session, select, func
+
+from database import engine
+import models
+from metrics import register_cache
+from hot_rank import hot_ranker
+from write_queue import write_queue
+from hot_replica import hot_replica
+
+# 计数分片数量，不同帖子的计数更新不会争用同一把锁
+SHARD_COUNT = 16
+# 内存中最多保存的帖子点赞数（平均分到各分片，每个分片按最近使用淘汰）
+MAX_ENTRIES = 100000
+
+def bump_post_like_counts(db: Session, deltas: Dict[int, int]):
+    """在当前事务中更新帖子表上冗余的点赞数（用于按点赞数排序），不提交"""
+    for post_id, delta in deltas.items():
+        if delta:
+            db.execute(
+                update(models.Post)
+                .where(models.Post.id == post_id)
+                .values(like_count=models.Post.like_count + delta)
+            )
+
+class _Shard:
+    __slots__ = ("lock", "counts", "version", "pending")
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counts: "OrderedDict[int, int]" = OrderedDict()
+        self.version = 0
+        # 帖子ID -> 已开始提交、还未更新到内存的写入数量
+        self.pending: Dict[int, int] = {}
+
+class LikeCounter:
+    """
+    帖子点赞数的内存计数层
+
+    读请求直接从内存返回点赞数，未命中时才查询数据库；写入由批量写线程
+    提交成功后按增量更新。计数按帖子ID分片加锁，热门帖子的突发点赞不会阻塞其他帖子。
+    每个分片最多保存 max_entries / 分片数 个帖子，超出时淘汰最久未读取的帖子。
+
+    写入在提交前调用 begin_write，提交后调用 apply（失败时调用 cancel_write）。
+    两者之间未命中加载到的可能已经是提交后的数量，不放入缓存，否则 apply 会再加一次。
+    """
+
+    def __init__(self, shard_count: int = SHARD_COUNT, max_entries: int = MAX_ENTRIES):
+        self._shards = [_Shard() for _ in range(shard_count)]
+        self.max_entries = max_entries
+        self._shard_capacity = max(1, max_entries // shard_count)
+        # 自上次对账以来发生过变化的帖子
+        self._dirty = set()
+        self._dirty_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _shard(self, post_id: int) -> _Shard:
+        return self._shards[post_id % len(self._shards)]
+
+    def get(self, db: Session, post_id: int) -> int:
+        return self.get_many(db, [post_id])[post_id]
+
+    def get_many(self, db: Session, post_ids: Iterable[int]) -> Dict[int, int]:
+        result = {}
+        missing = []
+        versions = {}
+        for post_id in post_ids:
+            shard = self._shard(post_id)
+            with shard.lock:
+                count = shard.counts.get(post_id)
+                if count is None:
+                    versions[post_id] = shard.version
+                    missing.append(post_id)
+                else:
+                    shard.counts.move_to_end(post_id)
+                    result[post_id] = count
+        self.hits += len(result)
+        self.misses += len(missing)
+
+        if missing:
+            # 一次分组查询加载所有未命中的帖子
+            statement = (
+                select(models.PostLike.post_id, func.count())
+                .where(models.PostLike.post_id.in_(missing))
+                .group_by(models.PostLike.post_id)
+            )
+            loaded = dict(db.exec(statement).all())
+            for post_id in missing:
+                count = loaded.get(post_id, 0)
+                result[post_id] = count
+                shard = self._shard(post_id)
+                with shard.lock:
+                    # 加载期间有写入、或有已提交还未 apply 的写入时不缓存，交给下一次读取重新加载
+                    if shard.version == versions[post_id] and not shard.pending.get(post_id):
+                        shard.counts[post_id] = count
+                        while len(shard.counts) > self._shard_capacity:
+                            shard.counts.popitem(last=False)
+                            self.evictions += 1
+        return result
+
+    def begin_write(self, post_ids: Iterable[int]):
+        """在提交点赞的事务之前调用，每个 post_id 对应之后的一次 apply 或 cancel_write"""
+        for post_id in post_ids:
+            shard = self._shard(post_id)
+            with shard.lock:
+                shard.version += 1
+                shard.pending[post_id] = shard.pending.get(post_id, 0) + 1
+
+    def cancel_write(self, post_ids: Iterable[int]):
+        """事务提交失败时撤销 begin_write"""
+        for post_id in post_ids:
+            shard = self._shard(post_id)
+            with shard.lock:
+                self._end_write(shard, post_id)
+
+    @staticmethod
+    def _end_write(shard: _Shard, post_id: int):
+        shard.version += 1
+        pending = shard.pending.get(post_id, 0)
+        if pending > 1:
+            shard.pending[post_id] = pending - 1
+        else:
+            shard.pending.pop(post_id, None)
+
+    def apply(self, post_id: int, delta: int):
+        shard = self._shard(post_id)
+        with shard.lock:
+            self._end_write(shard, post_id)
+            count = shard.counts.get(post_id)
+            if count is not None:
+                shard.counts[post_id] = max(0, count + delta)
+        with self._dirty_lock:
+            self._dirty.add(post_id)
+
+    def forget(self, post_id: int):
+        shard = self._shard(post_id)
+        with shard.lock:
+            shard.version += 1
+            shard.counts.pop(post_id, None)
+
+    def reconcile(self, db: Session) -> int:
+        """用数据库中的实际点赞数校正发生过变化的帖子，返回校正的帖子数量"""
+        with self._dirty_lock:
+            dirty, self._dirty = self._dirty, set()
+        if not dirty:
+            return 0
+
+        statement = (
+            select(models.PostLike.post_id, func.count())
+            .where(models.PostLike.post_id.in_(dirty))
+            .group_by(models.PostLike.post_id)
+        )
+        actual = dict(db.exec(statement).all())
+        # 帖子表上的冗余点赞数一并校正
+        for post_id in dirty:
+            db.execute(
+                update(models.Post)
+                .where(models.Post.id == post_id, models.Post.like_count != actual.get(post_id, 0))
+                .values(like_count=actual.get(post_id, 0))
+            )
+        db.commit()
+        for post_id in dirty:
+            shard = self._shard(post_id)
+            with shard.lock:
+                if post_id in shard.counts and not shard.pending.get(post_id):
+                    shard.counts[post_id] = actual.get(post_id, 0)
+        return len(dirty)
+
+    def stats(self) -> dict:
+        size = 0
+        for shard in self._shards:
+            with shard.lock:
+                size += len(shard.counts)
+        total = self.hits + self.misses
+        return {
+            "size": size,
+            "max_size": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": self.hits / total if total else 0.0,
+        }
+
+def _execute_like(db: Session, action: str, user_id: int, post_id: int, created_at: datetime) -> bool:
+    """执行一个点赞/取消点赞，返回是否改变了点赞状态（帖子表上的冗余点赞数在提交前统一更新）"""
+    if action == "like":
+        post_exists = (
+            select(literal(user_id), models.Post.id, literal(created_at, DateTime))
+            .where(models.Post.id == post_id)
+        )
+        statement = (
+            insert(models.PostLike)
+            .prefix_with("OR IGNORE")
+            .from_select(["user_id", "post_id", "created_at"], post_exists)
+        )
+        applied = db.execute(statement).rowcount > 0
+    else:
+        statement = (
+            delete(models.PostLike)
+            .where(
+                models.PostLike.user_id == user_id,
+                models.PostLike.post_id == post_id
+            )
+            .returning(models.PostLike.post_id)
+        )
+        applied = db.execute(statement).first() is not None
+    if applied:
+        # 同一批的点赞数增量合并后在提交前一次写入
+        deltas = db.info.setdefault("like_deltas", {})
+        deltas[post_id] = deltas.get(post_id, 0) + (1 if action == "like" else -1)
+        db.info.setdefault("liked_posts", []).append(post_id)
+    return applied
+
+def _bump_batch_like_counts(db: Session):
+    bump_post_like_counts(db, db.info.pop("like_deltas", {}))
+
+def _begin_batch_like_writes(db: Session):
+    like_counts.begin_write(db.info.get("liked_posts", []))
+
+def _cancel_batch_like_writes(db: Session):
+    like_counts.cancel_write(db.info.pop("liked_posts", []))
+
+def submit_like(action: str, user_id: int, post_id: int, created_at: Optional[datetime] = None) -> Future:
+    """
+    把点赞/取消点赞交给批量写线程，与其他并发写操作合并提交
+
+    Future 的结果为该操作是否改变了点赞状态；提交成功后更新内存计数、热度和内存副本。
+    """
+    created_at = created_at or datetime.now()
+
+    def after_commit(applied: bool):
+        if applied:
+            _like_committed(action, user_id, post_id, created_at)
+
+    return write_queue.submit(
+        lambda db: _execute_like(db, action, user_id, post_id, created_at),
+        after_commit
+    )
+
+def submit_like_batch(user_id: int, operations: List[Tuple[str, int]],
+                      created_at: Optional[datetime] = None) -> Future:
+    """
+    把一组 (动作, 帖子ID) 作为一个写操作交给批量写线程，按顺序在同一个事务中执行
+
+    Future 的结果为每个操作是否改变了点赞状态的列表。
+    """
+    created_at = created_at or datetime.now()
+
+    def execute(db: Session) -> List[bool]:
+        return [_execute_like(db, action, user_id, post_id, created_at) for action, post_id in operations]
+
+    def after_commit(results: List[bool]):
+        for (action, post_id), applied in zip(operations, results):
+            if applied:
+                _like_committed(action, user_id, post_id, created_at)
+
+    return write_queue.submit(execute, after_commit)
+
+def _like_committed(action: str, user_id: int, post_id: int, created_at: datetime):
+    """点赞状态的改变提交后更新内存计数、热度和内存副本"""
+    like_counts.apply(post_id, 1 if action == "like" else -1)
+    hot_ranker.touch(post_id)
+    hot_replica.apply_like(action, user_id, post_id, created_at)
+
+def _reconcile_like_counts():
+    with Session(engine) as db:
+        like_counts.reconcile(db)
+
+# 全局实例
+like_counts = LikeCounter()
+register_cache("like_counts", like_counts)
+write_queue.add_before_commit(_bump_batch_like_counts)
+# 提交前标记写入中的帖子，提交失败时撤销标记
+write_queue.add_before_commit(_begin_batch_like_writes)
+write_queue.add_after_rollback(_cancel_batch_like_writes)
+# 写线程空闲时定期用数据库中的真实行数校正内存计数
+write_queue.add_idle_task(_reconcile_like_counts)
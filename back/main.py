@@ -1,8 +1,9 @@
 from fastapi import FastAPI, Depends, HTTPException, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from fastapi.security import OAuth2PasswordRequestForm
 from fastapi.staticfiles import StaticFiles
-from sqlmodel import Session, SQLModel, select
+from sqlmodel import Session, select
 from datetime import datetime, timedelta
 from passlib.context import CryptContext
 from pathlib import Path
@@ -10,13 +11,20 @@ from pathlib import Path
 import models
 import schemas
 from database import engine, get_db
+from migrations import migrate
 from auth import get_current_user, create_access_token
-from routers import post, floor, user, profile, follow, nickname, like
+from metrics import MetricsMiddleware, render_prometheus
+from serialization import ORJSONResponse
+from compression import CompressionMiddleware
+from routers import post, floor, user, profile, follow, nickname, like, board
+from response_cache import invalidate_user
+from hot_replica import hot_replica
 
-# 为所有表模型创建表，会根据database的元数据自动创建
-SQLModel.metadata.create_all(engine)
+# 为所有表模型创建表，已有数据库按 PRAGMA user_version 执行待执行的迁移
+migrate(engine)
 
-app = FastAPI(title="论坛 API")
+# 默认使用 orjson 编码响应
+app = FastAPI(title="论坛 API", default_response_class=ORJSONResponse)
 
 origins = [
     "http://localhost:5173",
@@ -32,6 +40,11 @@ app.add_middleware(
     allow_headers=["*"], # 拦截器，考虑 bearer 规范？
 )
 
+# 按 Accept-Encoding 压缩较大的响应（br 需要安装 brotli，否则只使用 gzip）
+app.add_middleware(CompressionMiddleware)
+# 记录每个路由的耗时、SQL 数量和响应大小，最后添加的中间件在最外层
+app.add_middleware(MetricsMiddleware)
+
 # 密码哈希
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
@@ -97,6 +110,10 @@ def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(), db:
     user.last_login = datetime.now()
     db.add(user)
     db.commit()
+    # 最后登录时间属于个人空间的版本，登录后使该用户的个人空间缓存失效
+    # （帖子列表中作者的最后登录时间不因每次登录而刷新，随列表的其他写入一起更新）
+    hot_replica.sync_users(user.id)
+    invalidate_user(user.id)
     
     access_token_expires = timedelta(minutes=30)  # 使用与auth.py中相同的过期时间
     access_token = create_access_token(
@@ -112,6 +129,11 @@ def read_users_me(current_user: models.User = Depends(get_current_user)):
 def read_root():
     return {"message": "欢迎使用论坛 API"}
 
+@app.get("/metrics", response_class=PlainTextResponse)
+def read_metrics():
+    # Prometheus 文本格式：各路由的耗时/SQL/响应大小直方图，连接池和各缓存的命中率等指标
+    return PlainTextResponse(render_prometheus(), media_type="text/plain; version=0.0.4")
+
 # 包含路由
 app.include_router(post.router)
 app.include_router(floor.router)
@@ -120,6 +142,7 @@ app.include_router(profile.router)
 app.include_router(follow.router)
 app.include_router(nickname.router)
 app.include_router(like.router)
+app.include_router(board.router)
 
 if __name__ == "__main__":
     import uvicorn
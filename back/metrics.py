@@ -0,0 +1,210 @@
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Dict, Optional, Sequence, Tuple
+import threading
+import time
+
+from sqlalchemy import event
+
+# 已注册的缓存，名称 -> 提供 stats() 方法的对象
+_caches: Dict[str, object] = {}
+
+def register_cache(name: str, cache):
+    _caches[name] = cache
+
+def cache_stats() -> Dict[str, dict]:
+    return {name: cache.stats() for name, cache in _caches.items()}
+
+# 直方图的桶上界
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+class Histogram:
+    """累计直方图，按标签组合分别统计，导出为 Prometheus 格式"""
+
+    def __init__(self, name: str, help_text: str, buckets: Sequence[float]):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = tuple(buckets)
+        self._series: Dict[tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, labels: tuple, value: float):
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                # 各桶计数（最后一个为 +Inf）、总和
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][bisect_left(self.buckets, value)] += 1
+            series[1] += value
+
+    def render(self, label_names: Tuple[str, ...]) -> list:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = {labels: (list(counts), total) for labels, (counts, total) in self._series.items()}
+        for labels, (counts, total) in sorted(series.items()):
+            label_text = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(label_names, labels))
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else _format_value(bound)
+                lines.append(f'{self.name}_bucket{{{label_text},le="{le}"}} {cumulative}')
+            lines.append(f"{self.name}_sum{{{label_text}}} {_format_value(total)}")
+            lines.append(f"{self.name}_count{{{label_text}}} {cumulative}")
+        return lines
+
+REQUEST_LABELS = ("method", "route", "status")
+ROUTE_LABELS = ("method", "route")
+
+request_latency = Histogram("forum_request_duration_seconds", "请求处理耗时（秒）", LATENCY_BUCKETS)
+response_size = Histogram("forum_response_size_bytes", "响应体大小（字节，压缩后）", SIZE_BUCKETS)
+db_query_count = Histogram("forum_db_queries_per_request", "每个请求执行的 SQL 语句数", QUERY_COUNT_BUCKETS)
+db_query_time = Histogram("forum_db_time_seconds", "每个请求执行 SQL 的总耗时（秒）", LATENCY_BUCKETS)
+
+class RequestStats:
+    """当前请求的数据库统计，由 MetricsMiddleware 放入上下文变量"""
+    __slots__ = ("scope", "query_count", "db_time")
+
+    def __init__(self, scope):
+        # 路由匹配后 scope 中会有 route，慢查询日志用它标记调用的接口
+        self.scope = scope
+        self.query_count = 0
+        self.db_time = 0.0
+
+current_request: ContextVar[Optional[RequestStats]] = ContextVar("current_request", default=None)
+
+# 请求之外（后台线程、启动时）执行的 SQL
+_background_queries = 0
+_background_db_time = 0.0
+
+# 已挂上事件的引擎，用于导出连接池状态
+_engines: Dict[str, object] = {}
+
+def instrument_engine(engine, name: str = "main"):
+    """在引擎上挂载事件，统计每个请求的 SQL 数量和耗时"""
+    _engines[name] = engine
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        global _background_queries, _background_db_time
+        elapsed = time.perf_counter() - conn.info["query_start"].pop()
+        stats = current_request.get()
+        if stats is not None:
+            stats.query_count += 1
+            stats.db_time += elapsed
+        else:
+            _background_queries += 1
+            _background_db_time += elapsed
+
+    @event.listens_for(engine, "handle_error")
+    def handle_error(exception_context):
+        # 出错的语句不会触发 after_cursor_execute，弹出它的开始时间，否则连接上之后的计时都会错位
+        conn = exception_context.connection
+        if exception_context.execution_context is not None and conn is not None and conn.info.get("query_start"):
+            conn.info["query_start"].pop()
+
+def route_name(scope) -> str:
+    # 使用路由模板（/posts/{post_id}）而不是实际路径，避免标签数量无限增长
+    route = scope.get("route")
+    path = getattr(route, "path", None)
+    if path is not None:
+        return path
+    return "unmatched"
+
+class MetricsMiddleware:
+    """
+    记录每个路由的耗时、响应大小以及请求内执行的 SQL 数量和耗时
+
+    需要作为最外层中间件添加，响应大小为实际发送（压缩后）的字节数。
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats(scope)
+        token = current_request.set(stats)
+        status = 500
+        size = 0
+        start = time.perf_counter()
+
+        async def send_with_metrics(message):
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_metrics)
+        finally:
+            elapsed = time.perf_counter() - start
+            current_request.reset(token)
+            route = route_name(scope)
+            method = scope["method"]
+            request_latency.observe((method, route, str(status)), elapsed)
+            response_size.observe((method, route), size)
+            db_query_count.observe((method, route), stats.query_count)
+            db_query_time.observe((method, route), stats.db_time)
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_value(value) -> str:
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+def _pool_lines() -> list:
+    lines = []
+    for metric, method in (("size", "size"), ("checked_out", "checkedout"), ("overflow", "overflow"),
+                           ("checked_in", "checkedin")):
+        values = [(name, engine.pool) for name, engine in _engines.items() if hasattr(engine.pool, method)]
+        if not values:
+            continue
+        lines.append(f"# TYPE forum_db_pool_{metric} gauge")
+        for name, pool in values:
+            lines.append(f'forum_db_pool_{metric}{{engine="{_escape(name)}"}} {getattr(pool, method)()}')
+    return lines
+
+def _cache_lines() -> list:
+    # 缓存指标按 stats() 中的字段名导出，只导出数值字段
+    samples: Dict[str, list] = {}
+    for cache_name, stats in cache_stats().items():
+        for key, value in stats.items():
+            if isinstance(value, (int, float)):
+                samples.setdefault(key, []).append((cache_name, value))
+    lines = []
+    for key, values in sorted(samples.items()):
+        metric = f"forum_cache_{key}"
+        lines.append(f"# TYPE {metric} gauge")
+        for cache_name, value in values:
+            lines.append(f'{metric}{{cache="{_escape(cache_name)}"}} {_format_value(value)}')
+    return lines
+
+def render_prometheus() -> str:
+    """以 Prometheus 文本格式导出请求指标、SQL 统计、连接池和缓存状态"""
+    lines = []
+    lines += request_latency.render(REQUEST_LABELS)
+    lines += response_size.render(ROUTE_LABELS)
+    lines += db_query_count.render(ROUTE_LABELS)
+    lines += db_query_time.render(ROUTE_LABELS)
+    lines += [
+        "# TYPE forum_background_db_queries_total counter",
+        f"forum_background_db_queries_total {_background_queries}",
+        "# TYPE forum_background_db_time_seconds_total counter",
+        f"forum_background_db_time_seconds_total {_format_value(_background_db_time)}",
+    ]
+    lines += _pool_lines()
+    lines += _cache_lines()
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,270 @@
+"""
+数据库版本迁移
+
+已有数据库的版本号保存在 SQLite 的 PRAGMA user_version 中，启动时按顺序执行版本号更大的迁移，
+每个迁移执行完后更新版本号。create_all 只会创建不存在的表，已有表的新列、新索引都通过迁移补上。
+
+每个迁移连同版本号的更新在一个显式开启的事务中执行（SQLite 的 DDL 可以回滚），
+中途中断时整个迁移回滚，下次启动重新执行。迁移中的每一步也是幂等的（列已存在时跳过，
+索引使用 IF NOT EXISTS）：新建的数据库由 create_all 直接建成最新结构，迁移执行时不会重复创建。
+
+用法：
+    python migrations.py            执行待执行的迁移
+    python migrations.py --status   查看当前版本和待执行的迁移
+    python migrations.py --verify   用 EXPLAIN QUERY PLAN 检查常用查询是否使用索引
+    python migrations.py --db /path/to/forum.db --verify
+"""
+from typing import Callable, List, NamedTuple
+import argparse
+import logging
+import time
+
+from sqlalchemy import text
+from sqlmodel import SQLModel
+
+from excerpt import make_excerpt
+from slow_query import full_scans
+import models  # noqa: F401  注册所有表
+
+logger = logging.getLogger(__name__)
+
+class Migration(NamedTuple):
+    version: int
+    description: str
+    apply: Callable
+
+def _column_names(conn, table: str) -> set:
+    return {row[1] for row in conn.execute(text(f'PRAGMA table_info("{table}")'))}
+
+def add_column(conn, table: str, column: str, ddl: str, backfill=None):
+    """列不存在时添加并用 backfill（SQL 语句或接收连接的函数）填充历史数据"""
+    if column in _column_names(conn, table):
+        return
+    conn.execute(text(f'ALTER TABLE "{table}" ADD COLUMN "{column}" {ddl}'))
+    if callable(backfill):
+        backfill(conn)
+    elif backfill:
+        conn.execute(text(backfill))
+
+def create_index(conn, name: str, table: str, *columns: str):
+    conn.execute(text(f'CREATE INDEX IF NOT EXISTS "{name}" ON "{table}" ({", ".join(columns)})'))
+
+def _backfill_post_excerpts(conn):
+    # 摘要需要去掉标签等，不能用 SQL 完成
+    rows = conn.execute(text("SELECT id, content FROM post")).all()
+    if rows:
+        conn.execute(
+            text("UPDATE post SET excerpt = :excerpt WHERE id = :id"),
+            [{"id": post_id, "excerpt": make_excerpt(content)} for post_id, content in rows]
+        )
+
+def _post_denormalized_columns(conn):
+    add_column(conn, "post", "board_id", "INTEGER")
+    add_column(conn, "post", "last_reply_at", "DATETIME", """
+        UPDATE post SET last_reply_at = COALESCE(
+            (SELECT MAX(floor.created_at) FROM floor WHERE floor.post_id = post.id),
+            post.created_at
+        )
+    """)
+    add_column(conn, "post", "last_replier_id", "INTEGER", """
+        UPDATE post SET last_replier_id = COALESCE(
+            (SELECT floor.author_id FROM floor WHERE floor.post_id = post.id
+             ORDER BY floor.floor_number DESC LIMIT 1),
+            post.author_id
+        )
+    """)
+    add_column(conn, "post", "like_count", "INTEGER NOT NULL DEFAULT 0", """
+        UPDATE post SET like_count =
+            (SELECT COUNT(*) FROM postlike WHERE postlike.post_id = post.id)
+    """)
+    # 热度分数由 hot_rank 后台线程补算
+    add_column(conn, "post", "hot_score", "FLOAT")
+    add_column(conn, "post", "last_floor_number", "INTEGER NOT NULL DEFAULT 0", """
+        UPDATE post SET last_floor_number =
+            COALESCE((SELECT MAX(floor.floor_number) FROM floor WHERE floor.post_id = post.id), 0)
+    """)
+    add_column(conn, "post", "excerpt", "VARCHAR NOT NULL DEFAULT ''", _backfill_post_excerpts)
+
+def _post_list_indexes(conn):
+    create_index(conn, "ix_post_pinned_created", "post", "is_pinned", "created_at")
+    create_index(conn, "ix_post_pinned_last_reply", "post", "is_pinned", "last_reply_at")
+    create_index(conn, "ix_post_pinned_likes", "post", "is_pinned", "like_count")
+    create_index(conn, "ix_post_pinned_views", "post", "is_pinned", "view_count")
+    create_index(conn, "ix_post_hot", "post", "hot_score")
+    create_index(conn, "ix_post_board_pinned_created", "post", "board_id", "is_pinned", "created_at")
+    create_index(conn, "ix_post_board_hot", "post", "board_id", "hot_score")
+
+def _foreign_key_indexes(conn):
+    create_index(conn, "ix_floor_post_number", "floor", "post_id", "floor_number")
+    create_index(conn, "ix_floor_author_created", "floor", "author_id", "created_at")
+    create_index(conn, "ix_post_author_created", "post", "author_id", "created_at")
+    create_index(conn, "ix_postlike_post_created", "postlike", "post_id", "created_at")
+    create_index(conn, "ix_postlike_user_created", "postlike", "user_id", "created_at")
+    create_index(conn, "ix_follow_followed", "follow", "followed_id", "follower_id")
+
+# 按版本号排列，只能在末尾追加新的迁移，已发布的迁移不再修改
+MIGRATIONS: List[Migration] = [
+    Migration(1, "帖子的版块、最后回复、点赞数、热度、楼层号、摘要列", _post_denormalized_columns),
+    Migration(2, "帖子列表各排序方式及版块列表的索引", _post_list_indexes),
+    Migration(3, "楼层、帖子作者、点赞、关注的组合索引", _foreign_key_indexes),
+]
+LATEST_VERSION = MIGRATIONS[-1].version
+
+def current_version(conn) -> int:
+    return conn.execute(text("PRAGMA user_version")).scalar()
+
+def _apply(engine, migration: Migration):
+    with engine.connect() as conn:
+        # pysqlite 只在 INSERT/UPDATE/DELETE 前隐式开启事务，ALTER TABLE 等 DDL 会立即自动提交，
+        # 加列后、回填前中断时回填永远不会执行；显式 BEGIN 后加列、回填和版本号一起提交或回滚
+        conn.exec_driver_sql("BEGIN")
+        try:
+            migration.apply(conn)
+            conn.execute(text(f"PRAGMA user_version = {migration.version}"))
+        except Exception:
+            conn.rollback()
+            raise
+        conn.commit()
+
+def migrate(engine) -> int:
+    """
+    创建缺少的表并执行待执行的迁移，返回执行的迁移数量
+
+    执行后检查常用查询的执行计划，没有使用索引的查询记录为警告。
+    """
+    SQLModel.metadata.create_all(engine)
+    with engine.connect() as conn:
+        version = current_version(conn)
+    pending = [migration for migration in MIGRATIONS if migration.version > version]
+    for migration in pending:
+        started = time.perf_counter()
+        _apply(engine, migration)
+        logger.info("数据库迁移 %d（%s）完成，用时 %.1f 秒",
+                    migration.version, migration.description, time.perf_counter() - started)
+    if pending:
+        # 新索引需要统计信息才能被查询规划器正确选择
+        with engine.begin() as conn:
+            conn.execute(text("PRAGMA optimize"))
+    with engine.connect() as conn:
+        for problem in verify_query_plans(conn):
+            logger.warning("常用查询未使用索引：%s", problem)
+    return len(pending)
+
+class HotQuery(NamedTuple):
+    name: str
+    sql: str
+    index: str  # 期望使用的索引
+
+# 各接口的常用查询，参数都用 1 代替
+HOT_QUERIES: List[HotQuery] = [
+    HotQuery("帖子的楼层分页", "SELECT * FROM floor WHERE post_id = 1 ORDER BY floor_number LIMIT 20",
+             "ix_floor_post_number"),
+    HotQuery("帖子楼层数和最后更新时间",
+             "SELECT count(id), max(updated_at) FROM floor WHERE post_id = 1", "ix_floor_post_number"),
+    HotQuery("列表页各帖子的楼层数",
+             "SELECT post_id, count(*) FROM floor WHERE post_id IN (1, 2, 3) GROUP BY post_id",
+             "ix_floor_post_number"),
+    HotQuery("最后回复者", "SELECT author_id FROM floor WHERE post_id = 1 ORDER BY floor_number DESC LIMIT 1",
+             "ix_floor_post_number"),
+    HotQuery("用户的回复数", "SELECT count(*) FROM floor WHERE author_id = 1", "ix_floor_author_created"),
+    HotQuery("用户的帖子列表",
+             "SELECT id FROM post WHERE author_id = 1 ORDER BY created_at DESC LIMIT 10", "ix_post_author_created"),
+    HotQuery("用户的发帖数", "SELECT count(*) FROM post WHERE author_id = 1", "ix_post_author_created"),
+    HotQuery("帖子的点赞列表",
+             "SELECT * FROM postlike WHERE post_id = 1 ORDER BY created_at DESC LIMIT 20", "ix_postlike_post_created"),
+    HotQuery("帖子的点赞数", "SELECT count(*) FROM postlike WHERE post_id IN (1, 2, 3) GROUP BY post_id",
+             "ix_postlike_post_created"),
+    HotQuery("用户点赞过的帖子",
+             "SELECT post.id FROM post JOIN postlike ON post.id = postlike.post_id "
+             "WHERE postlike.user_id = 1 ORDER BY postlike.created_at DESC LIMIT 10", "ix_postlike_user_created"),
+    HotQuery("粉丝列表",
+             'SELECT "user".id FROM "user" JOIN follow ON "user".id = follow.follower_id '
+             "WHERE follow.followed_id = 1 LIMIT 20", "ix_follow_followed"),
+    HotQuery("粉丝数", "SELECT count(*) FROM follow WHERE followed_id = 1", "ix_follow_followed"),
+]
+
+# 帖子列表各排序方式期望使用的索引
+SORT_INDEXES = {
+    "newest": "ix_post_pinned_created",
+    "latest_reply": "ix_post_pinned_last_reply",
+    "most_liked": "ix_post_pinned_likes",
+    "most_viewed": "ix_post_pinned_views",
+}
+
+def post_list_queries(dialect) -> List[HotQuery]:
+    """
+    帖子列表、版块列表和搜索的查询，与接口一样由 post_queries 构造后编译为 SQL
+
+    排序方式或列表列变化时这里的检查随之变化，不会与接口实际执行的查询脱节。
+    """
+    # post_queries 依赖内存计数层等运行时模块，用到时再导入
+    from post_queries import HOT_ORDER, SEARCH_ORDER, post_rows_query, search_condition, sort_order
+
+    def compile_query(order_by: tuple, *conditions) -> str:
+        query = post_rows_query().where(*conditions).order_by(*order_by).offset(0).limit(20)
+        return str(query.compile(dialect=dialect, compile_kwargs={"literal_binds": True}))
+
+    in_board = models.Post.board_id == 1
+    matches = search_condition("关键词", "标签")
+    queries = [
+        HotQuery(f"帖子列表（{sort}）", compile_query(sort_order(sort)), index)
+        for sort, index in SORT_INDEXES.items()
+    ]
+    queries += [
+        HotQuery("热门帖子列表", compile_query(HOT_ORDER), "ix_post_hot"),
+        HotQuery("搜索帖子", compile_query(SEARCH_ORDER, matches), "ix_post_pinned_created"),
+        HotQuery("版块帖子列表", compile_query(sort_order("newest"), in_board), "ix_post_board_pinned_created"),
+        HotQuery("版块热门帖子列表", compile_query(HOT_ORDER, in_board), "ix_post_board_hot"),
+        HotQuery("版块内搜索", compile_query(SEARCH_ORDER, in_board, matches), "ix_post_board_pinned_created"),
+    ]
+    return queries
+
+def hot_queries(dialect) -> List[HotQuery]:
+    return HOT_QUERIES + post_list_queries(dialect)
+
+def verify_query_plans(conn) -> List[str]:
+    """
+    用 EXPLAIN QUERY PLAN 检查常用查询（HOT_QUERIES 和帖子列表查询）是否使用了期望的索引，返回问题列表（为空表示全部通过）
+
+    没有使用期望的索引，或出现不经过索引的全表扫描（SCAN floor 等）都视为问题。
+    """
+    problems = []
+    for query in hot_queries(conn.dialect):
+        plan = [row[3] for row in conn.execute(text("EXPLAIN QUERY PLAN " + query.sql))]
+        if query.index not in " ".join(plan) or full_scans(plan):
+            problems.append(f"{query.name}：{' | '.join(plan)}")
+    return problems
+
+def main():
+    from sqlalchemy import create_engine
+
+    parser = argparse.ArgumentParser(description="数据库版本迁移")
+    parser.add_argument("--db", default="forum.db", help="数据库文件")
+    parser.add_argument("--status", action="store_true", help="只查看当前版本和待执行的迁移")
+    parser.add_argument("--verify", action="store_true", help="迁移后检查常用查询的执行计划")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    engine = create_engine(f"sqlite:///{args.db}")
+    if args.status:
+        with engine.connect() as conn:
+            version = current_version(conn)
+        print(f"当前版本：{version}，最新版本：{LATEST_VERSION}")
+        for migration in MIGRATIONS:
+            if migration.version > version:
+                print(f"  待执行：{migration.version} {migration.description}")
+        return
+
+    applied = migrate(engine)
+    print(f"执行了 {applied} 个迁移，当前版本：{LATEST_VERSION}")
+    if args.verify:
+        with engine.connect() as conn:
+            problems = verify_query_plans(conn)
+        for problem in problems:
+            print(f"未使用索引：{problem}")
+        if problems:
+            raise SystemExit(1)
+        print(f"{len(hot_queries(engine.dialect))} 个常用查询都使用了索引")
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,4 @@
+from sqlalchemy import Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from sqlmodel import SQLModel, Field, Relationship
@@ -41,6 +42,14 @@ class UserRead(UserBase):
     followers_count: int = 0
     following_count: int = 0
 
+# 版块模型
+class Board(SQLModel, table=True):
+    id: Optional[int] = Field(default=None, primary_key=True)
+    name: str = Field(unique=True, index=True)  # 版块名称
+    description: Optional[str] = None  # 版块简介
+    post_count: int = Field(default=0)  # 帖子数量（由写路径增量维护）
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
 # 基础帖子模型
 class PostBase(SQLModel):
     title: str = Field(index=True)  # 标题，建立索引便于搜索
@@ -56,6 +65,27 @@ class PostBase(SQLModel):
 class Post(PostBase, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
     author_id: Optional[int] = Field(default=None, foreign_key="user.id")
+    board_id: Optional[int] = Field(default=None, foreign_key="board.id")  # 所属版块，为空表示不属于任何版块
+    last_reply_at: Optional[datetime] = None  # 最后回复时间（发帖时为发帖时间）
+    last_replier_id: Optional[int] = None  # 最后回复的用户ID（不设外键，避免与 author 关系冲突）
+    like_count: int = Field(default=0)  # 点赞数量（冗余字段，用于按点赞数排序）
+    hot_score: Optional[float] = None  # 热度分数，由 hot_rank 后台线程计算
+    last_floor_number: int = Field(default=0)  # 已分配的最大楼层号（只增不减，用于计算未读数）
+    excerpt: str = Field(default="")  # 纯文本摘要，发帖/编辑时生成，列表只读取它而不读取 content
+    
+    # 帖子列表的每种排序方式各对应一个索引，排序时直接按索引扫描
+    __table_args__ = (
+        Index("ix_post_pinned_created", "is_pinned", "created_at"),
+        Index("ix_post_pinned_last_reply", "is_pinned", "last_reply_at"),
+        Index("ix_post_pinned_likes", "is_pinned", "like_count"),
+        Index("ix_post_pinned_views", "is_pinned", "view_count"),
+        Index("ix_post_hot", "hot_score"),
+        # 每个版块的列表和热门列表只扫描该版块在索引中的区间
+        Index("ix_post_board_pinned_created", "board_id", "is_pinned", "created_at"),
+        Index("ix_post_board_hot", "board_id", "hot_score"),
+        # 个人空间的帖子列表按作者查询、按发帖时间倒序
+        Index("ix_post_author_created", "author_id", "created_at"),
+    )
     
     # 定义关系但不作为表字段
     author: Optional["User"] = Relationship(back_populates="posts")
@@ -76,6 +106,12 @@ class Floor(FloorBase, table=True):
     author_id: int = Field(foreign_key="user.id")
     reply_to_floor_id: Optional[int] = Field(default=None, foreign_key="floor.id")
     
+    # 帖子的楼层按楼层号分页；用户的回复按时间统计
+    __table_args__ = (
+        Index("ix_floor_post_number", "post_id", "floor_number"),
+        Index("ix_floor_author_created", "author_id", "created_at"),
+    )
+    
     # 定义关系但不作为表字段
     post: "Post" = Relationship(back_populates="floors")
     author: "User" = Relationship(back_populates="floors")
@@ -98,6 +134,11 @@ class Follow(SQLModel, table=True):
     followed_id: int = Field(foreign_key="user.id", primary_key=True)
     created_at: datetime = Field(default_factory=datetime.utcnow)
     
+    # 主键以 follower_id 开头，粉丝列表按 followed_id 查询需要单独的索引（包含 follower_id，无需回表）
+    __table_args__ = (
+        Index("ix_follow_followed", "followed_id", "follower_id"),
+    )
+    
     # 定义关系但不作为表字段
     follower: "User" = Relationship(back_populates="following", sa_relationship_kwargs={"foreign_keys": "[Follow.follower_id]"})
     followed: "User" = Relationship(back_populates="followers", sa_relationship_kwargs={"foreign_keys": "[Follow.followed_id]"})
@@ -109,6 +150,26 @@ class PostLike(SQLModel, table=True):
     post_id: int = Field(foreign_key="post.id", primary_key=True)
     created_at: datetime = Field(default_factory=datetime.utcnow)
     
+    # 帖子的点赞列表、用户点赞过的帖子都按点赞时间倒序
+    __table_args__ = (
+        Index("ix_postlike_post_created", "post_id", "created_at"),
+        Index("ix_postlike_user_created", "user_id", "created_at"),
+    )
+    
     # 定义关系但不作为表字段
     user: "User" = Relationship(back_populates="post_likes")
     post: "Post" = Relationship(back_populates="likes")
+
+# 已读标记模型（用户在每个帖子中已读到的楼层）
+class ReadMarker(SQLModel, table=True):
+    user_id: int = Field(foreign_key="user.id", primary_key=True)
+    post_id: int = Field(foreign_key="post.id", primary_key=True)
+    last_floor_number: int = Field(default=0)
+
+# 用户统计模型（发帖/回复/粉丝/关注数量，由写路径增量维护）
+class UserStats(SQLModel, table=True):
+    user_id: int = Field(foreign_key="user.id", primary_key=True)
+    post_count: int = Field(default=0)
+    floor_count: int = Field(default=0)
+    followers_count: int = Field(default=0)
+    following_count: int = Field(default=0)
@@ -0,0 +1,182 @@
+from datetime import datetime
+from typing import Dict, List, Literal, NamedTuple, Optional, Set
+
+from sqlmodel import Session, select, or_, func
+
+import models
+import schemas
+from like_counter import like_counts
+from read_markers import unread_counts
+
+def floor_counts_for(db: Session, post_ids: List[int]) -> Dict[int, int]:
+    """一次分组查询统计多个帖子的楼层数量"""
+    if not post_ids:
+        return {}
+    statement = (
+        select(models.Floor.post_id, func.count())
+        .where(models.Floor.post_id.in_(post_ids))
+        .group_by(models.Floor.post_id)
+    )
+    return dict(db.exec(statement).all())
+
+def liked_post_ids_for(db: Session, user_id: int, post_ids: List[int]) -> Set[int]:
+    """一次查询得到用户点赞过的帖子"""
+    if not post_ids:
+        return set()
+    statement = select(models.PostLike.post_id).where(
+        models.PostLike.user_id == user_id,
+        models.PostLike.post_id.in_(post_ids)
+    )
+    return set(db.exec(statement).all())
+
+# 帖子列表的排序方式 -> 排序列，每一列都有 (is_pinned, 列) 索引
+PostSort = Literal["newest", "latest_reply", "most_liked", "most_viewed"]
+POST_SORT_COLUMNS = {
+    "newest": models.Post.created_at,
+    "latest_reply": models.Post.last_reply_at,
+    "most_liked": models.Post.like_count,
+    "most_viewed": models.Post.view_count,
+}
+
+def sort_order(sort: str) -> tuple:
+    return (models.Post.is_pinned.desc(), POST_SORT_COLUMNS[sort].desc(), models.Post.id.desc())
+
+# 搜索结果按最新发布排序
+SEARCH_ORDER = sort_order("newest")
+
+# 热门列表按 hot_score 索引扫描，不区分置顶
+HOT_ORDER = (models.Post.hot_score.desc(), models.Post.id.desc())
+
+class UserRow(NamedTuple):
+    """列表中嵌入的用户信息（只读取 UserResponse 需要的列）"""
+    id: int
+    username: str
+    email: str
+    avatar: Optional[str]
+    bio: Optional[str]
+    is_active: bool
+    is_admin: bool
+    created_at: datetime
+    last_login: Optional[datetime]
+
+USER_ROW_COLUMNS = (
+    models.User.id, models.User.username, models.User.email, models.User.avatar, models.User.bio,
+    models.User.is_active, models.User.is_admin, models.User.created_at, models.User.last_login,
+)
+
+class PostRow(NamedTuple):
+    """帖子列表的一行（只读取列表需要的列，不读取 content）"""
+    id: int
+    title: str
+    excerpt: str
+    tags: Optional[str]
+    author_id: int
+    board_id: Optional[int]
+    view_count: int
+    is_pinned: bool
+    is_closed: bool
+    created_at: datetime
+    updated_at: datetime
+    last_reply_at: Optional[datetime]
+    last_replier_id: Optional[int]
+    last_floor_number: int
+
+POST_ROW_COLUMNS = (
+    models.Post.id, models.Post.title, models.Post.excerpt, models.Post.tags, models.Post.author_id,
+    models.Post.board_id, models.Post.view_count, models.Post.is_pinned, models.Post.is_closed,
+    models.Post.created_at, models.Post.updated_at, models.Post.last_reply_at, models.Post.last_replier_id,
+    models.Post.last_floor_number,
+)
+
+def user_rows_for(db: Session, user_ids: Set[int]) -> Dict[int, UserRow]:
+    """一次查询取出多个用户的列表展示信息"""
+    if not user_ids:
+        return {}
+    statement = select(*USER_ROW_COLUMNS).where(models.User.id.in_(user_ids))
+    return {row[0]: UserRow._make(row) for row in db.exec(statement).all()}
+
+def _user_response(row: Optional[UserRow]) -> Optional[schemas.UserResponse]:
+    if row is None:
+        return None
+    return schemas.UserResponse.model_construct(**row._asdict())
+
+def post_rows_query():
+    """帖子摘要行的查询，调用方再加上过滤、排序和分页"""
+    return select(*POST_ROW_COLUMNS)
+
+def load_post_summaries(db: Session, query) -> List[schemas.PostSummaryResponse]:
+    """
+    执行 post_rows_query() 构造的查询，组装帖子摘要（作者、楼层数量、最后回复者）
+
+    只查询需要的列，不构造 ORM 对象；数据来自数据库、类型已确定，
+    直接用 model_construct 组装响应模型，不再逐字段校验。
+    """
+    posts = [PostRow._make(row) for row in db.exec(query).all()]
+    floor_counts = floor_counts_for(db, [post.id for post in posts])
+    
+    # 作者和最后回复者一次查询取出
+    user_ids = {post.author_id for post in posts}
+    user_ids.update(post.last_replier_id for post in posts if post.last_replier_id is not None)
+    users = user_rows_for(db, user_ids)
+    
+    return [
+        schemas.PostSummaryResponse.model_construct(
+            **post._asdict(),
+            author=_user_response(users.get(post.author_id)),
+            floor_count=floor_counts.get(post.id, 0),
+            last_replier=_user_response(users.get(post.last_replier_id)),
+        )
+        for post in posts
+    ]
+
+def post_page_loader(page: int, page_size: int, order_by: tuple, *conditions):
+    """
+    帖子列表中与访问者无关的部分，可被缓存共享
+
+    conditions 为额外的过滤条件（例如所属版块）
+    """
+    def loader(db: Session) -> list:
+        # 计算偏移量
+        offset = (page - 1) * page_size
+        
+        query = (
+            post_rows_query()
+            .where(*conditions)
+            .order_by(*order_by)
+            .offset(offset)
+            .limit(page_size)
+        )
+        return load_post_summaries(db, query)
+    return loader
+
+def with_viewer_fields(db: Session, user_id: int, cached: list) -> list:
+    """在共享的列表结果上填充点赞数量、当前用户是否点赞和未读楼层数"""
+    # 点赞数量从内存计数层读取，当前用户是否点赞、已读标记各一次批量查询
+    post_ids = [post.id for post in cached]
+    like_counts_by_post = like_counts.get_many(db, post_ids)
+    liked_post_ids = liked_post_ids_for(db, user_id, post_ids)
+    unread = unread_counts(db, user_id, {post.id: post.last_floor_number or 0 for post in cached})
+    
+    return [
+        post.model_copy(update={
+            "like_count": like_counts_by_post[post.id],
+            "is_liked": post.id in liked_post_ids,
+            "unread_count": unread[post.id]
+        })
+        for post in cached
+    ]
+
+def search_condition(query: str = "", tags: Optional[str] = None):
+    """标题/内容包含关键词或包含任一标签（OR 组合），没有搜索条件时返回 None"""
+    conditions = []
+    if query:
+        conditions.append(models.Post.title.contains(query))
+        conditions.append(models.Post.content.contains(query))
+    
+    if tags:
+        for tag in tags.split(','):
+            tag = tag.strip()
+            if tag:
+                conditions.append(models.Post.tags.contains(tag))
+    
+    return or_(*conditions) if conditions else None
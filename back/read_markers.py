@@ -0,0 +1,41 @@
+from typing import Dict, Optional
+
+from sqlalchemy.dialects.sqlite import insert
+from sqlmodel import Session, select
+
+import models
+
+def mark_read(db: Session, user_id: int, post_id: int, floor_number: Optional[int]):
+    """
+    记录用户已读到的楼层并提交，只会前进不会后退（回看前面的页不会减少已读楼层）
+    """
+    if not floor_number:
+        return
+    statement = insert(models.ReadMarker).values(
+        user_id=user_id, post_id=post_id, last_floor_number=floor_number
+    )
+    statement = statement.on_conflict_do_update(
+        index_elements=["user_id", "post_id"],
+        set_={"last_floor_number": statement.excluded.last_floor_number},
+        where=models.ReadMarker.last_floor_number < statement.excluded.last_floor_number,
+    )
+    db.execute(statement)
+    db.commit()
+
+def unread_counts(db: Session, user_id: int, last_floor_numbers: Dict[int, int]) -> Dict[int, Optional[int]]:
+    """
+    一次查询计算多个帖子的未读楼层数：帖子最大楼层号 - 已读楼层号
+
+    last_floor_numbers 为 帖子ID -> 帖子当前最大楼层号；从未看过的帖子返回 None。
+    """
+    if not last_floor_numbers:
+        return {}
+    statement = select(models.ReadMarker.post_id, models.ReadMarker.last_floor_number).where(
+        models.ReadMarker.user_id == user_id,
+        models.ReadMarker.post_id.in_(list(last_floor_numbers))
+    )
+    markers = dict(db.exec(statement).all())
+    return {
+        post_id: max(last_floor_number - markers[post_id], 0) if post_id in markers else None
+        for post_id, last_floor_number in last_floor_numbers.items()
+    }
@@ -0,0 +1,268 @@
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional, Set
+import logging
+import threading
+import time
+
+from sqlmodel import Session
+
+from database import engine
+from metrics import register_cache
+from singleflight import read_flight
+
+logger = logging.getLogger(__name__)
+
+class _Entry:
+    __slots__ = ("value", "created", "tags")
+
+    def __init__(self, value: Any, tags: Iterable[str]):
+        self.value = value
+        self.created = time.monotonic()
+        self.tags = tuple(tags)
+
+class ResponseCache:
+    """
+    有界的响应缓存（stale-while-revalidate）
+
+    - 条目在 ttl 内直接返回；
+    - 过期但仍在 stale_ttl 内时先返回旧数据，同时由后台线程刷新（每个键同一时间只刷新一次）；
+    - 超过 ttl + stale_ttl 或不存在时同步计算。
+    写路径通过 invalidate_tags 按标签删除条目。loader 接收一个数据库会话并返回可共享的不可变结果。
+    """
+
+    def __init__(self, name: str, max_entries: int = 1000, ttl: float = 30.0, stale_ttl: float = 300.0,
+                 refresh_workers: int = 2):
+        self.name = name
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._tags: Dict[str, Set[Hashable]] = {}
+        self._refreshing: Set[Hashable] = set()
+        self._lock = threading.Lock()
+        # 每次失效都会增加版本号，避免失效前开始的加载把旧数据写回缓存
+        self._generation = 0
+        self._executor = ThreadPoolExecutor(max_workers=refresh_workers, thread_name_prefix=f"{name}-refresh")
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.max_stale_age = 0.0
+        self._stale_age_total = 0.0
+        register_cache(name, self)
+
+    def get(self, db: Session, key: Hashable, loader: Callable[[Session], Any], tags: Iterable[str] = ()) -> Any:
+        now = time.monotonic()
+        schedule_refresh = False
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                age = now - entry.created
+                if age < self.ttl:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry.value
+                if age >= self.ttl + self.stale_ttl:
+                    entry = None
+            if entry is None:
+                self.misses += 1
+            else:
+                # 已过期但仍可接受：返回旧数据，由后台刷新
+                self._entries.move_to_end(key)
+                self.stale_hits += 1
+                stale_age = age - self.ttl
+                self._stale_age_total += stale_age
+                self.max_stale_age = max(self.max_stale_age, stale_age)
+                if key not in self._refreshing:
+                    self._refreshing.add(key)
+                    schedule_refresh = True
+            generation = self._generation
+
+        if entry is not None:
+            if schedule_refresh:
+                self._executor.submit(self._refresh, key, loader, tags, generation)
+            return entry.value
+
+        # 并发的相同未命中只加载一次；键中包含版本号，失效之后的未命中不会拿到失效之前开始的加载结果
+        value = read_flight.do((self.name, generation, key), lambda: loader(db))
+        self._store(key, value, tags, generation)
+        return value
+
+    def _refresh(self, key: Hashable, loader: Callable[[Session], Any], tags: Iterable[str], generation: int):
+        try:
+            with Session(engine) as db:
+                value = loader(db)
+            self._store(key, value, tags, generation)
+            self.refreshes += 1
+        except Exception:
+            # 刷新失败（例如用户已被删除）时丢弃旧条目，下次请求同步计算
+            logger.exception("刷新缓存 %s 失败: %r", self.name, key)
+            with self._lock:
+                self._remove(key)
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def _store(self, key: Hashable, value: Any, tags: Iterable[str], generation: int):
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._remove(key)
+            entry = _Entry(value, tags)
+            self._entries[key] = entry
+            for tag in entry.tags:
+                self._tags.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+
+    def _remove(self, key: Hashable):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for tag in entry.tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+    def invalidate_tags(self, *tags: str):
+        with self._lock:
+            self._generation += 1
+            for tag in tags:
+                for key in list(self._tags.get(tag, ())):
+                    self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self._tags.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            size = len(self._entries)
+            now = time.monotonic()
+            oldest_age = max((now - entry.created for entry in self._entries.values()), default=0.0)
+        total = self.hits + self.stale_hits + self.misses
+        return {
+            "size": size,
+            "max_size": self.max_entries,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "refreshes": self.refreshes,
+            "hit_ratio": (self.hits + self.stale_hits) / total if total else 0.0,
+            "avg_stale_age_seconds": self._stale_age_total / self.stale_hits if self.stale_hits else 0.0,
+            "max_stale_age_seconds": self.max_stale_age,
+            "oldest_entry_age_seconds": oldest_age,
+        }
+
+class VersionedPageCache:
+    """
+    按版本号失效的分页缓存，只缓存前 max_pages 页
+
+    写路径调用 bump() 递增版本号，所有旧版本的页面立即失效；加载期间版本号变化时，
+    加载结果带着旧版本号写入，下次读取会被当作未命中。max_age 用于兜底刷新
+    浏览次数这类不递增版本号的字段。
+    页面可以属于某个分区（例如版块），bump(partition) 只使该分区的页面失效。
+    """
+
+    def __init__(self, name: str, max_pages: int = 3, max_entries: int = 64, max_age: float = 60.0):
+        self.name = name
+        self.max_pages = max_pages
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self.version = 0
+        self._partition_versions: Dict[Hashable, int] = {}
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.bypasses = 0
+        register_cache(name, self)
+
+    def bump(self, partition: Hashable = None):
+        with self._lock:
+            if partition is None:
+                self.version += 1
+                self._entries.clear()
+                return
+            self._partition_versions[partition] = self._partition_versions.get(partition, 0) + 1
+            for key in [key for key in self._entries if key[0] == partition]:
+                del self._entries[key]
+
+    def partition_version(self, partition: Hashable = None) -> tuple:
+        """分区的当前版本（全局版本号, 分区版本号），可作为计数缓存的版本"""
+        with self._lock:
+            return self.version, self._partition_versions.get(partition, 0)
+
+    def get(self, db: Session, key: Hashable, page: int, loader: Callable[[Session], Any],
+            partition: Hashable = None) -> Any:
+        if page > self.max_pages:
+            self.bypasses += 1
+            return loader(db)
+
+        key = (partition, key)
+        now = time.monotonic()
+        with self._lock:
+            version = (self.version, self._partition_versions.get(partition, 0))
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == version and now - entry[1] < self.max_age:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[2]
+            self.misses += 1
+
+        # 并发的相同未命中只加载一次
+        value = read_flight.do((self.name, version, key), lambda: loader(db))
+        with self._lock:
+            if version == (self.version, self._partition_versions.get(partition, 0)):
+                self._entries[key] = (version, time.monotonic(), value)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return value
+
+    def stats(self) -> dict:
+        with self._lock:
+            size = len(self._entries)
+        total = self.hits + self.misses
+        return {
+            "size": size,
+            "max_size": self.max_entries,
+            "version": self.version,
+            "hits": self.hits,
+            "misses": self.misses,
+            "bypasses": self.bypasses,
+            "hit_ratio": self.hits / total if total else 0.0,
+        }
+
+# 公开个人空间页面（/profile/users/{user_id} 及其帖子列表）的缓存
+profile_cache = ResponseCache("profile_pages", max_entries=5000, ttl=30.0, stale_ttl=300.0)
+
+def invalidate_user(*user_ids: int):
+    """用户资料、发帖、回复、关注关系变化时调用，使该用户相关的缓存页面失效"""
+    profile_cache.invalidate_tags(*(f"user:{user_id}" for user_id in user_ids))
+
+# 帖子列表（/posts/）前几页中与访问者无关的部分
+post_list_cache = VersionedPageCache("post_list_pages", max_pages=3)
+
+# 版块帖子列表，按版块ID分区，某个版块的写入不会使其他版块的缓存失效
+board_list_cache = VersionedPageCache("board_list_pages", max_pages=3, max_entries=512)
+
+def invalidate_post_lists(*board_ids: Optional[int]):
+    """
+    帖子/楼层写入后调用，使全站帖子列表和相关版块的列表缓存失效
+
+    不传参数时（例如用户修改了资料，所有列表中的作者信息都可能变化）使所有版块失效。
+    """
+    post_list_cache.bump()
+    if not board_ids:
+        board_list_cache.bump()
+        return
+    for board_id in set(board_ids):
+        if board_id is not None:
+            board_list_cache.bump(board_id)
@@ -0,0 +1,140 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlmodel import Session, select
+from typing import List, Optional
+
+from database import get_db
+import models
+import schemas
+from auth import get_current_user
+from counts import post_counts
+from hot_rank import hot_ranker
+from post_queries import HOT_ORDER, sort_order, post_page_loader, with_viewer_fields, search_condition
+from response_cache import board_list_cache
+from serialization import post_list_response
+
+router = APIRouter(
+    prefix="/boards",
+    tags=["boards"],
+    responses={404: {"description": "Not found"}},
+)
+
+# 版块内的列表顺序，分别对应 (board_id, is_pinned, created_at) 和 (board_id, hot_score) 索引
+BOARD_LATEST_ORDER = sort_order("newest")
+BOARD_HOT_ORDER = HOT_ORDER
+
+def _get_board(db: Session, board_id: int) -> models.Board:
+    board = db.get(models.Board, board_id)
+    if not board:
+        raise HTTPException(status_code=404, detail="版块不存在")
+    return board
+
+# 获取所有版块
+@router.get("/", response_model=List[schemas.BoardResponse])
+def get_boards(
+    db: Session = Depends(get_db)
+):
+    return db.exec(select(models.Board).order_by(models.Board.id)).all()
+
+# 创建版块（仅管理员）
+@router.post("/", response_model=schemas.BoardResponse)
+def create_board(
+    board: schemas.BoardCreate,
+    current_user: models.User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    if not current_user.is_admin:
+        raise HTTPException(status_code=403, detail="只有管理员可以创建版块")
+
+    # 检查版块名称是否已存在
+    existing = db.exec(select(models.Board).where(models.Board.name == board.name)).first()
+    if existing:
+        raise HTTPException(status_code=400, detail="版块名称已存在")
+
+    db_board = models.Board(name=board.name, description=board.description)
+    db.add(db_board)
+    db.commit()
+    db.refresh(db_board)
+
+    return db_board
+
+# 获取版块信息
+@router.get("/{board_id}", response_model=schemas.BoardResponse)
+def get_board(
+    board_id: int,
+    db: Session = Depends(get_db)
+):
+    return _get_board(db, board_id)
+
+# 获取版块内的帖子（分页）
+@router.get("/{board_id}/posts", response_model=schemas.PostSearchResponse)
+def get_board_posts(
+    board_id: int,
+    page: int = Query(1, ge=1),
+    page_size: int = Query(10, ge=1, le=100),
+    include_total: bool = Query(True, description="是否返回帖子总数"),
+    current_user: models.User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    board = _get_board(db, board_id)
+
+    # 前几页按版块分区缓存，其他版块的写入不会使其失效
+    cached = board_list_cache.get(
+        db, ("latest", page, page_size), page,
+        post_page_loader(page, page_size, BOARD_LATEST_ORDER, models.Post.board_id == board_id),
+        partition=board_id
+    )
+
+    # 帖子总数直接读取版块上维护的计数
+    total = board.post_count if include_total else None
+    return post_list_response(total, page, page_size, with_viewer_fields(db, current_user.id, cached))
+
+# 版块内的热门帖子
+@router.get("/{board_id}/hot", response_model=schemas.PostSearchResponse)
+def get_board_hot_posts(
+    board_id: int,
+    page: int = Query(1, ge=1),
+    page_size: int = Query(10, ge=1, le=100),
+    current_user: models.User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    _get_board(db, board_id)
+    hot_ranker.start()
+
+    cached = board_list_cache.get(
+        db, ("hot", page, page_size), page,
+        post_page_loader(page, page_size, BOARD_HOT_ORDER, models.Post.board_id == board_id),
+        partition=board_id
+    )
+
+    return post_list_response(None, page, page_size, with_viewer_fields(db, current_user.id, cached))
+
+# 在版块内搜索帖子
+@router.get("/{board_id}/search", response_model=schemas.PostSearchResponse)
+def search_board_posts(
+    board_id: int,
+    query: str = "",
+    tags: Optional[str] = None,
+    page: int = Query(1, ge=1),
+    page_size: int = Query(10, ge=1, le=100),
+    include_total: bool = Query(True, description="是否返回结果总数，超过 1000 时返回 1000 并标记 total_capped"),
+    current_user: models.User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    _get_board(db, board_id)
+
+    conditions = [models.Post.board_id == board_id]
+    condition = search_condition(query, tags)
+    if condition is not None:
+        conditions.append(condition)
+
+    # 计数结果按该版块的列表版本缓存
+    total, total_capped = None, False
+    if include_total:
+        total, total_capped = post_counts.get(
+            db, ("board_search", board_id, query, tags), board_list_cache.partition_version(board_id),
+            select(models.Post.id).where(*conditions)
+        )
+
+    posts = post_page_loader(page, page_size, BOARD_LATEST_ORDER, *conditions)(db)
+
+    return post_list_response(total, page, page_size, with_viewer_fields(db, current_user.id, posts), total_capped)
@@ -1,5 +1,7 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
 from sqlmodel import Session, select, func
+from sqlalchemy import update
+from sqlalchemy.orm import selectinload
 from typing import List
 from datetime import datetime
 
@@ -7,6 +9,19 @@ from database import get_db
 import models
 import schemas
 from auth import get_current_user
+from like_counter import like_counts
+from hot_rank import hot_ranker
+from user_stats import bump_user_stats, bump_floor_counts
+from counts import bump_board_post_count
+from write_queue import write_queue
+from hot_replica import hot_replica
+from response_cache import invalidate_user, invalidate_post_lists
+from singleflight import read_flight
+from read_markers import mark_read
+from sparse import SparseOptions, sparse_options
+from serialization import model_response, floor_list_adapter
+from etag import make_etag, user_version, is_not_modified, not_modified_response, set_validators
+from post_queries import USER_ROW_COLUMNS, UserRow
 
 router = APIRouter(
     prefix="/floors",
@@ -14,15 +29,7 @@ router = APIRouter(
     responses={404: {"description": "Not found"}},
 )
 
-# 获取帖子的所有楼层
-@router.get("/post/{post_id}", response_model=List[schemas.FloorResponse])
-def get_floors_by_post(
-    post_id: int,
-    page: int = Query(1, ge=1),
-    page_size: int = Query(20, ge=1, le=100),
-    current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db)
-):
+def _load_floors(db: Session, post_id: int, page: int, page_size: int) -> List[schemas.FloorResponse]:
     # 检查帖子是否存在
     post_query = select(models.Post).where(models.Post.id == post_id)
     post = db.exec(post_query).first()
@@ -32,9 +39,10 @@ def get_floors_by_post(
     # 计算偏移量
     offset = (page - 1) * page_size
     
-    # 查询楼层（按楼层号排序）
+    # 查询楼层（按楼层号排序），作者一次性加载
     query = (
         select(models.Floor)
+        .options(selectinload(models.Floor.author))
         .where(models.Floor.post_id == post_id)
         .order_by(models.Floor.floor_number)
         .offset(offset)
@@ -42,7 +50,81 @@ def get_floors_by_post(
     )
     floors = db.exec(query).all()
     
-    return floors
+    return [schemas.FloorResponse.model_validate(floor) for floor in floors]
+
+def _page_version(db: Session, post_id: int, page: int, page_size: int):
+    """
+    楼层页的版本：楼层数量、最近修改时间和这一页作者的用户信息，返回 (版本, 这一页最大的楼层号)
+
+    响应中嵌入了作者信息，作者修改资料后版本随之变化。
+    """
+    totals = (
+        select(func.count(models.Floor.id), func.max(models.Floor.updated_at))
+        .where(models.Floor.post_id == post_id)
+    )
+    # 楼层数量和最近修改时间作为不相关子查询附在这一页的每一行上（只计算一次），一次查询取回
+    page_query = (
+        select(
+            totals.with_only_columns(func.count(models.Floor.id)).scalar_subquery(),
+            totals.with_only_columns(func.max(models.Floor.updated_at)).scalar_subquery(),
+            models.Floor.floor_number, *USER_ROW_COLUMNS
+        )
+        .join(models.User, models.User.id == models.Floor.author_id)
+        .where(models.Floor.post_id == post_id)
+        .order_by(models.Floor.floor_number)
+        .offset((page - 1) * page_size)
+        .limit(page_size)
+    )
+    page_rows = db.exec(page_query).all()
+    if page_rows:
+        floor_count, last_modified = page_rows[0][:2]
+    else:
+        # 超出最后一页或没有楼层
+        floor_count, last_modified = db.exec(totals).one()
+    authors = {row[3]: user_version(UserRow._make(row[3:])) for row in page_rows}
+    last_floor_number = max((row[2] for row in page_rows), default=None)
+    return (floor_count, last_modified, tuple(authors.values())), last_floor_number
+
+# 获取帖子的所有楼层
+@router.get("/post/{post_id}", response_model=List[schemas.FloorResponse])
+def get_floors_by_post(
+    post_id: int,
+    request: Request,
+    response: Response,
+    page: int = Query(1, ge=1),
+    page_size: int = Query(20, ge=1, le=100),
+    sparse: SparseOptions = Depends(sparse_options),
+    current_user: models.User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    # 用楼层数量、最近修改时间和作者信息作为版本，条件请求未变化时直接返回 304
+    # 删除较早的楼层、作者修改资料都不会改变最近修改时间，不提供 Last-Modified，只用 ETag 验证
+    version, last_floor_number = _page_version(db, post_id, page, page_size)
+    if version[0]:
+        etag = make_etag("floors", post_id, page, page_size, sparse.cache_key(), version)
+        if is_not_modified(request, etag):
+            # 客户端已有这一页，同样记为已读
+            mark_read(db, current_user.id, post_id, last_floor_number)
+            return not_modified_response(etag, private=True)
+        set_validators(response, etag, private=True)
+    
+    # 副本中这一页的版本（与 ETag 使用同一个版本）与主库一致时从副本读取
+    def replica_is_current(replica_db: Session) -> bool:
+        return _page_version(replica_db, post_id, page, page_size)[0] == version
+    
+    # 并发的相同请求共享同一次查询；键中包含版本，写入之后的请求不会拿到写入之前开始的查询结果
+    floors = read_flight.do(
+        ("floors", post_id, page, page_size, version),
+        lambda: hot_replica.read(
+            db, lambda read_db: _load_floors(read_db, post_id, page, page_size), post_id, replica_is_current
+        )
+    )
+    
+    # 记录当前用户已读到这一页的最后一楼
+    mark_read(db, current_user.id, post_id, max((floor.floor_number for floor in floors), default=None))
+    if sparse.active:
+        return sparse.response(None, floors, schemas.FloorResponse, headers=response.headers)
+    return model_response(floor_list_adapter, floors, response)
 
 # 创建新楼层（回复）
 @router.post("/", response_model=schemas.FloorResponse)
@@ -68,30 +150,52 @@ def create_floor(
         if not reply_floor:
             raise HTTPException(status_code=404, detail="回复的楼层不存在")
     
-    # 获取当前最大楼层号
-    max_floor_query = select(func.max(models.Floor.floor_number)).where(models.Floor.post_id == floor.post_id)
-    max_floor = db.exec(max_floor_query).one() or 0
-    
-    # 创建新楼层
-    new_floor = models.Floor(
-        content=floor.content,
-        post_id=floor.post_id,
-        author_id=current_user.id,
-        floor_number=max_floor + 1,
-        reply_to_floor_id=floor.reply_to_floor_id,
-        created_at=datetime.utcnow(),
-        updated_at=datetime.utcnow()
-    )
+    now = datetime.utcnow()
     
-    db.add(new_floor)
-    db.commit()
-    db.refresh(new_floor)
+    def insert_floor(write_db: Session):
+        # 从帖子上的楼层序号分配新楼层号并更新最后回复信息（单条 UPDATE，并发回复不会拿到相同楼层号）
+        allocate_query = (
+            update(models.Post)
+            .where(models.Post.id == floor.post_id, models.Post.is_closed == False)
+            .values(
+                last_floor_number=models.Post.last_floor_number + 1,
+                updated_at=now,
+                last_reply_at=now,
+                last_replier_id=current_user.id
+            )
+            .returning(models.Post.last_floor_number)
+        )
+        floor_number = write_db.execute(allocate_query).scalar()
+        if floor_number is None:
+            return None
+        
+        # 创建新楼层
+        new_floor = models.Floor(
+            content=floor.content,
+            post_id=floor.post_id,
+            author_id=current_user.id,
+            floor_number=floor_number,
+            reply_to_floor_id=floor.reply_to_floor_id,
+            created_at=now,
+            updated_at=now
+        )
+        write_db.add(new_floor)
+        bump_user_stats(write_db, current_user.id, floor_count=1)
+        write_db.flush()
+        return new_floor
     
-    # 更新帖子的更新时间
-    post.updated_at = datetime.utcnow()
-    db.commit()
+    # 交给批量写线程，与其他并发写操作合并提交
+    new_floor = write_queue.run(insert_floor)
+    if new_floor is None:
+        # 检查之后帖子被关闭
+        raise HTTPException(status_code=400, detail="该帖子已关闭，无法回复")
+    
+    hot_replica.sync_post(post.id, floor_ids=[new_floor.id])
+    invalidate_user(current_user.id, post.author_id)
+    invalidate_post_lists(post.board_id)
+    hot_ranker.touch(post.id)
     
-    return new_floor
+    return {**new_floor.model_dump(), "author": current_user}
 
 # 更新楼层
 @router.put("/{floor_id}", response_model=schemas.FloorResponse)
@@ -118,6 +222,7 @@ def update_floor(
     
     db.commit()
     db.refresh(db_floor)
+    hot_replica.sync_post(db_floor.post_id, floor_ids=[floor_id])
     
     return db_floor
 
@@ -139,6 +244,16 @@ def delete_floor(
     if db_floor.author_id != current_user.id and not current_user.is_admin:
         raise HTTPException(status_code=403, detail="没有权限删除此楼层")
     
+    post_id = db_floor.post_id
+    # 需要刷新个人空间缓存的用户
+    affected_user_ids = set()
+    # 需要重新计算热度的帖子（删除整个帖子时不需要）
+    touched_post_id = None
+    # 帖子所属版块，用于使版块列表缓存失效
+    board_id = None
+    # 是否删除了整个帖子
+    post_deleted = False
+    
     # 检查是否是一楼（帖子的第一个楼层）
     if db_floor.floor_number == 1:
         # 如果是一楼，需要删除整个帖子
@@ -151,24 +266,67 @@ def delete_floor(
             for floor in floors:
                 db.delete(floor)
             
+            # 更新作者和版块统计
+            bump_user_stats(db, post.author_id, post_count=-1)
+            bump_board_post_count(db, post.board_id, -1)
+            board_id = post.board_id
+            bump_floor_counts(db, [floor.author_id for floor in floors])
+            affected_user_ids.update(floor.author_id for floor in floors)
+            affected_user_ids.add(post.author_id)
+            
             # 删除帖子
             db.delete(post)
+            post_deleted = True
     else:
         # 如果不是一楼，删除该楼层及其所有回复
         # 递归删除所有回复
+        deleted_author_ids = [db_floor.author_id]
+        
         def delete_floor_and_replies(floor_id):
             replies_query = select(models.Floor).where(models.Floor.reply_to_floor_id == floor_id)
             replies = db.exec(replies_query).all()
             
             for reply in replies:
                 delete_floor_and_replies(reply.id)
+                deleted_author_ids.append(reply.author_id)
                 db.delete(reply)
         
         # 删除所有回复
         delete_floor_and_replies(floor_id)
         # 删除当前楼层
         db.delete(db_floor)
+        # 更新作者统计
+        bump_floor_counts(db, deleted_author_ids)
+        affected_user_ids.update(deleted_author_ids)
+        
+        # 帖子作者的帖子列表中包含楼层数量，更新帖子的更新时间
+        post = db.get(models.Post, db_floor.post_id)
+        if post:
+            post.updated_at = datetime.utcnow()
+            affected_user_ids.add(post.author_id)
+            board_id = post.board_id
+            
+            # 删除的可能是最后一条回复，按剩余楼层重新取最后回复信息
+            db.flush()
+            last_floor = db.exec(
+                select(models.Floor)
+                .where(models.Floor.post_id == post.id)
+                .order_by(models.Floor.floor_number.desc())
+                .limit(1)
+            ).first()
+            if last_floor:
+                post.last_reply_at = last_floor.created_at
+                post.last_replier_id = last_floor.author_id
+            touched_post_id = post.id
     
     db.commit()
+    # 提交后再丢弃内存中的点赞数，提交前丢弃时并发读取可能重新加载删除前的数量
+    if post_deleted:
+        like_counts.forget(post_id)
+    hot_replica.sync_post(post_id)
+    invalidate_user(*affected_user_ids)
+    invalidate_post_lists(board_id)
+    if touched_post_id is not None:
+        hot_ranker.touch(touched_post_id)
     
     return None
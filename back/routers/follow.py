@@ -1,12 +1,17 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlmodel import Session, select, func
-from typing import List, Optional
+from sqlmodel import Session, select
+from sqlalchemy import delete, insert
 from datetime import datetime
+import asyncio
 
 from database import get_db
 import models
 import schemas
 from auth import get_current_user
+from follow_cache import follow_sets, preview_users
+from user_stats import bump_user_stats, get_user_stats
+from response_cache import invalidate_user
+from write_queue import write_queue
 
 router = APIRouter(
     prefix="/follow",
@@ -34,35 +39,35 @@ async def follow_user(
     if current_user.id == follow_data.followed_id:
         raise HTTPException(status_code=400, detail="不能关注自己")
     
-    # 检查是否已经关注
-    statement = select(models.Follow).where(
-        models.Follow.follower_id == current_user.id,
-        models.Follow.followed_id == follow_data.followed_id
-    )
-    existing_follow = db.exec(statement).first()
-    
-    if existing_follow:
+    created_at = datetime.now()
+    follower_id, followed_id = current_user.id, follow_data.followed_id
+    
+    def insert_follow(write_db: Session) -> bool:
+        # INSERT OR IGNORE：已经关注时不插入，也不更新统计
+        statement = (
+            insert(models.Follow)
+            .prefix_with("OR IGNORE")
+            .values(follower_id=follower_id, followed_id=followed_id, created_at=created_at)
+        )
+        if write_db.execute(statement).rowcount == 0:
+            return False
+        bump_user_stats(write_db, follower_id, following_count=1)
+        bump_user_stats(write_db, followed_id, followers_count=1)
+        return True
+    
+    # 交给批量写线程，与其他并发写操作合并提交
+    if not await asyncio.wrap_future(write_queue.submit(insert_follow)):
         raise HTTPException(status_code=400, detail="已经关注了该用户")
+    follow_sets.invalidate(follower_id, followed_id)
+    invalidate_user(follower_id, followed_id)
     
-    # 创建关注关系
-    new_follow = models.Follow(
-        follower_id=current_user.id,
-        followed_id=follow_data.followed_id,
-        created_at=datetime.now()
-    )
-    
-    db.add(new_follow)
-    db.commit()
-    db.refresh(new_follow)
-    
-    # 获取完整的关注信息（包括用户信息）
-    statement = select(models.Follow).where(
-        models.Follow.follower_id == current_user.id,
-        models.Follow.followed_id == follow_data.followed_id
-    )
-    follow_with_users = db.exec(statement).first()
-    
-    return follow_with_users
+    return {
+        "follower_id": follower_id,
+        "followed_id": followed_id,
+        "created_at": created_at,
+        "follower": current_user,
+        "followed": followed_user
+    }
 
 @router.delete("/{user_id}", response_model=dict)
 async def unfollow_user(
@@ -80,19 +85,25 @@ async def unfollow_user(
     if not followed_user:
         raise HTTPException(status_code=404, detail="要取消关注的用户不存在")
     
-    # 检查是否已经关注
-    statement = select(models.Follow).where(
-        models.Follow.follower_id == current_user.id,
-        models.Follow.followed_id == user_id
-    )
-    existing_follow = db.exec(statement).first()
-    
-    if not existing_follow:
+    follower_id = current_user.id
+    
+    def delete_follow(write_db: Session) -> bool:
+        # DELETE ... RETURNING：只有确实删除了关注关系才更新统计
+        statement = (
+            delete(models.Follow)
+            .where(models.Follow.follower_id == follower_id, models.Follow.followed_id == user_id)
+            .returning(models.Follow.follower_id)
+        )
+        if write_db.execute(statement).first() is None:
+            return False
+        bump_user_stats(write_db, follower_id, following_count=-1)
+        bump_user_stats(write_db, user_id, followers_count=-1)
+        return True
+    
+    if not await asyncio.wrap_future(write_queue.submit(delete_follow)):
         raise HTTPException(status_code=400, detail="未关注该用户")
-    
-    # 删除关注关系
-    db.delete(existing_follow)
-    db.commit()
+    follow_sets.invalidate(current_user.id, user_id)
+    invalidate_user(current_user.id, user_id)
     
     return {"message": "已取消关注"}
 
@@ -100,6 +111,7 @@ async def unfollow_user(
 async def get_my_followers(
     page: int = Query(1, ge=1),
     page_size: int = Query(10, ge=1, le=100),
+    include_total: bool = Query(True, description="是否返回粉丝/关注总数"),
     current_user: models.User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -109,17 +121,11 @@ async def get_my_followers(
     # 计算偏移量
     offset = (page - 1) * page_size
     
-    # 查询粉丝总数
-    followers_count_query = select(func.count()).select_from(models.Follow).where(
-        models.Follow.followed_id == current_user.id
-    )
-    followers_count = db.exec(followers_count_query).one()
-    
-    # 查询关注总数
-    following_count_query = select(func.count()).select_from(models.Follow).where(
-        models.Follow.follower_id == current_user.id
-    )
-    following_count = db.exec(following_count_query).one()
+    # 粉丝/关注总数从用户统计表读取
+    followers_count, following_count = None, None
+    if include_total:
+        stats = get_user_stats(db, current_user.id)
+        followers_count, following_count = stats.followers_count, stats.following_count
     
     # 查询粉丝列表
     query = (
@@ -144,6 +150,7 @@ async def get_my_followers(
 async def get_my_following(
     page: int = Query(1, ge=1),
     page_size: int = Query(10, ge=1, le=100),
+    include_total: bool = Query(True, description="是否返回粉丝/关注总数"),
     current_user: models.User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -153,17 +160,11 @@ async def get_my_following(
     # 计算偏移量
     offset = (page - 1) * page_size
     
-    # 查询粉丝总数
-    followers_count_query = select(func.count()).select_from(models.Follow).where(
-        models.Follow.followed_id == current_user.id
-    )
-    followers_count = db.exec(followers_count_query).one()
-    
-    # 查询关注总数
-    following_count_query = select(func.count()).select_from(models.Follow).where(
-        models.Follow.follower_id == current_user.id
-    )
-    following_count = db.exec(following_count_query).one()
+    # 粉丝/关注总数从用户统计表读取
+    followers_count, following_count = None, None
+    if include_total:
+        stats = get_user_stats(db, current_user.id)
+        followers_count, following_count = stats.followers_count, stats.following_count
     
     # 查询关注列表
     query = (
@@ -189,6 +190,7 @@ async def get_user_followers(
     user_id: int,
     page: int = Query(1, ge=1),
     page_size: int = Query(10, ge=1, le=100),
+    include_total: bool = Query(True, description="是否返回粉丝/关注总数"),
     current_user: models.User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -205,17 +207,11 @@ async def get_user_followers(
     # 计算偏移量
     offset = (page - 1) * page_size
     
-    # 查询粉丝总数
-    followers_count_query = select(func.count()).select_from(models.Follow).where(
-        models.Follow.followed_id == user_id
-    )
-    followers_count = db.exec(followers_count_query).one()
-    
-    # 查询关注总数
-    following_count_query = select(func.count()).select_from(models.Follow).where(
-        models.Follow.follower_id == user_id
-    )
-    following_count = db.exec(following_count_query).one()
+    # 粉丝/关注总数从用户统计表读取
+    followers_count, following_count = None, None
+    if include_total:
+        stats = get_user_stats(db, user_id)
+        followers_count, following_count = stats.followers_count, stats.following_count
     
     # 查询粉丝列表
     query = (
@@ -241,6 +237,7 @@ async def get_user_following(
     user_id: int,
     page: int = Query(1, ge=1),
     page_size: int = Query(10, ge=1, le=100),
+    include_total: bool = Query(True, description="是否返回粉丝/关注总数"),
     current_user: models.User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -257,17 +254,11 @@ async def get_user_following(
     # 计算偏移量
     offset = (page - 1) * page_size
     
-    # 查询粉丝总数
-    followers_count_query = select(func.count()).select_from(models.Follow).where(
-        models.Follow.followed_id == user_id
-    )
-    followers_count = db.exec(followers_count_query).one()
-    
-    # 查询关注总数
-    following_count_query = select(func.count()).select_from(models.Follow).where(
-        models.Follow.follower_id == user_id
-    )
-    following_count = db.exec(following_count_query).one()
+    # 粉丝/关注总数从用户统计表读取
+    followers_count, following_count = None, None
+    if include_total:
+        stats = get_user_stats(db, user_id)
+        followers_count, following_count = stats.followers_count, stats.following_count
     
     # 查询关注列表
     query = (
@@ -288,6 +279,40 @@ async def get_user_following(
         "page_size": page_size
     }
 
+@router.get("/users/{user_id}/mutual", response_model=schemas.MutualFollowsResponse)
+async def get_mutual_follows(
+    user_id: int,
+    page: int = Query(1, ge=1),
+    page_size: int = Query(10, ge=1, le=100),
+    current_user: models.User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    获取当前用户与指定用户的共同关注和共同好友列表
+    """
+    # 检查用户是否存在
+    statement = select(models.User).where(models.User.id == user_id)
+    user = db.exec(statement).first()
+    
+    if not user:
+        raise HTTPException(status_code=404, detail="用户不存在")
+    
+    # 计算偏移量
+    offset = (page - 1) * page_size
+    
+    # 集合运算均在关注集合缓存中完成
+    common_followers = follow_sets.common_followers(db, current_user.id, user_id)
+    mutual_friends = follow_sets.mutual_friends(db, current_user.id, user_id)
+    
+    return {
+        "common_followers": preview_users(db, common_followers, limit=page_size, offset=offset),
+        "common_followers_count": len(common_followers),
+        "mutual_friends": preview_users(db, mutual_friends, limit=page_size, offset=offset),
+        "mutual_friends_count": len(mutual_friends),
+        "page": page,
+        "page_size": page_size
+    }
+
 @router.get("/check/{user_id}", response_model=dict)
 async def check_follow_status(
     user_id: int,
@@ -1,12 +1,19 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlmodel import Session, select, func
+from sqlalchemy.orm import selectinload
 from typing import List, Optional
 from datetime import datetime
+import asyncio
 
 from database import get_db
 import models
 import schemas
 from auth import get_current_user
+from sparse import SparseOptions, sparse_options
+from post_queries import post_rows_query, load_post_summaries
+from like_counter import like_counts, submit_like, submit_like_batch
+from hot_replica import hot_replica
+from counts import capped_count
 
 router = APIRouter(
     prefix="/likes",
@@ -14,6 +21,9 @@ router = APIRouter(
     responses={404: {"description": "Not found"}},
 )
 
+# 单次批量操作的最大条数
+MAX_BATCH_OPERATIONS = 500
+
 @router.post("", response_model=schemas.PostLikeResponse)
 async def like_post(
     like_data: schemas.PostLikeCreate,
@@ -21,37 +31,29 @@ async def like_post(
     db: Session = Depends(get_db)
 ):
     """
-    点赞帖子
+    点赞帖子（幂等，重复点赞返回已有的点赞记录）
     """
-    # 检查帖子是否存在
-    statement = select(models.Post).where(models.Post.id == like_data.post_id)
-    post = db.exec(statement).first()
-    
-    if not post:
-        raise HTTPException(status_code=404, detail="帖子不存在")
+    created_at = datetime.now()
     
-    # 检查是否已经点赞
-    statement = select(models.PostLike).where(
-        models.PostLike.user_id == current_user.id,
-        models.PostLike.post_id == like_data.post_id
+    # 交给批量写线程执行单条 INSERT OR IGNORE ... SELECT，与其他并发点赞合并提交
+    applied = await asyncio.wrap_future(
+        submit_like("like", current_user.id, like_data.post_id, created_at)
     )
-    existing_like = db.exec(statement).first()
     
-    if existing_like:
-        raise HTTPException(status_code=400, detail="已经点赞了该帖子")
-    
-    # 创建点赞关系
-    new_like = models.PostLike(
-        user_id=current_user.id,
-        post_id=like_data.post_id,
-        created_at=datetime.now()
-    )
+    if applied:
+        return {
+            "user_id": current_user.id,
+            "post_id": like_data.post_id,
+            "created_at": created_at,
+            "user": current_user
+        }
     
-    db.add(new_like)
-    db.commit()
-    db.refresh(new_like)
+    # 未插入：要么已经点赞过，要么帖子不存在
+    existing_like = db.get(models.PostLike, (current_user.id, like_data.post_id))
+    if not existing_like:
+        raise HTTPException(status_code=404, detail="帖子不存在")
     
-    return new_like
+    return existing_like
 
 @router.delete("/{post_id}", response_model=dict)
 async def unlike_post(
@@ -60,36 +62,72 @@ async def unlike_post(
     db: Session = Depends(get_db)
 ):
     """
-    取消点赞帖子
+    取消点赞帖子（幂等，未点赞时同样返回成功）
     """
-    # 检查帖子是否存在
-    statement = select(models.Post).where(models.Post.id == post_id)
-    post = db.exec(statement).first()
+    deleted = await asyncio.wrap_future(submit_like("unlike", current_user.id, post_id))
     
-    if not post:
-        raise HTTPException(status_code=404, detail="帖子不存在")
-    
-    # 检查是否已经点赞
-    statement = select(models.PostLike).where(
-        models.PostLike.user_id == current_user.id,
-        models.PostLike.post_id == post_id
-    )
-    existing_like = db.exec(statement).first()
-    
-    if not existing_like:
-        raise HTTPException(status_code=400, detail="未点赞该帖子")
-    
-    # 删除点赞关系
-    db.delete(existing_like)
-    db.commit()
+    if not deleted:
+        # 未删除任何记录时才检查帖子是否存在
+        post = db.get(models.Post, post_id)
+        if not post:
+            raise HTTPException(status_code=404, detail="帖子不存在")
     
     return {"message": "已取消点赞"}
 
+@router.post("/batch", response_model=schemas.PostLikeBatchResponse)
+async def batch_like_posts(
+    batch: schemas.PostLikeBatchRequest,
+    current_user: models.User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    批量点赞/取消点赞（按顺序在同一个事务中执行，用于客户端离线同步）
+    """
+    if len(batch.operations) > MAX_BATCH_OPERATIONS:
+        raise HTTPException(status_code=400, detail=f"单次最多提交 {MAX_BATCH_OPERATIONS} 个操作")
+    
+    # 一次查询确认所有涉及的帖子是否存在
+    post_ids = {operation.post_id for operation in batch.operations}
+    existing_post_ids = set()
+    if post_ids:
+        statement = select(models.Post.id).where(models.Post.id.in_(post_ids))
+        existing_post_ids = set(db.exec(statement).all())
+    
+    # 存在的帖子作为一个写操作交给批量写线程，在同一个事务中按顺序执行，
+    # 提交后由写线程更新内存计数、热度和内存副本
+    operations = [
+        (operation.action, operation.post_id)
+        for operation in batch.operations if operation.post_id in existing_post_ids
+    ]
+    applied = iter(await asyncio.wrap_future(submit_like_batch(current_user.id, operations)))
+    
+    results = []
+    for operation in batch.operations:
+        if operation.post_id not in existing_post_ids:
+            results.append({
+                "post_id": operation.post_id,
+                "action": operation.action,
+                "applied": False,
+                "is_liked": False,
+                "error": "帖子不存在"
+            })
+            continue
+        results.append({
+            "post_id": operation.post_id,
+            "action": operation.action,
+            "applied": next(applied),
+            "is_liked": operation.action == "like"
+        })
+    
+    return {"results": results}
+
 @router.get("/posts/{post_id}", response_model=schemas.PostLikesResponse)
 async def get_post_likes(
     post_id: int,
     page: int = Query(1, ge=1),
     page_size: int = Query(10, ge=1, le=100),
+    include_total: bool = Query(True, description="是否返回点赞总数"),
+    sparse: SparseOptions = Depends(sparse_options),
     current_user: models.User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -106,11 +144,8 @@ async def get_post_likes(
     # 计算偏移量
     offset = (page - 1) * page_size
     
-    # 查询点赞总数
-    like_count_query = select(func.count()).select_from(models.PostLike).where(
-        models.PostLike.post_id == post_id
-    )
-    like_count = db.exec(like_count_query).one()
+    # 点赞总数从内存计数层读取
+    like_count = like_counts.get(db, post_id) if include_total else None
     
     # 查询当前用户是否点赞
     statement = select(models.PostLike).where(
@@ -119,15 +154,23 @@ async def get_post_likes(
     )
     is_liked = db.exec(statement).first() is not None
     
-    # 查询点赞列表
+    # 查询点赞列表，点赞用户一次性加载（帖子在内存副本中时从副本读取）
     query = (
         select(models.PostLike)
+        .options(selectinload(models.PostLike.user))
         .where(models.PostLike.post_id == post_id)
         .order_by(models.PostLike.created_at.desc())
         .offset(offset)
         .limit(page_size)
     )
-    likes = db.exec(query).all()
+    likes = hot_replica.read(
+        db, lambda read_db: [schemas.PostLikeResponse.model_validate(like) for like in read_db.exec(query).all()],
+        post_id
+    )
+    
+    if sparse.active:
+        envelope = {"like_count": like_count, "is_liked": is_liked, "page": page, "page_size": page_size}
+        return sparse.response(envelope, likes, schemas.PostLikeResponse, items_key="likes")
     
     return {
         "likes": likes,
@@ -141,6 +184,7 @@ async def get_post_likes(
 async def get_my_liked_posts(
     page: int = Query(1, ge=1),
     page_size: int = Query(10, ge=1, le=100),
+    include_total: bool = Query(True, description="是否返回总数，超过 1000 时返回 1000 并标记 total_capped"),
     current_user: models.User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -150,54 +194,33 @@ async def get_my_liked_posts(
     # 计算偏移量
     offset = (page - 1) * page_size
     
-    # 查询点赞帖子总数
-    total_query = select(func.count()).select_from(models.PostLike).where(
-        models.PostLike.user_id == current_user.id
-    )
-    total = db.exec(total_query).one()
+    # 查询点赞帖子总数（沿主键索引最多数到上限）
+    total, total_capped = None, False
+    if include_total:
+        total_query = select(models.PostLike.post_id).where(models.PostLike.user_id == current_user.id)
+        total, total_capped = capped_count(db, total_query)
     
-    # 查询点赞帖子列表
+    # 查询点赞帖子列表（只读取摘要需要的列）
     query = (
-        select(models.Post)
+        post_rows_query()
         .join(models.PostLike, models.Post.id == models.PostLike.post_id)
         .where(models.PostLike.user_id == current_user.id)
         .order_by(models.PostLike.created_at.desc())
         .offset(offset)
         .limit(page_size)
     )
-    posts = db.exec(query).all()
-    
-    # 为每个帖子添加楼层数量和点赞信息
-    result_posts = []
-    for post in posts:
-        # 查询楼层数量
-        floor_count_query = select(func.count()).where(models.Floor.post_id == post.id)
-        floor_count = db.exec(floor_count_query).one()
-        
-        # 查询点赞数量
-        like_count_query = select(func.count()).where(models.PostLike.post_id == post.id)
-        like_count = db.exec(like_count_query).one()
-        
-        post_dict = {
-            "id": post.id,
-            "title": post.title,
-            "content": post.content,
-            "view_count": post.view_count,
-            "is_pinned": post.is_pinned,
-            "is_closed": post.is_closed,
-            "created_at": post.created_at,
-            "updated_at": post.updated_at,
-            "tags": post.tags,
-            "author_id": post.author_id,
-            "author": post.author,
-            "floor_count": floor_count,
-            "like_count": like_count,
-            "is_liked": True  # 当前用户肯定点赞了这些帖子
-        }
-        result_posts.append(post_dict)
+    posts = load_post_summaries(db, query)
+    
+    # 点赞数量从内存计数层批量读取，当前用户肯定点赞了这些帖子
+    like_counts_by_post = like_counts.get_many(db, [post.id for post in posts])
+    result_posts = [
+        post.model_copy(update={"like_count": like_counts_by_post[post.id], "is_liked": True})
+        for post in posts
+    ]
     
     return {
         "total": total,
+        "total_capped": total_capped,
         "page": page,
         "page_size": page_size,
         "results": result_posts
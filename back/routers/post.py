@@ -1,12 +1,29 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlmodel import Session, select, or_, func
-from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
+from sqlmodel import Session, select, func
+from sqlalchemy import update
+from typing import Optional
 from datetime import datetime
 
 from database import get_db
 import models
 import schemas
 from auth import get_current_user
+from like_counter import like_counts
+from user_stats import bump_user_stats, bump_floor_counts
+from response_cache import invalidate_user, invalidate_post_lists, post_list_cache
+from singleflight import read_flight
+from counts import post_counts, bump_board_post_count
+from hot_rank import hot_ranker
+from write_queue import write_queue
+from hot_replica import hot_replica
+from post_queries import (
+    PostSort, HOT_ORDER, SEARCH_ORDER, sort_order, post_page_loader, with_viewer_fields, search_condition,
+    USER_ROW_COLUMNS, UserRow
+)
+from excerpt import make_excerpt
+from sparse import SparseOptions, sparse_options
+from serialization import model_response, post_adapter, post_list_response
+from etag import make_etag, user_version, is_not_modified, not_modified_response, set_validators
 
 router = APIRouter(
     prefix="/posts",
@@ -21,13 +38,23 @@ def create_post(
     current_user: models.User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
+    # 检查版块是否存在
+    if post.board_id is not None and db.get(models.Board, post.board_id) is None:
+        raise HTTPException(status_code=404, detail="版块不存在")
+    
+    now = datetime.utcnow()
     db_post = models.Post(
         title=post.title,
         content=post.content,
+        excerpt=make_excerpt(post.content),
         tags=post.tags,
         author_id=current_user.id,
-        created_at=datetime.utcnow(),
-        updated_at=datetime.utcnow()
+        board_id=post.board_id,
+        created_at=now,
+        updated_at=now,
+        last_reply_at=now,  # 新帖的最后活动时间为发帖时间
+        last_replier_id=current_user.id,
+        last_floor_number=1  # 第一楼为楼主发言
     )
     db.add(db_post)
     db.commit()
@@ -43,76 +70,61 @@ def create_post(
         updated_at=datetime.utcnow()
     )
     db.add(floor)
+    bump_user_stats(db, current_user.id, post_count=1, floor_count=1)
+    bump_board_post_count(db, db_post.board_id, 1)
     db.commit()
+    hot_replica.sync_post(db_post.id)
+    invalidate_user(current_user.id)
+    invalidate_post_lists(db_post.board_id)
+    hot_ranker.touch(db_post.id)
     
     return db_post
 
+
 # 获取所有帖子（分页）
 @router.get("/", response_model=schemas.PostSearchResponse)
 def get_posts(
     page: int = Query(1, ge=1),
     page_size: int = Query(10, ge=1, le=100),
+    include_total: bool = Query(True, description="是否返回帖子总数，滚动加载时可关闭"),
+    sort: PostSort = Query("newest", description="排序方式：newest 最新发布、latest_reply 最后回复、most_liked 最多点赞、most_viewed 最多浏览"),
+    sparse: SparseOptions = Depends(sparse_options),
     current_user: models.User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    # 计算偏移量
-    offset = (page - 1) * page_size
-    
-    # 查询帖子总数
-    total_query = select(func.count()).select_from(models.Post)
-    total = db.exec(total_query).one()
-    
-    # 查询帖子列表（按创建时间降序，置顶优先）
-    query = (
-        select(models.Post)
-        .order_by(models.Post.is_pinned.desc(), models.Post.created_at.desc())
-        .offset(offset)
-        .limit(page_size)
-    )
-    posts = db.exec(query).all()
-    
-    # 为每个帖子添加楼层数量和点赞信息
-    result_posts = []
-    for post in posts:
-        # 查询楼层数量
-        floor_count_query = select(func.count()).where(models.Floor.post_id == post.id)
-        floor_count = db.exec(floor_count_query).one()
-        
-        # 查询点赞数量
-        like_count_query = select(func.count()).where(models.PostLike.post_id == post.id)
-        like_count = db.exec(like_count_query).one()
-        
-        # 查询当前用户是否点赞
-        statement = select(models.PostLike).where(
-            models.PostLike.user_id == current_user.id,
-            models.PostLike.post_id == post.id
-        )
-        is_liked = db.exec(statement).first() is not None
-        
-        post_dict = {
-            "id": post.id,
-            "title": post.title,
-            "content": post.content,
-            "view_count": post.view_count,
-            "is_pinned": post.is_pinned,
-            "is_closed": post.is_closed,
-            "created_at": post.created_at,
-            "updated_at": post.updated_at,
-            "tags": post.tags,
-            "author_id": post.author_id,
-            "author": post.author,
-            "floor_count": floor_count,
-            "like_count": like_count,
-            "is_liked": is_liked
-        }
-        result_posts.append(post_dict)
-    
-    return {
-        "total": total,
-        "page": page,
-        "page_size": page_size,
-        "results": result_posts
-    }
+    # 前几页从缓存读取，帖子/楼层写入时版本号递增使缓存失效
+    # （点赞数、浏览数排序的顺序变化不递增版本号，最多延迟 max_age 秒）
+    loader = post_page_loader(page, page_size, sort_order(sort))
+    if hot_replica.covers(sort, page, page_size):
+        # 窗口之内的页从内存副本读取
+        loader = hot_replica.reader(loader)
+    cached = post_list_cache.get(db, (sort, page, page_size), page, loader)
+    
+    # 帖子总数按帖子列表版本缓存，版本递增后才重新计数
+    total = None
+    if include_total:
+        total, _ = post_counts.get(db, ("all",), post_list_cache.version, select(models.Post.id), cap=None)
+    
+    results = with_viewer_fields(db, current_user.id, cached)
+    if sparse.active:
+        envelope = {"total": total, "total_capped": False, "page": page, "page_size": page_size}
+        return sparse.response(envelope, results, schemas.PostSummaryResponse)
+    
+    return post_list_response(total, page, page_size, results)
+
+# 热门帖子（按后台计算的热度分数排序）
+@router.get("/hot", response_model=schemas.PostSearchResponse)
+def get_hot_posts(
+    page: int = Query(1, ge=1),
+    page_size: int = Query(10, ge=1, le=100),
+    current_user: models.User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    # 确保后台线程已启动（启动时会补算没有热度分数的帖子）
+    hot_ranker.start()
+    cached = post_list_cache.get(db, ("hot", page, page_size), page, post_page_loader(page, page_size, HOT_ORDER))
+    
+    return post_list_response(None, page, page_size, with_viewer_fields(db, current_user.id, cached))
 
 # 搜索帖子
 @router.get("/search", response_model=schemas.PostSearchResponse)
@@ -121,118 +133,41 @@ def search_posts(
     tags: Optional[str] = None,
     page: int = Query(1, ge=1),
     page_size: int = Query(10, ge=1, le=100),
+    include_total: bool = Query(True, description="是否返回结果总数，超过 1000 时返回 1000 并标记 total_capped"),
     current_user: models.User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    # 计算偏移量
-    offset = (page - 1) * page_size
-    
-    # 构建搜索条件
-    conditions = []
-    if query:
-        conditions.append(models.Post.title.contains(query))
-        conditions.append(models.Post.content.contains(query))
-    
-    if tags:
-        for tag in tags.split(','):
-            tag = tag.strip()
-            if tag:
-                conditions.append(models.Post.tags.contains(tag))
-    
-    # 如果有搜索条件，则使用OR组合
-    if conditions:
-        search_condition = or_(*conditions)
-        
-        # 查询帖子总数
-        total_query = select(func.count()).select_from(models.Post).where(search_condition)
-        total = db.exec(total_query).one()
-        
-        # 查询帖子列表
-        query = (
-            select(models.Post)
-            .where(search_condition)
-            .order_by(models.Post.is_pinned.desc(), models.Post.created_at.desc())
-            .offset(offset)
-            .limit(page_size)
-        )
-    else:
-        # 无搜索条件时，返回所有帖子
-        total_query = select(func.count()).select_from(models.Post)
-        total = db.exec(total_query).one()
-        
-        query = (
-            select(models.Post)
-            .order_by(models.Post.is_pinned.desc(), models.Post.created_at.desc())
-            .offset(offset)
-            .limit(page_size)
-        )
-    
-    posts = db.exec(query).all()
-    
-    # 为每个帖子添加楼层数量
-    result_posts = []
-    for post in posts:
-        floor_count_query = select(func.count()).where(models.Floor.post_id == post.id)
-        floor_count = db.exec(floor_count_query).one()
-        
-        post_dict = {
-            "id": post.id,
-            "title": post.title,
-            "content": post.content,
-            "view_count": post.view_count,
-            "is_pinned": post.is_pinned,
-            "is_closed": post.is_closed,
-            "created_at": post.created_at,
-            "updated_at": post.updated_at,
-            "tags": post.tags,
-            "author_id": post.author_id,
-            "author": post.author,
-            "floor_count": floor_count
-        }
-        result_posts.append(post_dict)
-    
-    return {
-        "total": total,
-        "page": page,
-        "page_size": page_size,
-        "results": result_posts
-    }
+    count_key = ("search", query, tags)
+    
+    # 构建搜索条件（OR 组合），没有搜索条件时返回所有帖子
+    condition = search_condition(query, tags)
+    conditions = [condition] if condition is not None else []
+    
+    # 查询帖子总数（最多数到上限）
+    total_query = select(models.Post.id).where(*conditions)
+    
+    # 计数结果按帖子列表版本缓存，帖子增删改后重新计数
+    total, total_capped = None, False
+    if include_total:
+        total, total_capped = post_counts.get(db, count_key, post_list_cache.version, total_query)
+    
+    # 查询帖子列表（只读取摘要需要的列）
+    result_posts = post_page_loader(page, page_size, SEARCH_ORDER, *conditions)(db)
+    
+    return post_list_response(total, page, page_size, result_posts, total_capped)
 
-# 获取单个帖子详情
-@router.get("/{post_id}", response_model=schemas.PostResponse)
-def get_post(
-    post_id: int,
-    current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db)
-):
+def _load_post(db: Session, post_id: int) -> schemas.PostResponse:
+    """帖子详情中与访问者无关的部分"""
     # 查询帖子
     statement = select(models.Post).where(models.Post.id == post_id)
     post = db.exec(statement).first()
     if not post:
         raise HTTPException(status_code=404, detail="帖子不存在")
     
-    # 增加浏览次数
-    post.view_count += 1
-    db.add(post)
-    db.commit()
-    db.refresh(post)
-    
     # 查询楼层数量
     floor_count_query = select(func.count()).where(models.Floor.post_id == post_id)
     floor_count = db.exec(floor_count_query).one()
     
-    # 查询点赞数量
-    like_count_query = select(func.count()).where(models.PostLike.post_id == post_id)
-    like_count = db.exec(like_count_query).one()
-    
-    # 查询当前用户是否点赞
-    statement = select(models.PostLike).where(
-        models.PostLike.user_id == current_user.id,
-        models.PostLike.post_id == post_id
-    )
-    is_liked = db.exec(statement).first() is not None
-    
-    # 添加楼层数量和点赞信息到响应中
     post_dict = {
         "id": post.id,
         "title": post.title,
@@ -243,14 +178,71 @@ def get_post(
         "created_at": post.created_at,
         "updated_at": post.updated_at,
         "tags": post.tags,
+        "excerpt": post.excerpt,
         "author_id": post.author_id,
+        "board_id": post.board_id,
         "author": post.author,
-        "floor_count": floor_count,
-        "like_count": like_count,
-        "is_liked": is_liked
+        "floor_count": floor_count
     }
+    return schemas.PostResponse.model_validate(post_dict, from_attributes=True)
+
+def _bump_view_count(post_id: int):
+    return (
+        update(models.Post)
+        .where(models.Post.id == post_id)
+        .values(view_count=models.Post.view_count + 1)
+    )
+
+# 获取单个帖子详情
+@router.get("/{post_id}", response_model=schemas.PostResponse)
+def get_post(
+    post_id: int,
+    request: Request,
+    response: Response,
+    current_user: models.User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    # 取回帖子的更新时间和作者信息（响应中嵌入了作者，都参与 ETag）
+    version_query = (
+        select(models.Post.updated_at, *USER_ROW_COLUMNS)
+        .join(models.User, models.User.id == models.Post.author_id)
+        .where(models.Post.id == post_id)
+    )
+    row = db.exec(version_query).first()
+    if row is None:
+        raise HTTPException(status_code=404, detail="帖子不存在")
+    updated_at, author = row[0], user_version(UserRow._make(row[1:]))
+    
+    # 浏览次数交给批量写线程累加，不等待提交
+    def after_view(_):
+        hot_ranker.touch(post_id)
+        hot_replica.apply_view(post_id)
+    write_queue.submit(lambda write_db: write_db.execute(_bump_view_count(post_id)), after_view)
     
-    return post_dict
+    # 点赞数量从内存计数层读取，是否点赞按主键查询
+    like_count = like_counts.get(db, post_id)
+    is_liked = db.get(models.PostLike, (current_user.id, post_id)) is not None
+    
+    # 新回复会更新 updated_at；浏览次数不参与 ETag（弱验证器）
+    etag = make_etag("post", post_id, updated_at, author, like_count, is_liked)
+    if is_not_modified(request, etag):
+        return not_modified_response(etag, private=True)
+    set_validators(response, etag, private=True)
+    
+    # 副本中的帖子更新时间和作者信息与主库一致时从副本读取
+    def replica_is_current(replica_db: Session) -> bool:
+        return tuple(replica_db.exec(version_query).first() or ()) == tuple(row)
+    
+    # 并发的相同请求共享同一次查询；键中包含版本，写入之后的请求不会拿到写入之前开始的查询结果
+    post = read_flight.do(("post", post_id, updated_at, author), lambda: hot_replica.read(
+        db, lambda read_db: _load_post(read_db, post_id), post_id, replica_is_current
+    ))
+    
+    # 添加点赞信息到响应中
+    return model_response(post_adapter, post.model_copy(update={
+        "like_count": like_count,
+        "is_liked": is_liked
+    }), response)
 
 # 更新帖子
 @router.put("/{post_id}", response_model=schemas.PostResponse)
@@ -275,12 +267,17 @@ def update_post(
     update_data = post_update.dict(exclude_unset=True)
     for key, value in update_data.items():
         setattr(db_post, key, value)
+    if "content" in update_data:
+        db_post.excerpt = make_excerpt(db_post.content)
     
     # 更新时间
     db_post.updated_at = datetime.utcnow()
     
     db.commit()
     db.refresh(db_post)
+    hot_replica.sync_post(post_id, floor_ids=())
+    invalidate_user(db_post.author_id)
+    invalidate_post_lists(db_post.board_id)
     
     return db_post
 
@@ -308,8 +305,17 @@ def delete_post(
     for floor in floors:
         db.delete(floor)
     
+    # 更新作者统计
+    bump_user_stats(db, db_post.author_id, post_count=-1)
+    bump_floor_counts(db, [floor.author_id for floor in floors])
+    bump_board_post_count(db, db_post.board_id, -1)
+    
     # 删除帖子
     db.delete(db_post)
     db.commit()
+    like_counts.forget(post_id)
+    hot_replica.sync_post(post_id)
+    invalidate_user(db_post.author_id, *{floor.author_id for floor in floors})
+    invalidate_post_lists(db_post.board_id)
     
     return None
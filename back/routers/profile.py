@@ -1,11 +1,18 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlmodel import Session, select, func
 from typing import List, Optional
 
 from database import get_db
 import models
 import schemas
-from auth import get_current_user
+from auth import get_current_user, get_optional_user
+from follow_cache import follow_sets, preview_users
+from user_stats import get_user_stats
+from response_cache import profile_cache
+from post_queries import post_rows_query, load_post_summaries
+from serialization import model_response, user_profile_adapter, user_posts_adapter
+from compression import EncodedBody, encoded_response
+from etag import make_etag, user_version, is_not_modified, not_modified_response, set_validators
 
 router = APIRouter(
     prefix="/profile",
@@ -15,111 +22,113 @@ router = APIRouter(
 
 @router.get("/me", response_model=schemas.UserProfileResponse)
 async def get_my_profile(
+    request: Request,
+    response: Response,
     current_user: models.User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
     获取当前登录用户的个人空间信息
     """
-    # 查询用户发帖数量
-    post_count_query = select(func.count()).where(models.Post.author_id == current_user.id)
-    post_count = db.exec(post_count_query).one()
-    
-    # 查询用户回复数量
-    floor_count_query = select(func.count()).where(models.Floor.author_id == current_user.id)
-    floor_count = db.exec(floor_count_query).one()
+    # 发帖/回复/粉丝/关注数量从用户统计表中一次读取
+    stats = get_user_stats(db, current_user.id)
     
-    # 查询粉丝数量
-    followers_count_query = select(func.count()).where(models.Follow.followed_id == current_user.id)
-    followers_count = db.exec(followers_count_query).one()
-    
-    # 查询关注数量
-    following_count_query = select(func.count()).where(models.Follow.follower_id == current_user.id)
-    following_count = db.exec(following_count_query).one()
+    etag = make_etag(
+        "profile", user_version(current_user),
+        stats.post_count, stats.floor_count, stats.followers_count, stats.following_count
+    )
+    if is_not_modified(request, etag):
+        return not_modified_response(etag, private=True)
+    set_validators(response, etag, private=True)
     
     return {
         "user": current_user,
-        "post_count": post_count,
-        "floor_count": floor_count,
-        "followers_count": followers_count,
-        "following_count": following_count,
+        "post_count": stats.post_count,
+        "floor_count": stats.floor_count,
+        "followers_count": stats.followers_count,
+        "following_count": stats.following_count,
         "is_following": False  # 自己不能关注自己
     }
 
+def _user_responses(users) -> list:
+    return [schemas.UserResponse.model_validate(user) for user in users]
+
+def _load_user_profile(user_id: int):
+    """
+    个人空间中与访问者无关的部分（用户信息和统计数量）、ETag 及序列化后的响应体，可被缓存共享
+
+    响应体按编码压缩后保存在缓存条目中，未登录用户的请求不再逐次序列化和压缩。
+    """
+    def loader(db: Session):
+        # 查询用户
+        statement = select(models.User).where(models.User.id == user_id)
+        user = db.exec(statement).first()
+        
+        if not user:
+            raise HTTPException(status_code=404, detail="用户不存在")
+        
+        # 发帖/回复/粉丝/关注数量从用户统计表中一次读取
+        stats = get_user_stats(db, user_id)
+        
+        etag = make_etag(
+            "profile", user_version(user),
+            stats.post_count, stats.floor_count, stats.followers_count, stats.following_count
+        )
+        profile = schemas.UserProfileResponse(
+            user=schemas.UserResponse.model_validate(user),
+            post_count=stats.post_count,
+            floor_count=stats.floor_count,
+            followers_count=stats.followers_count,
+            following_count=stats.following_count
+        )
+        return etag, profile, EncodedBody(user_profile_adapter.dump_json(profile))
+    return loader
+
 @router.get("/users/{user_id}", response_model=schemas.UserProfileResponse)
-async def get_user_profile(
+def get_user_profile(
     user_id: int,
     request: Request,
+    response: Response,
+    current_user: Optional[models.User] = Depends(get_optional_user),
     db: Session = Depends(get_db)
 ):
     """
     获取指定用户的个人空间信息
     """
-    # 查询用户
-    statement = select(models.User).where(models.User.id == user_id)
-    user = db.exec(statement).first()
-    
-    if not user:
-        raise HTTPException(status_code=404, detail="用户不存在")
-    
-    # 查询用户发帖数量
-    post_count_query = select(func.count()).where(models.Post.author_id == user_id)
-    post_count = db.exec(post_count_query).one()
-    
-    # 查询用户回复数量
-    floor_count_query = select(func.count()).where(models.Floor.author_id == user_id)
-    floor_count = db.exec(floor_count_query).one()
-    
-    # 查询粉丝数量
-    followers_count_query = select(func.count()).where(models.Follow.followed_id == user_id)
-    followers_count = db.exec(followers_count_query).one()
-    
-    # 查询关注数量
-    following_count_query = select(func.count()).where(models.Follow.follower_id == user_id)
-    following_count = db.exec(following_count_query).one()
-    
-    # 检查当前登录用户是否已关注该用户
-    is_following = False
-    current_user = None
-    
-    try:
-        # 尝试获取当前登录用户（可能未登录）
-        token = None
-        for param in request.query_params:
-            if param.lower() == "token":
-                token = request.query_params[param]
-                break
-        
-        if token:
-            from auth import decode_access_token
-            payload = decode_access_token(token)
-            username = payload.get("sub")
-            if username:
-                user_statement = select(models.User).where(models.User.username == username)
-                current_user = db.exec(user_statement).first()
-    except Exception:
-        # 如果获取当前用户失败，忽略错误
-        pass
-    
-    # 如果获取到当前用户，检查是否已关注
-    if current_user:
-        follow_statement = select(models.Follow).where(
-            models.Follow.follower_id == current_user.id,
-            models.Follow.followed_id == user_id
-        )
-        is_following = db.exec(follow_statement).first() is not None
+    etag, profile, body = profile_cache.get(
+        db, ("profile", user_id), _load_user_profile(user_id), tags=[f"user:{user_id}"]
+    )
     
-    return {
-        "user": user,
-        "post_count": post_count,
-        "floor_count": floor_count,
-        "followers_count": followers_count,
-        "following_count": following_count,
-        "is_following": is_following
-    }
+    # 未登录或查看自己时没有与访问者相关的字段
+    if not current_user or current_user.id == user_id:
+        if is_not_modified(request, etag):
+            return not_modified_response(etag)
+        set_validators(response, etag)
+        return encoded_response(request, body, response)
+    
+    # 检查当前登录用户是否已关注该用户，并计算共同关注/共同好友
+    is_following = user_id in follow_sets.following(db, current_user.id)
+    common_followers = follow_sets.common_followers(db, current_user.id, user_id)
+    mutual_friends = follow_sets.mutual_friends(db, current_user.id, user_id)
+    
+    # 关注集合都在内存中，未变化时不再查询预览用户和序列化
+    etag = make_etag(etag, current_user.id, is_following, common_followers, mutual_friends)
+    if is_not_modified(request, etag):
+        return not_modified_response(etag, private=True)
+    set_validators(response, etag, private=True)
+    
+    return model_response(user_profile_adapter, profile.model_copy(update={
+        "is_following": is_following,
+        "common_followers": _user_responses(preview_users(db, common_followers)),
+        "common_followers_count": len(common_followers),
+        "mutual_friends": _user_responses(preview_users(db, mutual_friends)),
+        "mutual_friends_count": len(mutual_friends)
+    }), response)
 
 @router.get("/me/posts", response_model=schemas.UserPostsResponse)
 async def get_my_posts(
+    request: Request,
+    response: Response,
     page: int = Query(1, ge=1),
     page_size: int = Query(10, ge=1, le=100),
     current_user: models.User = Depends(get_current_user),
@@ -128,55 +137,83 @@ async def get_my_posts(
     """
     获取当前登录用户发布的帖子（分页）
     """
+    # 帖子数量和最近更新时间作为版本（新回复会更新帖子的 updated_at）
+    # 删除较早的帖子不会改变最近更新时间，不提供 Last-Modified，只用包含帖子数量的 ETag 验证
+    version_query = (
+        select(func.count(models.Post.id), func.max(models.Post.updated_at))
+        .where(models.Post.author_id == current_user.id)
+    )
+    post_count, newest_update = db.exec(version_query).one()
+    etag = make_etag("my_posts", user_version(current_user), page, page_size, post_count, newest_update)
+    if is_not_modified(request, etag):
+        return not_modified_response(etag, private=True)
+    set_validators(response, etag, private=True)
+    
     # 计算偏移量
     offset = (page - 1) * page_size
     
-    # 查询帖子总数
-    total_query = select(func.count()).select_from(models.Post).where(models.Post.author_id == current_user.id)
-    total = db.exec(total_query).one()
+    # 帖子总数即版本查询中的数量
+    total = post_count
     
-    # 查询帖子列表（按创建时间降序）
+    # 查询帖子列表（按创建时间降序，只读取摘要需要的列）
     query = (
-        select(models.Post)
+        post_rows_query()
         .where(models.Post.author_id == current_user.id)
         .order_by(models.Post.created_at.desc())
         .offset(offset)
         .limit(page_size)
     )
-    posts = db.exec(query).all()
+    result_posts = load_post_summaries(db, query)
     
-    # 为每个帖子添加楼层数量
-    result_posts = []
-    for post in posts:
-        floor_count_query = select(func.count()).where(models.Floor.post_id == post.id)
-        floor_count = db.exec(floor_count_query).one()
+    return model_response(user_posts_adapter, schemas.UserPostsResponse.model_construct(
+        total=total, page=page, page_size=page_size, results=result_posts
+    ), response)
+
+def _load_user_posts(user_id: int, page: int, page_size: int):
+    """指定用户的帖子列表、ETag 及序列化（并按需压缩）后的响应体"""
+    def loader(db: Session):
+        # 查询用户是否存在
+        user_query = select(models.User).where(models.User.id == user_id)
+        user = db.exec(user_query).first()
         
-        post_dict = {
-            "id": post.id,
-            "title": post.title,
-            "content": post.content,
-            "view_count": post.view_count,
-            "is_pinned": post.is_pinned,
-            "is_closed": post.is_closed,
-            "created_at": post.created_at,
-            "updated_at": post.updated_at,
-            "tags": post.tags,
-            "author_id": post.author_id,
-            "author": post.author,
-            "floor_count": floor_count
-        }
-        result_posts.append(post_dict)
-    
-    return {
-        "total": total,
-        "page": page,
-        "page_size": page_size,
-        "results": result_posts
-    }
+        if not user:
+            raise HTTPException(status_code=404, detail="用户不存在")
+        
+        # 计算偏移量
+        offset = (page - 1) * page_size
+        
+        # 查询帖子总数
+        total_query = select(func.count()).select_from(models.Post).where(models.Post.author_id == user_id)
+        total = db.exec(total_query).one()
+        
+        # 查询帖子列表（按创建时间降序，只读取摘要需要的列）
+        query = (
+            post_rows_query()
+            .where(models.Post.author_id == user_id)
+            .order_by(models.Post.created_at.desc())
+            .offset(offset)
+            .limit(page_size)
+        )
+        result_posts = load_post_summaries(db, query)
+        
+        etag = make_etag(
+            "user_posts", user_version(user), page, page_size, total,
+            [(post.id, post.updated_at, post.floor_count) for post in result_posts]
+        )
+        user_posts = schemas.UserPostsResponse.model_validate({
+            "total": total,
+            "page": page,
+            "page_size": page_size,
+            "results": result_posts
+        }, from_attributes=True)
+        return etag, user_posts, EncodedBody(user_posts_adapter.dump_json(user_posts))
+    return loader
 
 @router.get("/users/{user_id}/posts", response_model=schemas.UserPostsResponse)
-async def get_user_posts(
+def get_user_posts(
     user_id: int,
+    request: Request,
+    response: Response,
     page: int = Query(1, ge=1),
     page_size: int = Query(10, ge=1, le=100),
     db: Session = Depends(get_db)
@@ -184,55 +221,14 @@ async def get_user_posts(
     """
     获取指定用户发布的帖子（分页）
     """
-    # 查询用户是否存在
-    user_query = select(models.User).where(models.User.id == user_id)
-    user = db.exec(user_query).first()
-    
-    if not user:
-        raise HTTPException(status_code=404, detail="用户不存在")
-    
-    # 计算偏移量
-    offset = (page - 1) * page_size
-    
-    # 查询帖子总数
-    total_query = select(func.count()).select_from(models.Post).where(models.Post.author_id == user_id)
-    total = db.exec(total_query).one()
-    
-    # 查询帖子列表（按创建时间降序）
-    query = (
-        select(models.Post)
-        .where(models.Post.author_id == user_id)
-        .order_by(models.Post.created_at.desc())
-        .offset(offset)
-        .limit(page_size)
+    etag, _, body = profile_cache.get(
+        db,
+        ("posts", user_id, page, page_size),
+        _load_user_posts(user_id, page, page_size),
+        tags=[f"user:{user_id}"]
     )
-    posts = db.exec(query).all()
+    if is_not_modified(request, etag):
+        return not_modified_response(etag)
+    set_validators(response, etag)
     
-    # 为每个帖子添加楼层数量
-    result_posts = []
-    for post in posts:
-        floor_count_query = select(func.count()).where(models.Floor.post_id == post.id)
-        floor_count = db.exec(floor_count_query).one()
-        
-        post_dict = {
-            "id": post.id,
-            "title": post.title,
-            "content": post.content,
-            "view_count": post.view_count,
-            "is_pinned": post.is_pinned,
-            "is_closed": post.is_closed,
-            "created_at": post.created_at,
-            "updated_at": post.updated_at,
-            "tags": post.tags,
-            "author_id": post.author_id,
-            "author": post.author,
-            "floor_count": floor_count
-        }
-        result_posts.append(post_dict)
-    
-    return {
-        "total": total,
-        "page": page,
-        "page_size": page_size,
-        "results": result_posts
-    }
+    return encoded_response(request, body, response)
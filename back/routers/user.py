@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
+from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Request, Response
 from sqlmodel import Session, select
 from typing import List
 import os
@@ -10,6 +10,10 @@ import models
 import schemas
 from database import get_db
 from auth import get_current_user
+from response_cache import invalidate_user, invalidate_post_lists
+from hot_replica import hot_replica
+from serialization import model_response, user_adapter
+from etag import make_etag, user_version, is_not_modified, not_modified_response, set_validators
 
 router = APIRouter(
     prefix="/users",
@@ -59,6 +63,10 @@ async def update_user_profile(
     db.add(db_user)
     db.commit()
     db.refresh(db_user)
+    hot_replica.sync_users(db_user.id)
+    invalidate_user(db_user.id)
+    # 帖子列表中嵌入了作者信息
+    invalidate_post_lists()
     
     return db_user
 
@@ -98,12 +106,18 @@ async def upload_avatar(
     db.add(db_user)
     db.commit()
     db.refresh(db_user)
+    hot_replica.sync_users(db_user.id)
+    invalidate_user(db_user.id)
+    # 帖子列表中嵌入了作者信息
+    invalidate_post_lists()
     
     return {"avatar_url": avatar_url}
 
 @router.get("/{user_id}", response_model=schemas.UserResponse)
 async def get_user_by_id(
     user_id: int,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db)
 ):
     """
@@ -115,4 +129,9 @@ async def get_user_by_id(
     if not user:
         raise HTTPException(status_code=404, detail="用户不存在")
     
-    return user
+    etag = make_etag("user", user_version(user))
+    if is_not_modified(request, etag):
+        return not_modified_response(etag)
+    set_validators(response, etag)
+    
+    return model_response(user_adapter, user_adapter.validate_python(user, from_attributes=True), response)
@@ -1,4 +1,4 @@
-from typing import Optional, List
+from typing import Optional, List, Literal
 from datetime import datetime
 from sqlmodel import SQLModel
 
@@ -46,7 +46,7 @@ class PostBase(SQLModel):
     tags: Optional[str] = None
 
 class PostCreate(PostBase):
-    pass
+    board_id: Optional[int] = None  # 发布到的版块
 
 class PostUpdate(SQLModel):
     title: Optional[str] = None
@@ -55,9 +55,14 @@ class PostUpdate(SQLModel):
     is_pinned: Optional[bool] = None
     is_closed: Optional[bool] = None
 
-class PostResponse(PostBase):
+# 列表中的帖子摘要，不包含完整内容
+class PostSummaryResponse(SQLModel):
     id: int
+    title: str
+    tags: Optional[str] = None
+    excerpt: str = ""  # 纯文本摘要
     author_id: int
+    board_id: Optional[int] = None
     view_count: int
     is_pinned: bool
     is_closed: bool
@@ -67,10 +72,19 @@ class PostResponse(PostBase):
     floor_count: Optional[int] = None  # 非数据库字段，用于API返回
     like_count: Optional[int] = None  # 点赞数量
     is_liked: Optional[bool] = None  # 当前用户是否点赞
+    last_reply_at: Optional[datetime] = None  # 最后回复时间
+    last_replier_id: Optional[int] = None  # 最后回复的用户ID
+    last_replier: Optional[UserResponse] = None  # 最后回复的用户（列表接口填充）
+    last_floor_number: Optional[int] = None  # 最大楼层号
+    unread_count: Optional[int] = None  # 上次阅读以来的新楼层数，从未看过时为空
 
     class Config:
         from_attributes = True
 
+# 帖子详情，包含完整内容
+class PostResponse(PostSummaryResponse):
+    content: str
+
 # 楼层模式
 class FloorBase(SQLModel):
     content: str
@@ -102,10 +116,11 @@ class PostSearchQuery(SQLModel):
     page_size: int = 10
 
 class PostSearchResponse(SQLModel):
-    total: int
+    total: Optional[int] = None  # include_total=false 时不返回
+    total_capped: bool = False  # 为 True 时 total 是上限值，实际数量更多（显示为“1000+”）
     page: int
     page_size: int
-    results: List[PostResponse]
+    results: List[PostSummaryResponse]
 
 # 个人空间模式
 class UserProfileResponse(SQLModel):
@@ -115,12 +130,16 @@ class UserProfileResponse(SQLModel):
     followers_count: int = 0
     following_count: int = 0
     is_following: bool = False  # 当前登录用户是否关注了此用户
+    common_followers: List[UserResponse] = []  # 当前用户关注的人中也关注了此用户的（预览）
+    common_followers_count: int = 0
+    mutual_friends: List[UserResponse] = []  # 双方的共同好友（预览）
+    mutual_friends_count: int = 0
 
 class UserPostsResponse(SQLModel):
     total: int
     page: int
     page_size: int
-    results: List[PostResponse]
+    results: List[PostSummaryResponse]
 
 # 关注模式
 class FollowCreate(SQLModel):
@@ -139,8 +158,16 @@ class FollowResponse(SQLModel):
 class UserFollowsResponse(SQLModel):
     followers: List[UserResponse]
     following: List[UserResponse]
-    followers_count: int
-    following_count: int
+    followers_count: Optional[int] = None  # include_total=false 时不返回
+    following_count: Optional[int] = None
+    page: int = 1
+    page_size: int = 10
+
+class MutualFollowsResponse(SQLModel):
+    common_followers: List[UserResponse]
+    common_followers_count: int
+    mutual_friends: List[UserResponse]
+    mutual_friends_count: int
     page: int = 1
     page_size: int = 10
 
@@ -157,9 +184,41 @@ class PostLikeResponse(SQLModel):
     class Config:
         from_attributes = True
 
+class PostLikeBatchOperation(SQLModel):
+    post_id: int
+    action: Literal["like", "unlike"]
+
+class PostLikeBatchRequest(SQLModel):
+    operations: List[PostLikeBatchOperation]
+
+class PostLikeBatchResult(SQLModel):
+    post_id: int
+    action: str
+    applied: bool  # 本次操作是否改变了点赞状态
+    is_liked: bool  # 操作完成后的点赞状态
+    error: Optional[str] = None
+
+class PostLikeBatchResponse(SQLModel):
+    results: List[PostLikeBatchResult]
+
 class PostLikesResponse(SQLModel):
     likes: List[PostLikeResponse]
-    like_count: int
+    like_count: Optional[int] = None  # include_total=false 时不返回
     is_liked: bool
     page: int = 1
     page_size: int = 10
+
+# 版块模式
+class BoardCreate(SQLModel):
+    name: str
+    description: Optional[str] = None
+
+class BoardResponse(SQLModel):
+    id: int
+    name: str
+    description: Optional[str] = None
+    post_count: int
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,40 @@
+from typing import Any, List, Optional
+
+from fastapi import Response
+from fastapi.responses import ORJSONResponse  # noqa: F401  需要安装 orjson，由 main.py 设为默认响应类
+from pydantic import TypeAdapter
+
+import schemas
+
+# 预先编译好的响应序列化器
+# 路由中已经是响应模型实例的数据（来自数据库、由 model_construct/model_validate 组装）
+# 直接用 pydantic-core 序列化为 JSON 字节，跳过 FastAPI 按 response_model 的再次校验
+# 和 jsonable_encoder 转换
+post_adapter = TypeAdapter(schemas.PostResponse)
+post_list_adapter = TypeAdapter(schemas.PostSearchResponse)
+floor_list_adapter = TypeAdapter(List[schemas.FloorResponse])
+user_adapter = TypeAdapter(schemas.UserResponse)
+user_profile_adapter = TypeAdapter(schemas.UserProfileResponse)
+user_posts_adapter = TypeAdapter(schemas.UserPostsResponse)
+
+def model_response(adapter: TypeAdapter, value: Any, response: Optional[Response] = None,
+                   status_code: int = 200) -> Response:
+    """
+    把已经是响应模型的数据序列化为 JSON 响应
+
+    response 为路由注入的 Response，其中设置的头（ETag 等）会复制到返回的响应上。
+    """
+    return Response(
+        content=adapter.dump_json(value),
+        status_code=status_code,
+        media_type="application/json",
+        headers=dict(response.headers) if response is not None else None,
+    )
+
+def post_list_response(total: Optional[int], page: int, page_size: int, results: list,
+                       total_capped: bool = False) -> Response:
+    """帖子列表响应（results 为 PostSummaryResponse 列表）"""
+    value = schemas.PostSearchResponse.model_construct(
+        total=total, total_capped=total_capped, page=page, page_size=page_size, results=results
+    )
+    return model_response(post_list_adapter, value)
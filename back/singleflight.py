@@ -0,0 +1,71 @@
+from typing import Any, Callable, Dict, Hashable, Optional
+import threading
+
+from metrics import register_cache
+
+class _Call:
+    __slots__ = ("event", "value", "error")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+
+class SingleFlight:
+    """
+    合并并发的相同读请求（single-flight）
+
+    同一个键同时只执行一次计算，其余并发调用等待并共享同一个结果（包括异常）。
+    结果会被多个请求共享，调用方不能修改它，与访问者相关的字段需要在之后单独填充。
+    只用于在线程池中执行的同步路由，等待时会阻塞当前线程。
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+        self.executions = 0
+        self.coalesced = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                self.coalesced += 1
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                self.executions += 1
+                leader = True
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value
+
+        try:
+            call.value = fn()
+            return call.value
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+
+    def stats(self) -> dict:
+        with self._lock:
+            in_flight = len(self._calls)
+        total = self.executions + self.coalesced
+        return {
+            "in_flight": in_flight,
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+            "coalesced_ratio": self.coalesced / total if total else 0.0,
+        }
+
+# 全局实例，键的第一个元素区分不同的读路径
+read_flight = SingleFlight()
+register_cache("read_coalescing", read_flight)
@@ -0,0 +1,142 @@
+from collections import OrderedDict
+from datetime import datetime
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
+from typing import List, Optional
+import json
+import logging
+import threading
+import time
+
+from sqlalchemy import event
+
+from metrics import current_request, route_name
+
+# 超过该耗时（秒）的 SQL 记入慢查询日志
+SLOW_QUERY_THRESHOLD = 0.05
+# 只记录这些路由模块中发起的查询
+SLOW_QUERY_ROUTERS = {"routers.post", "routers.floor", "routers.follow"}
+# 日志文件按大小轮转
+LOG_DIR = Path("logs")
+LOG_FILE = LOG_DIR / "slow_queries.log"
+LOG_MAX_BYTES = 10 * 1024 * 1024
+LOG_BACKUP_COUNT = 5
+# 参数中过长的字符串截断后记录
+MAX_PARAM_LENGTH = 200
+# 执行计划按 SQL 文本缓存，同一语句只 EXPLAIN 一次
+MAX_CACHED_PLANS = 500
+
+logger = logging.getLogger("slow_query")
+
+class _JsonLineFormatter(logging.Formatter):
+    """每条日志一行 JSON，消息本身就是记录的字段"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        return json.dumps(record.msg, ensure_ascii=False, default=str)
+
+_plans: "OrderedDict[str, List[str]]" = OrderedDict()
+_plans_lock = threading.Lock()
+
+def _explain(cursor, statement: str, parameters) -> Optional[List[str]]:
+    """用 EXPLAIN QUERY PLAN 获取执行计划的每一步描述"""
+    with _plans_lock:
+        plan = _plans.get(statement)
+        if plan is not None:
+            _plans.move_to_end(statement)
+            return plan
+    try:
+        # 在同一个连接上另开游标，不影响当前游标中还未读取的结果
+        explain_cursor = cursor.connection.cursor()
+        try:
+            rows = explain_cursor.execute("EXPLAIN QUERY PLAN " + statement, parameters or ()).fetchall()
+        finally:
+            explain_cursor.close()
+    except Exception:
+        logger.debug("EXPLAIN QUERY PLAN 失败", exc_info=True)
+        return None
+    # 每行为 (id, parent, notused, detail)
+    plan = [row[3] for row in rows]
+    with _plans_lock:
+        _plans[statement] = plan
+        if len(_plans) > MAX_CACHED_PLANS:
+            _plans.popitem(last=False)
+    return plan
+
+# 沿索引顺序扫描（通常是为了避免排序，配合 LIMIT 提前结束）不算全表扫描
+INDEXED_SCAN_MARKERS = ("USING INDEX", "USING COVERING INDEX", "USING INTEGER PRIMARY KEY", "CONSTANT ROW")
+
+def full_scans(plan: List[str]) -> List[str]:
+    """执行计划中不经过索引的全表扫描（SCAN post、SCAN floor 等），SCAN ... USING INDEX 和常量行不算"""
+    return [
+        detail for detail in plan
+        if detail.startswith("SCAN ") and not any(marker in detail for marker in INDEXED_SCAN_MARKERS)
+    ]
+
+def _loggable_parameters(parameters):
+    def shorten(value):
+        if isinstance(value, (str, bytes)) and len(value) > MAX_PARAM_LENGTH:
+            return value[:MAX_PARAM_LENGTH] + ("…" if isinstance(value, str) else b"...")
+        return value
+    if isinstance(parameters, dict):
+        return {key: shorten(value) for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [shorten(value) for value in parameters]
+    return parameters
+
+def enable_slow_query_log(engine, threshold: Optional[float] = None):
+    """
+    在引擎上挂载慢查询日志
+
+    来自 SLOW_QUERY_ROUTERS 中路由的查询超过 threshold 秒（默认为 SLOW_QUERY_THRESHOLD）时，
+    以 JSON 行的形式记录 SQL、参数、路由、耗时和 EXPLAIN QUERY PLAN 的结果，
+    计划中出现全表扫描时标记 full_scan，便于从日志中发现缺少的索引。
+    """
+    if not logger.handlers:
+        LOG_DIR.mkdir(exist_ok=True)
+        handler = RotatingFileHandler(
+            LOG_FILE, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT, encoding="utf-8"
+        )
+        handler.setFormatter(_JsonLineFormatter())
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("slow_query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "handle_error")
+    def handle_error(exception_context):
+        # 出错的语句不会触发 after_cursor_execute，同样弹出开始时间
+        conn = exception_context.connection
+        if exception_context.execution_context is not None and conn is not None and conn.info.get("slow_query_start"):
+            conn.info["slow_query_start"].pop()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["slow_query_start"].pop()
+        if elapsed < (SLOW_QUERY_THRESHOLD if threshold is None else threshold):
+            return
+        stats = current_request.get()
+        if stats is None:
+            return
+        route = stats.scope.get("route")
+        module = getattr(getattr(route, "endpoint", None), "__module__", None)
+        if module not in SLOW_QUERY_ROUTERS:
+            return
+
+        # executemany 的参数是多组，无法生成单条执行计划
+        plan = None if executemany else _explain(cursor, statement, parameters)
+        scans = full_scans(plan) if plan else []
+        logger.info({
+            "time": datetime.now().isoformat(timespec="milliseconds"),
+            "route": f"{stats.scope['method']} {route_name(stats.scope)}",
+            "module": module,
+            "duration_ms": round(elapsed * 1000, 3),
+            "statement": statement,
+            "parameters": None if executemany else _loggable_parameters(parameters),
+            "executemany": executemany,
+            "plan": plan,
+            "full_scan": bool(scans),
+            "scans": scans,
+        })
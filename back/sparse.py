@@ -0,0 +1,124 @@
+from typing import Any, Dict, Iterable, List, Optional, Set, Type
+
+from fastapi import HTTPException, Query
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
+
+import schemas
+
+# 列表项中嵌入的用户字段 -> 对应的用户ID字段
+EMBEDDED_USERS = {"author": "author_id", "last_replier": "last_replier_id", "user": "user_id"}
+
+class SparseOptions:
+    """
+    列表接口的稀疏字段选项
+
+    - fields：只返回列出的字段，例如 fields=id,title,author；用户字段可以写成 author.username
+      （对所有嵌入的用户和 authors 映射生效）
+    - include=authors：列表项不再嵌入用户对象，只保留 author_id 等ID，
+      用户信息在响应的 authors 映射（用户ID -> 用户）中只出现一次
+    """
+
+    def __init__(self, fields: Optional[str] = None, include: Optional[str] = None):
+        self.fields: Optional[Set[str]] = None
+        self.user_fields: Optional[Set[str]] = None
+        if fields:
+            self.fields = set()
+            for name in fields.split(","):
+                name = name.strip()
+                if not name:
+                    continue
+                if "." in name:
+                    parent, child = name.split(".", 1)
+                    if parent not in EMBEDDED_USERS:
+                        raise HTTPException(status_code=400, detail=f"字段 {name} 不存在")
+                    self.user_fields = (self.user_fields or set()) | {child}
+                    self.fields.add(parent)
+                else:
+                    self.fields.add(name)
+
+        includes = {part.strip() for part in include.split(",")} if include else set()
+        unknown = includes - {"", "authors"}
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"不支持的 include：{', '.join(sorted(unknown))}")
+        self.include_authors = "authors" in includes
+
+    @property
+    def active(self) -> bool:
+        return self.fields is not None or self.include_authors
+
+    def cache_key(self) -> tuple:
+        """参与 ETag 计算，不同字段组合的响应不会共用验证器"""
+        return (
+            tuple(sorted(self.fields)) if self.fields is not None else None,
+            tuple(sorted(self.user_fields)) if self.user_fields is not None else None,
+            self.include_authors,
+        )
+
+    def _check(self, model: Type[BaseModel]):
+        if self.fields is not None:
+            unknown = self.fields - set(model.model_fields)
+            if unknown:
+                raise HTTPException(status_code=400, detail=f"字段不存在：{', '.join(sorted(unknown))}")
+        if self.user_fields is not None:
+            unknown = self.user_fields - set(schemas.UserResponse.model_fields)
+            if unknown:
+                raise HTTPException(status_code=400, detail=f"用户字段不存在：{', '.join(sorted(unknown))}")
+
+    def render(self, items: Iterable[BaseModel], model: Type[BaseModel]) -> tuple:
+        """把列表项转换为 JSON 字典，返回 (列表项, authors 映射或 None)"""
+        self._check(model)
+        user_attrs = [attr for attr in EMBEDDED_USERS if attr in model.model_fields]
+
+        include: Optional[Dict[str, Any]] = None
+        if self.fields is not None:
+            include = {name: True for name in self.fields}
+        if self.user_fields is not None:
+            include = include if include is not None else {name: True for name in model.model_fields}
+            for attr in user_attrs:
+                if attr in include:
+                    include[attr] = {name: True for name in self.user_fields}
+        exclude = None
+        if self.include_authors:
+            exclude = set(user_attrs)
+            if include is not None:
+                # 列表项中保留用户ID，用于在 authors 映射中查找
+                for attr in user_attrs:
+                    if attr in include:
+                        include[EMBEDDED_USERS[attr]] = True
+
+        results: List[dict] = []
+        authors: Dict[str, dict] = {}
+        for item in items:
+            results.append(item.model_dump(mode="json", include=include, exclude=exclude))
+            if self.include_authors:
+                for attr in user_attrs:
+                    if self.fields is not None and attr not in self.fields:
+                        continue
+                    user = getattr(item, attr)
+                    if user is not None and str(user.id) not in authors:
+                        authors[str(user.id)] = user.model_dump(mode="json", include=self.user_fields)
+        return results, (authors if self.include_authors else None)
+
+    def response(self, envelope: Optional[dict], items: Iterable[BaseModel], model: Type[BaseModel],
+                 items_key: str = "results", headers=None) -> ORJSONResponse:
+        """
+        直接返回 JSON 响应（不再按 response_model 校验）
+
+        envelope 为列表以外的字段（total、page 等）；为 None 表示原接口直接返回列表，
+        此时只选择字段时仍返回列表，include=authors 时返回 {results, authors}。
+        """
+        results, authors = self.render(items, model)
+        if envelope is None:
+            content: Any = results if authors is None else {items_key: results, "authors": authors}
+        else:
+            content = {**envelope, items_key: results}
+            if authors is not None:
+                content["authors"] = authors
+        return ORJSONResponse(content=content, headers=dict(headers) if headers else None)
+
+def sparse_options(
+    fields: Optional[str] = Query(None, description="只返回列出的字段（逗号分隔），用户字段可写成 author.username"),
+    include: Optional[str] = Query(None, description="include=authors 时用户信息只在 authors 映射中出现一次"),
+) -> SparseOptions:
+    return SparseOptions(fields, include)
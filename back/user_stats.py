@@ -0,0 +1,82 @@
+from collections import Counter
+from typing import Iterable
+import os
+import sys
+
+from sqlalchemy import delete, insert, literal, update
+from sqlmodel import Session, SQLModel, select, func
+
+# 确保能够导入项目模块
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from database import engine
+import models
+
+def _count_subqueries(user_id):
+    return (
+        select(func.count()).select_from(models.Post).where(models.Post.author_id == user_id).scalar_subquery(),
+        select(func.count()).select_from(models.Floor).where(models.Floor.author_id == user_id).scalar_subquery(),
+        select(func.count()).select_from(models.Follow).where(models.Follow.followed_id == user_id).scalar_subquery(),
+        select(func.count()).select_from(models.Follow).where(models.Follow.follower_id == user_id).scalar_subquery(),
+    )
+
+def get_user_stats(db: Session, user_id: int) -> models.UserStats:
+    """
+    读取用户统计（主键查询）；还没有统计行时用一条 INSERT ... SELECT 计算并写入
+    """
+    stats = db.get(models.UserStats, user_id)
+    if stats:
+        return stats
+
+    statement = (
+        insert(models.UserStats)
+        .prefix_with("OR IGNORE")
+        .from_select(
+            ["user_id", "post_count", "floor_count", "followers_count", "following_count"],
+            select(literal(user_id), *_count_subqueries(user_id))
+        )
+    )
+    db.execute(statement)
+    db.commit()
+    return db.get(models.UserStats, user_id)
+
+def bump_user_stats(db: Session, user_id: int, **deltas: int):
+    """
+    在当前事务中增量更新用户统计，例如 bump_user_stats(db, 1, post_count=1)
+
+    统计行不存在时不做任何事，首次读取时会按实际数据计算。
+    """
+    values = {
+        name: getattr(models.UserStats, name) + delta
+        for name, delta in deltas.items()
+        if delta
+    }
+    if not values:
+        return
+    statement = update(models.UserStats).where(models.UserStats.user_id == user_id).values(**values)
+    db.execute(statement)
+
+def bump_floor_counts(db: Session, author_ids: Iterable[int], sign: int = -1):
+    """按作者批量更新回复数（删除多个楼层时使用）"""
+    for author_id, count in Counter(author_ids).items():
+        bump_user_stats(db, author_id, floor_count=sign * count)
+
+def rebuild_user_stats(db: Session) -> int:
+    """
+    根据 Post/Floor/Follow 表重新计算所有用户的统计，返回用户数量
+    """
+    db.execute(delete(models.UserStats))
+    statement = insert(models.UserStats).from_select(
+        ["user_id", "post_count", "floor_count", "followers_count", "following_count"],
+        select(models.User.id, *_count_subqueries(models.User.id))
+    )
+    db.execute(statement)
+    db.commit()
+    return db.exec(select(func.count()).select_from(models.UserStats)).one()
+
+if __name__ == "__main__":
+    # 重建用户统计：python user_stats.py
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as db:
+        count = rebuild_user_stats(db)
+    print(f"已重建 {count} 个用户的统计数据")
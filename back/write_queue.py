@@ -0,0 +1,211 @@
+from concurrent.futures import Future
+from typing import Any, Callable, List, Optional
+import contextvars
+import logging
+import queue
+import threading
+import time
+
+from sqlmodel import Session
+
+from database import engine
+from metrics import register_cache
+
+logger = logging.getLogger(__name__)
+
+# 第一个操作到达后最多再等待多久（秒）收集同一批操作
+BATCH_BUDGET = 0.005
+# 每批最多合并提交的操作数
+MAX_BATCH_SIZE = 500
+# 空闲任务（例如点赞计数对账）的执行间隔（秒）
+IDLE_INTERVAL = 30.0
+
+class _WriteOperation:
+    __slots__ = ("execute", "after_commit", "future", "submitted", "context")
+
+    def __init__(self, execute: Callable[[Session], Any], after_commit: Optional[Callable[[Any], None]]):
+        self.execute = execute
+        self.after_commit = after_commit
+        self.future: Future = Future()
+        self.submitted = time.perf_counter()
+        # 在提交者的上下文中执行，语句计入所属请求的 SQL 统计
+        self.context = contextvars.copy_context()
+
+class WriteQueue:
+    """
+    SQLite 写操作的批量提交线程（group commit）
+
+    路由把小的写操作（点赞、关注、浏览次数、回复等）作为函数提交，函数接收写线程的会话，
+    在事务中执行语句并返回结果，不要自行提交。写线程取到第一个操作后，在它入队后的 batch_budget 内
+    继续收集后到的操作，所有操作在同一个事务中执行、一次提交，再依次调用各操作的
+    after_commit 并设置 Future 的结果。SQLite 同一时间只有一个写入者，合并提交后
+    突发写入只产生少量事务和 fsync，不再排队争用写锁。
+
+    批量提交失败时（例如某个操作违反约束）回滚并逐条重新执行，只有出错的操作收到异常。
+    会话设置了 expire_on_commit=False，操作可以直接返回在事务中创建的对象。
+    """
+
+    def __init__(self, engine, batch_budget: float = BATCH_BUDGET, max_batch_size: int = MAX_BATCH_SIZE,
+                 idle_interval: float = IDLE_INTERVAL):
+        self.engine = engine
+        self.batch_budget = batch_budget
+        self.max_batch_size = max_batch_size
+        self.idle_interval = idle_interval
+        self._queue: "queue.Queue[Optional[_WriteOperation]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._idle_tasks: List[Callable[[], None]] = []
+        self._before_commit: List[Callable[[Session], None]] = []
+        self._after_rollback: List[Callable[[Session], None]] = []
+        self._last_idle = time.monotonic()
+        self.batches = 0
+        self.operations = 0
+        self.fallbacks = 0
+        self._wait_total = 0.0
+
+    def submit(self, execute: Callable[[Session], Any],
+               after_commit: Optional[Callable[[Any], None]] = None) -> Future:
+        """提交一个写操作，Future 的结果为 execute 的返回值（提交之后才会设置）"""
+        self._ensure_started()
+        operation = _WriteOperation(execute, after_commit)
+        self._queue.put(operation)
+        return operation.future
+
+    def run(self, execute: Callable[[Session], Any], after_commit: Optional[Callable[[Any], None]] = None) -> Any:
+        """提交并等待结果（在同步路由中使用，异步路由使用 asyncio.wrap_future(submit(...))）"""
+        return self.submit(execute, after_commit).result()
+
+    def add_before_commit(self, hook: Callable[[Session], None]):
+        """
+        注册每批提交前在同一事务中执行的函数
+
+        操作可以把需要合并的更新（例如帖子的冗余计数增量）记在 db.info 中，由钩子一次写入。
+        """
+        self._before_commit.append(hook)
+
+    def add_after_rollback(self, hook: Callable[[Session], None]):
+        """注册提交失败时调用的函数，用于撤销提交前钩子在内存中做的标记"""
+        self._after_rollback.append(hook)
+
+    def add_idle_task(self, task: Callable[[], None]):
+        """注册在写线程中定期执行的任务（两批之间或空闲时，每 idle_interval 秒一次）"""
+        self._idle_tasks.append(task)
+
+    def _ensure_started(self):
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="write-queue", daemon=True)
+                self._thread.start()
+
+    def stop(self):
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        while True:
+            try:
+                first = self._queue.get(timeout=self.idle_interval)
+            except queue.Empty:
+                self._run_idle_tasks()
+                continue
+            if first is None:
+                break
+
+            # 收集后到的操作一起提交；预算从第一个操作提交时算起，已经排队够久的操作不再额外等待
+            batch = [first]
+            stopping = False
+            deadline = first.submitted + self.batch_budget
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.perf_counter()
+                try:
+                    operation = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if operation is None:
+                    stopping = True
+                    break
+                batch.append(operation)
+
+            self._flush(batch)
+            if stopping:
+                break
+            if time.monotonic() - self._last_idle >= self.idle_interval:
+                self._run_idle_tasks()
+
+    def _flush(self, batch: List[_WriteOperation]):
+        started = time.perf_counter()
+        try:
+            with Session(self.engine, expire_on_commit=False) as db:
+                results = [operation.context.run(operation.execute, db) for operation in batch]
+                self._commit(db)
+        except Exception:
+            logger.warning("批量提交失败，改为逐条提交", exc_info=True)
+            self.fallbacks += 1
+            results = self._flush_one_by_one(batch)
+        else:
+            self.batches += 1
+
+        self.operations += len(batch)
+        for operation, result in zip(batch, results):
+            self._wait_total += started - operation.submitted
+            if isinstance(result, Exception):
+                operation.future.set_exception(result)
+                continue
+            if operation.after_commit is not None:
+                try:
+                    operation.after_commit(result)
+                except Exception:
+                    logger.exception("写操作提交后的回调失败")
+            operation.future.set_result(result)
+
+    def _commit(self, db: Session):
+        try:
+            for hook in self._before_commit:
+                hook(db)
+            db.commit()
+        except Exception:
+            for hook in self._after_rollback:
+                try:
+                    hook(db)
+                except Exception:
+                    logger.exception("提交失败后的回调失败")
+            raise
+
+    def _flush_one_by_one(self, batch: List[_WriteOperation]) -> list:
+        results = []
+        for operation in batch:
+            try:
+                with Session(self.engine, expire_on_commit=False) as db:
+                    result = operation.context.run(operation.execute, db)
+                    self._commit(db)
+                self.batches += 1
+                results.append(result)
+            except Exception as e:
+                results.append(e)
+        return results
+
+    def _run_idle_tasks(self):
+        self._last_idle = time.monotonic()
+        for task in self._idle_tasks:
+            try:
+                task()
+            except Exception:
+                logger.exception("写线程的定期任务失败")
+
+    def stats(self) -> dict:
+        return {
+            "queue_size": self._queue.qsize(),
+            "batches": self.batches,
+            "operations": self.operations,
+            "fallbacks": self.fallbacks,
+            "avg_batch_size": self.operations / self.batches if self.batches else 0.0,
+            "avg_queue_wait_seconds": self._wait_total / self.operations if self.operations else 0.0,
+        }
+
+# 全局实例
+write_queue = WriteQueue(engine)
+register_cache("write_queue", write_queue)
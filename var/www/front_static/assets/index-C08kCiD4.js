@@ -63,4 +63,4 @@ var EE=(e,t)=>()=>(t||e((t={exports:{}}).exports,t),t.exports);var vne=EE((po,vo
   * vue-router v4.5.0
   * (c) 2024 Eduardo San Martin Morote
   * @license MIT
-  */const Tr=typeof document<"u";function uE(e){return typeof e=="object"||"displayName"in e||"props"in e||"__vccOpts"in e}function mQ(e){return e.__esModule||e[Symbol.toStringTag]==="Module"||e.default&&uE(e.default)}const Wt=Object.assign;function Xf(e,t){const n={};for(const o in t){const a=t[o];n[o]=jo(a)?a.map(e):e(a)}return n}const ri=()=>{},jo=Array.isArray,cE=/#/g,gQ=/&/g,yQ=/\//g,bQ=/=/g,wQ=/\?/g,dE=/\+/g,CQ=/%5B/g,SQ=/%5D/g,fE=/%5E/g,_Q=/%60/g,pE=/%7B/g,kQ=/%7C/g,vE=/%7D/g,EQ=/%20/g;function Um(e){return encodeURI(""+e).replace(kQ,"|").replace(CQ,"[").replace(SQ,"]")}function $Q(e){return Um(e).replace(pE,"{").replace(vE,"}").replace(fE,"^")}function Mv(e){return Um(e).replace(dE,"%2B").replace(EQ,"+").replace(cE,"%23").replace(gQ,"%26").replace(_Q,"`").replace(pE,"{").replace(vE,"}").replace(fE,"^")}function TQ(e){return Mv(e).replace(bQ,"%3D")}function OQ(e){return Um(e).replace(cE,"%23").replace(wQ,"%3F")}function RQ(e){return e==null?"":OQ(e).replace(yQ,"%2F")}function Bi(e){try{return decodeURIComponent(""+e)}catch{}return""+e}const MQ=/\/$/,NQ=e=>e.replace(MQ,"");function Jf(e,t,n="/"){let o,a={},l="",r="";const i=t.indexOf("#");let u=t.indexOf("?");return i<u&&i>=0&&(u=-1),u>-1&&(o=t.slice(0,u),l=t.slice(u+1,i>-1?i:t.length),a=e(l)),i>-1&&(o=o||t.slice(0,i),r=t.slice(i,t.length)),o=AQ(o??t,n),{fullPath:o+(l&&"?")+l+r,path:o,query:a,hash:Bi(r)}}function PQ(e,t){const n=t.query?e(t.query):"";return t.path+(n&&"?")+n+(t.hash||"")}function j0(e,t){return!t||!e.toLowerCase().startsWith(t.toLowerCase())?e:e.slice(t.length)||"/"}function IQ(e,t,n){const o=t.matched.length-1,a=n.matched.length-1;return o>-1&&o===a&&is(t.matched[o],n.matched[a])&&hE(t.params,n.params)&&e(t.query)===e(n.query)&&t.hash===n.hash}function is(e,t){return(e.aliasOf||e)===(t.aliasOf||t)}function hE(e,t){if(Object.keys(e).length!==Object.keys(t).length)return!1;for(const n in e)if(!xQ(e[n],t[n]))return!1;return!0}function xQ(e,t){return jo(e)?U0(e,t):jo(t)?U0(t,e):e===t}function U0(e,t){return jo(t)?e.length===t.length&&e.every((n,o)=>n===t[o]):e.length===1&&e[0]===t}function AQ(e,t){if(e.startsWith("/"))return e;if(!e)return t;const n=t.split("/"),o=e.split("/"),a=o[o.length-1];(a===".."||a===".")&&o.push("");let l=n.length-1,r,i;for(r=0;r<o.length;r++)if(i=o[r],i!==".")if(i==="..")l>1&&l--;else break;return n.slice(0,l).join("/")+"/"+o.slice(r).join("/")}const qa={path:"/",name:void 0,params:{},query:{},hash:"",fullPath:"/",matched:[],meta:{},redirectedFrom:void 0};var Fi;(function(e){e.pop="pop",e.push="push"})(Fi||(Fi={}));var si;(function(e){e.back="back",e.forward="forward",e.unknown=""})(si||(si={}));function LQ(e){if(!e)if(Tr){const t=document.querySelector("base");e=t&&t.getAttribute("href")||"/",e=e.replace(/^\w+:\/\/[^\/]+/,"")}else e="/";return e[0]!=="/"&&e[0]!=="#"&&(e="/"+e),NQ(e)}const DQ=/^[^#]+#/;function BQ(e,t){return e.replace(DQ,"#")+t}function FQ(e,t){const n=document.documentElement.getBoundingClientRect(),o=e.getBoundingClientRect();return{behavior:t.behavior,left:o.left-n.left-(t.left||0),top:o.top-n.top-(t.top||0)}}const Xd=()=>({left:window.scrollX,top:window.scrollY});function VQ(e){let t;if("el"in e){const n=e.el,o=typeof n=="string"&&n.startsWith("#"),a=typeof n=="string"?o?document.getElementById(n.slice(1)):document.querySelector(n):n;if(!a)return;t=FQ(a,e)}else t=e;"scrollBehavior"in document.documentElement.style?window.scrollTo(t):window.scrollTo(t.left!=null?t.left:window.scrollX,t.top!=null?t.top:window.scrollY)}function q0(e,t){return(history.state?history.state.position-t:-1)+e}const Nv=new Map;function zQ(e,t){Nv.set(e,t)}function HQ(e){const t=Nv.get(e);return Nv.delete(e),t}let KQ=()=>location.protocol+"//"+location.host;function mE(e,t){const{pathname:n,search:o,hash:a}=t,l=e.indexOf("#");if(l>-1){let i=a.includes(e.slice(l))?e.slice(l).length:1,u=a.slice(i);return u[0]!=="/"&&(u="/"+u),j0(u,"")}return j0(n,e)+o+a}function WQ(e,t,n,o){let a=[],l=[],r=null;const i=({state:p})=>{const v=mE(e,location),m=n.value,h=t.value;let y=0;if(p){if(n.value=v,t.value=p,r&&r===m){r=null;return}y=h?p.position-h.position:0}else o(v);a.forEach(g=>{g(n.value,m,{delta:y,type:Fi.pop,direction:y?y>0?si.forward:si.back:si.unknown})})};function u(){r=n.value}function c(p){a.push(p);const v=()=>{const m=a.indexOf(p);m>-1&&a.splice(m,1)};return l.push(v),v}function d(){const{history:p}=window;p.state&&p.replaceState(Wt({},p.state,{scroll:Xd()}),"")}function f(){for(const p of l)p();l=[],window.removeEventListener("popstate",i),window.removeEventListener("beforeunload",d)}return window.addEventListener("popstate",i),window.addEventListener("beforeunload",d,{passive:!0}),{pauseListeners:u,listen:c,destroy:f}}function Y0(e,t,n,o=!1,a=!1){return{back:e,current:t,forward:n,replaced:o,position:window.history.length,scroll:a?Xd():null}}function jQ(e){const{history:t,location:n}=window,o={value:mE(e,n)},a={value:t.state};a.value||l(o.value,{back:null,current:o.value,forward:null,position:t.length-1,replaced:!0,scroll:null},!0);function l(u,c,d){const f=e.indexOf("#"),p=f>-1?(n.host&&document.querySelector("base")?e:e.slice(f))+u:KQ()+e+u;try{t[d?"replaceState":"pushState"](c,"",p),a.value=c}catch(v){console.error(v),n[d?"replace":"assign"](p)}}function r(u,c){const d=Wt({},t.state,Y0(a.value.back,u,a.value.forward,!0),c,{position:a.value.position});l(u,d,!0),o.value=u}function i(u,c){const d=Wt({},a.value,t.state,{forward:u,scroll:Xd()});l(d.current,d,!0);const f=Wt({},Y0(o.value,u,null),{position:d.position+1},c);l(u,f,!1),o.value=u}return{location:o,state:a,push:i,replace:r}}function UQ(e){e=LQ(e);const t=jQ(e),n=WQ(e,t.state,t.location,t.replace);function o(l,r=!0){r||n.pauseListeners(),history.go(l)}const a=Wt({location:"",base:e,go:o,createHref:BQ.bind(null,e)},t,n);return Object.defineProperty(a,"location",{enumerable:!0,get:()=>t.location.value}),Object.defineProperty(a,"state",{enumerable:!0,get:()=>t.state.value}),a}function qQ(e){return typeof e=="string"||e&&typeof e=="object"}function gE(e){return typeof e=="string"||typeof e=="symbol"}const yE=Symbol("");var G0;(function(e){e[e.aborted=4]="aborted",e[e.cancelled=8]="cancelled",e[e.duplicated=16]="duplicated"})(G0||(G0={}));function us(e,t){return Wt(new Error,{type:e,[yE]:!0},t)}function wa(e,t){return e instanceof Error&&yE in e&&(t==null||!!(e.type&t))}const X0="[^/]+?",YQ={sensitive:!1,strict:!1,start:!0,end:!0},GQ=/[.+*?^${}()[\]/\\]/g;function XQ(e,t){const n=Wt({},YQ,t),o=[];let a=n.start?"^":"";const l=[];for(const c of e){const d=c.length?[]:[90];n.strict&&!c.length&&(a+="/");for(let f=0;f<c.length;f++){const p=c[f];let v=40+(n.sensitive?.25:0);if(p.type===0)f||(a+="/"),a+=p.value.replace(GQ,"\\$&"),v+=40;else if(p.type===1){const{value:m,repeatable:h,optional:y,regexp:g}=p;l.push({name:m,repeatable:h,optional:y});const S=g||X0;if(S!==X0){v+=10;try{new RegExp(`(${S})`)}catch(b){throw new Error(`Invalid custom RegExp for param "${m}" (${S}): `+b.message)}}let w=h?`((?:${S})(?:/(?:${S}))*)`:`(${S})`;f||(w=y&&c.length<2?`(?:/${w})`:"/"+w),y&&(w+="?"),a+=w,v+=20,y&&(v+=-8),h&&(v+=-20),S===".*"&&(v+=-50)}d.push(v)}o.push(d)}if(n.strict&&n.end){const c=o.length-1;o[c][o[c].length-1]+=.7000000000000001}n.strict||(a+="/?"),n.end?a+="$":n.strict&&!a.endsWith("/")&&(a+="(?:/|$)");const r=new RegExp(a,n.sensitive?"":"i");function i(c){const d=c.match(r),f={};if(!d)return null;for(let p=1;p<d.length;p++){const v=d[p]||"",m=l[p-1];f[m.name]=v&&m.repeatable?v.split("/"):v}return f}function u(c){let d="",f=!1;for(const p of e){(!f||!d.endsWith("/"))&&(d+="/"),f=!1;for(const v of p)if(v.type===0)d+=v.value;else if(v.type===1){const{value:m,repeatable:h,optional:y}=v,g=m in c?c[m]:"";if(jo(g)&&!h)throw new Error(`Provided param "${m}" is an array but it is not repeatable (* or + modifiers)`);const S=jo(g)?g.join("/"):g;if(!S)if(y)p.length<2&&(d.endsWith("/")?d=d.slice(0,-1):f=!0);else throw new Error(`Missing required param "${m}"`);d+=S}}return d||"/"}return{re:r,score:o,keys:l,parse:i,stringify:u}}function JQ(e,t){let n=0;for(;n<e.length&&n<t.length;){const o=t[n]-e[n];if(o)return o;n++}return e.length<t.length?e.length===1&&e[0]===80?-1:1:e.length>t.length?t.length===1&&t[0]===80?1:-1:0}function bE(e,t){let n=0;const o=e.score,a=t.score;for(;n<o.length&&n<a.length;){const l=JQ(o[n],a[n]);if(l)return l;n++}if(Math.abs(a.length-o.length)===1){if(J0(o))return 1;if(J0(a))return-1}return a.length-o.length}function J0(e){const t=e[e.length-1];return e.length>0&&t[t.length-1]<0}const ZQ={type:0,value:""},QQ=/[a-zA-Z0-9_]/;function eee(e){if(!e)return[[]];if(e==="/")return[[ZQ]];if(!e.startsWith("/"))throw new Error(`Invalid path "${e}"`);function t(v){throw new Error(`ERR (${n})/"${c}": ${v}`)}let n=0,o=n;const a=[];let l;function r(){l&&a.push(l),l=[]}let i=0,u,c="",d="";function f(){c&&(n===0?l.push({type:0,value:c}):n===1||n===2||n===3?(l.length>1&&(u==="*"||u==="+")&&t(`A repeatable param (${c}) must be alone in its segment. eg: '/:ids+.`),l.push({type:1,value:c,regexp:d,repeatable:u==="*"||u==="+",optional:u==="*"||u==="?"})):t("Invalid state to consume buffer"),c="")}function p(){c+=u}for(;i<e.length;){if(u=e[i++],u==="\\"&&n!==2){o=n,n=4;continue}switch(n){case 0:u==="/"?(c&&f(),r()):u===":"?(f(),n=1):p();break;case 4:p(),n=o;break;case 1:u==="("?n=2:QQ.test(u)?p():(f(),n=0,u!=="*"&&u!=="?"&&u!=="+"&&i--);break;case 2:u===")"?d[d.length-1]=="\\"?d=d.slice(0,-1)+u:n=3:d+=u;break;case 3:f(),n=0,u!=="*"&&u!=="?"&&u!=="+"&&i--,d="";break;default:t("Unknown state");break}}return n===2&&t(`Unfinished custom RegExp for param "${c}"`),f(),r(),a}function tee(e,t,n){const o=XQ(eee(e.path),n),a=Wt(o,{record:e,parent:t,children:[],alias:[]});return t&&!a.record.aliasOf==!t.record.aliasOf&&t.children.push(a),a}function nee(e,t){const n=[],o=new Map;t=t1({strict:!1,end:!0,sensitive:!1},t);function a(f){return o.get(f)}function l(f,p,v){const m=!v,h=Q0(f);h.aliasOf=v&&v.record;const y=t1(t,f),g=[h];if("alias"in f){const b=typeof f.alias=="string"?[f.alias]:f.alias;for(const C of b)g.push(Q0(Wt({},h,{components:v?v.record.components:h.components,path:C,aliasOf:v?v.record:h})))}let S,w;for(const b of g){const{path:C}=b;if(p&&C[0]!=="/"){const k=p.record.path,T=k[k.length-1]==="/"?"":"/";b.path=p.record.path+(C&&T+C)}if(S=tee(b,p,y),v?v.alias.push(S):(w=w||S,w!==S&&w.alias.push(S),m&&f.name&&!e1(S)&&r(f.name)),wE(S)&&u(S),h.children){const k=h.children;for(let T=0;T<k.length;T++)l(k[T],S,v&&v.children[T])}v=v||S}return w?()=>{r(w)}:ri}function r(f){if(gE(f)){const p=o.get(f);p&&(o.delete(f),n.splice(n.indexOf(p),1),p.children.forEach(r),p.alias.forEach(r))}else{const p=n.indexOf(f);p>-1&&(n.splice(p,1),f.record.name&&o.delete(f.record.name),f.children.forEach(r),f.alias.forEach(r))}}function i(){return n}function u(f){const p=lee(f,n);n.splice(p,0,f),f.record.name&&!e1(f)&&o.set(f.record.name,f)}function c(f,p){let v,m={},h,y;if("name"in f&&f.name){if(v=o.get(f.name),!v)throw us(1,{location:f});y=v.record.name,m=Wt(Z0(p.params,v.keys.filter(w=>!w.optional).concat(v.parent?v.parent.keys.filter(w=>w.optional):[]).map(w=>w.name)),f.params&&Z0(f.params,v.keys.map(w=>w.name))),h=v.stringify(m)}else if(f.path!=null)h=f.path,v=n.find(w=>w.re.test(h)),v&&(m=v.parse(h),y=v.record.name);else{if(v=p.name?o.get(p.name):n.find(w=>w.re.test(p.path)),!v)throw us(1,{location:f,currentLocation:p});y=v.record.name,m=Wt({},p.params,f.params),h=v.stringify(m)}const g=[];let S=v;for(;S;)g.unshift(S.record),S=S.parent;return{name:y,path:h,params:m,matched:g,meta:aee(g)}}e.forEach(f=>l(f));function d(){n.length=0,o.clear()}return{addRoute:l,resolve:c,removeRoute:r,clearRoutes:d,getRoutes:i,getRecordMatcher:a}}function Z0(e,t){const n={};for(const o of t)o in e&&(n[o]=e[o]);return n}function Q0(e){const t={path:e.path,redirect:e.redirect,name:e.name,meta:e.meta||{},aliasOf:e.aliasOf,beforeEnter:e.beforeEnter,props:oee(e),children:e.children||[],instances:{},leaveGuards:new Set,updateGuards:new Set,enterCallbacks:{},components:"components"in e?e.components||null:e.component&&{default:e.component}};return Object.defineProperty(t,"mods",{value:{}}),t}function oee(e){const t={},n=e.props||!1;if("component"in e)t.default=n;else for(const o in e.components)t[o]=typeof n=="object"?n[o]:n;return t}function e1(e){for(;e;){if(e.record.aliasOf)return!0;e=e.parent}return!1}function aee(e){return e.reduce((t,n)=>Wt(t,n.meta),{})}function t1(e,t){const n={};for(const o in e)n[o]=o in t?t[o]:e[o];return n}function lee(e,t){let n=0,o=t.length;for(;n!==o;){const l=n+o>>1;bE(e,t[l])<0?o=l:n=l+1}const a=ree(e);return a&&(o=t.lastIndexOf(a,o-1)),o}function ree(e){let t=e;for(;t=t.parent;)if(wE(t)&&bE(e,t)===0)return t}function wE({record:e}){return!!(e.name||e.components&&Object.keys(e.components).length||e.redirect)}function see(e){const t={};if(e===""||e==="?")return t;const o=(e[0]==="?"?e.slice(1):e).split("&");for(let a=0;a<o.length;++a){const l=o[a].replace(dE," "),r=l.indexOf("="),i=Bi(r<0?l:l.slice(0,r)),u=r<0?null:Bi(l.slice(r+1));if(i in t){let c=t[i];jo(c)||(c=t[i]=[c]),c.push(u)}else t[i]=u}return t}function n1(e){let t="";for(let n in e){const o=e[n];if(n=TQ(n),o==null){o!==void 0&&(t+=(t.length?"&":"")+n);continue}(jo(o)?o.map(l=>l&&Mv(l)):[o&&Mv(o)]).forEach(l=>{l!==void 0&&(t+=(t.length?"&":"")+n,l!=null&&(t+="="+l))})}return t}function iee(e){const t={};for(const n in e){const o=e[n];o!==void 0&&(t[n]=jo(o)?o.map(a=>a==null?null:""+a):o==null?o:""+o)}return t}const uee=Symbol(""),o1=Symbol(""),Jd=Symbol(""),qm=Symbol(""),Pv=Symbol("");function Ds(){let e=[];function t(o){return e.push(o),()=>{const a=e.indexOf(o);a>-1&&e.splice(a,1)}}function n(){e=[]}return{add:t,list:()=>e.slice(),reset:n}}function tl(e,t,n,o,a,l=r=>r()){const r=o&&(o.enterCallbacks[a]=o.enterCallbacks[a]||[]);return()=>new Promise((i,u)=>{const c=p=>{p===!1?u(us(4,{from:n,to:t})):p instanceof Error?u(p):qQ(p)?u(us(2,{from:t,to:p})):(r&&o.enterCallbacks[a]===r&&typeof p=="function"&&r.push(p),i())},d=l(()=>e.call(o&&o.instances[a],t,n,c));let f=Promise.resolve(d);e.length<3&&(f=f.then(c)),f.catch(p=>u(p))})}function Zf(e,t,n,o,a=l=>l()){const l=[];for(const r of e)for(const i in r.components){let u=r.components[i];if(!(t!=="beforeRouteEnter"&&!r.instances[i]))if(uE(u)){const d=(u.__vccOpts||u)[t];d&&l.push(tl(d,n,o,r,i,a))}else{let c=u();l.push(()=>c.then(d=>{if(!d)throw new Error(`Couldn't resolve component "${i}" at "${r.path}"`);const f=mQ(d)?d.default:d;r.mods[i]=d,r.components[i]=f;const v=(f.__vccOpts||f)[t];return v&&tl(v,n,o,r,i,a)()}))}}return l}function a1(e){const t=xe(Jd),n=xe(qm),o=_(()=>{const u=s(e.to);return t.resolve(u)}),a=_(()=>{const{matched:u}=o.value,{length:c}=u,d=u[c-1],f=n.matched;if(!d||!f.length)return-1;const p=f.findIndex(is.bind(null,d));if(p>-1)return p;const v=l1(u[c-2]);return c>1&&l1(d)===v&&f[f.length-1].path!==v?f.findIndex(is.bind(null,u[c-2])):p}),l=_(()=>a.value>-1&&vee(n.params,o.value.params)),r=_(()=>a.value>-1&&a.value===n.matched.length-1&&hE(n.params,o.value.params));function i(u={}){if(pee(u)){const c=t[s(e.replace)?"replace":"push"](s(e.to)).catch(ri);return e.viewTransition&&typeof document<"u"&&"startViewTransition"in document&&document.startViewTransition(()=>c),c}return Promise.resolve()}return{route:o,href:_(()=>o.value.href),isActive:l,isExactActive:r,navigate:i}}function cee(e){return e.length===1?e[0]:e}const dee=Y({name:"RouterLink",compatConfig:{MODE:3},props:{to:{type:[String,Object],required:!0},replace:Boolean,activeClass:String,exactActiveClass:String,custom:Boolean,ariaCurrentValue:{type:String,default:"page"}},useLink:a1,setup(e,{slots:t}){const n=bt(a1(e)),{options:o}=xe(Jd),a=_(()=>({[r1(e.activeClass,o.linkActiveClass,"router-link-active")]:n.isActive,[r1(e.exactActiveClass,o.linkExactActiveClass,"router-link-exact-active")]:n.isExactActive}));return()=>{const l=t.default&&cee(t.default(n));return e.custom?l:qe("a",{"aria-current":n.isExactActive?e.ariaCurrentValue:null,href:n.href,onClick:n.navigate,class:a.value},l)}}}),fee=dee;function pee(e){if(!(e.metaKey||e.altKey||e.ctrlKey||e.shiftKey)&&!e.defaultPrevented&&!(e.button!==void 0&&e.button!==0)){if(e.currentTarget&&e.currentTarget.getAttribute){const t=e.currentTarget.getAttribute("target");if(/\b_blank\b/i.test(t))return}return e.preventDefault&&e.preventDefault(),!0}}function vee(e,t){for(const n in t){const o=t[n],a=e[n];if(typeof o=="string"){if(o!==a)return!1}else if(!jo(a)||a.length!==o.length||o.some((l,r)=>l!==a[r]))return!1}return!0}function l1(e){return e?e.aliasOf?e.aliasOf.path:e.path:""}const r1=(e,t,n)=>e??t??n,hee=Y({name:"RouterView",inheritAttrs:!1,props:{name:{type:String,default:"default"},route:Object},compatConfig:{MODE:3},setup(e,{attrs:t,slots:n}){const o=xe(Pv),a=_(()=>e.route||o.value),l=xe(o1,0),r=_(()=>{let c=s(l);const{matched:d}=a.value;let f;for(;(f=d[c])&&!f.components;)c++;return c}),i=_(()=>a.value.matched[r.value]);vt(o1,_(()=>r.value+1)),vt(uee,i),vt(Pv,a);const u=P();return fe(()=>[u.value,i.value,e.name],([c,d,f],[p,v,m])=>{d&&(d.instances[f]=c,v&&v!==d&&c&&c===p&&(d.leaveGuards.size||(d.leaveGuards=v.leaveGuards),d.updateGuards.size||(d.updateGuards=v.updateGuards))),c&&d&&(!v||!is(d,v)||!p)&&(d.enterCallbacks[f]||[]).forEach(h=>h(c))},{flush:"post"}),()=>{const c=a.value,d=e.name,f=i.value,p=f&&f.components[d];if(!p)return s1(n.default,{Component:p,route:c});const v=f.props[d],m=v?v===!0?c.params:typeof v=="function"?v(c):v:null,y=qe(p,Wt({},m,t,{onVnodeUnmounted:g=>{g.component.isUnmounted&&(f.instances[d]=null)},ref:u}));return s1(n.default,{Component:y,route:c})||y}}});function s1(e,t){if(!e)return null;const n=e(t);return n.length===1?n[0]:n}const mee=hee;function gee(e){const t=nee(e.routes,e),n=e.parseQuery||see,o=e.stringifyQuery||n1,a=e.history,l=Ds(),r=Ds(),i=Ds(),u=Ft(qa);let c=qa;Tr&&e.scrollBehavior&&"scrollRestoration"in history&&(history.scrollRestoration="manual");const d=Xf.bind(null,U=>""+U),f=Xf.bind(null,RQ),p=Xf.bind(null,Bi);function v(U,le){let ae,Se;return gE(U)?(ae=t.getRecordMatcher(U),Se=le):Se=U,t.addRoute(Se,ae)}function m(U){const le=t.getRecordMatcher(U);le&&t.removeRoute(le)}function h(){return t.getRoutes().map(U=>U.record)}function y(U){return!!t.getRecordMatcher(U)}function g(U,le){if(le=Wt({},le||u.value),typeof U=="string"){const se=Jf(n,U,le.path),he=t.resolve({path:se.path},le),ye=a.createHref(se.fullPath);return Wt(se,he,{params:p(he.params),hash:Bi(se.hash),redirectedFrom:void 0,href:ye})}let ae;if(U.path!=null)ae=Wt({},U,{path:Jf(n,U.path,le.path).path});else{const se=Wt({},U.params);for(const he in se)se[he]==null&&delete se[he];ae=Wt({},U,{params:f(se)}),le.params=f(le.params)}const Se=t.resolve(ae,le),ve=U.hash||"";Se.params=d(p(Se.params));const V=PQ(o,Wt({},U,{hash:$Q(ve),path:Se.path})),j=a.createHref(V);return Wt({fullPath:V,hash:ve,query:o===n1?iee(U.query):U.query||{}},Se,{redirectedFrom:void 0,href:j})}function S(U){return typeof U=="string"?Jf(n,U,u.value.path):Wt({},U)}function w(U,le){if(c!==U)return us(8,{from:le,to:U})}function b(U){return T(U)}function C(U){return b(Wt(S(U),{replace:!0}))}function k(U){const le=U.matched[U.matched.length-1];if(le&&le.redirect){const{redirect:ae}=le;let Se=typeof ae=="function"?ae(U):ae;return typeof Se=="string"&&(Se=Se.includes("?")||Se.includes("#")?Se=S(Se):{path:Se},Se.params={}),Wt({query:U.query,hash:U.hash,params:Se.path!=null?{}:U.params},Se)}}function T(U,le){const ae=c=g(U),Se=u.value,ve=U.state,V=U.force,j=U.replace===!0,se=k(ae);if(se)return T(Wt(S(se),{state:typeof se=="object"?Wt({},ve,se.state):ve,force:V,replace:j}),le||ae);const he=ae;he.redirectedFrom=le;let ye;return!V&&IQ(o,Se,ae)&&(ye=us(16,{to:he,from:Se}),J(Se,Se,!0,!1)),(ye?Promise.resolve(ye):N(he,Se)).catch(de=>wa(de)?wa(de,2)?de:q(de):D(de,he,Se)).then(de=>{if(de){if(wa(de,2))return T(Wt({replace:j},S(de.to),{state:typeof de.to=="object"?Wt({},ve,de.to.state):ve,force:V}),le||he)}else de=I(he,Se,!0,j,ve);return x(he,Se,de),de})}function R(U,le){const ae=w(U,le);return ae?Promise.reject(ae):Promise.resolve()}function $(U){const le=ue.values().next().value;return le&&typeof le.runWithContext=="function"?le.runWithContext(U):U()}function N(U,le){let ae;const[Se,ve,V]=yee(U,le);ae=Zf(Se.reverse(),"beforeRouteLeave",U,le);for(const se of Se)se.leaveGuards.forEach(he=>{ae.push(tl(he,U,le))});const j=R.bind(null,U,le);return ae.push(j),re(ae).then(()=>{ae=[];for(const se of l.list())ae.push(tl(se,U,le));return ae.push(j),re(ae)}).then(()=>{ae=Zf(ve,"beforeRouteUpdate",U,le);for(const se of ve)se.updateGuards.forEach(he=>{ae.push(tl(he,U,le))});return ae.push(j),re(ae)}).then(()=>{ae=[];for(const se of V)if(se.beforeEnter)if(jo(se.beforeEnter))for(const he of se.beforeEnter)ae.push(tl(he,U,le));else ae.push(tl(se.beforeEnter,U,le));return ae.push(j),re(ae)}).then(()=>(U.matched.forEach(se=>se.enterCallbacks={}),ae=Zf(V,"beforeRouteEnter",U,le,$),ae.push(j),re(ae))).then(()=>{ae=[];for(const se of r.list())ae.push(tl(se,U,le));return ae.push(j),re(ae)}).catch(se=>wa(se,8)?se:Promise.reject(se))}function x(U,le,ae){i.list().forEach(Se=>$(()=>Se(U,le,ae)))}function I(U,le,ae,Se,ve){const V=w(U,le);if(V)return V;const j=le===qa,se=Tr?history.state:{};ae&&(Se||j?a.replace(U.fullPath,Wt({scroll:j&&se&&se.scroll},ve)):a.push(U.fullPath,ve)),u.value=U,J(U,le,ae,j),q()}let K;function G(){K||(K=a.listen((U,le,ae)=>{if(!ce.listening)return;const Se=g(U),ve=k(Se);if(ve){T(Wt(ve,{replace:!0,force:!0}),Se).catch(ri);return}c=Se;const V=u.value;Tr&&zQ(q0(V.fullPath,ae.delta),Xd()),N(Se,V).catch(j=>wa(j,12)?j:wa(j,2)?(T(Wt(S(j.to),{force:!0}),Se).then(se=>{wa(se,20)&&!ae.delta&&ae.type===Fi.pop&&a.go(-1,!1)}).catch(ri),Promise.reject()):(ae.delta&&a.go(-ae.delta,!1),D(j,Se,V))).then(j=>{j=j||I(Se,V,!1),j&&(ae.delta&&!wa(j,8)?a.go(-ae.delta,!1):ae.type===Fi.pop&&wa(j,20)&&a.go(-1,!1)),x(Se,V,j)}).catch(ri)}))}let H=Ds(),O=Ds(),A;function D(U,le,ae){q(U);const Se=O.list();return Se.length?Se.forEach(ve=>ve(U,le,ae)):console.error(U),Promise.reject(U)}function L(){return A&&u.value!==qa?Promise.resolve():new Promise((U,le)=>{H.add([U,le])})}function q(U){return A||(A=!U,G(),H.list().forEach(([le,ae])=>U?ae(U):le()),H.reset()),U}function J(U,le,ae,Se){const{scrollBehavior:ve}=e;if(!Tr||!ve)return Promise.resolve();const V=!ae&&HQ(q0(U.fullPath,0))||(Se||!ae)&&history.state&&history.state.scroll||null;return ze().then(()=>ve(U,le,V)).then(j=>j&&VQ(j)).catch(j=>D(j,U,le))}const ee=U=>a.go(U);let X;const ue=new Set,ce={currentRoute:u,listening:!0,addRoute:v,removeRoute:m,clearRoutes:t.clearRoutes,hasRoute:y,getRoutes:h,resolve:g,options:e,push:b,replace:C,go:ee,back:()=>ee(-1),forward:()=>ee(1),beforeEach:l.add,beforeResolve:r.add,afterEach:i.add,onError:O.add,isReady:L,install(U){const le=this;U.component("RouterLink",fee),U.component("RouterView",mee),U.config.globalProperties.$router=le,Object.defineProperty(U.config.globalProperties,"$route",{enumerable:!0,get:()=>s(u)}),Tr&&!X&&u.value===qa&&(X=!0,b(a.location).catch(ve=>{}));const ae={};for(const ve in qa)Object.defineProperty(ae,ve,{get:()=>u.value[ve],enumerable:!0});U.provide(Jd,le),U.provide(qm,Wv(ae)),U.provide(Pv,u);const Se=U.unmount;ue.add(U),U.unmount=function(){ue.delete(U),ue.size<1&&(c=qa,K&&K(),K=null,u.value=qa,X=!1,A=!1),Se()}}};function re(U){return U.reduce((le,ae)=>le.then(()=>$(ae)),Promise.resolve())}return ce}function yee(e,t){const n=[],o=[],a=[],l=Math.max(t.matched.length,e.matched.length);for(let r=0;r<l;r++){const i=t.matched[r];i&&(e.matched.find(c=>is(c,i))?o.push(i):n.push(i));const u=e.matched[r];u&&(t.matched.find(c=>is(c,u))||a.push(u))}return[n,o,a]}function El(){return xe(Jd)}function Zd(e){return xe(qm)}const dr=(e,t)=>{const n=e.__vccOpts||e;for(const[o,a]of t)n[o]=a;return n},bee={class:"app-container"},wee={class:"header-container"},Cee={class:"nav-links"},See={__name:"App",setup(e){const t=kl(),n=El(),o=_(()=>t.isLoggedIn),a=()=>{t.logout(),n.push("/login")};return(l,r)=>{const i=Ne("el-button"),u=Ne("el-header"),c=Ne("router-view"),d=Ne("el-main"),f=Ne("el-footer"),p=Ne("el-container");return E(),F("div",bee,[B(p,null,{default:W(()=>[B(u,null,{default:W(()=>[z("div",wee,[z("div",{class:"logo",onClick:r[0]||(r[0]=v=>s(n).push("/"))},"个人论坛"),z("div",Cee,[o.value?(E(),F(Fe,{key:0},[B(i,{type:"text",onClick:r[1]||(r[1]=v=>s(n).push("/myspace"))},{default:W(()=>r[5]||(r[5]=[De("我的空间")])),_:1}),B(i,{type:"text",onClick:r[2]||(r[2]=v=>s(n).push("/profile"))},{default:W(()=>r[6]||(r[6]=[De("个人资料")])),_:1}),B(i,{type:"text",onClick:a},{default:W(()=>r[7]||(r[7]=[De("退出登录")])),_:1})],64)):(E(),F(Fe,{key:1},[B(i,{type:"text",onClick:r[3]||(r[3]=v=>s(n).push("/login"))},{default:W(()=>r[8]||(r[8]=[De("登录")])),_:1}),B(i,{type:"text",onClick:r[4]||(r[4]=v=>s(n).push("/register"))},{default:W(()=>r[9]||(r[9]=[De("注册")])),_:1})],64))])])]),_:1}),B(d,null,{default:W(()=>[B(c)]),_:1}),B(f,null,{default:W(()=>r[10]||(r[10]=[z("div",{class:"footer-container"},[z("p",null," 2025 洋葱论坛 - 使用 Vue + FastAPI 构建")],-1)])),_:1})]),_:1})])}}},Bs="http://localhost:8000",Ym=nh("post",()=>{const e=P([]),t=P(!1),n=P(null),o=P(""),a=P(1),l=P(10),r=P(0),i=P(null),u=_(()=>e.value.length>0);async function c(g="",S=1,w=10){var b,C;t.value=!0,n.value=null;try{const k=await Nt.get(`${Bs}/posts/search`,{params:{query:g,page:S,page_size:w},headers:{Authorization:`Bearer ${localStorage.getItem("token")}`}});return e.value=k.data.results,r.value=k.data.total,a.value=k.data.page,l.value=k.data.page_size,o.value=g,k.data}catch(k){throw n.value=((C=(b=k.response)==null?void 0:b.data)==null?void 0:C.detail)||"获取帖子失败",k}finally{t.value=!1}}async function d(g=1,S=10){return c("",g,S)}async function f(g){var S,w;t.value=!0,n.value=null;try{const b=await Nt.get(`${Bs}/posts/${g}`,{headers:{Authorization:`Bearer ${localStorage.getItem("token")}`}});return i.value=b.data,b.data}catch(b){throw n.value=((w=(S=b.response)==null?void 0:S.data)==null?void 0:w.detail)||"获取帖子详情失败",b}finally{t.value=!1}}async function p(g){var S,w;t.value=!0,n.value=null;try{const b=await Nt.post(`${Bs}/posts/`,g,{headers:{Authorization:`Bearer ${localStorage.getItem("token")}`}});return e.value.length>0&&e.value.unshift(b.data),b.data}catch(b){throw n.value=((w=(S=b.response)==null?void 0:S.data)==null?void 0:w.detail)||"创建帖子失败",b}finally{t.value=!1}}async function v(g,S){var w,b;t.value=!0,n.value=null;try{const C=await Nt.put(`${Bs}/posts/${g}`,S,{headers:{Authorization:`Bearer ${localStorage.getItem("token")}`}}),k=e.value.findIndex(T=>T.id===g);return k!==-1&&(e.value[k]=C.data),i.value&&i.value.id===g&&(i.value=C.data),C.data}catch(C){throw n.value=((b=(w=C.response)==null?void 0:w.data)==null?void 0:b.detail)||"更新帖子失败",C}finally{t.value=!1}}async function m(g){var S,w;t.value=!0,n.value=null;try{return await Nt.delete(`${Bs}/posts/${g}`,{headers:{Authorization:`Bearer ${localStorage.getItem("token")}`}}),e.value=e.value.filter(b=>b.id!==g),i.value&&i.value.id===g&&(i.value=null),!0}catch(b){throw n.value=((w=(S=b.response)==null?void 0:S.data)==null?void 0:w.detail)||"删除帖子失败",b}finally{t.value=!1}}function h(){e.value=[],n.value=null,o.value=""}function y(){i.value=null}return{posts:e,loading:t,error:n,searchQuery:o,currentPage:a,pageSize:l,totalPosts:r,currentPost:i,hasPosts:u,searchPosts:c,fetchPosts:d,getPostById:f,createPost:p,updatePost:v,deletePost:m,clearPosts:h,clearCurrentPost:y}}),_ee={class:"home"},kee={class:"action-buttons"},Eee={key:1,class:"posts-container"},$ee={class:"search-container"},Tee={class:"posts-list"},Oee={class:"post-header"},Ree=["onClick"],Mee={class:"post-meta"},Nee={class:"author"},Pee={class:"time"},Iee={class:"views"},xee={class:"post-content"},Aee={key:0,class:"post-tags"},Lee={key:3,class:"pagination-container"},i1="http://localhost:8000",Dee={__name:"Home",setup(e){const t=El(),n=Zd(),o=kl(),a=Ym(),l=_(()=>o.isLoggedIn),r=P(""),i=P(1),u=P(10),c=P(!1);nt(async()=>{l.value&&(n.query.search?(r.value=n.query.search,await f()):await d())}),fe(l,async C=>{C?await d():a.clearPosts()}),fe(()=>{var C,k;return(k=(C=a.posts[0])==null?void 0:C.author)==null?void 0:k.avatar},(C,k)=>{console.log(`${i1}${C}`)},{deep:!0});async function d(){c.value=!0;try{await a.fetchPosts(i.value,u.value)}catch(C){Dt.error("获取帖子失败"),console.error(C)}finally{c.value=!1}}async function f(){c.value=!0,i.value=1;try{await a.searchPosts(r.value,i.value,u.value)}catch(C){Dt.error("搜索失败"),console.error(C)}finally{c.value=!1}}function p(C){r.value=C,f()}function v(C){u.value=C,h()}function m(C){i.value=C,h()}async function h(){c.value=!0;try{r.value?await a.searchPosts(r.value,i.value,u.value):await a.fetchPosts(i.value,u.value)}catch(C){Dt.error("获取帖子失败"),console.error(C)}finally{c.value=!1}}function y(C){t.push(`/posts/${C}`)}function g(){t.push("/posts/create")}function S(C){return new Date(C).toLocaleString("zh-CN",{year:"numeric",month:"2-digit",day:"2-digit",hour:"2-digit",minute:"2-digit"})}function w(C){return C.length>100?C.substring(0,100)+"...":C}function b(C){return C?C.split(",").map(k=>k.trim()).filter(k=>k):[]}return(C,k)=>{const T=Ne("el-button"),R=Ne("el-card"),$=Ne("el-icon"),N=Ne("el-input"),x=Ne("el-empty"),I=Ne("el-skeleton"),K=Ne("el-tag"),G=Ne("el-avatar"),H=Ne("el-pagination");return E(),F("div",_ee,[l.value?(E(),F("div",Eee,[z("div",$ee,[B(N,{modelValue:r.value,"onUpdate:modelValue":k[2]||(k[2]=O=>r.value=O),placeholder:"搜索帖子...",clearable:"",onKeyup:Pt(f,["enter"]),class:"search-input"},{prefix:W(()=>[B($,null,{default:W(()=>[B(s(ZC))]),_:1})]),append:W(()=>[B(T,{onClick:f},{default:W(()=>k[9]||(k[9]=[De("搜索")])),_:1})]),_:1},8,["modelValue"]),B(T,{type:"primary",onClick:g,class:"create-post-btn"},{default:W(()=>[B($,null,{default:W(()=>[B(s(Ji))]),_:1}),k[10]||(k[10]=De(" 发布新帖子 "))]),_:1})]),z("div",Tee,[!c.value&&!s(a).hasPosts?(E(),ie(x,{key:0,description:"暂无帖子"})):ne("",!0),c.value?(E(),F(Fe,{key:1},ft(5,O=>B(I,{rows:3,animated:"",key:O})),64)):(E(!0),F(Fe,{key:2},ft(s(a).posts,O=>(E(),ie(R,{key:O.id,class:"post-card"},{default:W(()=>[z("div",Oee,[z("h3",{class:"post-title",onClick:A=>y(O.id)},[De(me(O.title)+" ",1),O.is_pinned?(E(),ie(K,{key:0,size:"small",type:"success"},{default:W(()=>k[11]||(k[11]=[De("置顶")])),_:1})):ne("",!0),O.is_closed?(E(),ie(K,{key:1,size:"small",type:"info"},{default:W(()=>k[12]||(k[12]=[De("已关闭")])),_:1})):ne("",!0)],8,Ree),z("div",Mee,[z("span",Nee,[B(G,{size:24,src:`${i1}${O.author.avatar}`},null,8,["src"]),De(" "+me(O.author.username),1)]),z("span",Pee,me(S(O.created_at)),1),z("span",Iee,[B($,null,{default:W(()=>[B(s(Th))]),_:1}),De(" "+me(O.view_count),1)])])]),z("p",xee,me(w(O.content)),1),O.tags?(E(),F("div",Aee,[(E(!0),F(Fe,null,ft(b(O.tags),A=>(E(),ie(K,{key:A,size:"small",effect:"plain",onClick:D=>p(A)},{default:W(()=>[De(me(A),1)]),_:2},1032,["onClick"]))),128))])):ne("",!0)]),_:2},1024))),128)),s(a).totalPosts>0?(E(),F("div",Lee,[B(H,{"current-page":i.value,"onUpdate:currentPage":k[3]||(k[3]=O=>i.value=O),"page-size":u.value,"onUpdate:pageSize":k[4]||(k[4]=O=>u.value=O),"page-sizes":[5,10,20,50],layout:"total, sizes, prev, pager, next, jumper",total:s(a).totalPosts,onSizeChange:v,onCurrentChange:m},null,8,["current-page","page-size","total"])])):ne("",!0)])])):(E(),ie(R,{key:0,class:"welcome-card"},{default:W(()=>[k[7]||(k[7]=z("div",{class:"welcome-text"},[z("h1",null,"欢迎来到洋葱个人论坛")],-1)),k[8]||(k[8]=z("p",null,"这是一个使用Vue + Element Plus + Pinia构建的前端和FastAPI + SQLite构建的后端的个人论坛项目。",-1)),z("div",kee,[B(T,{type:"primary",onClick:k[0]||(k[0]=O=>C.$router.push("/login")),size:"large"},{default:W(()=>k[5]||(k[5]=[De("登录")])),_:1}),B(T,{type:"success",onClick:k[1]||(k[1]=O=>C.$router.push("/register")),size:"large"},{default:W(()=>k[6]||(k[6]=[De("注册")])),_:1})])]),_:1}))])}}},Bee=dr(Dee,[["__scopeId","data-v-714f2cb4"]]),Fee={class:"login-page"},Vee={class:"login-container"},zee={class:"login-form-container"},Hee={class:"register-link"},Kee={__name:"Login",setup(e){const t=El(),n=kl(),o=P(null),a=P(!1);P(!1);const l=bt({username:"",password:""}),r={username:[{required:!0,message:"请输入用户名",trigger:"blur"},{min:3,max:20,message:"用户名长度应为3-20个字符",trigger:"blur"}],password:[{required:!0,message:"请输入密码",trigger:"blur"},{min:6,max:20,message:"密码长度应为6-20个字符",trigger:"blur"}]},i=async()=>{o.value&&await o.value.validate(async u=>{if(u){a.value=!0;try{await n.login(l),Dt.success("登录成功"),t.push("/")}catch(c){Dt.error(c.message||"登录失败，请检查用户名和密码")}finally{a.value=!1}}})};return(u,c)=>{const d=Ne("el-icon"),f=Ne("el-input"),p=Ne("el-form-item"),v=Ne("el-button"),m=Ne("el-form"),h=Ne("el-link");return E(),F("div",Fee,[z("div",Vee,[z("div",zee,[c[6]||(c[6]=z("div",{class:"login-header"},[z("h1",null,"欢迎回来"),z("p",null,"登录您的账户以继续访问论坛")],-1)),B(m,{model:l,rules:r,ref_key:"loginFormRef",ref:o,class:"login-form"},{default:W(()=>[B(p,{prop:"username"},{default:W(()=>[B(f,{modelValue:l.username,"onUpdate:modelValue":c[0]||(c[0]=y=>l.username=y),placeholder:"用户名","prefix-icon":"el-icon-user",size:"large"},{prefix:W(()=>[B(d,null,{default:W(()=>[B(s(eS))]),_:1})]),_:1},8,["modelValue"])]),_:1}),B(p,{prop:"password"},{default:W(()=>[B(f,{modelValue:l.password,"onUpdate:modelValue":c[1]||(c[1]=y=>l.password=y),type:"password",placeholder:"密码","prefix-icon":"el-icon-lock",size:"large","show-password":""},{prefix:W(()=>[B(d,null,{default:W(()=>[B(s(JC))]),_:1})]),_:1},8,["modelValue"])]),_:1}),B(p,null,{default:W(()=>[B(v,{type:"primary",onClick:i,loading:a.value,class:"login-button",size:"large"},{default:W(()=>c[3]||(c[3]=[De(" 登录 ")])),_:1},8,["loading"])]),_:1})]),_:1},8,["model"]),c[7]||(c[7]=z("div",{class:"login-divider"},[z("span",null,"或者")],-1)),z("div",Hee,[c[5]||(c[5]=De(" 还没有账号? ")),B(h,{type:"primary",onClick:c[2]||(c[2]=y=>u.$router.push("/register"))},{default:W(()=>c[4]||(c[4]=[De("立即注册")])),_:1})])]),c[8]||(c[8]=z("div",{class:"login-image-container"},[z("div",{class:"login-image-content"},[z("h2",null,"加入我们的社区"),z("p",null,"探索无限可能，分享您的想法，结交志同道合的朋友"),z("img",{src:"https://img.freepik.com/free-vector/mobile-login-concept-illustration_114360-83.jpg",alt:"登录插图",class:"login-image"})])],-1))])])}}},Wee=dr(Kee,[["__scopeId","data-v-a162cc16"]]),jee={class:"register-page"},Uee={class:"register-container"},qee={class:"register-form-container"},Yee={class:"terms-agreement"},Gee={class:"login-link"},Xee={__name:"Register",setup(e){const t=El(),n=kl(),o=P(null),a=P(!1),l=P(!1),r=bt({username:"",email:"",password:"",confirmPassword:""}),u={username:[{required:!0,message:"请输入用户名",trigger:"blur"},{min:3,max:20,message:"用户名长度应为3-20个字符",trigger:"blur"}],email:[{required:!0,message:"请输入邮箱",trigger:"blur"},{type:"email",message:"请输入有效的邮箱地址",trigger:"blur"}],password:[{required:!0,message:"请输入密码",trigger:"blur"},{min:6,max:20,message:"密码长度应为6-20个字符",trigger:"blur"}],confirmPassword:[{required:!0,message:"请再次输入密码",trigger:"blur"},{validator:(d,f,p)=>{f===""?p(new Error("请再次输入密码")):f!==r.password?p(new Error("两次输入密码不一致")):p()},trigger:"blur"}]},c=async()=>{if(o.value){if(!l.value){Dt.warning("请阅读并同意服务条款和隐私政策");return}await o.value.validate(async d=>{if(d){a.value=!0;try{await n.register({username:r.username,email:r.email,password:r.password}),Dt.success("注册成功，请登录"),t.push("/login")}catch(f){Dt.error(f.message||"注册失败，请稍后再试")}finally{a.value=!1}}})}};return(d,f)=>{const p=Ne("el-icon"),v=Ne("el-input"),m=Ne("el-form-item"),h=Ne("el-link"),y=Ne("el-checkbox"),g=Ne("el-button"),S=Ne("el-form");return E(),F("div",jee,[z("div",Uee,[f[14]||(f[14]=z("div",{class:"register-image-container"},[z("div",{class:"register-image-content"},[z("h2",null,"成为我们社区的一员"),z("p",null,"注册账号，开始您的论坛之旅"),z("img",{src:"https://img.freepik.com/free-vector/sign-concept-illustration_114360-125.jpg",alt:"注册插图",class:"register-image"})])],-1)),z("div",qee,[f[13]||(f[13]=z("div",{class:"register-header"},[z("h1",null,"创建新账户"),z("p",null,"填写以下信息完成注册")],-1)),B(S,{model:r,rules:u,ref_key:"registerFormRef",ref:o,class:"register-form"},{default:W(()=>[B(m,{prop:"username"},{default:W(()=>[B(v,{modelValue:r.username,"onUpdate:modelValue":f[0]||(f[0]=w=>r.username=w),placeholder:"用户名",size:"large"},{prefix:W(()=>[B(p,null,{default:W(()=>[B(s(eS))]),_:1})]),_:1},8,["modelValue"])]),_:1}),B(m,{prop:"email"},{default:W(()=>[B(v,{modelValue:r.email,"onUpdate:modelValue":f[1]||(f[1]=w=>r.email=w),placeholder:"电子邮箱",size:"large"},{prefix:W(()=>[B(p,null,{default:W(()=>[B(s(uA))]),_:1})]),_:1},8,["modelValue"])]),_:1}),B(m,{prop:"password"},{default:W(()=>[B(v,{modelValue:r.password,"onUpdate:modelValue":f[2]||(f[2]=w=>r.password=w),type:"password",placeholder:"密码",size:"large","show-password":""},{prefix:W(()=>[B(p,null,{default:W(()=>[B(s(JC))]),_:1})]),_:1},8,["modelValue"])]),_:1}),B(m,{prop:"confirmPassword"},{default:W(()=>[B(v,{modelValue:r.confirmPassword,"onUpdate:modelValue":f[3]||(f[3]=w=>r.confirmPassword=w),type:"password",placeholder:"确认密码",size:"large","show-password":""},{prefix:W(()=>[B(p,null,{default:W(()=>[B(s(Ed))]),_:1})]),_:1},8,["modelValue"])]),_:1}),z("div",Yee,[B(y,{modelValue:l.value,"onUpdate:modelValue":f[4]||(f[4]=w=>l.value=w)},{default:W(()=>[f[8]||(f[8]=De("我已阅读并同意")),B(h,{type:"primary"},{default:W(()=>f[6]||(f[6]=[De("服务条款")])),_:1}),f[9]||(f[9]=De("和")),B(h,{type:"primary"},{default:W(()=>f[7]||(f[7]=[De("隐私政策")])),_:1})]),_:1},8,["modelValue"])]),B(m,null,{default:W(()=>[B(g,{type:"primary",onClick:c,loading:a.value,class:"register-button",size:"large",disabled:!l.value},{default:W(()=>f[10]||(f[10]=[De(" 注册 ")])),_:1},8,["loading","disabled"])]),_:1})]),_:1},8,["model"]),z("div",Gee,[f[12]||(f[12]=De(" 已有账号? ")),B(h,{type:"primary",onClick:f[5]||(f[5]=w=>d.$router.push("/login"))},{default:W(()=>f[11]||(f[11]=[De("立即登录")])),_:1})])])])])}}},Jee=dr(Xee,[["__scopeId","data-v-450c690e"]]),Zee={class:"profile-container"},Qee={class:"header"},ete={key:0,class:"profile-content"},tte={class:"avatar-container"},nte={class:"profile-actions"},ote={class:"avatar-upload"},ate=["src"],lte={class:"avatar-upload-tip"},rte={key:0,class:"current-file"},ste={class:"dialog-footer"},ite={__name:"Profile",setup(e){const t=El(),n=kl(),o=P(null),a=P(!1),l=P(!1),r=P(""),i=P("");fe(()=>n.user,m=>{m&&m.avatar&&console.log("Avatar path:",m.avatar)});const u=bt({username:"",email:"",bio:"",avatar:null}),c={email:[{required:!0,message:"请输入邮箱",trigger:"blur"},{type:"email",message:"请输入有效的邮箱地址",trigger:"blur"}],bio:[{max:200,message:"个人简介不能超过200个字符",trigger:"blur"}]},d=m=>{if(!m)return;if(!m.raw.type.startsWith("image/")){Dt.error("只能上传图片文件!");return}if(!(m.size/1024/1024<2)){Dt.error("图片大小不能超过 2MB!");return}r.value=URL.createObjectURL(m.raw),i.value=m.name,u.avatar=m.raw};nt(async()=>{if(!n.isLoggedIn){t.push("/login");return}try{await n.getUserProfile(),n.user&&(u.username=n.user.username,u.email=n.user.email,u.bio=n.user.bio||"",n.avatarUrl&&(r.value=n.avatarUrl,console.log("Real path:",r.value)))}catch{Dt.error("获取用户信息失败")}});const f=m=>m?new Date(m).toLocaleString():"",p=async()=>{o.value&&await o.value.validate(async m=>{if(m){a.value=!0;try{await n.updateProfile(u),Dt.success("个人资料更新成功"),l.value=!1}catch(h){Dt.error(h.message||"更新失败，请稍后再试")}finally{a.value=!1}}})},v=()=>{n.logout(),Dt.success("已退出登录"),t.push("/")};return(m,h)=>{const y=Ne("el-button"),g=Ne("el-avatar"),S=Ne("el-descriptions-item"),w=Ne("el-descriptions"),b=Ne("el-input"),C=Ne("el-form-item"),k=Ne("el-icon"),T=Ne("el-upload"),R=Ne("el-form"),$=Ne("el-dialog"),N=Ne("el-card");return E(),F("div",Zee,[B(N,{class:"profile-card"},{header:W(()=>[z("div",Qee,[h[7]||(h[7]=z("h2",null,"个人资料",-1)),B(y,{type:"danger",onClick:v,size:"small"},{default:W(()=>h[6]||(h[6]=[De("退出登录")])),_:1})])]),default:W(()=>[s(n).user?(E(),F("div",ete,[z("div",tte,[B(g,{size:100,src:s(n).avatarUrl||r.value||"https://cube.elemecdn.com/3/7c/3ea6beec64369c2642b92c6726f1epng.png"},null,8,["src"])]),B(w,{title:"用户信息",column:1,border:""},{default:W(()=>[B(S,{label:"用户名"},{default:W(()=>[De(me(s(n).user.username),1)]),_:1}),B(S,{label:"邮箱"},{default:W(()=>[De(me(s(n).user.email),1)]),_:1}),B(S,{label:"注册时间"},{default:W(()=>[De(me(f(s(n).user.created_at)),1)]),_:1}),B(S,{label:"上次登录"},{default:W(()=>[De(me(s(n).user.last_login?f(s(n).user.last_login):"暂无记录"),1)]),_:1})]),_:1}),z("div",nte,[B(y,{type:"primary",onClick:h[0]||(h[0]=x=>l.value=!0)},{default:W(()=>h[8]||(h[8]=[De("编辑资料")])),_:1})])])):ne("",!0),B($,{modelValue:l.value,"onUpdate:modelValue":h[5]||(h[5]=x=>l.value=x),title:"编辑个人资料",width:"500px"},{footer:W(()=>[z("span",ste,[B(y,{onClick:h[4]||(h[4]=x=>l.value=!1)},{default:W(()=>h[10]||(h[10]=[De("取消")])),_:1}),B(y,{type:"primary",onClick:p,loading:a.value},{default:W(()=>h[11]||(h[11]=[De(" 保存 ")])),_:1},8,["loading"])])]),default:W(()=>[B(R,{model:u,rules:c,ref_key:"editFormRef",ref:o,"label-width":"100px"},{default:W(()=>[B(C,{label:"用户名",prop:"username"},{default:W(()=>[B(b,{modelValue:u.username,"onUpdate:modelValue":h[1]||(h[1]=x=>u.username=x),disabled:""},null,8,["modelValue"])]),_:1}),B(C,{label:"邮箱",prop:"email"},{default:W(()=>[B(b,{modelValue:u.email,"onUpdate:modelValue":h[2]||(h[2]=x=>u.email=x)},null,8,["modelValue"])]),_:1}),B(C,{label:"个人简介",prop:"bio"},{default:W(()=>[B(b,{modelValue:u.bio,"onUpdate:modelValue":h[3]||(h[3]=x=>u.bio=x),type:"textarea",rows:4},null,8,["modelValue"])]),_:1}),B(C,{label:"头像",prop:"avatar"},{default:W(()=>[z("div",ote,[B(T,{class:"avatar-uploader",action:"http://localhost:8000/uploads/avatars","auto-upload":!1,"show-file-list":!1,"on-change":d,accept:"image/*"},{default:W(()=>[r.value?(E(),F("img",{key:0,src:r.value,class:"avatar-preview"},null,8,ate)):(E(),ie(k,{key:1,class:"avatar-uploader-icon"},{default:W(()=>[B(s(Ji))]),_:1}))]),_:1}),z("div",lte,[h[9]||(h[9]=z("p",null,"点击上传头像",-1)),r.value?(E(),F("p",rte," 已选择: "+me(i.value||"预览中"),1)):ne("",!0)])])]),_:1})]),_:1},8,["model"])]),_:1},8,["modelValue"])]),_:1})])}}},ute=dr(ite,[["__scopeId","data-v-2f0f07e1"]]),Du="http://localhost:8000",cte=nh("floor",()=>{const e=P([]),t=P(!1),n=P(null),o=P(1),a=P(20),l=P(null),r=_(()=>e.value.length>0);async function i(m,h=1,y=20){var g,S;t.value=!0,n.value=null;try{const w=await Nt.get(`${Du}/floors/post/${m}`,{params:{page:h,page_size:y},headers:{Authorization:`Bearer ${localStorage.getItem("token")}`}});return e.value=w.data,o.value=h,a.value=y,w.data}catch(w){throw n.value=((S=(g=w.response)==null?void 0:g.data)==null?void 0:S.detail)||"获取楼层失败",w}finally{t.value=!1}}async function u(m){var h,y;t.value=!0,n.value=null;try{const g=await Nt.post(`${Du}/floors/`,m,{headers:{Authorization:`Bearer ${localStorage.getItem("token")}`}});return e.value.push(g.data),l.value=null,g.data}catch(g){throw n.value=((y=(h=g.response)==null?void 0:h.data)==null?void 0:y.detail)||"创建回复失败",g}finally{t.value=!1}}async function c(m,h){var y,g;t.value=!0,n.value=null;try{const S=await Nt.put(`${Du}/floors/${m}`,{content:h},{headers:{Authorization:`Bearer ${localStorage.getItem("token")}`}}),w=e.value.findIndex(b=>b.id===m);return w!==-1&&(e.value[w]=S.data),S.data}catch(S){throw n.value=((g=(y=S.response)==null?void 0:y.data)==null?void 0:g.detail)||"更新回复失败",S}finally{t.value=!1}}async function d(m){var h,y;t.value=!0,n.value=null;try{return await Nt.delete(`${Du}/floors/${m}`,{headers:{Authorization:`Bearer ${localStorage.getItem("token")}`}}),e.value=e.value.filter(g=>g.id!==m),!0}catch(g){throw n.value=((y=(h=g.response)==null?void 0:h.data)==null?void 0:y.detail)||"删除回复失败",g}finally{t.value=!1}}function f(m){l.value=m}function p(){l.value=null}function v(){e.value=[],n.value=null}return{floors:e,loading:t,error:n,currentPage:o,pageSize:a,replyingTo:l,hasFloors:r,getFloorsByPostId:i,createFloor:u,updateFloor:c,deleteFloor:d,setReplyTarget:f,clearReplyTarget:p,clearFloors:v}}),dte={class:"post-detail-container"},fte={key:0,class:"loading-container"},pte={key:1,class:"error-container"},vte={class:"post-header"},hte={class:"post-title"},mte={class:"post-meta"},gte={class:"time"},yte={class:"views"},bte={key:0,class:"post-tags"},wte={class:"post-content"},Cte={key:0,class:"post-actions"},Ste={class:"floors-section"},_te={class:"section-title"},kte={key:0,class:"loading-container"},Ete={key:1,class:"error-container"},$te={key:2,class:"empty-floors"},Tte={key:3,class:"floor-list"},Ote=["id"],Rte={class:"floor-header"},Mte=["onClick"],Nte={class:"author-name"},Pte={class:"floor-meta"},Ite={class:"floor-number"},xte={class:"floor-time"},Ate={class:"floor-content"},Lte={key:0,class:"reply-reference"},Dte={class:"content-text"},Bte={class:"floor-actions"},Fte={key:1,class:"reply-editor"},Vte={class:"reply-title"},zte="https://cube.elemecdn.com/3/7c/3ea6beec64369c2642b92c6726f1epng.png",Hte="http://localhost:8000",Kte={__name:"PostDetail",setup(e){const t=Zd(),n=El(),o=Ym(),a=kl(),l=cte(),r=P(!0),i=P(null),u=P(!1),c=P(null),d=P(!1),f=P(""),p=P(null),v=_(()=>o.currentPost),m=_(()=>l.floors),h=_(()=>!v.value||!a.user?!1:v.value.author_id===a.user.id||a.user.is_admin);nt(async()=>{await y(),v.value&&await $()});async function y(){const O=parseInt(t.params.id);if(isNaN(O)){i.value="无效的帖子ID",r.value=!1;return}r.value=!0,i.value=null;try{await o.getPostById(O)}catch(A){i.value=A.message||"获取帖子详情失败",console.error(A)}finally{r.value=!1}}function g(){n.back()}function S(O){n.push({path:"/",query:{search:O}})}function w(){n.push(`/posts/edit/${v.value.id}`)}async function b(){try{await o.deletePost(v.value.id),Dt.success("帖子已删除"),n.push("/")}catch(O){Dt.error(O.message||"删除帖子失败"),console.error(O)}}function C(O){if(!O)return"";const A=new Date(O),L=new Date-A;return Math.floor(L/(1e3*60*60*24))===0?A.toLocaleTimeString():A.toLocaleDateString()}function k(O){return O?O.startsWith("http")?O:`${Hte}${O}`:zte}function T(O){O&&(a.user&&O===a.user.id?n.push("/myspace"):n.push(`/user/${O}/space`))}function R(O){return O?O.split(",").map(A=>A.trim()).filter(A=>A):[]}async function $(){if(v.value){u.value=!0,c.value=null;try{await l.getFloorsByPostId(v.value.id)}catch(O){c.value=O.message||"获取回复列表失败",console.error(O)}finally{u.value=!1}}}function N(O){const A=m.value.find(D=>D.id===O);return A?A.floor_number:"?"}function x(O){l.setReplyTarget(O),ze(()=>{document.querySelector(".reply-editor").scrollIntoView({behavior:"smooth"})})}async function I(){if(f.value.trim()){d.value=!0;try{if(p.value)await l.updateFloor(p.value,f.value),p.value=null,Dt.success("回复更新成功");else{const O={content:f.value,post_id:v.value.id,reply_to_floor_id:l.replyingTo?l.replyingTo.id:null};await l.createFloor(O),Dt.success("回复发表成功")}f.value="",l.clearReplyTarget()}catch(O){Dt.error(O.message||"操作失败"),console.error(O)}finally{d.value=!1}}}function K(O){f.value=O.content,p.value=O.id,ze(()=>{document.querySelector(".reply-editor").scrollIntoView({behavior:"smooth"})})}async function G(O){try{await l.deleteFloor(O),Dt.success("回复已删除")}catch(A){Dt.error(A.message||"删除回复失败"),console.error(A)}}function H(O){return a.user?O.author_id===a.user.id||a.user.is_admin:!1}return(O,A)=>{var ve,V;const D=Ne("el-page-header"),L=Ne("el-skeleton"),q=Ne("el-button"),J=Ne("el-result"),ee=Ne("el-tag"),X=Ne("el-avatar"),ue=Ne("el-icon"),ce=Ne("el-popconfirm"),re=Ne("el-alert"),U=Ne("el-empty"),le=Ne("el-input"),ae=Ne("el-form-item"),Se=Ne("el-form");return E(),F("div",dte,[B(D,{onBack:g,title:"返回"}),r.value?(E(),F("div",fte,[B(L,{rows:10,animated:""})])):i.value?(E(),F("div",pte,[B(J,{icon:"error",title:"加载失败","sub-title":i.value},{extra:W(()=>[B(q,{type:"primary",onClick:y},{default:W(()=>A[4]||(A[4]=[De("重试")])),_:1})]),_:1},8,["sub-title"])])):v.value?(E(),F(Fe,{key:2},[z("div",vte,[z("h1",hte,[De(me(v.value.title)+" ",1),v.value.is_pinned?(E(),ie(ee,{key:0,type:"success",size:"small"},{default:W(()=>A[5]||(A[5]=[De("置顶")])),_:1})):ne("",!0),v.value.is_closed?(E(),ie(ee,{key:1,type:"info",size:"small"},{default:W(()=>A[6]||(A[6]=[De("已关闭")])),_:1})):ne("",!0)]),z("div",mte,[z("span",{class:"author",onClick:A[0]||(A[0]=j=>T(v.value.author_id))},[B(X,{size:32,src:k((ve=v.value.author)==null?void 0:ve.avatar)},null,8,["src"]),De(" "+me((V=v.value.author)==null?void 0:V.username),1)]),z("span",gte,"发布于: "+me(C(v.value.created_at)),1),z("span",yte,[B(ue,null,{default:W(()=>[B(s(Th))]),_:1}),De(" "+me(v.value.view_count),1)])]),v.value.tags?(E(),F("div",bte,[(E(!0),F(Fe,null,ft(R(v.value.tags),j=>(E(),ie(ee,{key:j,size:"small",effect:"plain",onClick:se=>S(j)},{default:W(()=>[De(me(j),1)]),_:2},1032,["onClick"]))),128))])):ne("",!0)]),z("div",wte,me(v.value.content),1),h.value?(E(),F("div",Cte,[B(q,{type:"primary",onClick:w,icon:s(eA)},{default:W(()=>A[7]||(A[7]=[De("编辑")])),_:1},8,["icon"]),B(ce,{title:"确定要删除这个帖子吗？",onConfirm:b,"confirm-button-text":"确定","cancel-button-text":"取消"},{reference:W(()=>[B(q,{type:"danger",icon:s(XC)},{default:W(()=>A[8]||(A[8]=[De("删除")])),_:1},8,["icon"])]),_:1})])):ne("",!0),z("div",Ste,[z("h2",_te,"全部回复 ("+me(m.value.length)+")",1),u.value?(E(),F("div",kte,[B(L,{rows:5,animated:""})])):c.value?(E(),F("div",Ete,[B(re,{title:c.value,type:"error","show-icon":"",onClose:A[1]||(A[1]=j=>c.value=null)},null,8,["title"]),B(q,{class:"mt-3",type:"primary",onClick:$},{default:W(()=>A[9]||(A[9]=[De("重试")])),_:1})])):m.value.length===0?(E(),F("div",$te,[B(U,{description:"暂无回复，来发表第一条回复吧！"})])):(E(),F("div",Tte,[(E(!0),F(Fe,null,ft(m.value,j=>{var se,he;return E(),F("div",{key:j.id,class:"floor-item",id:`floor-${j.id}`},[z("div",Rte,[z("div",{class:"floor-author",onClick:ye=>T(j.author_id)},[B(X,{size:32,src:k((se=j.author)==null?void 0:se.avatar)},null,8,["src"]),z("span",Nte,me((he=j.author)==null?void 0:he.username),1)],8,Mte),z("div",Pte,[z("span",Ite,"#"+me(j.floor_number),1),z("span",xte,me(C(j.created_at)),1)])]),z("div",Ate,[j.reply_to_floor_id?(E(),F("div",Lte,[B(ee,{size:"small",type:"info"},{default:W(()=>[De(" 回复 #"+me(N(j.reply_to_floor_id)),1)]),_:2},1024)])):ne("",!0),z("div",Dte,me(j.content),1)]),z("div",Bte,[B(q,{type:"primary",size:"small",text:"",onClick:ye=>x(j),disabled:v.value.is_closed},{default:W(()=>A[10]||(A[10]=[De(" 回复 ")])),_:2},1032,["onClick","disabled"]),H(j)?(E(),F(Fe,{key:0},[B(q,{type:"primary",size:"small",text:"",onClick:ye=>K(j)},{default:W(()=>A[11]||(A[11]=[De(" 编辑 ")])),_:2},1032,["onClick"]),B(ce,{title:"确定要删除这条回复吗？",onConfirm:ye=>G(j.id),"confirm-button-text":"确定","cancel-button-text":"取消"},{reference:W(()=>[B(q,{type:"danger",size:"small",text:""},{default:W(()=>A[12]||(A[12]=[De("删除")])),_:1})]),_:2},1032,["onConfirm"])],64)):ne("",!0)])],8,Ote)}),128))]))]),v.value.is_closed?(E(),ie(re,{key:2,title:"该帖子已关闭，无法回复",type:"info",closable:!1,"show-icon":""})):(E(),F("div",Fte,[z("h3",Vte,[De(me(s(l).replyingTo?`回复 #${s(l).replyingTo.floor_number}`:"发表回复")+" ",1),s(l).replyingTo?(E(),ie(q,{key:0,type:"info",size:"small",text:"",onClick:A[2]||(A[2]=j=>s(l).clearReplyTarget())},{default:W(()=>A[13]||(A[13]=[De(" 取消回复 ")])),_:1})):ne("",!0)]),B(Se,{onSubmit:Ge(I,["prevent"])},{default:W(()=>[B(ae,null,{default:W(()=>[B(le,{modelValue:f.value,"onUpdate:modelValue":A[3]||(A[3]=j=>f.value=j),type:"textarea",rows:4,placeholder:"请输入回复内容...",disabled:d.value},null,8,["modelValue","disabled"])]),_:1}),B(ae,null,{default:W(()=>[B(q,{type:"primary",onClick:I,loading:d.value,disabled:!f.value.trim()},{default:W(()=>A[14]||(A[14]=[De(" 发表回复 ")])),_:1},8,["loading","disabled"])]),_:1})]),_:1})]))],64)):ne("",!0)])}}},Wte=dr(Kte,[["__scopeId","data-v-b19364d7"]]),jte={class:"post-form-container"},Ute={class:"form-title"},qte={__name:"PostForm",setup(e){const t=Zd(),n=El(),o=Ym(),a=kl(),l=P(null),r=P(!1),i=_(()=>parseInt(t.params.id)),u=_(()=>!!i.value),c=_(()=>{var y;return(y=a.user)==null?void 0:y.is_admin}),d=_(()=>{var y;return!u.value||!o.currentPost?!0:o.currentPost.author_id===((y=a.user)==null?void 0:y.id)}),f=bt({title:"",content:"",tags:"",is_pinned:!1,is_closed:!1}),p={title:[{required:!0,message:"请输入帖子标题",trigger:"blur"},{min:3,max:100,message:"标题长度应在3到100个字符之间",trigger:"blur"}],content:[{required:!0,message:"请输入帖子内容",trigger:"blur"},{min:10,max:5e3,message:"内容长度应在10到5000个字符之间",trigger:"blur"}]};nt(async()=>{u.value&&await v()});async function v(){var y;r.value=!0;try{const g=await o.getPostById(i.value);if(!c.value&&g.author_id!==((y=a.user)==null?void 0:y.id)){Dt.error("您没有权限编辑此帖子"),n.push(`/posts/${i.value}`);return}f.title=g.title,f.content=g.content,f.tags=g.tags||"",f.is_pinned=g.is_pinned,f.is_closed=g.is_closed}catch(g){Dt.error("获取帖子数据失败"),console.error(g),n.push("/")}finally{r.value=!1}}async function m(){l.value&&await l.value.validate(async y=>{if(y){r.value=!0;try{if(u.value)await o.updatePost(i.value,f),Dt.success("帖子已更新"),n.push(`/posts/${i.value}`);else{const g=await o.createPost(f);Dt.success("帖子已发布"),n.push(`/posts/${g.id}`)}}catch(g){Dt.error(g.message||(u.value?"更新帖子失败":"发布帖子失败")),console.error(g)}finally{r.value=!1}}})}function h(){n.back()}return(y,g)=>{const S=Ne("el-page-header"),w=Ne("el-input"),b=Ne("el-form-item"),C=Ne("el-checkbox"),k=Ne("el-button"),T=Ne("el-form");return E(),F("div",jte,[B(S,{onBack:h,title:"返回"}),z("h2",Ute,me(u.value?"编辑帖子":"创建新帖子"),1),B(T,{ref_key:"formRef",ref:l,model:f,rules:p,"label-position":"top",onSubmit:Ge(m,["prevent"])},{default:W(()=>[B(b,{label:"标题",prop:"title"},{default:W(()=>[B(w,{modelValue:f.title,"onUpdate:modelValue":g[0]||(g[0]=R=>f.title=R),placeholder:"请输入帖子标题",maxlength:"100","show-word-limit":""},null,8,["modelValue"])]),_:1}),B(b,{label:"内容",prop:"content"},{default:W(()=>[B(w,{modelValue:f.content,"onUpdate:modelValue":g[1]||(g[1]=R=>f.content=R),type:"textarea",placeholder:"请输入帖子内容",rows:10,maxlength:"5000","show-word-limit":""},null,8,["modelValue"])]),_:1}),B(b,{label:"标签"},{default:W(()=>[B(w,{modelValue:f.tags,"onUpdate:modelValue":g[2]||(g[2]=R=>f.tags=R),placeholder:"输入标签，用逗号分隔",maxlength:"100"},null,8,["modelValue"]),g[5]||(g[5]=z("div",{class:"form-tip"},"标签示例: 技术,问题,讨论",-1))]),_:1}),u.value&&(c.value||d.value)?(E(),ie(b,{key:0},{default:W(()=>[B(C,{modelValue:f.is_pinned,"onUpdate:modelValue":g[3]||(g[3]=R=>f.is_pinned=R)},{default:W(()=>g[6]||(g[6]=[De("置顶帖子")])),_:1},8,["modelValue"]),B(C,{modelValue:f.is_closed,"onUpdate:modelValue":g[4]||(g[4]=R=>f.is_closed=R)},{default:W(()=>g[7]||(g[7]=[De("关闭讨论")])),_:1},8,["modelValue"])]),_:1})):ne("",!0),B(b,null,{default:W(()=>[B(k,{type:"primary","native-type":"submit",loading:r.value},{default:W(()=>[De(me(u.value?"保存修改":"发布帖子"),1)]),_:1},8,["loading"]),B(k,{onClick:h},{default:W(()=>g[8]||(g[8]=[De("取消")])),_:1})]),_:1})]),_:1},8,["model"])])}}},u1=dr(qte,[["__scopeId","data-v-ab651aca"]]),Yte={class:"myspace-container"},Gte={class:"header"},Xte={key:0,class:"profile-content"},Jte={class:"avatar-container"},Zte={key:0,class:"avatar-edit-hint"},Qte={class:"bio-section"},ene={class:"bio-header"},tne={class:"bio-content"},nne={key:1,class:"loading-container"},one={class:"header"},ane={key:0},lne={key:1},rne={class:"post-title"},sne={class:"pagination-container"},ine={key:1,class:"loading-container"},une=["src"],cne={class:"dialog-footer"},dne={class:"dialog-footer"},fne={__name:"MySpace",setup(e){const t=El(),n=Zd(),o=kl(),a=P(null),l=_(()=>!a.value),r=P(""),i=P(null),u=P(null),c=P(1),d=P(10),f=P(!1),p=P(""),v=P(null),m=P(!1),h=P(!1),y=bt({bio:""}),g=P(null),S=P(!1),w=async()=>{try{l.value?i.value=await o.getUserProfileSpace():i.value=await o.getOtherUserProfile(a.value),i.value&&i.value.user&&(y.bio=i.value.user.bio||"",i.value.user.avatar&&(r.value=o.getAvatarUrl(i.value.user.avatar)))}catch(K){Dt.error("获取个人空间信息失败"),console.error(K)}},b=async()=>{try{l.value?u.value=await o.getUserPosts(c.value,d.value):u.value=await o.getOtherUserPosts(a.value,c.value,d.value)}catch(K){Dt.error("获取帖子列表失败"),console.error(K)}},C=K=>K?new Date(K).toLocaleString():"",k=K=>{if(!K)return;if(!K.raw.type.startsWith("image/")){Dt.error("只能上传图片文件!");return}if(!(K.size/1024/1024<2)){Dt.error("图片大小不能超过 2MB!");return}p.value=URL.createObjectURL(K.raw),v.value=K.raw},T=async()=>{if(!v.value){Dt.warning("请先选择图片");return}m.value=!0;try{await o.updateProfile({email:i.value.user.email,bio:i.value.user.bio,avatar:v.value}),Dt.success("头像更新成功"),f.value=!1,await w()}catch(K){Dt.error("头像更新失败"),console.error(K)}finally{m.value=!1}},R=async()=>{S.value=!0;try{await o.updateProfile({email:i.value.user.email,bio:y.bio,avatar:i.value.user.avatar}),Dt.success("个人简介更新成功"),h.value=!1,i.value&&i.value.user&&(i.value.user.bio=y.bio)}catch(K){Dt.error("个人简介更新失败"),console.error(K)}finally{S.value=!1}},$=K=>{d.value=K,b()},N=K=>{c.value=K,b()},x=K=>{t.push(`/posts/${K.id}`)},I=()=>{l.value&&(f.value=!0)};return nt(async()=>{if(n.params.id&&(a.value=n.params.id),l.value&&!o.isLoggedIn){t.push("/login");return}await w(),await b()}),(K,G)=>{const H=Ne("el-avatar"),O=Ne("el-descriptions-item"),A=Ne("el-descriptions"),D=Ne("el-button"),L=Ne("el-skeleton"),q=Ne("el-card"),J=Ne("el-col"),ee=Ne("el-empty"),X=Ne("el-table-column"),ue=Ne("el-table"),ce=Ne("el-pagination"),re=Ne("el-row"),U=Ne("el-icon"),le=Ne("el-upload"),ae=Ne("el-dialog"),Se=Ne("el-input"),ve=Ne("el-form-item"),V=Ne("el-form");return E(),F("div",Yte,[B(re,{gutter:20},{default:W(()=>[B(J,{span:8},{default:W(()=>[B(q,{class:"profile-card"},{header:W(()=>[z("div",Gte,[z("h2",null,me(l.value?"我的空间":"用户空间"),1)])]),default:W(()=>[i.value?(E(),F("div",Xte,[z("div",Jte,[B(H,{size:120,src:(l.value?s(o).avatarUrl:r.value)||"https://cube.elemecdn.com/3/7c/3ea6beec64369c2642b92c6726f1epng.png",onClick:I},null,8,["src"]),l.value?(E(),F("div",Zte,"点击更换头像")):ne("",!0)]),B(A,{title:"个人信息",column:1,border:""},{default:W(()=>[B(O,{label:"用户名"},{default:W(()=>[De(me(i.value.user.username),1)]),_:1}),B(O,{label:"邮箱"},{default:W(()=>[De(me(i.value.user.email),1)]),_:1}),B(O,{label:"发帖数"},{default:W(()=>[De(me(i.value.post_count),1)]),_:1}),B(O,{label:"回复数"},{default:W(()=>[De(me(i.value.floor_count),1)]),_:1}),B(O,{label:"注册时间"},{default:W(()=>[De(me(C(i.value.user.created_at)),1)]),_:1}),B(O,{label:"上次登录"},{default:W(()=>[De(me(i.value.user.last_login?C(i.value.user.last_login):"暂无记录"),1)]),_:1})]),_:1}),z("div",Qte,[z("div",ene,[G[10]||(G[10]=z("h3",null,"个人简介",-1)),l.value?(E(),ie(D,{key:0,type:"primary",size:"small",onClick:G[0]||(G[0]=j=>h.value=!0)},{default:W(()=>G[9]||(G[9]=[De("编辑")])),_:1})):ne("",!0)]),z("div",tne,me(i.value.user.bio||"这个人很懒，还没有填写个人简介..."),1)])])):(E(),F("div",nne,[B(L,{rows:6,animated:""})]))]),_:1})]),_:1}),B(J,{span:16},{default:W(()=>[B(q,{class:"posts-card"},{header:W(()=>[z("div",one,[z("h2",null,me(l.value?"我的帖子":"用户帖子"),1),l.value?(E(),ie(D,{key:0,type:"primary",size:"small",onClick:G[1]||(G[1]=j=>s(t).push("/posts/create"))},{default:W(()=>G[11]||(G[11]=[De("发布新帖")])),_:1})):ne("",!0)])]),default:W(()=>[u.value?(E(),F("div",ane,[u.value.results.length===0?(E(),ie(ee,{key:0,description:l.value?"您还没有发布过帖子":"该用户还没有发布过帖子"},null,8,["description"])):(E(),F("div",lne,[B(ue,{data:u.value.results,style:{width:"100%"},onRowClick:x},{default:W(()=>[B(X,{prop:"title",label:"标题","min-width":"200"},{default:W(j=>[z("div",rne,me(j.row.title),1)]),_:1}),B(X,{prop:"view_count",label:"浏览",width:"80",align:"center"}),B(X,{prop:"floor_count",label:"回复",width:"80",align:"center"}),B(X,{label:"发布时间",width:"180",align:"center"},{default:W(j=>[De(me(C(j.row.created_at)),1)]),_:1})]),_:1},8,["data"]),z("div",sne,[B(ce,{"current-page":c.value,"onUpdate:currentPage":G[2]||(G[2]=j=>c.value=j),"page-size":d.value,"onUpdate:pageSize":G[3]||(G[3]=j=>d.value=j),"page-sizes":[5,10,20,50],layout:"total, sizes, prev, pager, next, jumper",total:u.value.total,onSizeChange:$,onCurrentChange:N},null,8,["current-page","page-size","total"])])]))])):(E(),F("div",ine,[B(L,{rows:6,animated:""})]))]),_:1})]),_:1})]),_:1}),B(ae,{modelValue:f.value,"onUpdate:modelValue":G[5]||(G[5]=j=>f.value=j),title:"更换头像",width:"400px"},{footer:W(()=>[z("span",cne,[B(D,{onClick:G[4]||(G[4]=j=>f.value=!1)},{default:W(()=>G[12]||(G[12]=[De("取消")])),_:1}),B(D,{type:"primary",onClick:T,loading:m.value},{default:W(()=>G[13]||(G[13]=[De(" 保存 ")])),_:1},8,["loading"])])]),default:W(()=>[B(le,{class:"avatar-uploader",action:"#","auto-upload":!1,"show-file-list":!1,"on-change":k,accept:"image/*"},{default:W(()=>[p.value?(E(),F("img",{key:0,src:p.value,class:"avatar-preview"},null,8,une)):(E(),ie(U,{key:1,class:"avatar-uploader-icon"},{default:W(()=>[B(s(Ji))]),_:1}))]),_:1}),G[14]||(G[14]=z("div",{class:"upload-hint"},"点击上方区域选择图片",-1))]),_:1},8,["modelValue"]),B(ae,{modelValue:h.value,"onUpdate:modelValue":G[8]||(G[8]=j=>h.value=j),title:"编辑个人简介",width:"500px"},{footer:W(()=>[z("span",dne,[B(D,{onClick:G[7]||(G[7]=j=>h.value=!1)},{default:W(()=>G[15]||(G[15]=[De("取消")])),_:1}),B(D,{type:"primary",onClick:R,loading:S.value},{default:W(()=>G[16]||(G[16]=[De(" 保存 ")])),_:1},8,["loading"])])]),default:W(()=>[B(V,{model:y,ref_key:"bioFormRef",ref:g},{default:W(()=>[B(ve,{prop:"bio"},{default:W(()=>[B(Se,{modelValue:y.bio,"onUpdate:modelValue":G[6]||(G[6]=j=>y.bio=j),type:"textarea",rows:5,placeholder:"请输入个人简介（最多200字）",maxlength:"200","show-word-limit":""},null,8,["modelValue"])]),_:1})]),_:1},8,["model"])]),_:1},8,["modelValue"])])}}},c1=dr(fne,[["__scopeId","data-v-f1882b97"]]),CE=gee({history:UQ(),routes:[{path:"/",component:Bee,name:"Home"},{path:"/login",component:Wee,name:"Login"},{path:"/register",component:Jee,name:"Register"},{path:"/profile",component:ute,name:"Profile",meta:{requiresAuth:!0}},{path:"/myspace",component:c1,name:"MySpace",meta:{requiresAuth:!0}},{path:"/user/:id/space",component:c1,name:"UserSpace"},{path:"/posts/create",component:u1,name:"CreatePost",meta:{requiresAuth:!0}},{path:"/posts/edit/:id",component:u1,name:"EditPost",meta:{requiresAuth:!0}},{path:"/posts/:id",component:Wte,name:"PostDetail",meta:{requiresAuth:!0}}]});CE.beforeEach((e,t,n)=>{const o=localStorage.getItem("token");e.meta.requiresAuth&&!o?(alert("请先登录"),n("/login")):n()});const pne=YT(),Qd=Lw(See);Qd.use(CE);Qd.use(pne);Qd.use(VJ);Qd.mount("#app")});export default vne();
+  */const Tr=typeof document<"u";function uE(e){return typeof e=="object"||"displayName"in e||"props"in e||"__vccOpts"in e}function mQ(e){return e.__esModule||e[Symbol.toStringTag]==="Module"||e.default&&uE(e.default)}const Wt=Object.assign;function Xf(e,t){const n={};for(const o in t){const a=t[o];n[o]=jo(a)?a.map(e):e(a)}return n}const ri=()=>{},jo=Array.isArray,cE=/#/g,gQ=/&/g,yQ=/\//g,bQ=/=/g,wQ=/\?/g,dE=/\+/g,CQ=/%5B/g,SQ=/%5D/g,fE=/%5E/g,_Q=/%60/g,pE=/%7B/g,kQ=/%7C/g,vE=/%7D/g,EQ=/%20/g;function Um(e){return encodeURI(""+e).replace(kQ,"|").replace(CQ,"[").replace(SQ,"]")}function $Q(e){return Um(e).replace(pE,"{").replace(vE,"}").replace(fE,"^")}function Mv(e){return Um(e).replace(dE,"%2B").replace(EQ,"+").replace(cE,"%23").replace(gQ,"%26").replace(_Q,"`").replace(pE,"{").replace(vE,"}").replace(fE,"^")}function TQ(e){return Mv(e).replace(bQ,"%3D")}function OQ(e){return Um(e).replace(cE,"%23").replace(wQ,"%3F")}function RQ(e){return e==null?"":OQ(e).replace(yQ,"%2F")}function Bi(e){try{return decodeURIComponent(""+e)}catch{}return""+e}const MQ=/\/$/,NQ=e=>e.replace(MQ,"");function Jf(e,t,n="/"){let o,a={},l="",r="";const i=t.indexOf("#");let u=t.indexOf("?");return i<u&&i>=0&&(u=-1),u>-1&&(o=t.slice(0,u),l=t.slice(u+1,i>-1?i:t.length),a=e(l)),i>-1&&(o=o||t.slice(0,i),r=t.slice(i,t.length)),o=AQ(o??t,n),{fullPath:o+(l&&"?")+l+r,path:o,query:a,hash:Bi(r)}}function PQ(e,t){const n=t.query?e(t.query):"";return t.path+(n&&"?")+n+(t.hash||"")}function j0(e,t){return!t||!e.toLowerCase().startsWith(t.toLowerCase())?e:e.slice(t.length)||"/"}function IQ(e,t,n){const o=t.matched.length-1,a=n.matched.length-1;return o>-1&&o===a&&is(t.matched[o],n.matched[a])&&hE(t.params,n.params)&&e(t.query)===e(n.query)&&t.hash===n.hash}function is(e,t){return(e.aliasOf||e)===(t.aliasOf||t)}function hE(e,t){if(Object.keys(e).length!==Object.keys(t).length)return!1;for(const n in e)if(!xQ(e[n],t[n]))return!1;return!0}function xQ(e,t){return jo(e)?U0(e,t):jo(t)?U0(t,e):e===t}function U0(e,t){return jo(t)?e.length===t.length&&e.every((n,o)=>n===t[o]):e.length===1&&e[0]===t}function AQ(e,t){if(e.startsWith("/"))return e;if(!e)return t;const n=t.split("/"),o=e.split("/"),a=o[o.length-1];(a===".."||a===".")&&o.push("");let l=n.length-1,r,i;for(r=0;r<o.length;r++)if(i=o[r],i!==".")if(i==="..")l>1&&l--;else break;return n.slice(0,l).join("/")+"/"+o.slice(r).join("/")}const qa={path:"/",name:void 0,params:{},query:{},hash:"",fullPath:"/",matched:[],meta:{},redirectedFrom:void 0};var Fi;(function(e){e.pop="pop",e.push="push"})(Fi||(Fi={}));var si;(function(e){e.back="back",e.forward="forward",e.unknown=""})(si||(si={}));function LQ(e){if(!e)if(Tr){const t=document.querySelector("base");e=t&&t.getAttribute("href")||"/",e=e.replace(/^\w+:\/\/[^\/]+/,"")}else e="/";return e[0]!=="/"&&e[0]!=="#"&&(e="/"+e),NQ(e)}const DQ=/^[^#]+#/;function BQ(e,t){return e.replace(DQ,"#")+t}function FQ(e,t){const n=document.documentElement.getBoundingClientRect(),o=e.getBoundingClientRect();return{behavior:t.behavior,left:o.left-n.left-(t.left||0),top:o.top-n.top-(t.top||0)}}const Xd=()=>({left:window.scrollX,top:window.scrollY});function VQ(e){let t;if("el"in e){const n=e.el,o=typeof n=="string"&&n.startsWith("#"),a=typeof n=="string"?o?document.getElementById(n.slice(1)):document.querySelector(n):n;if(!a)return;t=FQ(a,e)}else t=e;"scrollBehavior"in document.documentElement.style?window.scrollTo(t):window.scrollTo(t.left!=null?t.left:window.scrollX,t.top!=null?t.top:window.scrollY)}function q0(e,t){return(history.state?history.state.position-t:-1)+e}const Nv=new Map;function zQ(e,t){Nv.set(e,t)}function HQ(e){const t=Nv.get(e);return Nv.delete(e),t}let KQ=()=>location.protocol+"//"+location.host;function mE(e,t){const{pathname:n,search:o,hash:a}=t,l=e.indexOf("#");if(l>-1){let i=a.includes(e.slice(l))?e.slice(l).length:1,u=a.slice(i);return u[0]!=="/"&&(u="/"+u),j0(u,"")}return j0(n,e)+o+a}function WQ(e,t,n,o){let a=[],l=[],r=null;const i=({state:p})=>{const v=mE(e,location),m=n.value,h=t.value;let y=0;if(p){if(n.value=v,t.value=p,r&&r===m){r=null;return}y=h?p.position-h.position:0}else o(v);a.forEach(g=>{g(n.value,m,{delta:y,type:Fi.pop,direction:y?y>0?si.forward:si.back:si.unknown})})};function u(){r=n.value}function c(p){a.push(p);const v=()=>{const m=a.indexOf(p);m>-1&&a.splice(m,1)};return l.push(v),v}function d(){const{history:p}=window;p.state&&p.replaceState(Wt({},p.state,{scroll:Xd()}),"")}function f(){for(const p of l)p();l=[],window.removeEventListener("popstate",i),window.removeEventListener("beforeunload",d)}return window.addEventListener("popstate",i),window.addEventListener("beforeunload",d,{passive:!0}),{pauseListeners:u,listen:c,destroy:f}}function Y0(e,t,n,o=!1,a=!1){return{back:e,current:t,forward:n,replaced:o,position:window.history.length,scroll:a?Xd():null}}function jQ(e){const{history:t,location:n}=window,o={value:mE(e,n)},a={value:t.state};a.value||l(o.value,{back:null,current:o.value,forward:null,position:t.length-1,replaced:!0,scroll:null},!0);function l(u,c,d){const f=e.indexOf("#"),p=f>-1?(n.host&&document.querySelector("base")?e:e.slice(f))+u:KQ()+e+u;try{t[d?"replaceState":"pushState"](c,"",p),a.value=c}catch(v){console.error(v),n[d?"replace":"assign"](p)}}function r(u,c){const d=Wt({},t.state,Y0(a.value.back,u,a.value.forward,!0),c,{position:a.value.position});l(u,d,!0),o.value=u}function i(u,c){const d=Wt({},a.value,t.state,{forward:u,scroll:Xd()});l(d.current,d,!0);const f=Wt({},Y0(o.value,u,null),{position:d.position+1},c);l(u,f,!1),o.value=u}return{location:o,state:a,push:i,replace:r}}function UQ(e){e=LQ(e);const t=jQ(e),n=WQ(e,t.state,t.location,t.replace);function o(l,r=!0){r||n.pauseListeners(),history.go(l)}const a=Wt({location:"",base:e,go:o,createHref:BQ.bind(null,e)},t,n);return Object.defineProperty(a,"location",{enumerable:!0,get:()=>t.location.value}),Object.defineProperty(a,"state",{enumerable:!0,get:()=>t.state.value}),a}function qQ(e){return typeof e=="string"||e&&typeof e=="object"}function gE(e){return typeof e=="string"||typeof e=="symbol"}const yE=Symbol("");var G0;(function(e){e[e.aborted=4]="aborted",e[e.cancelled=8]="cancelled",e[e.duplicated=16]="duplicated"})(G0||(G0={}));function us(e,t){return Wt(new Error,{type:e,[yE]:!0},t)}function wa(e,t){return e instanceof Error&&yE in e&&(t==null||!!(e.type&t))}const X0="[^/]+?",YQ={sensitive:!1,strict:!1,start:!0,end:!0},GQ=/[.+*?^${}()[\]/\\]/g;function XQ(e,t){const n=Wt({},YQ,t),o=[];let a=n.start?"^":"";const l=[];for(const c of e){const d=c.length?[]:[90];n.strict&&!c.length&&(a+="/");for(let f=0;f<c.length;f++){const p=c[f];let v=40+(n.sensitive?.25:0);if(p.type===0)f||(a+="/"),a+=p.value.replace(GQ,"\\$&"),v+=40;else if(p.type===1){const{value:m,repeatable:h,optional:y,regexp:g}=p;l.push({name:m,repeatable:h,optional:y});const S=g||X0;if(S!==X0){v+=10;try{new RegExp(`(${S})`)}catch(b){throw new Error(`Invalid custom RegExp for param "${m}" (${S}): `+b.message)}}let w=h?`((?:${S})(?:/(?:${S}))*)`:`(${S})`;f||(w=y&&c.length<2?`(?:/${w})`:"/"+w),y&&(w+="?"),a+=w,v+=20,y&&(v+=-8),h&&(v+=-20),S===".*"&&(v+=-50)}d.push(v)}o.push(d)}if(n.strict&&n.end){const c=o.length-1;o[c][o[c].length-1]+=.7000000000000001}n.strict||(a+="/?"),n.end?a+="$":n.strict&&!a.endsWith("/")&&(a+="(?:/|$)");const r=new RegExp(a,n.sensitive?"":"i");function i(c){const d=c.match(r),f={};if(!d)return null;for(let p=1;p<d.length;p++){const v=d[p]||"",m=l[p-1];f[m.name]=v&&m.repeatable?v.split("/"):v}return f}function u(c){let d="",f=!1;for(const p of e){(!f||!d.endsWith("/"))&&(d+="/"),f=!1;for(const v of p)if(v.type===0)d+=v.value;else if(v.type===1){const{value:m,repeatable:h,optional:y}=v,g=m in c?c[m]:"";if(jo(g)&&!h)throw new Error(`Provided param "${m}" is an array but it is not repeatable (* or + modifiers)`);const S=jo(g)?g.join("/"):g;if(!S)if(y)p.length<2&&(d.endsWith("/")?d=d.slice(0,-1):f=!0);else throw new Error(`Missing required param "${m}"`);d+=S}}return d||"/"}return{re:r,score:o,keys:l,parse:i,stringify:u}}function JQ(e,t){let n=0;for(;n<e.length&&n<t.length;){const o=t[n]-e[n];if(o)return o;n++}return e.length<t.length?e.length===1&&e[0]===80?-1:1:e.length>t.length?t.length===1&&t[0]===80?1:-1:0}function bE(e,t){let n=0;const o=e.score,a=t.score;for(;n<o.length&&n<a.length;){const l=JQ(o[n],a[n]);if(l)return l;n++}if(Math.abs(a.length-o.length)===1){if(J0(o))return 1;if(J0(a))return-1}return a.length-o.length}function J0(e){const t=e[e.length-1];return e.length>0&&t[t.length-1]<0}const ZQ={type:0,value:""},QQ=/[a-zA-Z0-9_]/;function eee(e){if(!e)return[[]];if(e==="/")return[[ZQ]];if(!e.startsWith("/"))throw new Error(`Invalid path "${e}"`);function t(v){throw new Error(`ERR (${n})/"${c}": ${v}`)}let n=0,o=n;const a=[];let l;function r(){l&&a.push(l),l=[]}let i=0,u,c="",d="";function f(){c&&(n===0?l.push({type:0,value:c}):n===1||n===2||n===3?(l.length>1&&(u==="*"||u==="+")&&t(`A repeatable param (${c}) must be alone in its segment. eg: '/:ids+.`),l.push({type:1,value:c,regexp:d,repeatable:u==="*"||u==="+",optional:u==="*"||u==="?"})):t("Invalid state to consume buffer"),c="")}function p(){c+=u}for(;i<e.length;){if(u=e[i++],u==="\\"&&n!==2){o=n,n=4;continue}switch(n){case 0:u==="/"?(c&&f(),r()):u===":"?(f(),n=1):p();break;case 4:p(),n=o;break;case 1:u==="("?n=2:QQ.test(u)?p():(f(),n=0,u!=="*"&&u!=="?"&&u!=="+"&&i--);break;case 2:u===")"?d[d.length-1]=="\\"?d=d.slice(0,-1)+u:n=3:d+=u;break;case 3:f(),n=0,u!=="*"&&u!=="?"&&u!=="+"&&i--,d="";break;default:t("Unknown state");break}}return n===2&&t(`Unfinished custom RegExp for param "${c}"`),f(),r(),a}function tee(e,t,n){const o=XQ(eee(e.path),n),a=Wt(o,{record:e,parent:t,children:[],alias:[]});return t&&!a.record.aliasOf==!t.record.aliasOf&&t.children.push(a),a}function nee(e,t){const n=[],o=new Map;t=t1({strict:!1,end:!0,sensitive:!1},t);function a(f){return o.get(f)}function l(f,p,v){const m=!v,h=Q0(f);h.aliasOf=v&&v.record;const y=t1(t,f),g=[h];if("alias"in f){const b=typeof f.alias=="string"?[f.alias]:f.alias;for(const C of b)g.push(Q0(Wt({},h,{components:v?v.record.components:h.components,path:C,aliasOf:v?v.record:h})))}let S,w;for(const b of g){const{path:C}=b;if(p&&C[0]!=="/"){const k=p.record.path,T=k[k.length-1]==="/"?"":"/";b.path=p.record.path+(C&&T+C)}if(S=tee(b,p,y),v?v.alias.push(S):(w=w||S,w!==S&&w.alias.push(S),m&&f.name&&!e1(S)&&r(f.name)),wE(S)&&u(S),h.children){const k=h.children;for(let T=0;T<k.length;T++)l(k[T],S,v&&v.children[T])}v=v||S}return w?()=>{r(w)}:ri}function r(f){if(gE(f)){const p=o.get(f);p&&(o.delete(f),n.splice(n.indexOf(p),1),p.children.forEach(r),p.alias.forEach(r))}else{const p=n.indexOf(f);p>-1&&(n.splice(p,1),f.record.name&&o.delete(f.record.name),f.children.forEach(r),f.alias.forEach(r))}}function i(){return n}function u(f){const p=lee(f,n);n.splice(p,0,f),f.record.name&&!e1(f)&&o.set(f.record.name,f)}function c(f,p){let v,m={},h,y;if("name"in f&&f.name){if(v=o.get(f.name),!v)throw us(1,{location:f});y=v.record.name,m=Wt(Z0(p.params,v.keys.filter(w=>!w.optional).concat(v.parent?v.parent.keys.filter(w=>w.optional):[]).map(w=>w.name)),f.params&&Z0(f.params,v.keys.map(w=>w.name))),h=v.stringify(m)}else if(f.path!=null)h=f.path,v=n.find(w=>w.re.test(h)),v&&(m=v.parse(h),y=v.record.name);else{if(v=p.name?o.get(p.name):n.find(w=>w.re.test(p.path)),!v)throw us(1,{location:f,currentLocation:p});y=v.record.name,m=Wt({},p.params,f.params),h=v.stringify(m)}const g=[];let S=v;for(;S;)g.unshift(S.record),S=S.parent;return{name:y,path:h,params:m,matched:g,meta:aee(g)}}e.forEach(f=>l(f));function d(){n.length=0,o.clear()}return{addRoute:l,resolve:c,removeRoute:r,clearRoutes:d,getRoutes:i,getRecordMatcher:a}}function Z0(e,t){const n={};for(const o of t)o in e&&(n[o]=e[o]);return n}function Q0(e){const t={path:e.path,redirect:e.redirect,name:e.name,meta:e.meta||{},aliasOf:e.aliasOf,beforeEnter:e.beforeEnter,props:oee(e),children:e.children||[],instances:{},leaveGuards:new Set,updateGuards:new Set,enterCallbacks:{},components:"components"in e?e.components||null:e.component&&{default:e.component}};return Object.defineProperty(t,"mods",{value:{}}),t}function oee(e){const t={},n=e.props||!1;if("component"in e)t.default=n;else for(const o in e.components)t[o]=typeof n=="object"?n[o]:n;return t}function e1(e){for(;e;){if(e.record.aliasOf)return!0;e=e.parent}return!1}function aee(e){return e.reduce((t,n)=>Wt(t,n.meta),{})}function t1(e,t){const n={};for(const o in e)n[o]=o in t?t[o]:e[o];return n}function lee(e,t){let n=0,o=t.length;for(;n!==o;){const l=n+o>>1;bE(e,t[l])<0?o=l:n=l+1}const a=ree(e);return a&&(o=t.lastIndexOf(a,o-1)),o}function ree(e){let t=e;for(;t=t.parent;)if(wE(t)&&bE(e,t)===0)return t}function wE({record:e}){return!!(e.name||e.components&&Object.keys(e.components).length||e.redirect)}function see(e){const t={};if(e===""||e==="?")return t;const o=(e[0]==="?"?e.slice(1):e).split("&");for(let a=0;a<o.length;++a){const l=o[a].replace(dE," "),r=l.indexOf("="),i=Bi(r<0?l:l.slice(0,r)),u=r<0?null:Bi(l.slice(r+1));if(i in t){let c=t[i];jo(c)||(c=t[i]=[c]),c.push(u)}else t[i]=u}return t}function n1(e){let t="";for(let n in e){const o=e[n];if(n=TQ(n),o==null){o!==void 0&&(t+=(t.length?"&":"")+n);continue}(jo(o)?o.map(l=>l&&Mv(l)):[o&&Mv(o)]).forEach(l=>{l!==void 0&&(t+=(t.length?"&":"")+n,l!=null&&(t+="="+l))})}return t}function iee(e){const t={};for(const n in e){const o=e[n];o!==void 0&&(t[n]=jo(o)?o.map(a=>a==null?null:""+a):o==null?o:""+o)}return t}const uee=Symbol(""),o1=Symbol(""),Jd=Symbol(""),qm=Symbol(""),Pv=Symbol("");function Ds(){let e=[];function t(o){return e.push(o),()=>{const a=e.indexOf(o);a>-1&&e.splice(a,1)}}function n(){e=[]}return{add:t,list:()=>e.slice(),reset:n}}function tl(e,t,n,o,a,l=r=>r()){const r=o&&(o.enterCallbacks[a]=o.enterCallbacks[a]||[]);return()=>new Promise((i,u)=>{const c=p=>{p===!1?u(us(4,{from:n,to:t})):p instanceof Error?u(p):qQ(p)?u(us(2,{from:t,to:p})):(r&&o.enterCallbacks[a]===r&&typeof p=="function"&&r.push(p),i())},d=l(()=>e.call(o&&o.instances[a],t,n,c));let f=Promise.resolve(d);e.length<3&&(f=f.then(c)),f.catch(p=>u(p))})}function Zf(e,t,n,o,a=l=>l()){const l=[];for(const r of e)for(const i in r.components){let u=r.components[i];if(!(t!=="beforeRouteEnter"&&!r.instances[i]))if(uE(u)){const d=(u.__vccOpts||u)[t];d&&l.push(tl(d,n,o,r,i,a))}else{let c=u();l.push(()=>c.then(d=>{if(!d)throw new Error(`Couldn't resolve component "${i}" at "${r.path}"`);const f=mQ(d)?d.default:d;r.mods[i]=d,r.components[i]=f;const v=(f.__vccOpts||f)[t];return v&&tl(v,n,o,r,i,a)()}))}}return l}function a1(e){const t=xe(Jd),n=xe(qm),o=_(()=>{const u=s(e.to);return t.resolve(u)}),a=_(()=>{const{matched:u}=o.value,{length:c}=u,d=u[c-1],f=n.matched;if(!d||!f.length)return-1;const p=f.findIndex(is.bind(null,d));if(p>-1)return p;const v=l1(u[c-2]);return c>1&&l1(d)===v&&f[f.length-1].path!==v?f.findIndex(is.bind(null,u[c-2])):p}),l=_(()=>a.value>-1&&vee(n.params,o.value.params)),r=_(()=>a.value>-1&&a.value===n.matched.length-1&&hE(n.params,o.value.params));function i(u={}){if(pee(u)){const c=t[s(e.replace)?"replace":"push"](s(e.to)).catch(ri);return e.viewTransition&&typeof document<"u"&&"startViewTransition"in document&&document.startViewTransition(()=>c),c}return Promise.resolve()}return{route:o,href:_(()=>o.value.href),isActive:l,isExactActive:r,navigate:i}}function cee(e){return e.length===1?e[0]:e}const dee=Y({name:"RouterLink",compatConfig:{MODE:3},props:{to:{type:[String,Object],required:!0},replace:Boolean,activeClass:String,exactActiveClass:String,custom:Boolean,ariaCurrentValue:{type:String,default:"page"}},useLink:a1,setup(e,{slots:t}){const n=bt(a1(e)),{options:o}=xe(Jd),a=_(()=>({[r1(e.activeClass,o.linkActiveClass,"router-link-active")]:n.isActive,[r1(e.exactActiveClass,o.linkExactActiveClass,"router-link-exact-active")]:n.isExactActive}));return()=>{const l=t.default&&cee(t.default(n));return e.custom?l:qe("a",{"aria-current":n.isExactActive?e.ariaCurrentValue:null,href:n.href,onClick:n.navigate,class:a.value},l)}}}),fee=dee;function pee(e){if(!(e.metaKey||e.altKey||e.ctrlKey||e.shiftKey)&&!e.defaultPrevented&&!(e.button!==void 0&&e.button!==0)){if(e.currentTarget&&e.currentTarget.getAttribute){const t=e.currentTarget.getAttribute("target");if(/\b_blank\b/i.test(t))return}return e.preventDefault&&e.preventDefault(),!0}}function vee(e,t){for(const n in t){const o=t[n],a=e[n];if(typeof o=="string"){if(o!==a)return!1}else if(!jo(a)||a.length!==o.length||o.some((l,r)=>l!==a[r]))return!1}return!0}function l1(e){return e?e.aliasOf?e.aliasOf.path:e.path:""}const r1=(e,t,n)=>e??t??n,hee=Y({name:"RouterView",inheritAttrs:!1,props:{name:{type:String,default:"default"},route:Object},compatConfig:{MODE:3},setup(e,{attrs:t,slots:n}){const o=xe(Pv),a=_(()=>e.route||o.value),l=xe(o1,0),r=_(()=>{let c=s(l);const{matched:d}=a.value;let f;for(;(f=d[c])&&!f.components;)c++;return c}),i=_(()=>a.value.matched[r.value]);vt(o1,_(()=>r.value+1)),vt(uee,i),vt(Pv,a);const u=P();return fe(()=>[u.value,i.value,e.name],([c,d,f],[p,v,m])=>{d&&(d.instances[f]=c,v&&v!==d&&c&&c===p&&(d.leaveGuards.size||(d.leaveGuards=v.leaveGuards),d.updateGuards.size||(d.updateGuards=v.updateGuards))),c&&d&&(!v||!is(d,v)||!p)&&(d.enterCallbacks[f]||[]).forEach(h=>h(c))},{flush:"post"}),()=>{const c=a.value,d=e.name,f=i.value,p=f&&f.components[d];if(!p)return s1(n.default,{Component:p,route:c});const v=f.props[d],m=v?v===!0?c.params:typeof v=="function"?v(c):v:null,y=qe(p,Wt({},m,t,{onVnodeUnmounted:g=>{g.component.isUnmounted&&(f.instances[d]=null)},ref:u}));return s1(n.default,{Component:y,route:c})||y}}});function s1(e,t){if(!e)return null;const n=e(t);return n.length===1?n[0]:n}const mee=hee;function gee(e){const t=nee(e.routes,e),n=e.parseQuery||see,o=e.stringifyQuery||n1,a=e.history,l=Ds(),r=Ds(),i=Ds(),u=Ft(qa);let c=qa;Tr&&e.scrollBehavior&&"scrollRestoration"in history&&(history.scrollRestoration="manual");const d=Xf.bind(null,U=>""+U),f=Xf.bind(null,RQ),p=Xf.bind(null,Bi);function v(U,le){let ae,Se;return gE(U)?(ae=t.getRecordMatcher(U),Se=le):Se=U,t.addRoute(Se,ae)}function m(U){const le=t.getRecordMatcher(U);le&&t.removeRoute(le)}function h(){return t.getRoutes().map(U=>U.record)}function y(U){return!!t.getRecordMatcher(U)}function g(U,le){if(le=Wt({},le||u.value),typeof U=="string"){const se=Jf(n,U,le.path),he=t.resolve({path:se.path},le),ye=a.createHref(se.fullPath);return Wt(se,he,{params:p(he.params),hash:Bi(se.hash),redirectedFrom:void 0,href:ye})}let ae;if(U.path!=null)ae=Wt({},U,{path:Jf(n,U.path,le.path).path});else{const se=Wt({},U.params);for(const he in se)se[he]==null&&delete se[he];ae=Wt({},U,{params:f(se)}),le.params=f(le.params)}const Se=t.resolve(ae,le),ve=U.hash||"";Se.params=d(p(Se.params));const V=PQ(o,Wt({},U,{hash:$Q(ve),path:Se.path})),j=a.createHref(V);return Wt({fullPath:V,hash:ve,query:o===n1?iee(U.query):U.query||{}},Se,{redirectedFrom:void 0,href:j})}function S(U){return typeof U=="string"?Jf(n,U,u.value.path):Wt({},U)}function w(U,le){if(c!==U)return us(8,{from:le,to:U})}function b(U){return T(U)}function C(U){return b(Wt(S(U),{replace:!0}))}function k(U){const le=U.matched[U.matched.length-1];if(le&&le.redirect){const{redirect:ae}=le;let Se=typeof ae=="function"?ae(U):ae;return typeof Se=="string"&&(Se=Se.includes("?")||Se.includes("#")?Se=S(Se):{path:Se},Se.params={}),Wt({query:U.query,hash:U.hash,params:Se.path!=null?{}:U.params},Se)}}function T(U,le){const ae=c=g(U),Se=u.value,ve=U.state,V=U.force,j=U.replace===!0,se=k(ae);if(se)return T(Wt(S(se),{state:typeof se=="object"?Wt({},ve,se.state):ve,force:V,replace:j}),le||ae);const he=ae;he.redirectedFrom=le;let ye;return!V&&IQ(o,Se,ae)&&(ye=us(16,{to:he,from:Se}),J(Se,Se,!0,!1)),(ye?Promise.resolve(ye):N(he,Se)).catch(de=>wa(de)?wa(de,2)?de:q(de):D(de,he,Se)).then(de=>{if(de){if(wa(de,2))return T(Wt({replace:j},S(de.to),{state:typeof de.to=="object"?Wt({},ve,de.to.state):ve,force:V}),le||he)}else de=I(he,Se,!0,j,ve);return x(he,Se,de),de})}function R(U,le){const ae=w(U,le);return ae?Promise.reject(ae):Promise.resolve()}function $(U){const le=ue.values().next().value;return le&&typeof le.runWithContext=="function"?le.runWithContext(U):U()}function N(U,le){let ae;const[Se,ve,V]=yee(U,le);ae=Zf(Se.reverse(),"beforeRouteLeave",U,le);for(const se of Se)se.leaveGuards.forEach(he=>{ae.push(tl(he,U,le))});const j=R.bind(null,U,le);return ae.push(j),re(ae).then(()=>{ae=[];for(const se of l.list())ae.push(tl(se,U,le));return ae.push(j),re(ae)}).then(()=>{ae=Zf(ve,"beforeRouteUpdate",U,le);for(const se of ve)se.updateGuards.forEach(he=>{ae.push(tl(he,U,le))});return ae.push(j),re(ae)}).then(()=>{ae=[];for(const se of V)if(se.beforeEnter)if(jo(se.beforeEnter))for(const he of se.beforeEnter)ae.push(tl(he,U,le));else ae.push(tl(se.beforeEnter,U,le));return ae.push(j),re(ae)}).then(()=>(U.matched.forEach(se=>se.enterCallbacks={}),ae=Zf(V,"beforeRouteEnter",U,le,$),ae.push(j),re(ae))).then(()=>{ae=[];for(const se of r.list())ae.push(tl(se,U,le));return ae.push(j),re(ae)}).catch(se=>wa(se,8)?se:Promise.reject(se))}function x(U,le,ae){i.list().forEach(Se=>$(()=>Se(U,le,ae)))}function I(U,le,ae,Se,ve){const V=w(U,le);if(V)return V;const j=le===qa,se=Tr?history.state:{};ae&&(Se||j?a.replace(U.fullPath,Wt({scroll:j&&se&&se.scroll},ve)):a.push(U.fullPath,ve)),u.value=U,J(U,le,ae,j),q()}let K;function G(){K||(K=a.listen((U,le,ae)=>{if(!ce.listening)return;const Se=g(U),ve=k(Se);if(ve){T(Wt(ve,{replace:!0,force:!0}),Se).catch(ri);return}c=Se;const V=u.value;Tr&&zQ(q0(V.fullPath,ae.delta),Xd()),N(Se,V).catch(j=>wa(j,12)?j:wa(j,2)?(T(Wt(S(j.to),{force:!0}),Se).then(se=>{wa(se,20)&&!ae.delta&&ae.type===Fi.pop&&a.go(-1,!1)}).catch(ri),Promise.reject()):(ae.delta&&a.go(-ae.delta,!1),D(j,Se,V))).then(j=>{j=j||I(Se,V,!1),j&&(ae.delta&&!wa(j,8)?a.go(-ae.delta,!1):ae.type===Fi.pop&&wa(j,20)&&a.go(-1,!1)),x(Se,V,j)}).catch(ri)}))}let H=Ds(),O=Ds(),A;function D(U,le,ae){q(U);const Se=O.list();return Se.length?Se.forEach(ve=>ve(U,le,ae)):console.error(U),Promise.reject(U)}function L(){return A&&u.value!==qa?Promise.resolve():new Promise((U,le)=>{H.add([U,le])})}function q(U){return A||(A=!U,G(),H.list().forEach(([le,ae])=>U?ae(U):le()),H.reset()),U}function J(U,le,ae,Se){const{scrollBehavior:ve}=e;if(!Tr||!ve)return Promise.resolve();const V=!ae&&HQ(q0(U.fullPath,0))||(Se||!ae)&&history.state&&history.state.scroll||null;return ze().then(()=>ve(U,le,V)).then(j=>j&&VQ(j)).catch(j=>D(j,U,le))}const ee=U=>a.go(U);let X;const ue=new Set,ce={currentRoute:u,listening:!0,addRoute:v,removeRoute:m,clearRoutes:t.clearRoutes,hasRoute:y,getRoutes:h,resolve:g,options:e,push:b,replace:C,go:ee,back:()=>ee(-1),forward:()=>ee(1),beforeEach:l.add,beforeResolve:r.add,afterEach:i.add,onError:O.add,isReady:L,install(U){const le=this;U.component("RouterLink",fee),U.component("RouterView",mee),U.config.globalProperties.$router=le,Object.defineProperty(U.config.globalProperties,"$route",{enumerable:!0,get:()=>s(u)}),Tr&&!X&&u.value===qa&&(X=!0,b(a.location).catch(ve=>{}));const ae={};for(const ve in qa)Object.defineProperty(ae,ve,{get:()=>u.value[ve],enumerable:!0});U.provide(Jd,le),U.provide(qm,Wv(ae)),U.provide(Pv,u);const Se=U.unmount;ue.add(U),U.unmount=function(){ue.delete(U),ue.size<1&&(c=qa,K&&K(),K=null,u.value=qa,X=!1,A=!1),Se()}}};function re(U){return U.reduce((le,ae)=>le.then(()=>$(ae)),Promise.resolve())}return ce}function yee(e,t){const n=[],o=[],a=[],l=Math.max(t.matched.length,e.matched.length);for(let r=0;r<l;r++){const i=t.matched[r];i&&(e.matched.find(c=>is(c,i))?o.push(i):n.push(i));const u=e.matched[r];u&&(t.matched.find(c=>is(c,u))||a.push(u))}return[n,o,a]}function El(){return xe(Jd)}function Zd(e){return xe(qm)}const dr=(e,t)=>{const n=e.__vccOpts||e;for(const[o,a]of t)n[o]=a;return n},bee={class:"app-container"},wee={class:"header-container"},Cee={class:"nav-links"},See={__name:"App",setup(e){const t=kl(),n=El(),o=_(()=>t.isLoggedIn),a=()=>{t.logout(),n.push("/login")};return(l,r)=>{const i=Ne("el-button"),u=Ne("el-header"),c=Ne("router-view"),d=Ne("el-main"),f=Ne("el-footer"),p=Ne("el-container");return E(),F("div",bee,[B(p,null,{default:W(()=>[B(u,null,{default:W(()=>[z("div",wee,[z("div",{class:"logo",onClick:r[0]||(r[0]=v=>s(n).push("/"))},"个人论坛"),z("div",Cee,[o.value?(E(),F(Fe,{key:0},[B(i,{type:"text",onClick:r[1]||(r[1]=v=>s(n).push("/myspace"))},{default:W(()=>r[5]||(r[5]=[De("我的空间")])),_:1}),B(i,{type:"text",onClick:r[2]||(r[2]=v=>s(n).push("/profile"))},{default:W(()=>r[6]||(r[6]=[De("个人资料")])),_:1}),B(i,{type:"text",onClick:a},{default:W(()=>r[7]||(r[7]=[De("退出登录")])),_:1})],64)):(E(),F(Fe,{key:1},[B(i,{type:"text",onClick:r[3]||(r[3]=v=>s(n).push("/login"))},{default:W(()=>r[8]||(r[8]=[De("登录")])),_:1}),B(i,{type:"text",onClick:r[4]||(r[4]=v=>s(n).push("/register"))},{default:W(()=>r[9]||(r[9]=[De("注册")])),_:1})],64))])])]),_:1}),B(d,null,{default:W(()=>[B(c)]),_:1}),B(f,null,{default:W(()=>r[10]||(r[10]=[z("div",{class:"footer-container"},[z("p",null," 2025 洋葱论坛 - 使用 Vue + FastAPI 构建")],-1)])),_:1})]),_:1})])}}},Bs="http://localhost:8000",Ym=nh("post",()=>{const e=P([]),t=P(!1),n=P(null),o=P(""),a=P(1),l=P(10),r=P(0),i=P(null),u=_(()=>e.value.length>0);async function c(g="",S=1,w=10){var b,C;t.value=!0,n.value=null;try{const k=await Nt.get(`${Bs}/posts/search`,{params:{query:g,page:S,page_size:w},headers:{Authorization:`Bearer ${localStorage.getItem("token")}`}});return e.value=k.data.results,r.value=k.data.total,a.value=k.data.page,l.value=k.data.page_size,o.value=g,k.data}catch(k){throw n.value=((C=(b=k.response)==null?void 0:b.data)==null?void 0:C.detail)||"获取帖子失败",k}finally{t.value=!1}}async function d(g=1,S=10){return c("",g,S)}async function f(g){var S,w;t.value=!0,n.value=null;try{const b=await Nt.get(`${Bs}/posts/${g}`,{headers:{Authorization:`Bearer ${localStorage.getItem("token")}`}});return i.value=b.data,b.data}catch(b){throw n.value=((w=(S=b.response)==null?void 0:S.data)==null?void 0:w.detail)||"获取帖子详情失败",b}finally{t.value=!1}}async function p(g){var S,w;t.value=!0,n.value=null;try{const b=await Nt.post(`${Bs}/posts/`,g,{headers:{Authorization:`Bearer ${localStorage.getItem("token")}`}});return e.value.length>0&&e.value.unshift(b.data),b.data}catch(b){throw n.value=((w=(S=b.response)==null?void 0:S.data)==null?void 0:w.detail)||"创建帖子失败",b}finally{t.value=!1}}async function v(g,S){var w,b;t.value=!0,n.value=null;try{const C=await Nt.put(`${Bs}/posts/${g}`,S,{headers:{Authorization:`Bearer ${localStorage.getItem("token")}`}}),k=e.value.findIndex(T=>T.id===g);return k!==-1&&(e.value[k]=C.data),i.value&&i.value.id===g&&(i.value=C.data),C.data}catch(C){throw n.value=((b=(w=C.response)==null?void 0:w.data)==null?void 0:b.detail)||"更新帖子失败",C}finally{t.value=!1}}async function m(g){var S,w;t.value=!0,n.value=null;try{return await Nt.delete(`${Bs}/posts/${g}`,{headers:{Authorization:`Bearer ${localStorage.getItem("token")}`}}),e.value=e.value.filter(b=>b.id!==g),i.value&&i.value.id===g&&(i.value=null),!0}catch(b){throw n.value=((w=(S=b.response)==null?void 0:S.data)==null?void 0:w.detail)||"删除帖子失败",b}finally{t.value=!1}}function h(){e.value=[],n.value=null,o.value=""}function y(){i.value=null}return{posts:e,loading:t,error:n,searchQuery:o,currentPage:a,pageSize:l,totalPosts:r,currentPost:i,hasPosts:u,searchPosts:c,fetchPosts:d,getPostById:f,createPost:p,updatePost:v,deletePost:m,clearPosts:h,clearCurrentPost:y}}),_ee={class:"home"},kee={class:"action-buttons"},Eee={key:1,class:"posts-container"},$ee={class:"search-container"},Tee={class:"posts-list"},Oee={class:"post-header"},Ree=["onClick"],Mee={class:"post-meta"},Nee={class:"author"},Pee={class:"time"},Iee={class:"views"},xee={class:"post-content"},Aee={key:0,class:"post-tags"},Lee={key:3,class:"pagination-container"},i1="http://localhost:8000",Dee={__name:"Home",setup(e){const t=El(),n=Zd(),o=kl(),a=Ym(),l=_(()=>o.isLoggedIn),r=P(""),i=P(1),u=P(10),c=P(!1);nt(async()=>{l.value&&(n.query.search?(r.value=n.query.search,await f()):await d())}),fe(l,async C=>{C?await d():a.clearPosts()}),fe(()=>{var C,k;return(k=(C=a.posts[0])==null?void 0:C.author)==null?void 0:k.avatar},(C,k)=>{console.log(`${i1}${C}`)},{deep:!0});async function d(){c.value=!0;try{await a.fetchPosts(i.value,u.value)}catch(C){Dt.error("获取帖子失败"),console.error(C)}finally{c.value=!1}}async function f(){c.value=!0,i.value=1;try{await a.searchPosts(r.value,i.value,u.value)}catch(C){Dt.error("搜索失败"),console.error(C)}finally{c.value=!1}}function p(C){r.value=C,f()}function v(C){u.value=C,h()}function m(C){i.value=C,h()}async function h(){c.value=!0;try{r.value?await a.searchPosts(r.value,i.value,u.value):await a.fetchPosts(i.value,u.value)}catch(C){Dt.error("获取帖子失败"),console.error(C)}finally{c.value=!1}}function y(C){t.push(`/posts/${C}`)}function g(){t.push("/posts/create")}function S(C){return new Date(C).toLocaleString("zh-CN",{year:"numeric",month:"2-digit",day:"2-digit",hour:"2-digit",minute:"2-digit"})}function w(C){return C.length>100?C.substring(0,100)+"...":C}function b(C){return C?C.split(",").map(k=>k.trim()).filter(k=>k):[]}return(C,k)=>{const T=Ne("el-button"),R=Ne("el-card"),$=Ne("el-icon"),N=Ne("el-input"),x=Ne("el-empty"),I=Ne("el-skeleton"),K=Ne("el-tag"),G=Ne("el-avatar"),H=Ne("el-pagination");return E(),F("div",_ee,[l.value?(E(),F("div",Eee,[z("div",$ee,[B(N,{modelValue:r.value,"onUpdate:modelValue":k[2]||(k[2]=O=>r.value=O),placeholder:"搜索帖子...",clearable:"",onKeyup:Pt(f,["enter"]),class:"search-input"},{prefix:W(()=>[B($,null,{default:W(()=>[B(s(ZC))]),_:1})]),append:W(()=>[B(T,{onClick:f},{default:W(()=>k[9]||(k[9]=[De("搜索")])),_:1})]),_:1},8,["modelValue"]),B(T,{type:"primary",onClick:g,class:"create-post-btn"},{default:W(()=>[B($,null,{default:W(()=>[B(s(Ji))]),_:1}),k[10]||(k[10]=De(" 发布新帖子 "))]),_:1})]),z("div",Tee,[!c.value&&!s(a).hasPosts?(E(),ie(x,{key:0,description:"暂无帖子"})):ne("",!0),c.value?(E(),F(Fe,{key:1},ft(5,O=>B(I,{rows:3,animated:"",key:O})),64)):(E(!0),F(Fe,{key:2},ft(s(a).posts,O=>(E(),ie(R,{key:O.id,class:"post-card"},{default:W(()=>[z("div",Oee,[z("h3",{class:"post-title",onClick:A=>y(O.id)},[De(me(O.title)+" ",1),O.is_pinned?(E(),ie(K,{key:0,size:"small",type:"success"},{default:W(()=>k[11]||(k[11]=[De("置顶")])),_:1})):ne("",!0),O.is_closed?(E(),ie(K,{key:1,size:"small",type:"info"},{default:W(()=>k[12]||(k[12]=[De("已关闭")])),_:1})):ne("",!0)],8,Ree),z("div",Mee,[z("span",Nee,[B(G,{size:24,src:`${i1}${O.author.avatar}`},null,8,["src"]),De(" "+me(O.author.username),1)]),z("span",Pee,me(S(O.created_at)),1),z("span",Iee,[B($,null,{default:W(()=>[B(s(Th))]),_:1}),De(" "+me(O.view_count),1)])])]),z("p",xee,me(O.excerpt),1),O.tags?(E(),F("div",Aee,[(E(!0),F(Fe,null,ft(b(O.tags),A=>(E(),ie(K,{key:A,size:"small",effect:"plain",onClick:D=>p(A)},{default:W(()=>[De(me(A),1)]),_:2},1032,["onClick"]))),128))])):ne("",!0)]),_:2},1024))),128)),s(a).totalPosts>0?(E(),F("div",Lee,[B(H,{"current-page":i.value,"onUpdate:currentPage":k[3]||(k[3]=O=>i.value=O),"page-size":u.value,"onUpdate:pageSize":k[4]||(k[4]=O=>u.value=O),"page-sizes":[5,10,20,50],layout:"total, sizes, prev, pager, next, jumper",total:s(a).totalPosts,onSizeChange:v,onCurrentChange:m},null,8,["current-page","page-size","total"])])):ne("",!0)])])):(E(),ie(R,{key:0,class:"welcome-card"},{default:W(()=>[k[7]||(k[7]=z("div",{class:"welcome-text"},[z("h1",null,"欢迎来到洋葱个人论坛")],-1)),k[8]||(k[8]=z("p",null,"这是一个使用Vue + Element Plus + Pinia构建的前端和FastAPI + SQLite构建的后端的个人论坛项目。",-1)),z("div",kee,[B(T,{type:"primary",onClick:k[0]||(k[0]=O=>C.$router.push("/login")),size:"large"},{default:W(()=>k[5]||(k[5]=[De("登录")])),_:1}),B(T,{type:"success",onClick:k[1]||(k[1]=O=>C.$router.push("/register")),size:"large"},{default:W(()=>k[6]||(k[6]=[De("注册")])),_:1})])]),_:1}))])}}},Bee=dr(Dee,[["__scopeId","data-v-714f2cb4"]]),Fee={class:"login-page"},Vee={class:"login-container"},zee={class:"login-form-container"},Hee={class:"register-link"},Kee={__name:"Login",setup(e){const t=El(),n=kl(),o=P(null),a=P(!1);P(!1);const l=bt({username:"",password:""}),r={username:[{required:!0,message:"请输入用户名",trigger:"blur"},{min:3,max:20,message:"用户名长度应为3-20个字符",trigger:"blur"}],password:[{required:!0,message:"请输入密码",trigger:"blur"},{min:6,max:20,message:"密码长度应为6-20个字符",trigger:"blur"}]},i=async()=>{o.value&&await o.value.validate(async u=>{if(u){a.value=!0;try{await n.login(l),Dt.success("登录成功"),t.push("/")}catch(c){Dt.error(c.message||"登录失败，请检查用户名和密码")}finally{a.value=!1}}})};return(u,c)=>{const d=Ne("el-icon"),f=Ne("el-input"),p=Ne("el-form-item"),v=Ne("el-button"),m=Ne("el-form"),h=Ne("el-link");return E(),F("div",Fee,[z("div",Vee,[z("div",zee,[c[6]||(c[6]=z("div",{class:"login-header"},[z("h1",null,"欢迎回来"),z("p",null,"登录您的账户以继续访问论坛")],-1)),B(m,{model:l,rules:r,ref_key:"loginFormRef",ref:o,class:"login-form"},{default:W(()=>[B(p,{prop:"username"},{default:W(()=>[B(f,{modelValue:l.username,"onUpdate:modelValue":c[0]||(c[0]=y=>l.username=y),placeholder:"用户名","prefix-icon":"el-icon-user",size:"large"},{prefix:W(()=>[B(d,null,{default:W(()=>[B(s(eS))]),_:1})]),_:1},8,["modelValue"])]),_:1}),B(p,{prop:"password"},{default:W(()=>[B(f,{modelValue:l.password,"onUpdate:modelValue":c[1]||(c[1]=y=>l.password=y),type:"password",placeholder:"密码","prefix-icon":"el-icon-lock",size:"large","show-password":""},{prefix:W(()=>[B(d,null,{default:W(()=>[B(s(JC))]),_:1})]),_:1},8,["modelValue"])]),_:1}),B(p,null,{default:W(()=>[B(v,{type:"primary",onClick:i,loading:a.value,class:"login-button",size:"large"},{default:W(()=>c[3]||(c[3]=[De(" 登录 ")])),_:1},8,["loading"])]),_:1})]),_:1},8,["model"]),c[7]||(c[7]=z("div",{class:"login-divider"},[z("span",null,"或者")],-1)),z("div",Hee,[c[5]||(c[5]=De(" 还没有账号? ")),B(h,{type:"primary",onClick:c[2]||(c[2]=y=>u.$router.push("/register"))},{default:W(()=>c[4]||(c[4]=[De("立即注册")])),_:1})])]),c[8]||(c[8]=z("div",{class:"login-image-container"},[z("div",{class:"login-image-content"},[z("h2",null,"加入我们的社区"),z("p",null,"探索无限可能，分享您的想法，结交志同道合的朋友"),z("img",{src:"https://img.freepik.com/free-vector/mobile-login-concept-illustration_114360-83.jpg",alt:"登录插图",class:"login-image"})])],-1))])])}}},Wee=dr(Kee,[["__scopeId","data-v-a162cc16"]]),jee={class:"register-page"},Uee={class:"register-container"},qee={class:"register-form-container"},Yee={class:"terms-agreement"},Gee={class:"login-link"},Xee={__name:"Register",setup(e){const t=El(),n=kl(),o=P(null),a=P(!1),l=P(!1),r=bt({username:"",email:"",password:"",confirmPassword:""}),u={username:[{required:!0,message:"请输入用户名",trigger:"blur"},{min:3,max:20,message:"用户名长度应为3-20个字符",trigger:"blur"}],email:[{required:!0,message:"请输入邮箱",trigger:"blur"},{type:"email",message:"请输入有效的邮箱地址",trigger:"blur"}],password:[{required:!0,message:"请输入密码",trigger:"blur"},{min:6,max:20,message:"密码长度应为6-20个字符",trigger:"blur"}],confirmPassword:[{required:!0,message:"请再次输入密码",trigger:"blur"},{validator:(d,f,p)=>{f===""?p(new Error("请再次输入密码")):f!==r.password?p(new Error("两次输入密码不一致")):p()},trigger:"blur"}]},c=async()=>{if(o.value){if(!l.value){Dt.warning("请阅读并同意服务条款和隐私政策");return}await o.value.validate(async d=>{if(d){a.value=!0;try{await n.register({username:r.username,email:r.email,password:r.password}),Dt.success("注册成功，请登录"),t.push("/login")}catch(f){Dt.error(f.message||"注册失败，请稍后再试")}finally{a.value=!1}}})}};return(d,f)=>{const p=Ne("el-icon"),v=Ne("el-input"),m=Ne("el-form-item"),h=Ne("el-link"),y=Ne("el-checkbox"),g=Ne("el-button"),S=Ne("el-form");return E(),F("div",jee,[z("div",Uee,[f[14]||(f[14]=z("div",{class:"register-image-container"},[z("div",{class:"register-image-content"},[z("h2",null,"成为我们社区的一员"),z("p",null,"注册账号，开始您的论坛之旅"),z("img",{src:"https://img.freepik.com/free-vector/sign-concept-illustration_114360-125.jpg",alt:"注册插图",class:"register-image"})])],-1)),z("div",qee,[f[13]||(f[13]=z("div",{class:"register-header"},[z("h1",null,"创建新账户"),z("p",null,"填写以下信息完成注册")],-1)),B(S,{model:r,rules:u,ref_key:"registerFormRef",ref:o,class:"register-form"},{default:W(()=>[B(m,{prop:"username"},{default:W(()=>[B(v,{modelValue:r.username,"onUpdate:modelValue":f[0]||(f[0]=w=>r.username=w),placeholder:"用户名",size:"large"},{prefix:W(()=>[B(p,null,{default:W(()=>[B(s(eS))]),_:1})]),_:1},8,["modelValue"])]),_:1}),B(m,{prop:"email"},{default:W(()=>[B(v,{modelValue:r.email,"onUpdate:modelValue":f[1]||(f[1]=w=>r.email=w),placeholder:"电子邮箱",size:"large"},{prefix:W(()=>[B(p,null,{default:W(()=>[B(s(uA))]),_:1})]),_:1},8,["modelValue"])]),_:1}),B(m,{prop:"password"},{default:W(()=>[B(v,{modelValue:r.password,"onUpdate:modelValue":f[2]||(f[2]=w=>r.password=w),type:"password",placeholder:"密码",size:"large","show-password":""},{prefix:W(()=>[B(p,null,{default:W(()=>[B(s(JC))]),_:1})]),_:1},8,["modelValue"])]),_:1}),B(m,{prop:"confirmPassword"},{default:W(()=>[B(v,{modelValue:r.confirmPassword,"onUpdate:modelValue":f[3]||(f[3]=w=>r.confirmPassword=w),type:"password",placeholder:"确认密码",size:"large","show-password":""},{prefix:W(()=>[B(p,null,{default:W(()=>[B(s(Ed))]),_:1})]),_:1},8,["modelValue"])]),_:1}),z("div",Yee,[B(y,{modelValue:l.value,"onUpdate:modelValue":f[4]||(f[4]=w=>l.value=w)},{default:W(()=>[f[8]||(f[8]=De("我已阅读并同意")),B(h,{type:"primary"},{default:W(()=>f[6]||(f[6]=[De("服务条款")])),_:1}),f[9]||(f[9]=De("和")),B(h,{type:"primary"},{default:W(()=>f[7]||(f[7]=[De("隐私政策")])),_:1})]),_:1},8,["modelValue"])]),B(m,null,{default:W(()=>[B(g,{type:"primary",onClick:c,loading:a.value,class:"register-button",size:"large",disabled:!l.value},{default:W(()=>f[10]||(f[10]=[De(" 注册 ")])),_:1},8,["loading","disabled"])]),_:1})]),_:1},8,["model"]),z("div",Gee,[f[12]||(f[12]=De(" 已有账号? ")),B(h,{type:"primary",onClick:f[5]||(f[5]=w=>d.$router.push("/login"))},{default:W(()=>f[11]||(f[11]=[De("立即登录")])),_:1})])])])])}}},Jee=dr(Xee,[["__scopeId","data-v-450c690e"]]),Zee={class:"profile-container"},Qee={class:"header"},ete={key:0,class:"profile-content"},tte={class:"avatar-container"},nte={class:"profile-actions"},ote={class:"avatar-upload"},ate=["src"],lte={class:"avatar-upload-tip"},rte={key:0,class:"current-file"},ste={class:"dialog-footer"},ite={__name:"Profile",setup(e){const t=El(),n=kl(),o=P(null),a=P(!1),l=P(!1),r=P(""),i=P("");fe(()=>n.user,m=>{m&&m.avatar&&console.log("Avatar path:",m.avatar)});const u=bt({username:"",email:"",bio:"",avatar:null}),c={email:[{required:!0,message:"请输入邮箱",trigger:"blur"},{type:"email",message:"请输入有效的邮箱地址",trigger:"blur"}],bio:[{max:200,message:"个人简介不能超过200个字符",trigger:"blur"}]},d=m=>{if(!m)return;if(!m.raw.type.startsWith("image/")){Dt.error("只能上传图片文件!");return}if(!(m.size/1024/1024<2)){Dt.error("图片大小不能超过 2MB!");return}r.value=URL.createObjectURL(m.raw),i.value=m.name,u.avatar=m.raw};nt(async()=>{if(!n.isLoggedIn){t.push("/login");return}try{await n.getUserProfile(),n.user&&(u.username=n.user.username,u.email=n.user.email,u.bio=n.user.bio||"",n.avatarUrl&&(r.value=n.avatarUrl,console.log("Real path:",r.value)))}catch{Dt.error("获取用户信息失败")}});const f=m=>m?new Date(m).toLocaleString():"",p=async()=>{o.value&&await o.value.validate(async m=>{if(m){a.value=!0;try{await n.updateProfile(u),Dt.success("个人资料更新成功"),l.value=!1}catch(h){Dt.error(h.message||"更新失败，请稍后再试")}finally{a.value=!1}}})},v=()=>{n.logout(),Dt.success("已退出登录"),t.push("/")};return(m,h)=>{const y=Ne("el-button"),g=Ne("el-avatar"),S=Ne("el-descriptions-item"),w=Ne("el-descriptions"),b=Ne("el-input"),C=Ne("el-form-item"),k=Ne("el-icon"),T=Ne("el-upload"),R=Ne("el-form"),$=Ne("el-dialog"),N=Ne("el-card");return E(),F("div",Zee,[B(N,{class:"profile-card"},{header:W(()=>[z("div",Qee,[h[7]||(h[7]=z("h2",null,"个人资料",-1)),B(y,{type:"danger",onClick:v,size:"small"},{default:W(()=>h[6]||(h[6]=[De("退出登录")])),_:1})])]),default:W(()=>[s(n).user?(E(),F("div",ete,[z("div",tte,[B(g,{size:100,src:s(n).avatarUrl||r.value||"https://cube.elemecdn.com/3/7c/3ea6beec64369c2642b92c6726f1epng.png"},null,8,["src"])]),B(w,{title:"用户信息",column:1,border:""},{default:W(()=>[B(S,{label:"用户名"},{default:W(()=>[De(me(s(n).user.username),1)]),_:1}),B(S,{label:"邮箱"},{default:W(()=>[De(me(s(n).user.email),1)]),_:1}),B(S,{label:"注册时间"},{default:W(()=>[De(me(f(s(n).user.created_at)),1)]),_:1}),B(S,{label:"上次登录"},{default:W(()=>[De(me(s(n).user.last_login?f(s(n).user.last_login):"暂无记录"),1)]),_:1})]),_:1}),z("div",nte,[B(y,{type:"primary",onClick:h[0]||(h[0]=x=>l.value=!0)},{default:W(()=>h[8]||(h[8]=[De("编辑资料")])),_:1})])])):ne("",!0),B($,{modelValue:l.value,"onUpdate:modelValue":h[5]||(h[5]=x=>l.value=x),title:"编辑个人资料",width:"500px"},{footer:W(()=>[z("span",ste,[B(y,{onClick:h[4]||(h[4]=x=>l.value=!1)},{default:W(()=>h[10]||(h[10]=[De("取消")])),_:1}),B(y,{type:"primary",onClick:p,loading:a.value},{default:W(()=>h[11]||(h[11]=[De(" 保存 ")])),_:1},8,["loading"])])]),default:W(()=>[B(R,{model:u,rules:c,ref_key:"editFormRef",ref:o,"label-width":"100px"},{default:W(()=>[B(C,{label:"用户名",prop:"username"},{default:W(()=>[B(b,{modelValue:u.username,"onUpdate:modelValue":h[1]||(h[1]=x=>u.username=x),disabled:""},null,8,["modelValue"])]),_:1}),B(C,{label:"邮箱",prop:"email"},{default:W(()=>[B(b,{modelValue:u.email,"onUpdate:modelValue":h[2]||(h[2]=x=>u.email=x)},null,8,["modelValue"])]),_:1}),B(C,{label:"个人简介",prop:"bio"},{default:W(()=>[B(b,{modelValue:u.bio,"onUpdate:modelValue":h[3]||(h[3]=x=>u.bio=x),type:"textarea",rows:4},null,8,["modelValue"])]),_:1}),B(C,{label:"头像",prop:"avatar"},{default:W(()=>[z("div",ote,[B(T,{class:"avatar-uploader",action:"http://localhost:8000/uploads/avatars","auto-upload":!1,"show-file-list":!1,"on-change":d,accept:"image/*"},{default:W(()=>[r.value?(E(),F("img",{key:0,src:r.value,class:"avatar-preview"},null,8,ate)):(E(),ie(k,{key:1,class:"avatar-uploader-icon"},{default:W(()=>[B(s(Ji))]),_:1}))]),_:1}),z("div",lte,[h[9]||(h[9]=z("p",null,"点击上传头像",-1)),r.value?(E(),F("p",rte," 已选择: "+me(i.value||"预览中"),1)):ne("",!0)])])]),_:1})]),_:1},8,["model"])]),_:1},8,["modelValue"])]),_:1})])}}},ute=dr(ite,[["__scopeId","data-v-2f0f07e1"]]),Du="http://localhost:8000",cte=nh("floor",()=>{const e=P([]),t=P(!1),n=P(null),o=P(1),a=P(20),l=P(null),r=_(()=>e.value.length>0);async function i(m,h=1,y=20){var g,S;t.value=!0,n.value=null;try{const w=await Nt.get(`${Du}/floors/post/${m}`,{params:{page:h,page_size:y},headers:{Authorization:`Bearer ${localStorage.getItem("token")}`}});return e.value=w.data,o.value=h,a.value=y,w.data}catch(w){throw n.value=((S=(g=w.response)==null?void 0:g.data)==null?void 0:S.detail)||"获取楼层失败",w}finally{t.value=!1}}async function u(m){var h,y;t.value=!0,n.value=null;try{const g=await Nt.post(`${Du}/floors/`,m,{headers:{Authorization:`Bearer ${localStorage.getItem("token")}`}});return e.value.push(g.data),l.value=null,g.data}catch(g){throw n.value=((y=(h=g.response)==null?void 0:h.data)==null?void 0:y.detail)||"创建回复失败",g}finally{t.value=!1}}async function c(m,h){var y,g;t.value=!0,n.value=null;try{const S=await Nt.put(`${Du}/floors/${m}`,{content:h},{headers:{Authorization:`Bearer ${localStorage.getItem("token")}`}}),w=e.value.findIndex(b=>b.id===m);return w!==-1&&(e.value[w]=S.data),S.data}catch(S){throw n.value=((g=(y=S.response)==null?void 0:y.data)==null?void 0:g.detail)||"更新回复失败",S}finally{t.value=!1}}async function d(m){var h,y;t.value=!0,n.value=null;try{return await Nt.delete(`${Du}/floors/${m}`,{headers:{Authorization:`Bearer ${localStorage.getItem("token")}`}}),e.value=e.value.filter(g=>g.id!==m),!0}catch(g){throw n.value=((y=(h=g.response)==null?void 0:h.data)==null?void 0:y.detail)||"删除回复失败",g}finally{t.value=!1}}function f(m){l.value=m}function p(){l.value=null}function v(){e.value=[],n.value=null}return{floors:e,loading:t,error:n,currentPage:o,pageSize:a,replyingTo:l,hasFloors:r,getFloorsByPostId:i,createFloor:u,updateFloor:c,deleteFloor:d,setReplyTarget:f,clearReplyTarget:p,clearFloors:v}}),dte={class:"post-detail-container"},fte={key:0,class:"loading-container"},pte={key:1,class:"error-container"},vte={class:"post-header"},hte={class:"post-title"},mte={class:"post-meta"},gte={class:"time"},yte={class:"views"},bte={key:0,class:"post-tags"},wte={class:"post-content"},Cte={key:0,class:"post-actions"},Ste={class:"floors-section"},_te={class:"section-title"},kte={key:0,class:"loading-container"},Ete={key:1,class:"error-container"},$te={key:2,class:"empty-floors"},Tte={key:3,class:"floor-list"},Ote=["id"],Rte={class:"floor-header"},Mte=["onClick"],Nte={class:"author-name"},Pte={class:"floor-meta"},Ite={class:"floor-number"},xte={class:"floor-time"},Ate={class:"floor-content"},Lte={key:0,class:"reply-reference"},Dte={class:"content-text"},Bte={class:"floor-actions"},Fte={key:1,class:"reply-editor"},Vte={class:"reply-title"},zte="https://cube.elemecdn.com/3/7c/3ea6beec64369c2642b92c6726f1epng.png",Hte="http://localhost:8000",Kte={__name:"PostDetail",setup(e){const t=Zd(),n=El(),o=Ym(),a=kl(),l=cte(),r=P(!0),i=P(null),u=P(!1),c=P(null),d=P(!1),f=P(""),p=P(null),v=_(()=>o.currentPost),m=_(()=>l.floors),h=_(()=>!v.value||!a.user?!1:v.value.author_id===a.user.id||a.user.is_admin);nt(async()=>{await y(),v.value&&await $()});async function y(){const O=parseInt(t.params.id);if(isNaN(O)){i.value="无效的帖子ID",r.value=!1;return}r.value=!0,i.value=null;try{await o.getPostById(O)}catch(A){i.value=A.message||"获取帖子详情失败",console.error(A)}finally{r.value=!1}}function g(){n.back()}function S(O){n.push({path:"/",query:{search:O}})}function w(){n.push(`/posts/edit/${v.value.id}`)}async function b(){try{await o.deletePost(v.value.id),Dt.success("帖子已删除"),n.push("/")}catch(O){Dt.error(O.message||"删除帖子失败"),console.error(O)}}function C(O){if(!O)return"";const A=new Date(O),L=new Date-A;return Math.floor(L/(1e3*60*60*24))===0?A.toLocaleTimeString():A.toLocaleDateString()}function k(O){return O?O.startsWith("http")?O:`${Hte}${O}`:zte}function T(O){O&&(a.user&&O===a.user.id?n.push("/myspace"):n.push(`/user/${O}/space`))}function R(O){return O?O.split(",").map(A=>A.trim()).filter(A=>A):[]}async function $(){if(v.value){u.value=!0,c.value=null;try{await l.getFloorsByPostId(v.value.id)}catch(O){c.value=O.message||"获取回复列表失败",console.error(O)}finally{u.value=!1}}}function N(O){const A=m.value.find(D=>D.id===O);return A?A.floor_number:"?"}function x(O){l.setReplyTarget(O),ze(()=>{document.querySelector(".reply-editor").scrollIntoView({behavior:"smooth"})})}async function I(){if(f.value.trim()){d.value=!0;try{if(p.value)await l.updateFloor(p.value,f.value),p.value=null,Dt.success("回复更新成功");else{const O={content:f.value,post_id:v.value.id,reply_to_floor_id:l.replyingTo?l.replyingTo.id:null};await l.createFloor(O),Dt.success("回复发表成功")}f.value="",l.clearReplyTarget()}catch(O){Dt.error(O.message||"操作失败"),console.error(O)}finally{d.value=!1}}}function K(O){f.value=O.content,p.value=O.id,ze(()=>{document.querySelector(".reply-editor").scrollIntoView({behavior:"smooth"})})}async function G(O){try{await l.deleteFloor(O),Dt.success("回复已删除")}catch(A){Dt.error(A.message||"删除回复失败"),console.error(A)}}function H(O){return a.user?O.author_id===a.user.id||a.user.is_admin:!1}return(O,A)=>{var ve,V;const D=Ne("el-page-header"),L=Ne("el-skeleton"),q=Ne("el-button"),J=Ne("el-result"),ee=Ne("el-tag"),X=Ne("el-avatar"),ue=Ne("el-icon"),ce=Ne("el-popconfirm"),re=Ne("el-alert"),U=Ne("el-empty"),le=Ne("el-input"),ae=Ne("el-form-item"),Se=Ne("el-form");return E(),F("div",dte,[B(D,{onBack:g,title:"返回"}),r.value?(E(),F("div",fte,[B(L,{rows:10,animated:""})])):i.value?(E(),F("div",pte,[B(J,{icon:"error",title:"加载失败","sub-title":i.value},{extra:W(()=>[B(q,{type:"primary",onClick:y},{default:W(()=>A[4]||(A[4]=[De("重试")])),_:1})]),_:1},8,["sub-title"])])):v.value?(E(),F(Fe,{key:2},[z("div",vte,[z("h1",hte,[De(me(v.value.title)+" ",1),v.value.is_pinned?(E(),ie(ee,{key:0,type:"success",size:"small"},{default:W(()=>A[5]||(A[5]=[De("置顶")])),_:1})):ne("",!0),v.value.is_closed?(E(),ie(ee,{key:1,type:"info",size:"small"},{default:W(()=>A[6]||(A[6]=[De("已关闭")])),_:1})):ne("",!0)]),z("div",mte,[z("span",{class:"author",onClick:A[0]||(A[0]=j=>T(v.value.author_id))},[B(X,{size:32,src:k((ve=v.value.author)==null?void 0:ve.avatar)},null,8,["src"]),De(" "+me((V=v.value.author)==null?void 0:V.username),1)]),z("span",gte,"发布于: "+me(C(v.value.created_at)),1),z("span",yte,[B(ue,null,{default:W(()=>[B(s(Th))]),_:1}),De(" "+me(v.value.view_count),1)])]),v.value.tags?(E(),F("div",bte,[(E(!0),F(Fe,null,ft(R(v.value.tags),j=>(E(),ie(ee,{key:j,size:"small",effect:"plain",onClick:se=>S(j)},{default:W(()=>[De(me(j),1)]),_:2},1032,["onClick"]))),128))])):ne("",!0)]),z("div",wte,me(v.value.content),1),h.value?(E(),F("div",Cte,[B(q,{type:"primary",onClick:w,icon:s(eA)},{default:W(()=>A[7]||(A[7]=[De("编辑")])),_:1},8,["icon"]),B(ce,{title:"确定要删除这个帖子吗？",onConfirm:b,"confirm-button-text":"确定","cancel-button-text":"取消"},{reference:W(()=>[B(q,{type:"danger",icon:s(XC)},{default:W(()=>A[8]||(A[8]=[De("删除")])),_:1},8,["icon"])]),_:1})])):ne("",!0),z("div",Ste,[z("h2",_te,"全部回复 ("+me(m.value.length)+")",1),u.value?(E(),F("div",kte,[B(L,{rows:5,animated:""})])):c.value?(E(),F("div",Ete,[B(re,{title:c.value,type:"error","show-icon":"",onClose:A[1]||(A[1]=j=>c.value=null)},null,8,["title"]),B(q,{class:"mt-3",type:"primary",onClick:$},{default:W(()=>A[9]||(A[9]=[De("重试")])),_:1})])):m.value.length===0?(E(),F("div",$te,[B(U,{description:"暂无回复，来发表第一条回复吧！"})])):(E(),F("div",Tte,[(E(!0),F(Fe,null,ft(m.value,j=>{var se,he;return E(),F("div",{key:j.id,class:"floor-item",id:`floor-${j.id}`},[z("div",Rte,[z("div",{class:"floor-author",onClick:ye=>T(j.author_id)},[B(X,{size:32,src:k((se=j.author)==null?void 0:se.avatar)},null,8,["src"]),z("span",Nte,me((he=j.author)==null?void 0:he.username),1)],8,Mte),z("div",Pte,[z("span",Ite,"#"+me(j.floor_number),1),z("span",xte,me(C(j.created_at)),1)])]),z("div",Ate,[j.reply_to_floor_id?(E(),F("div",Lte,[B(ee,{size:"small",type:"info"},{default:W(()=>[De(" 回复 #"+me(N(j.reply_to_floor_id)),1)]),_:2},1024)])):ne("",!0),z("div",Dte,me(j.content),1)]),z("div",Bte,[B(q,{type:"primary",size:"small",text:"",onClick:ye=>x(j),disabled:v.value.is_closed},{default:W(()=>A[10]||(A[10]=[De(" 回复 ")])),_:2},1032,["onClick","disabled"]),H(j)?(E(),F(Fe,{key:0},[B(q,{type:"primary",size:"small",text:"",onClick:ye=>K(j)},{default:W(()=>A[11]||(A[11]=[De(" 编辑 ")])),_:2},1032,["onClick"]),B(ce,{title:"确定要删除这条回复吗？",onConfirm:ye=>G(j.id),"confirm-button-text":"确定","cancel-button-text":"取消"},{reference:W(()=>[B(q,{type:"danger",size:"small",text:""},{default:W(()=>A[12]||(A[12]=[De("删除")])),_:1})]),_:2},1032,["onConfirm"])],64)):ne("",!0)])],8,Ote)}),128))]))]),v.value.is_closed?(E(),ie(re,{key:2,title:"该帖子已关闭，无法回复",type:"info",closable:!1,"show-icon":""})):(E(),F("div",Fte,[z("h3",Vte,[De(me(s(l).replyingTo?`回复 #${s(l).replyingTo.floor_number}`:"发表回复")+" ",1),s(l).replyingTo?(E(),ie(q,{key:0,type:"info",size:"small",text:"",onClick:A[2]||(A[2]=j=>s(l).clearReplyTarget())},{default:W(()=>A[13]||(A[13]=[De(" 取消回复 ")])),_:1})):ne("",!0)]),B(Se,{onSubmit:Ge(I,["prevent"])},{default:W(()=>[B(ae,null,{default:W(()=>[B(le,{modelValue:f.value,"onUpdate:modelValue":A[3]||(A[3]=j=>f.value=j),type:"textarea",rows:4,placeholder:"请输入回复内容...",disabled:d.value},null,8,["modelValue","disabled"])]),_:1}),B(ae,null,{default:W(()=>[B(q,{type:"primary",onClick:I,loading:d.value,disabled:!f.value.trim()},{default:W(()=>A[14]||(A[14]=[De(" 发表回复 ")])),_:1},8,["loading","disabled"])]),_:1})]),_:1})]))],64)):ne("",!0)])}}},Wte=dr(Kte,[["__scopeId","data-v-b19364d7"]]),jte={class:"post-form-container"},Ute={class:"form-title"},qte={__name:"PostForm",setup(e){const t=Zd(),n=El(),o=Ym(),a=kl(),l=P(null),r=P(!1),i=_(()=>parseInt(t.params.id)),u=_(()=>!!i.value),c=_(()=>{var y;return(y=a.user)==null?void 0:y.is_admin}),d=_(()=>{var y;return!u.value||!o.currentPost?!0:o.currentPost.author_id===((y=a.user)==null?void 0:y.id)}),f=bt({title:"",content:"",tags:"",is_pinned:!1,is_closed:!1}),p={title:[{required:!0,message:"请输入帖子标题",trigger:"blur"},{min:3,max:100,message:"标题长度应在3到100个字符之间",trigger:"blur"}],content:[{required:!0,message:"请输入帖子内容",trigger:"blur"},{min:10,max:5e3,message:"内容长度应在10到5000个字符之间",trigger:"blur"}]};nt(async()=>{u.value&&await v()});async function v(){var y;r.value=!0;try{const g=await o.getPostById(i.value);if(!c.value&&g.author_id!==((y=a.user)==null?void 0:y.id)){Dt.error("您没有权限编辑此帖子"),n.push(`/posts/${i.value}`);return}f.title=g.title,f.content=g.content,f.tags=g.tags||"",f.is_pinned=g.is_pinned,f.is_closed=g.is_closed}catch(g){Dt.error("获取帖子数据失败"),console.error(g),n.push("/")}finally{r.value=!1}}async function m(){l.value&&await l.value.validate(async y=>{if(y){r.value=!0;try{if(u.value)await o.updatePost(i.value,f),Dt.success("帖子已更新"),n.push(`/posts/${i.value}`);else{const g=await o.createPost(f);Dt.success("帖子已发布"),n.push(`/posts/${g.id}`)}}catch(g){Dt.error(g.message||(u.value?"更新帖子失败":"发布帖子失败")),console.error(g)}finally{r.value=!1}}})}function h(){n.back()}return(y,g)=>{const S=Ne("el-page-header"),w=Ne("el-input"),b=Ne("el-form-item"),C=Ne("el-checkbox"),k=Ne("el-button"),T=Ne("el-form");return E(),F("div",jte,[B(S,{onBack:h,title:"返回"}),z("h2",Ute,me(u.value?"编辑帖子":"创建新帖子"),1),B(T,{ref_key:"formRef",ref:l,model:f,rules:p,"label-position":"top",onSubmit:Ge(m,["prevent"])},{default:W(()=>[B(b,{label:"标题",prop:"title"},{default:W(()=>[B(w,{modelValue:f.title,"onUpdate:modelValue":g[0]||(g[0]=R=>f.title=R),placeholder:"请输入帖子标题",maxlength:"100","show-word-limit":""},null,8,["modelValue"])]),_:1}),B(b,{label:"内容",prop:"content"},{default:W(()=>[B(w,{modelValue:f.content,"onUpdate:modelValue":g[1]||(g[1]=R=>f.content=R),type:"textarea",placeholder:"请输入帖子内容",rows:10,maxlength:"5000","show-word-limit":""},null,8,["modelValue"])]),_:1}),B(b,{label:"标签"},{default:W(()=>[B(w,{modelValue:f.tags,"onUpdate:modelValue":g[2]||(g[2]=R=>f.tags=R),placeholder:"输入标签，用逗号分隔",maxlength:"100"},null,8,["modelValue"]),g[5]||(g[5]=z("div",{class:"form-tip"},"标签示例: 技术,问题,讨论",-1))]),_:1}),u.value&&(c.value||d.value)?(E(),ie(b,{key:0},{default:W(()=>[B(C,{modelValue:f.is_pinned,"onUpdate:modelValue":g[3]||(g[3]=R=>f.is_pinned=R)},{default:W(()=>g[6]||(g[6]=[De("置顶帖子")])),_:1},8,["modelValue"]),B(C,{modelValue:f.is_closed,"onUpdate:modelValue":g[4]||(g[4]=R=>f.is_closed=R)},{default:W(()=>g[7]||(g[7]=[De("关闭讨论")])),_:1},8,["modelValue"])]),_:1})):ne("",!0),B(b,null,{default:W(()=>[B(k,{type:"primary","native-type":"submit",loading:r.value},{default:W(()=>[De(me(u.value?"保存修改":"发布帖子"),1)]),_:1},8,["loading"]),B(k,{onClick:h},{default:W(()=>g[8]||(g[8]=[De("取消")])),_:1})]),_:1})]),_:1},8,["model"])])}}},u1=dr(qte,[["__scopeId","data-v-ab651aca"]]),Yte={class:"myspace-container"},Gte={class:"header"},Xte={key:0,class:"profile-content"},Jte={class:"avatar-container"},Zte={key:0,class:"avatar-edit-hint"},Qte={class:"bio-section"},ene={class:"bio-header"},tne={class:"bio-content"},nne={key:1,class:"loading-container"},one={class:"header"},ane={key:0},lne={key:1},rne={class:"post-title"},sne={class:"pagination-container"},ine={key:1,class:"loading-container"},une=["src"],cne={class:"dialog-footer"},dne={class:"dialog-footer"},fne={__name:"MySpace",setup(e){const t=El(),n=Zd(),o=kl(),a=P(null),l=_(()=>!a.value),r=P(""),i=P(null),u=P(null),c=P(1),d=P(10),f=P(!1),p=P(""),v=P(null),m=P(!1),h=P(!1),y=bt({bio:""}),g=P(null),S=P(!1),w=async()=>{try{l.value?i.value=await o.getUserProfileSpace():i.value=await o.getOtherUserProfile(a.value),i.value&&i.value.user&&(y.bio=i.value.user.bio||"",i.value.user.avatar&&(r.value=o.getAvatarUrl(i.value.user.avatar)))}catch(K){Dt.error("获取个人空间信息失败"),console.error(K)}},b=async()=>{try{l.value?u.value=await o.getUserPosts(c.value,d.value):u.value=await o.getOtherUserPosts(a.value,c.value,d.value)}catch(K){Dt.error("获取帖子列表失败"),console.error(K)}},C=K=>K?new Date(K).toLocaleString():"",k=K=>{if(!K)return;if(!K.raw.type.startsWith("image/")){Dt.error("只能上传图片文件!");return}if(!(K.size/1024/1024<2)){Dt.error("图片大小不能超过 2MB!");return}p.value=URL.createObjectURL(K.raw),v.value=K.raw},T=async()=>{if(!v.value){Dt.warning("请先选择图片");return}m.value=!0;try{await o.updateProfile({email:i.value.user.email,bio:i.value.user.bio,avatar:v.value}),Dt.success("头像更新成功"),f.value=!1,await w()}catch(K){Dt.error("头像更新失败"),console.error(K)}finally{m.value=!1}},R=async()=>{S.value=!0;try{await o.updateProfile({email:i.value.user.email,bio:y.bio,avatar:i.value.user.avatar}),Dt.success("个人简介更新成功"),h.value=!1,i.value&&i.value.user&&(i.value.user.bio=y.bio)}catch(K){Dt.error("个人简介更新失败"),console.error(K)}finally{S.value=!1}},$=K=>{d.value=K,b()},N=K=>{c.value=K,b()},x=K=>{t.push(`/posts/${K.id}`)},I=()=>{l.value&&(f.value=!0)};return nt(async()=>{if(n.params.id&&(a.value=n.params.id),l.value&&!o.isLoggedIn){t.push("/login");return}await w(),await b()}),(K,G)=>{const H=Ne("el-avatar"),O=Ne("el-descriptions-item"),A=Ne("el-descriptions"),D=Ne("el-button"),L=Ne("el-skeleton"),q=Ne("el-card"),J=Ne("el-col"),ee=Ne("el-empty"),X=Ne("el-table-column"),ue=Ne("el-table"),ce=Ne("el-pagination"),re=Ne("el-row"),U=Ne("el-icon"),le=Ne("el-upload"),ae=Ne("el-dialog"),Se=Ne("el-input"),ve=Ne("el-form-item"),V=Ne("el-form");return E(),F("div",Yte,[B(re,{gutter:20},{default:W(()=>[B(J,{span:8},{default:W(()=>[B(q,{class:"profile-card"},{header:W(()=>[z("div",Gte,[z("h2",null,me(l.value?"我的空间":"用户空间"),1)])]),default:W(()=>[i.value?(E(),F("div",Xte,[z("div",Jte,[B(H,{size:120,src:(l.value?s(o).avatarUrl:r.value)||"https://cube.elemecdn.com/3/7c/3ea6beec64369c2642b92c6726f1epng.png",onClick:I},null,8,["src"]),l.value?(E(),F("div",Zte,"点击更换头像")):ne("",!0)]),B(A,{title:"个人信息",column:1,border:""},{default:W(()=>[B(O,{label:"用户名"},{default:W(()=>[De(me(i.value.user.username),1)]),_:1}),B(O,{label:"邮箱"},{default:W(()=>[De(me(i.value.user.email),1)]),_:1}),B(O,{label:"发帖数"},{default:W(()=>[De(me(i.value.post_count),1)]),_:1}),B(O,{label:"回复数"},{default:W(()=>[De(me(i.value.floor_count),1)]),_:1}),B(O,{label:"注册时间"},{default:W(()=>[De(me(C(i.value.user.created_at)),1)]),_:1}),B(O,{label:"上次登录"},{default:W(()=>[De(me(i.value.user.last_login?C(i.value.user.last_login):"暂无记录"),1)]),_:1})]),_:1}),z("div",Qte,[z("div",ene,[G[10]||(G[10]=z("h3",null,"个人简介",-1)),l.value?(E(),ie(D,{key:0,type:"primary",size:"small",onClick:G[0]||(G[0]=j=>h.value=!0)},{default:W(()=>G[9]||(G[9]=[De("编辑")])),_:1})):ne("",!0)]),z("div",tne,me(i.value.user.bio||"这个人很懒，还没有填写个人简介..."),1)])])):(E(),F("div",nne,[B(L,{rows:6,animated:""})]))]),_:1})]),_:1}),B(J,{span:16},{default:W(()=>[B(q,{class:"posts-card"},{header:W(()=>[z("div",one,[z("h2",null,me(l.value?"我的帖子":"用户帖子"),1),l.value?(E(),ie(D,{key:0,type:"primary",size:"small",onClick:G[1]||(G[1]=j=>s(t).push("/posts/create"))},{default:W(()=>G[11]||(G[11]=[De("发布新帖")])),_:1})):ne("",!0)])]),default:W(()=>[u.value?(E(),F("div",ane,[u.value.results.length===0?(E(),ie(ee,{key:0,description:l.value?"您还没有发布过帖子":"该用户还没有发布过帖子"},null,8,["description"])):(E(),F("div",lne,[B(ue,{data:u.value.results,style:{width:"100%"},onRowClick:x},{default:W(()=>[B(X,{prop:"title",label:"标题","min-width":"200"},{default:W(j=>[z("div",rne,me(j.row.title),1)]),_:1}),B(X,{prop:"view_count",label:"浏览",width:"80",align:"center"}),B(X,{prop:"floor_count",label:"回复",width:"80",align:"center"}),B(X,{label:"发布时间",width:"180",align:"center"},{default:W(j=>[De(me(C(j.row.created_at)),1)]),_:1})]),_:1},8,["data"]),z("div",sne,[B(ce,{"current-page":c.value,"onUpdate:currentPage":G[2]||(G[2]=j=>c.value=j),"page-size":d.value,"onUpdate:pageSize":G[3]||(G[3]=j=>d.value=j),"page-sizes":[5,10,20,50],layout:"total, sizes, prev, pager, next, jumper",total:u.value.total,onSizeChange:$,onCurrentChange:N},null,8,["current-page","page-size","total"])])]))])):(E(),F("div",ine,[B(L,{rows:6,animated:""})]))]),_:1})]),_:1})]),_:1}),B(ae,{modelValue:f.value,"onUpdate:modelValue":G[5]||(G[5]=j=>f.value=j),title:"更换头像",width:"400px"},{footer:W(()=>[z("span",cne,[B(D,{onClick:G[4]||(G[4]=j=>f.value=!1)},{default:W(()=>G[12]||(G[12]=[De("取消")])),_:1}),B(D,{type:"primary",onClick:T,loading:m.value},{default:W(()=>G[13]||(G[13]=[De(" 保存 ")])),_:1},8,["loading"])])]),default:W(()=>[B(le,{class:"avatar-uploader",action:"#","auto-upload":!1,"show-file-list":!1,"on-change":k,accept:"image/*"},{default:W(()=>[p.value?(E(),F("img",{key:0,src:p.value,class:"avatar-preview"},null,8,une)):(E(),ie(U,{key:1,class:"avatar-uploader-icon"},{default:W(()=>[B(s(Ji))]),_:1}))]),_:1}),G[14]||(G[14]=z("div",{class:"upload-hint"},"点击上方区域选择图片",-1))]),_:1},8,["modelValue"]),B(ae,{modelValue:h.value,"onUpdate:modelValue":G[8]||(G[8]=j=>h.value=j),title:"编辑个人简介",width:"500px"},{footer:W(()=>[z("span",dne,[B(D,{onClick:G[7]||(G[7]=j=>h.value=!1)},{default:W(()=>G[15]||(G[15]=[De("取消")])),_:1}),B(D,{type:"primary",onClick:R,loading:S.value},{default:W(()=>G[16]||(G[16]=[De(" 保存 ")])),_:1},8,["loading"])])]),default:W(()=>[B(V,{model:y,ref_key:"bioFormRef",ref:g},{default:W(()=>[B(ve,{prop:"bio"},{default:W(()=>[B(Se,{modelValue:y.bio,"onUpdate:modelValue":G[6]||(G[6]=j=>y.bio=j),type:"textarea",rows:5,placeholder:"请输入个人简介（最多200字）",maxlength:"200","show-word-limit":""},null,8,["modelValue"])]),_:1})]),_:1},8,["model"])]),_:1},8,["modelValue"])])}}},c1=dr(fne,[["__scopeId","data-v-f1882b97"]]),CE=gee({history:UQ(),routes:[{path:"/",component:Bee,name:"Home"},{path:"/login",component:Wee,name:"Login"},{path:"/register",component:Jee,name:"Register"},{path:"/profile",component:ute,name:"Profile",meta:{requiresAuth:!0}},{path:"/myspace",component:c1,name:"MySpace",meta:{requiresAuth:!0}},{path:"/user/:id/space",component:c1,name:"UserSpace"},{path:"/posts/create",component:u1,name:"CreatePost",meta:{requiresAuth:!0}},{path:"/posts/edit/:id",component:u1,name:"EditPost",meta:{requiresAuth:!0}},{path:"/posts/:id",component:Wte,name:"PostDetail",meta:{requiresAuth:!0}}]});CE.beforeEach((e,t,n)=>{const o=localStorage.getItem("token");e.meta.requiresAuth&&!o?(alert("请先登录"),n("/login")):n()});const pne=YT(),Qd=Lw(See);Qd.use(CE);Qd.use(pne);Qd.use(VJ);Qd.mount("#app")});export default vne();